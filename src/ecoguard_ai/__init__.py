@@ -11,11 +11,13 @@ __email__ = "team@ecoguard-ai.org"
 __license__ = "MIT"
 
 from ecoguard_ai.core.analyzer import EcoGuardAnalyzer
+from ecoguard_ai.core.async_analyzer import AsyncEcoGuardAnalyzer
 from ecoguard_ai.core.issue import Issue, Severity
 from ecoguard_ai.core.result import AnalysisResult
 
 __all__ = [
     "EcoGuardAnalyzer",
+    "AsyncEcoGuardAnalyzer",
     "Issue",
     "Severity",
     "AnalysisResult",
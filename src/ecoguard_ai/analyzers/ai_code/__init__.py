@@ -9,9 +9,17 @@ This module implements AI-specific code analysis rules including:
 """
 
 import ast
-from typing import List
-
-from ecoguard_ai.analyzers.base import ASTVisitorRule, BaseAnalyzer
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from ecoguard_ai.analyzers.ai_code.fingerprint import (
+    DuplicateIndex,
+    FunctionFingerprint,
+    FunctionNode,
+    fingerprint_function,
+)
+from ecoguard_ai.analyzers.base import ASTVisitorRule, BaseAnalyzer, in_project_run
+from ecoguard_ai.analyzers.semantic import Scope, ScopeKind
 from ecoguard_ai.core.issue import Fix, Impact, Issue
 
 
@@ -113,50 +121,67 @@ class RedundantVariableRule(ASTVisitorRule):
             severity="info",
         )
 
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
-        """Check for variables assigned once and immediately returned."""
-        self._check_immediate_return_pattern(node)
-        self.generic_visit(node)
+    def visit_Module(self, node: ast.Module) -> None:
+        """Check every function scope of the shared semantic model."""
+        for scope in self.semantic.scopes_of_kind(ScopeKind.FUNCTION):
+            self._check_immediate_return_pattern(scope)
 
-    def _check_immediate_return_pattern(self, node: ast.FunctionDef) -> None:
+    def _check_immediate_return_pattern(self, scope: Scope) -> None:
         """Check for: var = expr; return var pattern."""
-        if len(node.body) >= 2:
-            for i in range(len(node.body) - 1):
-                stmt1 = node.body[i]
-                stmt2 = node.body[i + 1]
-
-                if (
-                    isinstance(stmt1, ast.Assign)
-                    and isinstance(stmt2, ast.Return)
-                    and len(stmt1.targets) == 1
-                    and isinstance(stmt1.targets[0], ast.Name)
-                    and isinstance(stmt2.value, ast.Name)
-                    and stmt1.targets[0].id == stmt2.value.id
-                ):
+        body = getattr(scope.node, "body", [])
+        for stmt1, stmt2 in zip(body, body[1:]):
+            if (
+                isinstance(stmt1, ast.Assign)
+                and isinstance(stmt2, ast.Return)
+                and len(stmt1.targets) == 1
+                and isinstance(stmt1.targets[0], ast.Name)
+                and isinstance(stmt2.value, ast.Name)
+                and stmt1.targets[0].id == stmt2.value.id
+                and self._is_local_only(scope, stmt1.targets[0].id)
+            ):
 
-                    issue = self.create_issue(
-                        message=(
-                            f"Variable '{stmt1.targets[0].id}' is assigned "
-                            "and immediately returned"
-                        ),
-                        node=stmt1,
-                        file_path=self.current_file_path,
-                        suggested_fix=Fix(
-                            description=(
-                                "Return the expression directly without "
-                                "intermediate variable"
-                            ),
-                            replacement_code="# return expression",
+                issue = self.create_issue(
+                    message=(
+                        f"Variable '{stmt1.targets[0].id}' is assigned "
+                        "and immediately returned"
+                    ),
+                    node=stmt1,
+                    file_path=self.current_file_path,
+                    suggested_fix=Fix(
+                        description=(
+                            "Return the expression directly without "
+                            "intermediate variable"
                         ),
-                        impact=Impact(maintainability=0.2, performance=-0.02),
-                    )
-                    self.issues.append(issue)
+                        replacement_code="# return expression",
+                    ),
+                    impact=Impact(maintainability=0.2, performance=-0.02),
+                )
+                self.issues.append(issue)
+
+    def _is_local_only(self, scope: Scope, name: str) -> bool:
+        """The variable must not be shared with globals or nested closures."""
+        if name in scope.global_names or name in scope.nonlocal_names:
+            return False
+        model = self.semantic
+        return all(
+            model.enclosing_scope(reference) is scope
+            for binding in scope.lookup(name)
+            for reference in binding.references
+        )
 
 
 class DuplicateFunctionRule(ASTVisitorRule):
-    """Detect similar function patterns that might be duplicates."""
+    """
+    Detect similar function patterns that might be duplicates.
 
-    def __init__(self) -> None:
+    Functions are reduced to structural fingerprints that ignore identifiers
+    and literals. Duplicates within a file are reported when the file is
+    finalized. During a project run every fingerprint is also added to the
+    run's index, kept per thread, so that duplicates across files are
+    reported by ``finalize_project``.
+    """
+
+    def __init__(self, min_statements: int = 3) -> None:
         super().__init__(
             rule_id="duplicate_function",
             name="Potential Duplicate Function",
@@ -164,55 +189,116 @@ class DuplicateFunctionRule(ASTVisitorRule):
             category="ai_code",
             severity="warning",
         )
-        self.functions: List[ast.FunctionDef] = []
+        self.min_statements = min_statements
+        # Every thread runs its own project runs
+        self._project = threading.local()
+
+    @property
+    def project_index(self) -> DuplicateIndex:
+        """Functions of the current thread's project run."""
+        index: Optional[DuplicateIndex] = getattr(self._project, "index", None)
+        if index is None:
+            index = DuplicateIndex()
+            self._project.index = index
+        return index
+
+    def create_state(self) -> List[Tuple[FunctionFingerprint, FunctionNode]]:
+        """Functions of the current file with their fingerprints."""
+        return []
+
+    def reset_project(self) -> None:
+        """Forget every function seen in previous files."""
+        self._project.index = DuplicateIndex()
 
     def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
         """Collect functions for similarity analysis."""
-        self.functions.append(node)
+        self._collect(node)
+        self.generic_visit(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        """Collect async functions for similarity analysis."""
+        self._collect(node)
         self.generic_visit(node)
 
+    def _collect(self, node: FunctionNode) -> None:
+        # Only check functions with some complexity
+        if len(node.body) >= self.min_statements:
+            fingerprint = fingerprint_function(node, self.current_file_path)
+            self.state.append((fingerprint, node))
+
     def finalize(self) -> None:
         """Check for similar functions after visiting all nodes."""
-        for i, func1 in enumerate(self.functions):
-            for func2 in self.functions[i + 1 :]:
-                if self._are_functions_similar(func1, func2):
-                    issue = self.create_issue(
-                        message=(
-                            f"Function '{func1.name}' appears similar to "
-                            f"'{func2.name}'"
-                        ),
-                        node=func1,
-                        file_path=self.current_file_path,
-                        suggested_fix=Fix(
-                            description=(
-                                "Consider extracting common logic into a "
-                                "shared function"
-                            ),
-                            replacement_code=(
-                                "# Extract common patterns into reusable functions"
-                            ),
-                        ),
-                        impact=Impact(maintainability=-0.8, performance=-0.05),
-                    )
-                    self.issues.append(issue)
+        nodes = {id(fp): node for fp, node in self.state}
+        local_index = DuplicateIndex()
+        local_index.extend(fp for fp, _ in self.state)
+
+        for cluster in local_index.clusters():
+            original = cluster[0]
+            for duplicate in cluster[1:]:
+                self.issues.append(
+                    self._duplicate_issue(duplicate, original, nodes[id(duplicate)])
+                )
+
+        if in_project_run():
+            self.project_index.extend(fp for fp, _ in self.state)
+
+    def export_project_state(self) -> Dict[str, Any]:
+        """Fingerprints of every function seen in this run."""
+        return {"functions": [fp.to_dict() for fp in self.project_index.fingerprints()]}
+
+    def import_project_state(self, state: Dict[str, Any]) -> None:
+        """Add the fingerprints of another run to the project index."""
+        self.project_index.extend(
+            FunctionFingerprint.from_dict(data) for data in state.get("functions", [])
+        )
 
-    def _are_functions_similar(
-        self, func1: ast.FunctionDef, func2: ast.FunctionDef
-    ) -> bool:
-        """Check if two functions are structurally similar."""
-        # Simple heuristic: same number of statements and parameters
-        if (
-            len(func1.body) == len(func2.body)
-            and len(func1.args.args) == len(func2.args.args)
-            and len(func1.body) > 2
-        ):  # Only check functions with some complexity
-
-            # Check if they have similar structure (same statement types)
-            for stmt1, stmt2 in zip(func1.body, func2.body):
-                if not isinstance(stmt1, type(stmt2)):
-                    return False
-            return True
-        return False
+    def finalize_project(self) -> List[Issue]:
+        """Report duplicates whose copies live in different files."""
+        issues: List[Issue] = []
+        for cluster in self.project_index.clusters():
+            original = cluster[0]
+            reported = {original.file_path}
+            for duplicate in cluster[1:]:
+                # Copies inside one file were already reported by finalize()
+                if duplicate.file_path in reported:
+                    continue
+                reported.add(duplicate.file_path)
+                location = ast.Pass(
+                    lineno=duplicate.line,
+                    col_offset=duplicate.column,
+                    end_lineno=duplicate.end_line,
+                    end_col_offset=None,
+                )
+                issues.append(
+                    self._duplicate_issue(
+                        duplicate,
+                        original,
+                        location,
+                        where=f" in {original.file_path}:{original.line}",
+                    )
+                )
+        return issues
+
+    def _duplicate_issue(
+        self,
+        duplicate: FunctionFingerprint,
+        original: FunctionFingerprint,
+        node: ast.AST,
+        where: str = "",
+    ) -> Issue:
+        return self.create_issue(
+            message=(
+                f"Function '{duplicate.name}' appears similar to "
+                f"'{original.name}'{where}"
+            ),
+            node=node,
+            file_path=duplicate.file_path,
+            suggested_fix=Fix(
+                description="Consider extracting common logic into a shared function",
+                replacement_code="# Extract common patterns into reusable functions",
+            ),
+            impact=Impact(maintainability=-0.8, performance=-0.05),
+        )
 
 
 class OverCommentedCodeRule(ASTVisitorRule):
@@ -338,12 +424,8 @@ class AICodeAnalyzer(BaseAnalyzer):
             description="Analyzes AI-generated code inefficiencies and patterns",
         )
 
-        # Register AI-specific rules
-        self.register_rule(VerboseCodeRule())
-        self.register_rule(RedundantVariableRule())
-        self.register_rule(DuplicateFunctionRule())
-        self.register_rule(OverCommentedCodeRule())
-        self.register_rule(UnnecessaryTypeChecksRule())
+        # Rules are loaded from the registry when first used
+        self.load_rules("ai_code")
 
     def analyze(self, tree: ast.AST, source_code: str, file_path: str) -> List[Issue]:
         """
@@ -357,19 +439,4 @@ class AICodeAnalyzer(BaseAnalyzer):
         Returns:
             List of AI code issues
         """
-        all_issues = []
-
-        for rule in self.rules.values():
-            if rule.enabled:
-                if isinstance(rule, ASTVisitorRule):
-                    # Use visitor pattern for traversal rules
-                    rule.reset(file_path, source_code)
-                    rule.visit(tree)
-                    rule.finalize()
-                    all_issues.extend(rule.issues)
-                else:
-                    # Use direct checking for other rules
-                    issues = rule.check(tree, source_code, file_path)
-                    all_issues.extend(issues)
-
-        return all_issues
+        return self.run_rules(tree, source_code, file_path)
@@ -0,0 +1,265 @@
+"""
+Structural function fingerprints for duplicate detection.
+
+Functions are normalized into a sequence of AST node type names that ignores
+identifiers and literal values, so renamed copies of the same logic produce
+the same sequence. The sequence is hashed for exact structural clones and
+summarized with a MinHash signature whose bands are bucketed
+(locality-sensitive hashing) to find near-duplicates without comparing every
+pair of functions.
+"""
+
+import ast
+import hashlib
+import random
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+# MinHash / LSH parameters. With 8 bands of 4 rows, pairs above ~0.6
+# estimated Jaccard similarity almost always share a bucket.
+NUM_PERMUTATIONS = 32
+NUM_BANDS = 8
+ROWS_PER_BAND = NUM_PERMUTATIONS // NUM_BANDS
+SHINGLE_SIZE = 4
+SIMILARITY_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed seed so signatures are comparable across processes and machines
+_rng = random.Random(0xEC0)
+_PERMUTATIONS: Tuple[Tuple[int, int], ...] = tuple(
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+)
+
+# Nodes that carry no structural information
+_IGNORED_NODES = (ast.expr_context,)
+
+
+@dataclass(frozen=True)
+class FunctionFingerprint:
+    """Structural summary of a single function."""
+
+    name: str
+    file_path: str
+    line: int
+    column: int
+    end_line: int
+    structural_hash: str
+    signature: Tuple[int, ...]
+
+    def similarity(self, other: "FunctionFingerprint") -> float:
+        """Estimate the Jaccard similarity of two functions from signatures."""
+        if self.structural_hash == other.structural_hash:
+            return 1.0
+        matches = sum(1 for a, b in zip(self.signature, other.signature) if a == b)
+        return matches / NUM_PERMUTATIONS
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the fingerprint to a JSON-compatible dictionary."""
+        return {
+            "name": self.name,
+            "file_path": self.file_path,
+            "line": self.line,
+            "column": self.column,
+            "end_line": self.end_line,
+            "structural_hash": self.structural_hash,
+            "signature": list(self.signature),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FunctionFingerprint":
+        """Create a fingerprint from ``to_dict`` output."""
+        return cls(
+            name=data["name"],
+            file_path=data["file_path"],
+            line=data["line"],
+            column=data["column"],
+            end_line=data["end_line"],
+            structural_hash=data["structural_hash"],
+            signature=tuple(data["signature"]),
+        )
+
+
+def normalize_function(node: FunctionNode) -> List[str]:
+    """
+    Convert a function into a sequence of structural tokens.
+
+    Identifiers, literal values and the leading docstring are dropped; only
+    the node types and the nesting shape of the body remain.
+
+    Args:
+        node: Function definition node
+
+    Returns:
+        List of tokens describing the function structure
+    """
+    tokens: List[str] = ["args:%d" % len(node.args.args)]
+    body = node.body
+    if (
+        body
+        and isinstance(body[0], ast.Expr)
+        and isinstance(body[0].value, ast.Constant)
+        and isinstance(body[0].value.value, str)
+    ):
+        body = body[1:]
+
+    stack: List[Tuple[ast.AST, bool]] = [(stmt, False) for stmt in reversed(body)]
+    while stack:
+        current, leaving = stack.pop()
+        name = type(current).__name__
+        if leaving:
+            tokens.append("/" + name)
+            continue
+        tokens.append(name)
+        if isinstance(current, ast.stmt):
+            stack.append((current, True))
+        children = [
+            child
+            for child in ast.iter_child_nodes(current)
+            if not isinstance(child, _IGNORED_NODES)
+        ]
+        stack.extend((child, False) for child in reversed(children))
+    return tokens
+
+
+def _shingles(tokens: List[str]) -> List[int]:
+    """Hash overlapping token k-grams into 32-bit integers."""
+    if len(tokens) <= SHINGLE_SIZE:
+        return [zlib.crc32(" ".join(tokens).encode("utf-8"))]
+    return list(
+        {
+            zlib.crc32(" ".join(tokens[i : i + SHINGLE_SIZE]).encode("utf-8"))
+            for i in range(len(tokens) - SHINGLE_SIZE + 1)
+        }
+    )
+
+
+def minhash_signature(tokens: List[str]) -> Tuple[int, ...]:
+    """Compute the MinHash signature of a token sequence."""
+    shingles = _shingles(tokens)
+    return tuple(
+        min(((a * s + b) % _MERSENNE_PRIME) & _MAX_HASH for s in shingles)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def fingerprint_function(node: FunctionNode, file_path: str) -> FunctionFingerprint:
+    """
+    Build the structural fingerprint of a function.
+
+    Args:
+        node: Function definition node
+        file_path: Path of the file containing the function
+
+    Returns:
+        FunctionFingerprint for the function
+    """
+    tokens = normalize_function(node)
+    digest = hashlib.blake2b(
+        "\x1f".join(tokens).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    return FunctionFingerprint(
+        name=node.name,
+        file_path=file_path,
+        line=node.lineno,
+        column=node.col_offset,
+        end_line=getattr(node, "end_lineno", None) or node.lineno,
+        structural_hash=digest,
+        signature=minhash_signature(tokens),
+    )
+
+
+class DuplicateIndex:
+    """
+    Index of function fingerprints bucketed for duplicate lookup.
+
+    Exact structural clones share a hash bucket; near-duplicates share at
+    least one LSH band bucket. Candidates are only verified against the
+    first entry of each bucket, so clustering stays roughly linear in the
+    number of indexed functions.
+    """
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD) -> None:
+        self.threshold = threshold
+        self._entries: List[FunctionFingerprint] = []
+        self._exact: Dict[str, List[int]] = {}
+        self._bands: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, fingerprint: FunctionFingerprint) -> None:
+        """Add a fingerprint to the index."""
+        with self._lock:
+            index = len(self._entries)
+            self._entries.append(fingerprint)
+            self._exact.setdefault(fingerprint.structural_hash, []).append(index)
+            for band in range(NUM_BANDS):
+                start = band * ROWS_PER_BAND
+                key = (band, fingerprint.signature[start : start + ROWS_PER_BAND])
+                self._bands.setdefault(key, []).append(index)
+
+    def extend(self, fingerprints: Iterable[FunctionFingerprint]) -> None:
+        """Add several fingerprints to the index."""
+        for fingerprint in fingerprints:
+            self.add(fingerprint)
+
+    def fingerprints(self) -> List[FunctionFingerprint]:
+        """Return the indexed fingerprints in insertion order."""
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self) -> None:
+        """Remove all fingerprints from the index."""
+        with self._lock:
+            self._entries = []
+            self._exact = {}
+            self._bands = {}
+
+    def clusters(self) -> List[List[FunctionFingerprint]]:
+        """
+        Group indexed functions into clusters of duplicates.
+
+        Returns:
+            Clusters with at least two members, each sorted by location
+        """
+        with self._lock:
+            entries = list(self._entries)
+            buckets = list(self._exact.values()) + list(self._bands.values())
+
+        parent = list(range(len(entries)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for bucket in buckets:
+            if len(bucket) < 2:
+                continue
+            head = entries[bucket[0]]
+            for other in bucket[1:]:
+                if head.similarity(entries[other]) >= self.threshold:
+                    root_a, root_b = find(bucket[0]), find(other)
+                    if root_a != root_b:
+                        parent[root_b] = root_a
+
+        groups: Dict[int, List[FunctionFingerprint]] = {}
+        for i, entry in enumerate(entries):
+            groups.setdefault(find(i), []).append(entry)
+
+        clusters = [
+            sorted(group, key=lambda fp: (fp.file_path, fp.line, fp.column))
+            for group in groups.values()
+            if len(group) > 1
+        ]
+        clusters.sort(key=lambda group: (group[0].file_path, group[0].line))
+        return clusters
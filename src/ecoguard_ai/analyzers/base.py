@@ -6,11 +6,42 @@ must implement to integrate with the EcoGuard AI analysis pipeline.
 """
 
 import ast
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional
 
+from ecoguard_ai.analyzers.context import AnalysisContext, LineIndex
+from ecoguard_ai.analyzers.registry import RuleMap, get_registry
+from ecoguard_ai.analyzers.semantic import SemanticModel
 from ecoguard_ai.core.issue import Issue
 
+# Whether the current thread is analyzing the files of a project run
+_project_runs = threading.local()
+
+
+@contextmanager
+def project_run() -> Iterator[None]:
+    """
+    Mark the files analyzed by the current thread as one project run.
+
+    Rules that span files only add a file to their project-wide state
+    inside a run, so files analyzed on their own, possibly by other threads
+    at the same time, never end up in it.
+    """
+    previous = in_project_run()
+    _project_runs.active = True
+    try:
+        yield
+    finally:
+        _project_runs.active = previous
+
+
+def in_project_run() -> bool:
+    """Whether the current thread is inside ``project_run``."""
+    return bool(getattr(_project_runs, "active", False))
+
 
 class BaseAnalyzer(ABC):
     """
@@ -24,7 +55,7 @@ class BaseAnalyzer(ABC):
         self.name = name
         self.description = description
         self.enabled = True
-        self.rules: Dict[str, "BaseRule"] = {}
+        self.rules = RuleMap()
 
     @abstractmethod
     def analyze(self, tree: ast.AST, source_code: str, file_path: str) -> List[Issue]:
@@ -41,19 +72,124 @@ class BaseAnalyzer(ABC):
         """
         pass
 
+    def run_rules(self, tree: ast.AST, source_code: str, file_path: str) -> List[Issue]:
+        """
+        Run every enabled rule of this analyzer over a parsed file.
+
+        Args:
+            tree: The parsed AST of the source code
+            source_code: The original source code as a string
+            file_path: Path to the file being analyzed
+
+        Returns:
+            Issues reported by all enabled rules
+        """
+        all_issues: List[Issue] = []
+        node_types: Optional[FrozenSet[str]] = None
+        for rule_id in self.rules:
+            if not self.rules.is_enabled(rule_id):
+                continue
+            spec = self.rules.spec(rule_id)
+            if spec is not None and spec.node_types:
+                if node_types is None:
+                    context = AnalysisContext.for_tree(tree, source_code, file_path)
+                    node_types = context.node_types
+                if not spec.applies_to(node_types):
+                    continue
+            rule = self.rules[rule_id]
+            all_issues.extend(rule.check(tree, source_code, file_path))
+        return all_issues
+
+    def scan_text(self, source_code: str, file_path: str) -> List[Issue]:
+        """
+        Run the enabled text-only rules over a file that is not parsed.
+
+        Args:
+            source_code: The original source code as a string
+            file_path: Path to the file being analyzed
+
+        Returns:
+            Issues reported by the text-only rules
+        """
+        all_issues: List[Issue] = []
+        for rule_id in self.rules:
+            spec = self.rules.spec(rule_id)
+            if spec is None or not spec.text_only:
+                continue
+            if self.rules.is_enabled(rule_id):
+                rule = self.rules[rule_id]
+                all_issues.extend(rule.scan_text(source_code, file_path))
+        return all_issues
+
     def register_rule(self, rule: "BaseRule") -> None:
         """Register a rule with this analyzer."""
         self.rules[rule.rule_id] = rule
 
+    def load_rules(self, analyzer: str) -> None:
+        """
+        Register every rule the registry knows for an analyzer.
+
+        The rules are only imported and instantiated when first used.
+
+        Args:
+            analyzer: Analyzer name in the registry, e.g. "quality"
+        """
+        for spec in get_registry().rules_for(analyzer):
+            self.rules.add_spec(spec)
+
     def enable_rule(self, rule_id: str) -> None:
         """Enable a specific rule."""
-        if rule_id in self.rules:
-            self.rules[rule_id].enabled = True
+        self.rules.set_enabled(rule_id, True)
 
     def disable_rule(self, rule_id: str) -> None:
         """Disable a specific rule."""
-        if rule_id in self.rules:
-            self.rules[rule_id].enabled = False
+        self.rules.set_enabled(rule_id, False)
+
+    def reset_project(self) -> None:
+        """Clear project-wide state before analyzing a new set of files."""
+        # Rules that were never loaded cannot hold any project state
+        for rule in self.rules.loaded():
+            rule.reset_project()
+
+    def finalize_project(self) -> List[Issue]:
+        """
+        Run project-wide checks after every file has been analyzed.
+
+        Returns:
+            List of cross-file issues, each attributed to its own file
+        """
+        issues: List[Issue] = []
+        for rule in self.rules.loaded():
+            if rule.enabled:
+                issues.extend(rule.finalize_project())
+        return issues
+
+    def export_project_state(self) -> Dict[str, Any]:
+        """
+        Collect the project-wide state of the rules for another process.
+
+        Returns:
+            JSON-compatible state keyed by rule id, for the rules that keep
+            any
+        """
+        states: Dict[str, Any] = {}
+        for rule in self.rules.loaded():
+            if rule.enabled:
+                state = rule.export_project_state()
+                if state is not None:
+                    states[rule.rule_id] = state
+        return states
+
+    def import_project_state(self, states: Dict[str, Any]) -> None:
+        """
+        Add project-wide state exported by another analyzer run.
+
+        Args:
+            states: Output of ``export_project_state``
+        """
+        for rule_id, state in states.items():
+            if rule_id in self.rules and self.rules.is_enabled(rule_id):
+                self.rules[rule_id].import_project_state(state)
 
 
 class BaseRule(ABC):
@@ -95,6 +231,51 @@ class BaseRule(ABC):
         """
         pass
 
+    def scan_text(self, source_code: str, file_path: str) -> List[Issue]:
+        """
+        Check the raw text of a file that is too large to parse.
+
+        Only rules registered with ``text_only=True`` are asked.
+
+        Args:
+            source_code: The original source code
+            file_path: Path to the file being analyzed
+
+        Returns:
+            List of Issue objects (empty by default)
+        """
+        return []
+
+    def reset_project(self) -> None:
+        """Clear project-wide state. Override in rules that span files."""
+        pass
+
+    def finalize_project(self) -> List[Issue]:
+        """
+        Report issues that need every file of the project.
+
+        Returns:
+            List of cross-file issues (empty by default)
+        """
+        return []
+
+    def export_project_state(self) -> Optional[Any]:
+        """
+        Return the project-wide state as JSON-compatible data.
+
+        Rules that span files override this, together with
+        ``import_project_state``, so partial runs (e.g. shards) can be
+        combined and finalized elsewhere.
+
+        Returns:
+            The state, or None if the rule keeps none
+        """
+        return None
+
+    def import_project_state(self, state: Any) -> None:
+        """Add state from ``export_project_state`` of another run."""
+        pass
+
     def create_issue(
         self, message: str, node: ast.AST, file_path: str, **kwargs: Any
     ) -> Issue:
@@ -127,18 +308,94 @@ class BaseRule(ABC):
         )
 
 
+@dataclass
+class RuleContext:
+    """
+    Per-file state of a single rule run.
+
+    Rules keep everything they learn about a file here instead of on the
+    rule instance, so one rule instance can analyze several files at once
+    from different threads.
+    """
+
+    file_path: str = ""
+    source_code: str = ""
+    tree: Optional[ast.AST] = None
+    analysis: Optional[AnalysisContext] = None
+    issues: List[Issue] = field(default_factory=list)
+    state: Any = None
+
+
 class ASTVisitorRule(BaseRule, ast.NodeVisitor):
     """
     Base class for rules that use the visitor pattern to traverse the AST.
 
-    This is the most common type of rule for static analysis.
+    This is the most common type of rule for static analysis. The state of
+    the current run lives in a thread-local RuleContext; subclasses that need
+    to remember things between nodes override ``create_state``.
     """
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
-        self.issues: List[Issue] = []
-        self.current_source_code: str = ""
-        self.current_file_path: str = ""
+        self._local = threading.local()
+
+    @property
+    def context(self) -> RuleContext:
+        """Context of the run active on the current thread."""
+        context: Optional[RuleContext] = getattr(self._local, "context", None)
+        if context is None:
+            context = RuleContext(state=self.create_state())
+            self._local.context = context
+        return context
+
+    @property
+    def issues(self) -> List[Issue]:
+        """Issues found so far in the current run."""
+        return self.context.issues
+
+    @property
+    def current_file_path(self) -> str:
+        """Path of the file being analyzed in the current run."""
+        return self.context.file_path
+
+    @property
+    def current_source_code(self) -> str:
+        """Source code of the file being analyzed in the current run."""
+        return self.context.source_code
+
+    @property
+    def analysis(self) -> AnalysisContext:
+        """Per-file analysis context shared with the other rules."""
+        context = self.context
+        if context.analysis is None:
+            if context.tree is not None:
+                context.analysis = AnalysisContext.for_tree(
+                    context.tree, context.source_code, context.file_path
+                )
+            else:
+                context.analysis = AnalysisContext(
+                    context.file_path, context.source_code
+                )
+        return context.analysis
+
+    @property
+    def semantic(self) -> SemanticModel:
+        """Shared scope and symbol table of the tree being checked."""
+        return self.analysis.semantic
+
+    @property
+    def state(self) -> Any:
+        """Rule-specific state of the current run (see ``create_state``)."""
+        return self.context.state
+
+    def create_state(self) -> Any:
+        """
+        Create fresh rule-specific state for a new file.
+
+        Returns:
+            State object stored on the RuleContext (None by default)
+        """
+        return None
 
     def reset(self, file_path: str, source_code: str) -> None:
         """
@@ -148,9 +405,11 @@ class ASTVisitorRule(BaseRule, ast.NodeVisitor):
             file_path: Path to the file being analyzed
             source_code: Source code content
         """
-        self.issues = []
-        self.current_file_path = file_path
-        self.current_source_code = source_code
+        self._local.context = RuleContext(
+            file_path=file_path,
+            source_code=source_code,
+            state=self.create_state(),
+        )
 
     def finalize(self) -> None:
         """
@@ -162,6 +421,9 @@ class ASTVisitorRule(BaseRule, ast.NodeVisitor):
         """
         Run the visitor pattern on the AST to find issues.
 
+        The previous context of the calling thread is restored afterwards, so
+        nested checks with the same rule instance are safe.
+
         Args:
             node: Root AST node (typically ast.Module)
             source_code: Original source code
@@ -170,10 +432,38 @@ class ASTVisitorRule(BaseRule, ast.NodeVisitor):
         Returns:
             List of issues found
         """
+        previous = getattr(self._local, "context", None)
         self.reset(file_path, source_code)
-        self.visit(node)
-        self.finalize()
-        return self.issues.copy()
+        self.context.tree = node
+        try:
+            self.visit(node)
+            self.finalize()
+            return self.issues.copy()
+        finally:
+            self._local.context = previous
+
+    def create_issue(
+        self, message: str, node: ast.AST, file_path: str, **kwargs: Any
+    ) -> Issue:
+        """
+        Create an Issue, attaching a code snippet from the current file.
+
+        Args:
+            message: Description of the issue
+            node: The AST node where the issue was found
+            file_path: Path to the file
+            **kwargs: Additional Issue parameters
+
+        Returns:
+            Issue object representing the problem
+        """
+        if (
+            "code_snippet" not in kwargs
+            and file_path == self.current_file_path
+            and self.current_source_code
+        ):
+            kwargs["code_snippet"] = self.analysis.snippet(node)
+        return super().create_issue(message, node, file_path, **kwargs)
 
     def add_issue(self, message: str, node: ast.AST, **kwargs: Any) -> None:
         """
@@ -188,51 +478,21 @@ class ASTVisitorRule(BaseRule, ast.NodeVisitor):
         self.issues.append(issue)
 
 
-def get_source_segment(source_code: str, node: ast.AST) -> str:
+def get_source_segment(
+    source_code: str, node: ast.AST, line_index: Optional[LineIndex] = None
+) -> str:
     """
     Extract the source code segment for a given AST node.
 
     Args:
         source_code: Complete source code
         node: AST node
+        line_index: Line index of ``source_code``; pass the one from the
+            analysis context to avoid re-scanning the file on every call
 
     Returns:
         Source code segment as string
     """
-    if not (hasattr(node, "lineno") and hasattr(node, "end_lineno")):
-        return ""
-
-    lines = source_code.splitlines()
-    start_line = node.lineno - 1  # Convert to 0-based indexing
-    end_line = node.end_lineno - 1 if node.end_lineno else start_line
-
-    if start_line < 0 or start_line >= len(lines):
-        return ""
-
-    if start_line == end_line:
-        # Single line
-        line = lines[start_line]
-        start_col: int = int(getattr(node, "col_offset", 0))
-        end_col_attr = getattr(node, "end_col_offset", len(line))
-        end_col: int = int(end_col_attr) if end_col_attr is not None else len(line)
-        return str(line[start_col:end_col])
-    else:
-        # Multiple lines
-        result_lines = []
-        for i in range(start_line, min(end_line + 1, len(lines))):
-            if i == start_line:
-                # First line
-                line_start_col: int = int(getattr(node, "col_offset", 0))
-                result_lines.append(lines[i][line_start_col:])
-            elif i == end_line:
-                # Last line
-                end_col_attr = getattr(node, "end_col_offset", len(lines[i]))
-                line_end_col: int = (
-                    int(end_col_attr) if end_col_attr is not None else len(lines[i])
-                )
-                result_lines.append(lines[i][:line_end_col])
-            else:
-                # Middle lines
-                result_lines.append(lines[i])
-
-        return "\n".join(result_lines)
+    if line_index is None:
+        line_index = LineIndex(source_code)
+    return line_index.segment(node)
@@ -0,0 +1,268 @@
+"""
+Complexity metrics for every function and class of a module.
+
+A single traversal computes, for each function, its cyclomatic complexity
+(McCabe: one plus the number of decision points), its cognitive complexity
+(decision points weighted by how deeply they are nested, after the
+SonarSource definition) and the maximum nesting depth of its control-flow
+statements. Nested functions get their own metrics instead of being counted
+again in their parents, and classes aggregate the metrics of their methods.
+
+The report is cached on the tree, so the quality rules and the research
+metrics share one walk.
+"""
+
+import ast
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+_CACHE_ATTRIBUTE = "_ecoguard_complexity_report"
+
+ScopeNode = Union[ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef]
+
+
+@dataclass
+class ComplexityMetrics:
+    """Complexity of one function, class or module."""
+
+    name: str
+    kind: str  # "function", "class" or "module"
+    node: ast.AST = field(repr=False)
+    line: int = 0
+    cyclomatic: int = 1
+    cognitive: int = 0
+    max_nesting: int = 0
+    children: List["ComplexityMetrics"] = field(default_factory=list, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the metrics to a dictionary."""
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "line": self.line,
+            "cyclomatic": self.cyclomatic,
+            "cognitive": self.cognitive,
+            "max_nesting": self.max_nesting,
+        }
+
+
+class ComplexityReport:
+    """Complexity metrics of every function and class of a module."""
+
+    def __init__(self, module: ComplexityMetrics) -> None:
+        self.module = module
+        self.functions: List[ComplexityMetrics] = []
+        self.classes: List[ComplexityMetrics] = []
+        self._by_node: Dict[int, ComplexityMetrics] = {}
+
+    def _add(self, metrics: ComplexityMetrics) -> None:
+        self._by_node[id(metrics.node)] = metrics
+        if metrics.kind == "function":
+            self.functions.append(metrics)
+        elif metrics.kind == "class":
+            self.classes.append(metrics)
+
+    def get(self, node: ast.AST) -> Optional[ComplexityMetrics]:
+        """Return the metrics of a function or class node."""
+        return self._by_node.get(id(node))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the report as a dictionary."""
+        return {
+            "module": self.module.to_dict(),
+            "functions": [metrics.to_dict() for metrics in self.functions],
+            "classes": [metrics.to_dict() for metrics in self.classes],
+        }
+
+
+class _ComplexityCollector(ast.NodeVisitor):
+    """Single traversal filling a ComplexityReport."""
+
+    def __init__(self, tree: ast.AST) -> None:
+        module = ComplexityMetrics(name="<module>", kind="module", node=tree)
+        self.report = ComplexityReport(module)
+        self.frame = module
+        # Cognitive nesting level and structural depth of the current node
+        self.nesting = 0
+        self.depth = 0
+
+    # Scopes
+
+    def _scope(self, node: ScopeNode, kind: str) -> None:
+        metrics = ComplexityMetrics(
+            name=node.name,
+            kind=kind,
+            node=node,
+            line=node.lineno,
+        )
+        self.frame.children.append(metrics)
+        self.report._add(metrics)
+
+        outer, outer_nesting, outer_depth = self.frame, self.nesting, self.depth
+        self.frame, self.depth = metrics, 0
+        # Functions nested in functions count as one more level for readers
+        self.nesting = outer_nesting + 1 if outer.kind == "function" else 0
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        for statement in node.body:
+            self.visit(statement)
+        self.frame, self.nesting, self.depth = outer, outer_nesting, outer_depth
+
+        if kind == "class":
+            methods = [m for m in metrics.children if m.kind == "function"]
+            metrics.cyclomatic += sum(m.cyclomatic for m in methods)
+            metrics.cognitive += sum(m.cognitive for m in methods)
+            metrics.max_nesting = max(
+                [metrics.max_nesting] + [m.max_nesting for m in methods]
+            )
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._scope(node, "function")
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self._scope(node, "function")
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self._scope(node, "class")
+
+    def visit_Lambda(self, node: ast.Lambda) -> None:
+        self.nesting += 1
+        self.generic_visit(node)
+        self.nesting -= 1
+
+    # Control flow
+
+    def _decision(self) -> None:
+        """Count a structure that branches and nests (if, loop, except...)."""
+        self.frame.cyclomatic += 1
+        self.frame.cognitive += 1 + self.nesting
+
+    def _block(self, statements: List[ast.stmt], nested: bool = True) -> None:
+        if nested:
+            self.nesting += 1
+        self.depth += 1
+        self.frame.max_nesting = max(self.frame.max_nesting, self.depth)
+        for statement in statements:
+            self.visit(statement)
+        self.depth -= 1
+        if nested:
+            self.nesting -= 1
+
+    def visit_If(self, node: ast.If, is_elif: bool = False) -> None:
+        self.frame.cyclomatic += 1
+        # "elif" reads like a flat alternative, so it is not nested further
+        self.frame.cognitive += 1 if is_elif else 1 + self.nesting
+        self.visit(node.test)
+        self._block(node.body)
+        if len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If):
+            self.visit_If(node.orelse[0], is_elif=True)
+        elif node.orelse:
+            self.frame.cognitive += 1
+            self._block(node.orelse)
+
+    def _loop(self, node: Union[ast.For, ast.AsyncFor, ast.While]) -> None:
+        self._decision()
+        if isinstance(node, ast.While):
+            self.visit(node.test)
+        else:
+            self.visit(node.target)
+            self.visit(node.iter)
+        self._block(node.body)
+        if node.orelse:
+            self.frame.cognitive += 1
+            self._block(node.orelse)
+
+    def visit_For(self, node: ast.For) -> None:
+        self._loop(node)
+
+    def visit_AsyncFor(self, node: ast.AsyncFor) -> None:
+        self._loop(node)
+
+    def visit_While(self, node: ast.While) -> None:
+        self._loop(node)
+
+    def visit_Try(self, node: ast.Try) -> None:
+        self._block(node.body, nested=False)
+        for handler in node.handlers:
+            self._decision()
+            if handler.type is not None:
+                self.visit(handler.type)
+            self._block(handler.body)
+        self._block(node.orelse, nested=False)
+        self._block(node.finalbody, nested=False)
+
+    def _with(self, node: Union[ast.With, ast.AsyncWith]) -> None:
+        for item in node.items:
+            self.visit(item)
+        self._block(node.body, nested=False)
+
+    def visit_With(self, node: ast.With) -> None:
+        self._with(node)
+
+    def visit_AsyncWith(self, node: ast.AsyncWith) -> None:
+        self._with(node)
+
+    def visit_Match(self, node: ast.AST) -> None:
+        self.frame.cognitive += 1 + self.nesting
+        self.visit(node.subject)  # type: ignore[attr-defined]
+        for case in node.cases:  # type: ignore[attr-defined]
+            self.frame.cyclomatic += 1
+            if case.guard is not None:
+                self.visit(case.guard)
+            self._block(case.body)
+
+    # Expressions
+
+    def visit_IfExp(self, node: ast.IfExp) -> None:
+        self._decision()
+        self.generic_visit(node)
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> None:
+        self.frame.cyclomatic += len(node.values) - 1
+        # A run of the same operator is one step for the reader
+        self.frame.cognitive += 1
+        for value in node.values:
+            if isinstance(value, ast.BoolOp) and type(value.op) is type(node.op):
+                self.frame.cognitive -= 1
+            self.visit(value)
+
+    def visit_comprehension(self, node: ast.comprehension) -> None:
+        self.frame.cyclomatic += 1 + len(node.ifs)
+        self.frame.cognitive += 1 + len(node.ifs)
+        self.generic_visit(node)
+
+
+def compute_complexity(tree: ast.AST) -> ComplexityReport:
+    """
+    Compute the complexity of every function and class in one pass.
+
+    Args:
+        tree: Parsed module
+
+    Returns:
+        ComplexityReport for the module
+    """
+    collector = _ComplexityCollector(tree)
+    if isinstance(tree, ast.Module):
+        for statement in tree.body:
+            collector.visit(statement)
+    else:
+        collector.visit(tree)
+    return collector.report
+
+
+def get_complexity_report(tree: ast.AST) -> ComplexityReport:
+    """
+    Return the complexity report of a tree, computing it on first use.
+
+    Args:
+        tree: Parsed module
+
+    Returns:
+        ComplexityReport shared by every rule analyzing this tree
+    """
+    report: Optional[ComplexityReport] = getattr(tree, _CACHE_ATTRIBUTE, None)
+    if report is None:
+        report = compute_complexity(tree)
+        setattr(tree, _CACHE_ATTRIBUTE, report)
+    return report
@@ -0,0 +1,197 @@
+"""
+Per-file analysis context shared by every analyzer and rule.
+
+The context is created once when a file's source is read. It owns a line
+index so that source segments and code snippets can be extracted in time
+proportional to the segment, and it gives rules access to the shared
+semantic model of the parsed tree.
+"""
+
+import ast
+from bisect import bisect_right
+from typing import FrozenSet, List, Optional, Tuple
+
+from ecoguard_ai.analyzers.complexity import ComplexityReport, get_complexity_report
+from ecoguard_ai.analyzers.semantic import SemanticModel, get_semantic_model
+
+_CACHE_ATTRIBUTE = "_ecoguard_analysis_context"
+
+# Longest snippet attached to an issue, in lines
+SNIPPET_MAX_LINES = 5
+
+
+class LineIndex:
+    """Start offsets of every line of a source string."""
+
+    def __init__(self, source_code: str) -> None:
+        self.source_code = source_code
+        starts = [0]
+        position = source_code.find("\n")
+        while position != -1:
+            starts.append(position + 1)
+            position = source_code.find("\n", position + 1)
+        if starts[-1] == len(source_code) and len(starts) > 1:
+            # A trailing newline does not start another line
+            starts.pop()
+        self._starts: List[int] = starts
+
+    def __len__(self) -> int:
+        """Number of lines in the source."""
+        return len(self._starts) if self.source_code else 0
+
+    def line(self, lineno: int) -> str:
+        """
+        Return a single line without its line ending.
+
+        Args:
+            lineno: 1-based line number
+
+        Returns:
+            The line text, or an empty string when out of range
+        """
+        if lineno < 1 or lineno > len(self):
+            return ""
+        start = self._starts[lineno - 1]
+        end = (
+            self._starts[lineno] - 1
+            if lineno < len(self._starts)
+            else len(self.source_code)
+        )
+        return self.source_code[start:end].rstrip("\r\n")
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """
+        Convert a character offset into a line and column.
+
+        Args:
+            offset: 0-based character offset into the source
+
+        Returns:
+            Tuple of 1-based line number and 0-based character column
+        """
+        lineno = bisect_right(self._starts, offset)
+        return lineno, offset - self._starts[lineno - 1]
+
+    def segment(self, node: ast.AST, max_lines: Optional[int] = None) -> str:
+        """
+        Extract the source code segment for a given AST node.
+
+        Args:
+            node: AST node with position information
+            max_lines: Stop after this many lines of a multi-line node
+
+        Returns:
+            Source code segment as string (empty if the node has no position)
+        """
+        if not (hasattr(node, "lineno") and hasattr(node, "end_lineno")):
+            return ""
+
+        start_line: int = node.lineno
+        end_line: int = node.end_lineno or start_line
+        if start_line < 1 or start_line > len(self):
+            return ""
+        end_line = min(end_line, len(self))
+        truncated = False
+        if max_lines is not None and end_line - start_line + 1 > max_lines:
+            end_line = start_line + max_lines - 1
+            truncated = True
+
+        start_col = getattr(node, "col_offset", 0) or 0
+        end_col = None if truncated else getattr(node, "end_col_offset", None)
+
+        if start_line == end_line:
+            line = self.line(start_line)
+            return _slice_columns(line, start_col, end_col)
+
+        result_lines = [_slice_columns(self.line(start_line), start_col, None)]
+        for lineno in range(start_line + 1, end_line):
+            result_lines.append(self.line(lineno))
+        result_lines.append(_slice_columns(self.line(end_line), 0, end_col))
+        return "\n".join(result_lines)
+
+
+def _slice_columns(line: str, start: int, end: Optional[int]) -> str:
+    """Slice a line by AST column offsets, which count UTF-8 bytes."""
+    if line.isascii():
+        return line[start:end]
+    encoded = line.encode("utf-8")
+    return encoded[start:end].decode("utf-8", errors="replace")
+
+
+class AnalysisContext:
+    """
+    Everything the analyzers share while looking at one file.
+
+    Create it with ``for_tree`` so that every analyzer working on the same
+    tree reuses one context, one line index and one semantic model.
+    """
+
+    def __init__(
+        self, file_path: str, source_code: str, tree: Optional[ast.AST] = None
+    ) -> None:
+        self.file_path = file_path
+        self.source_code = source_code
+        self.tree = tree
+        self._lines: Optional[LineIndex] = None
+        self._node_types: Optional[FrozenSet[str]] = None
+
+    @classmethod
+    def for_tree(
+        cls, tree: ast.AST, source_code: str, file_path: str
+    ) -> "AnalysisContext":
+        """
+        Return the context attached to ``tree``, creating it if needed.
+
+        Args:
+            tree: Parsed module
+            source_code: Source the tree was parsed from
+            file_path: Path of the analyzed file
+
+        Returns:
+            AnalysisContext shared by everything analyzing this tree
+        """
+        context: Optional[AnalysisContext] = getattr(tree, _CACHE_ATTRIBUTE, None)
+        if context is None or (
+            context.source_code is not source_code
+            and context.source_code != source_code
+        ):
+            context = cls(file_path, source_code, tree)
+            setattr(tree, _CACHE_ATTRIBUTE, context)
+        return context
+
+    @property
+    def lines(self) -> LineIndex:
+        """Line index of the source, built on first use."""
+        if self._lines is None:
+            self._lines = LineIndex(self.source_code)
+        return self._lines
+
+    @property
+    def node_types(self) -> FrozenSet[str]:
+        """Class names of every AST node in the tree, collected on first use."""
+        if self._node_types is None:
+            if self.tree is None:
+                return frozenset()
+            self._node_types = frozenset(
+                type(node).__name__ for node in ast.walk(self.tree)
+            )
+        return self._node_types
+
+    @property
+    def semantic(self) -> SemanticModel:
+        """Shared scope and symbol table of the tree."""
+        if self.tree is None:
+            raise RuntimeError("The analysis context has no parsed tree")
+        return get_semantic_model(self.tree)
+
+    @property
+    def complexity(self) -> ComplexityReport:
+        """Complexity metrics of every function and class in the tree."""
+        if self.tree is None:
+            raise RuntimeError("The analysis context has no parsed tree")
+        return get_complexity_report(self.tree)
+
+    def snippet(self, node: ast.AST) -> Optional[str]:
+        """Return a short code snippet for an issue reported at ``node``."""
+        segment = self.lines.segment(node, max_lines=SNIPPET_MAX_LINES)
+        return segment or None
@@ -1,24 +1,189 @@
 """
 Green software analyzer for EcoGuard AI.
 
-This module implements green software analys                suggested_fix=Fix(
-                    description="Use list comprehension for better performance",
-                    replacement_code="# result = [expr for item in iterable]"
-                ),ules including:
+This module implements green software analysis rules including:
 - Inefficient string concatenation
 - List comprehension optimization
 - Generator vs list usage
 - Memory-efficient patterns
+- Quadratic membership tests in loops
+- Loop-invariant computations
+- pandas and NumPy code that bypasses vectorization
+- N+1 queries and other I/O repeated in loops
+- Quadratic accumulation into sequences
+- Resources that are leaked or reopened in loops
+- Pure functions recomputed with the same arguments
+- Regular expressions compiled in loops or prone to catastrophic backtracking
+- Blocking calls inside async functions
 """
 
 import ast
-from typing import List
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
 
 from ecoguard_ai.analyzers.base import ASTVisitorRule, BaseAnalyzer
+from ecoguard_ai.analyzers.green.blocking import (
+    DEFAULT_BLOCKING_CALLS,
+    BlockingCall,
+    BlockingPath,
+    blocking_functions,
+    match_blocking_call,
+)
+from ecoguard_ai.analyzers.green.dataflow import (
+    LoopEffects,
+    is_invariant,
+    is_pure_call,
+    iter_region,
+    loop_effects,
+    loop_region,
+    loops_between,
+)
+from ecoguard_ai.analyzers.green.inference import infer_type
+from ecoguard_ai.analyzers.green.io_calls import (
+    DEFAULT_IO_SIGNATURES,
+    IOCallSignature,
+    match_io_call,
+)
+from ecoguard_ai.analyzers.green.purity import (
+    FunctionPurity,
+    called_function,
+    infer_purity,
+    is_cached,
+    purity_statement,
+)
+from ecoguard_ai.analyzers.green.regex_patterns import backtracking_problem
+from ecoguard_ai.analyzers.semantic import BindingKind
 from ecoguard_ai.core.issue import Fix, Impact, Issue
 
+_COMPREHENSIONS = (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.DictComp)
 
-class StringConcatenationRule(ASTVisitorRule):
+
+@dataclass
+class _LoopDepth:
+    """Number of loops enclosing the node being visited."""
+
+    depth: int = 0
+
+
+def _loop_impact(depth: int, performance: float, carbon_impact: float) -> Impact:
+    """
+    Scale the impact of a per-iteration cost with the loop nesting depth.
+
+    Every enclosing loop multiplies how often the code runs, so the carbon
+    estimate doubles with each level and the performance cost grows
+    linearly up to its maximum.
+    """
+    depth = max(depth, 1)
+    return Impact(
+        performance=-min(1.0, performance * depth),
+        carbon_impact=carbon_impact * 2 ** (depth - 1),
+    )
+
+
+class LoopAwareRule(ASTVisitorRule):
+    """
+    Base class for rules that care how deeply code is nested in loops.
+
+    Loop bodies, ``while`` conditions and comprehensions count as loops; the
+    iterable of a ``for`` loop is evaluated once and does not. A function
+    body starts outside of any loop, since defining a function in a loop
+    does not run it there. Subclasses overriding a visitor below call
+    ``super()`` to keep the depth right.
+    """
+
+    def create_state(self) -> _LoopDepth:
+        """Start every file outside of any loop."""
+        return _LoopDepth()
+
+    @property
+    def loop_depth(self) -> int:
+        """Number of loops enclosing the node being visited."""
+        return int(self.state.depth)
+
+    def _visit_loop_body(self, nodes: Sequence[ast.AST]) -> None:
+        self.state.depth += 1
+        for node in nodes:
+            self.visit(node)
+        self.state.depth -= 1
+
+    def _visit_for(self, node: ast.AST) -> None:
+        self.visit(getattr(node, "iter"))
+        self._visit_loop_body([getattr(node, "target"), *getattr(node, "body")])
+        for statement in getattr(node, "orelse"):
+            self.visit(statement)
+
+    def visit_For(self, node: ast.For) -> None:
+        self._visit_for(node)
+
+    def visit_AsyncFor(self, node: ast.AsyncFor) -> None:
+        self._visit_for(node)
+
+    def visit_While(self, node: ast.While) -> None:
+        self._visit_loop_body([node.test, *node.body])
+        for statement in node.orelse:
+            self.visit(statement)
+
+    def _visit_comprehension(self, node: ast.AST, elements: List[ast.AST]) -> None:
+        generators: List[ast.comprehension] = getattr(node, "generators")
+        # The first iterable is evaluated once, before the loop starts
+        self.visit(generators[0].iter)
+        nodes: List[ast.AST] = [generators[0].target, *generators[0].ifs]
+        self._visit_loop_body([*nodes, *generators[1:], *elements])
+
+    def visit_ListComp(self, node: ast.ListComp) -> None:
+        self._visit_comprehension(node, [node.elt])
+
+    def visit_SetComp(self, node: ast.SetComp) -> None:
+        self._visit_comprehension(node, [node.elt])
+
+    def visit_GeneratorExp(self, node: ast.GeneratorExp) -> None:
+        self._visit_comprehension(node, [node.elt])
+
+    def visit_DictComp(self, node: ast.DictComp) -> None:
+        self._visit_comprehension(node, [node.key, node.value])
+
+    def _visit_function(self, node: ast.AST) -> None:
+        depth, self.state.depth = self.state.depth, 0
+        self.generic_visit(node)
+        self.state.depth = depth
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._visit_function(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self._visit_function(node)
+
+    def visit_Lambda(self, node: ast.Lambda) -> None:
+        self._visit_function(node)
+
+
+def _self_concatenation(node: ast.AST) -> Optional[ast.Name]:
+    """
+    Return the variable a statement rebuilds from itself by concatenation.
+
+    Matches ``x += y`` and ``x = x + y`` (or ``x = y + x``).
+    """
+    if isinstance(node, ast.AugAssign):
+        if isinstance(node.op, ast.Add) and isinstance(node.target, ast.Name):
+            return node.target
+        return None
+    if (
+        isinstance(node, ast.Assign)
+        and len(node.targets) == 1
+        and isinstance(node.targets[0], ast.Name)
+        and isinstance(node.value, ast.BinOp)
+        and isinstance(node.value.op, ast.Add)
+    ):
+        target = node.targets[0]
+        for operand in (node.value.left, node.value.right):
+            if isinstance(operand, ast.Name) and operand.id == target.id:
+                return target
+    return None
+
+
+class StringConcatenationRule(LoopAwareRule):
     """Detect inefficient string concatenation in loops."""
 
     def __init__(self) -> None:
@@ -29,32 +194,28 @@ class StringConcatenationRule(ASTVisitorRule):
             category="green",
             severity="warning",
         )
-        self.in_loop = False
 
-    def visit_For(self, node: ast.For) -> None:
-        self.in_loop = True
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+        """Check ``s += x`` on strings."""
+        self._check(node)
         self.generic_visit(node)
-        self.in_loop = False
 
-    def visit_While(self, node: ast.While) -> None:
-        self.in_loop = True
+    def visit_Assign(self, node: ast.Assign) -> None:
+        """Check ``s = s + x`` on strings."""
+        self._check(node)
         self.generic_visit(node)
-        self.in_loop = False
 
-    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+    def _check(self, node: ast.AST) -> None:
+        target = _self_concatenation(node)
         if (
-            self.in_loop
-            and isinstance(node.op, ast.Add)
-            and self._is_string_operation(node)
+            self.loop_depth
+            and target is not None
+            and infer_type(self.semantic, target) == "str"
         ):
-
-            issue = self.create_issue(
-                message=(
-                    "String concatenation in loop is inefficient. "
-                    "Use join() or f-strings instead"
-                ),
-                node=node,
-                file_path=self.current_file_path,
+            self.add_issue(
+                "String concatenation in loop is inefficient. "
+                "Use join() or f-strings instead",
+                node,
                 suggested_fix=Fix(
                     description="Use ''.join() for concatenating strings in loops",
                     replacement_code=(
@@ -62,18 +223,76 @@ class StringConcatenationRule(ASTVisitorRule):
                         "result = ''.join(parts)"
                     ),
                 ),
-                impact=Impact(performance=-0.15, carbon_impact=5.0),
+                impact=_loop_impact(self.loop_depth, 0.15, 5.0),
             )
-            self.issues.append(issue)
 
+
+class QuadraticAccumulationRule(LoopAwareRule):
+    """
+    Detect sequences rebuilt by concatenation on every loop iteration.
+
+    ``t += (x,)`` on a tuple, ``b += chunk`` on bytes and ``lst = lst + [x]``
+    copy everything accumulated so far, which makes the loop quadratic.
+    (``lst += [x]`` extends a list in place and is fine.) The accumulated
+    variable's type is inferred from all its assignments, so unknown types
+    are never reported. Strings are left to ``inefficient_string_concat``
+    and DataFrames and arrays to ``array_concat_in_loop``.
+    """
+
+    # Fix per accumulated type
+    FIXES = {
+        "list": (
+            "Grow the list in place with append() or extend()",
+            "# {name}.extend(items)",
+        ),
+        "tuple": (
+            "Accumulate into a list and convert it with tuple() after the loop",
+            "# parts.append(item)  ...  {name} = tuple(parts)",
+        ),
+        "bytes": (
+            "Accumulate into a bytearray, or collect chunks and b''.join() them",
+            "# {name} = bytearray(); {name} += chunk",
+        ),
+    }
+
+    def __init__(self) -> None:
+        super().__init__(
+            rule_id="quadratic_accumulation",
+            name="Quadratic Accumulation",
+            description="Sequence rebuilt by concatenation inside a loop",
+            category="green",
+            severity="warning",
+        )
+
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+        """Check ``x += y`` on immutable sequences."""
+        self._check(node, ("tuple", "bytes"))
         self.generic_visit(node)
 
-    def _is_string_operation(self, node: ast.AugAssign) -> bool:
-        """Check if this might be a string concatenation."""
-        # This is a heuristic - in real code we'd need type information
-        if isinstance(node.target, ast.Name):
-            return True  # Assume string if variable name suggests it
-        return False
+    def visit_Assign(self, node: ast.Assign) -> None:
+        """Check ``x = x + y`` on sequences."""
+        self._check(node, ("list", "tuple", "bytes"))
+        self.generic_visit(node)
+
+    def _check(self, node: ast.AST, types: Sequence[str]) -> None:
+        target = _self_concatenation(node)
+        if not self.loop_depth or target is None:
+            return
+        inferred = infer_type(self.semantic, target)
+        if inferred is None or inferred not in types:
+            return
+        description, code = self.FIXES[inferred]
+        self.add_issue(
+            f"{inferred.capitalize()} '{target.id}' is rebuilt by concatenation "
+            "on every iteration, copying everything accumulated so far",
+            node,
+            suggested_fix=Fix(
+                description=description,
+                replacement_code=code.format(name=target.id),
+                confidence=0.9,
+            ),
+            impact=_loop_impact(self.loop_depth, 0.15, 5.0),
+        )
 
 
 class ListComprehensionRule(ASTVisitorRule):
@@ -123,7 +342,38 @@ class ListComprehensionRule(ASTVisitorRule):
 
 
 class GeneratorExpressionRule(ASTVisitorRule):
-    """Suggest generators over lists when appropriate."""
+    """
+    Suggest generators over list comprehensions that are consumed once.
+
+    A comprehension is reported only when its list is iterated exactly once:
+    passed straight to a consuming builtin (``sum``, ``any``, ``max``,
+    ``set``, ...) or looped over by a ``for`` statement, either directly or
+    through a variable that is read once and not from inside a loop.
+    ``str.join`` is deliberately not a sink: it turns its argument into a
+    list anyway, so a generator saves nothing there.
+    """
+
+    # Builtins that consume their only argument in a single pass
+    SINKS = (
+        "sum",
+        "any",
+        "all",
+        "min",
+        "max",
+        "sorted",
+        "set",
+        "frozenset",
+        "tuple",
+        "dict",
+        "collections.Counter",
+        "collections.deque",
+    )
+
+    # Assumed length of a list whose size cannot be told statically
+    DEFAULT_LENGTH = 1000
+
+    # A list slot plus a small object such as an int or float kept alive
+    BYTES_PER_ELEMENT = 8 + 32
 
     def __init__(self) -> None:
         super().__init__(
@@ -136,12 +386,19 @@ class GeneratorExpressionRule(ASTVisitorRule):
 
     def visit_ListComp(self, node: ast.ListComp) -> None:
         """Check if list comprehension could be a generator."""
-        # This is a heuristic - would need more context in real implementation
-        if self._looks_like_single_use(node):
+        consumer = self._single_use_consumer(node)
+        if consumer is not None:
+            length = self._estimate_length(node)
+            if length is None:
+                length, estimate = self.DEFAULT_LENGTH, "1,000 elements assumed"
+            else:
+                estimate = f"{length} elements"
+            size = 56 + length * self.BYTES_PER_ELEMENT
             issue = self.create_issue(
                 message=(
-                    "Consider using generator expression instead of list "
-                    "comprehension for single use"
+                    f"List comprehension is only consumed by {consumer}; a "
+                    "generator expression avoids materializing the list "
+                    f"(~{size / 1024:.1f} KiB peak memory for {estimate})"
                 ),
                 node=node,
                 file_path=self.current_file_path,
@@ -151,60 +408,334 @@ class GeneratorExpressionRule(ASTVisitorRule):
                         "# Change [expr for item in iterable] to "
                         "(expr for item in iterable)"
                     ),
+                    confidence=0.9,
                 ),
-                impact=Impact(carbon_impact=2.0, performance=-0.1),
+                impact=Impact(carbon_impact=2.0, performance=-0.1, memory_impact=size),
             )
             self.issues.append(issue)
 
         self.generic_visit(node)
 
-    def _looks_like_single_use(self, node: ast.ListComp) -> bool:
-        """Heuristic to detect if this list might be used only once."""
-        # In a full implementation, we'd need data flow analysis
-        # For now, suggest generators for comprehensions in function calls
-        return True  # Simplified heuristic
+    def _single_use_consumer(self, node: ast.ListComp) -> Optional[str]:
+        """Describe what iterates the list, if it is iterated exactly once."""
+        consumer = self._direct_consumer(node)
+        if consumer is not None:
+            return consumer
+
+        statement = self.semantic.parent(node)
+        if not (
+            isinstance(statement, ast.Assign)
+            and len(statement.targets) == 1
+            and isinstance(statement.targets[0], ast.Name)
+        ):
+            return None
+        name = statement.targets[0].id
+        scope = self.semantic.enclosing_scope(statement)
+        bindings = scope.lookup(name)
+        if len(bindings) != 1 or len(bindings[0].references) != 1:
+            return None
+        reference = bindings[0].references[0]
+        if self.semantic.enclosing_scope(reference) is not scope:
+            return None
+        if self._repeated(reference, statement):
+            return None
+        consumer = self._direct_consumer(reference)
+        return None if consumer is None else f"{consumer} through '{name}'"
+
+    def _direct_consumer(self, node: ast.AST) -> Optional[str]:
+        parent = self.semantic.parent(node)
+        if isinstance(parent, (ast.For, ast.AsyncFor)) and parent.iter is node:
+            return "a for loop"
+        if (
+            isinstance(parent, ast.Call)
+            and len(parent.args) == 1
+            and parent.args[0] is node
+        ):
+            qualified = self.semantic.qualified_name(parent.func)
+            if qualified in self.SINKS:
+                return f"{qualified}()"
+        return None
+
+    def _repeated(self, reference: ast.AST, statement: ast.AST) -> bool:
+        """Whether a loop runs ``reference`` but not the assignment."""
+        assigned_in = {id(a) for a in self.semantic.ancestors(statement)}
+        child = reference
+        for ancestor in self.semantic.ancestors(reference):
+            if id(ancestor) in assigned_in:
+                return False
+            if isinstance(ancestor, ast.While):
+                return True
+            # Only the iterable of a for loop, or of the first generator of a
+            # comprehension, is evaluated once
+            if isinstance(ancestor, (ast.For, ast.AsyncFor, ast.comprehension)):
+                if ancestor.iter is not child:
+                    return True
+            elif isinstance(ancestor, _COMPREHENSIONS):
+                if child is not ancestor.generators[0]:
+                    return True
+            child = ancestor
+        return False
+
+    def _estimate_length(self, node: ast.ListComp) -> Optional[int]:
+        """Number of elements, when every iterable has a static size."""
+        length = 1
+        for generator in node.generators:
+            size = self._static_size(generator.iter)
+            if size is None:
+                return None
+            length *= size
+        return length
+
+    def _static_size(self, node: ast.AST) -> Optional[int]:
+        """Length of a literal container or a range() with constant bounds."""
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            return len(node.elts)
+        if not (
+            isinstance(node, ast.Call)
+            and self.semantic.qualified_name(node.func) == "range"
+            and 1 <= len(node.args) <= 3
+        ):
+            return None
+        bounds: List[int] = [
+            a.value
+            for a in node.args
+            if isinstance(a, ast.Constant) and isinstance(a.value, int)
+        ]
+        if len(bounds) != len(node.args):
+            return None
+        try:
+            return len(range(*bounds))
+        except (ValueError, OverflowError):
+            # A zero step, or more elements than fit in a C integer
+            return None
+
+
+# Calls that open a resource which must be closed, and what they open
+RESOURCE_CALLS = {
+    "open": "file",
+    "io.open": "file",
+    "gzip.open": "file",
+    "bz2.open": "file",
+    "lzma.open": "file",
+    "socket.socket": "socket",
+    "socket.create_connection": "socket",
+    "sqlite3.connect": "database connection",
+    "requests.Session": "HTTP session",
+    "requests.session": "HTTP session",
+    "httpx.Client": "HTTP client",
+    "urllib.request.urlopen": "HTTP response",
+}
+
+# The argument naming what a resource call opens, by position and keyword.
+# Only a call passing it opens the same resource again; socket.socket()
+# makes a new, unconnected socket whatever it is given
+RESOURCE_TARGETS = {
+    "open": (0, "file"),
+    "io.open": (0, "file"),
+    "gzip.open": (0, "filename"),
+    "bz2.open": (0, "filename"),
+    "lzma.open": (0, "filename"),
+    "socket.create_connection": (0, "address"),
+    "sqlite3.connect": (0, "database"),
+    "urllib.request.urlopen": (0, "url"),
+}
+
+# Sessions and clients are meant to be shared, whatever their arguments
+SHARED_RESOURCES = frozenset({"requests.Session", "requests.session", "httpx.Client"})
+
+# Wrappers that take over closing a resource passed to them
+_CLOSING_WRAPPERS = ("contextlib.closing",)
+
+_SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)
 
 
 class FileHandlingRule(ASTVisitorRule):
-    """Check for efficient file handling patterns."""
+    """
+    Check that files, sockets, connections and sessions are closed reliably
+    and are not reopened on every loop iteration.
+
+    A resource is handled when it is opened in a ``with`` statement
+    (directly, through ``contextlib.closing`` or ``ExitStack.enter_context``)
+    or bound to a name that is closed in a ``finally`` block, used in a
+    ``with`` statement or handed over (returned, stored, passed on). The
+    parent links of the shared semantic model tell where each resource
+    ends up.
+    """
 
     def __init__(self) -> None:
         super().__init__(
             rule_id="file_handling_efficiency",
-            name="File Handling Efficiency",
-            description="File handling could be more efficient",
+            name="Resource Handling",
+            description="Resource is not closed reliably or is reopened in a loop",
             category="green",
             severity="info",
         )
 
     def visit_Call(self, node: ast.Call) -> None:
-        """Check for inefficient file operations."""
-        if (
-            isinstance(node.func, ast.Name)
-            and node.func.id == "open"
-            and not self._in_with_statement(node)
-        ):
+        """Check calls that open a resource."""
+        qualified = self.semantic.qualified_name(node.func)
+        kind = RESOURCE_CALLS.get(qualified or "")
+        if kind is not None:
+            self._check_resource(node, qualified or "", kind)
+        self.generic_visit(node)
 
-            issue = self.create_issue(
-                message="Use 'with open()' for automatic file closing",
-                node=node,
-                file_path=self.current_file_path,
+    def _check_resource(self, node: ast.Call, qualified: str, kind: str) -> None:
+        loop = (
+            self._reopening_loop(node)
+            if self._names_resource(node, qualified)
+            else None
+        )
+        if loop is not None:
+            self.add_issue(
+                f"{kind.capitalize()} is reopened with the same arguments on "
+                f"every iteration of the loop at line {loop.lineno}",
+                node,
+                suggested_fix=Fix(
+                    description=f"Open the {kind} once before the loop and reuse it",
+                    confidence=0.8,
+                ),
+                impact=_loop_impact(loops_between(self.semantic, node, loop), 0.1, 3.0),
+            )
+            return
+
+        problem = self._lifetime_problem(node, qualified, kind)
+        if problem is not None:
+            self.add_issue(
+                problem,
+                node,
                 suggested_fix=Fix(
                     description=(
                         "Use context manager (with statement) for file handling"
+                        if kind == "file"
+                        else f"Open the {kind} in a with statement, wrapped in "
+                        "contextlib.closing() if it is not a context manager"
                     ),
                     replacement_code="# with open(filename) as f:",
                 ),
                 impact=Impact(carbon_impact=1.0, performance=-0.05),
             )
-            self.issues.append(issue)
 
-        self.generic_visit(node)
+    @staticmethod
+    def _names_resource(node: ast.Call, qualified: str) -> bool:
+        """Whether a call says which resource it opens, as a path or address."""
+        if qualified in SHARED_RESOURCES:
+            return True
+        if qualified not in RESOURCE_TARGETS:
+            return False
+        position, keyword = RESOURCE_TARGETS[qualified]
+        return len(node.args) > position or any(k.arg == keyword for k in node.keywords)
+
+    def _reopening_loop(self, node: ast.Call) -> Optional[ast.stmt]:
+        """Return the innermost loop that reopens a resource unchanged."""
+        child: ast.AST = node
+        for ancestor in self.semantic.ancestors(node):
+            if isinstance(ancestor, _SCOPE_NODES):
+                return None
+            # The iterable of a for loop is evaluated once per loop
+            if isinstance(ancestor, (ast.For, ast.AsyncFor, ast.While)) and (
+                getattr(ancestor, "iter", None) is not child
+            ):
+                effects = loop_effects(self.semantic, ancestor)
+                arguments = [*node.args, *(k.value for k in node.keywords)]
+                if all(is_invariant(self.semantic, a, effects) for a in arguments):
+                    return ancestor
+                return None
+            child = ancestor
+        return None
+
+    def _lifetime_problem(
+        self, node: ast.Call, qualified: str, kind: str
+    ) -> Optional[str]:
+        """Describe how a resource may stay open, or None if it is handled."""
+        parent = self.semantic.parent(node)
+        if isinstance(parent, ast.withitem):
+            if qualified == "sqlite3.connect":
+                return (
+                    "A sqlite3 connection used as a context manager is committed "
+                    "but never closed"
+                )
+            return None
+        if isinstance(parent, (ast.Return, ast.Yield, ast.YieldFrom)):
+            return None
+        if isinstance(parent, ast.Call) and self._is_closing_wrapper(parent):
+            return None
+        if isinstance(parent, (ast.Assign, ast.AnnAssign)):
+            targets = (
+                parent.targets if isinstance(parent, ast.Assign) else [parent.target]
+            )
+            if len(targets) == 1 and isinstance(targets[0], ast.Name):
+                return self._binding_problem(targets[0], kind)
+            # Stored on an object or unpacked: its owner closes it
+            return None
+        return (
+            f"Use 'with open()' for automatic file closing: the {kind} is never "
+            "closed explicitly and stays open until garbage collection"
+            if kind == "file"
+            else f"The {kind} is never closed explicitly and stays open until "
+            "garbage collection"
+        )
+
+    def _binding_problem(self, target: ast.Name, kind: str) -> Optional[str]:
+        scope = self.semantic.enclosing_scope(target)
+        if kind != "file" and scope is self.semantic.module_scope:
+            # Module-level sessions and connections are meant to live long
+            return None
+        closed = False
+        for binding in scope.lookup(target.id):
+            if binding.node is not target:
+                continue
+            for reference in binding.references:
+                parent = self.semantic.parent(reference)
+                if isinstance(parent, ast.withitem) or self._handed_over(
+                    reference, parent
+                ):
+                    return None
+                if (
+                    isinstance(parent, ast.Attribute)
+                    and parent.attr == "close"
+                    and isinstance(self.semantic.parent(parent), ast.Call)
+                ):
+                    if self._in_finally(parent):
+                        return None
+                    closed = True
+        if closed:
+            return (
+                f"The {kind} '{target.id}' is closed manually and stays open if "
+                "an exception is raised before the close() call"
+            )
+        return f"The {kind} '{target.id}' is never closed"
+
+    def _handed_over(self, node: ast.AST, parent: Optional[ast.AST]) -> bool:
+        """Whether a resource is returned, stored or passed to other code."""
+        if isinstance(parent, (ast.Return, ast.Yield, ast.YieldFrom)):
+            return True
+        if isinstance(parent, ast.keyword):
+            parent = self.semantic.parent(parent)
+        if isinstance(parent, ast.Call) and node is not parent.func:
+            # closing(f), stack.enter_context(f), Wrapper(f), ...
+            return True
+        if isinstance(parent, ast.Assign) and parent.value is node:
+            return (
+                not isinstance(parent.targets[0], ast.Name) or len(parent.targets) > 1
+            )
+        return False
+
+    def _is_closing_wrapper(self, call: ast.Call) -> bool:
+        """Whether a call takes over closing its argument."""
+        func = call.func
+        if isinstance(func, ast.Attribute) and func.attr == "enter_context":
+            return True
+        return self.semantic.qualified_name(func) in _CLOSING_WRAPPERS
 
-    def _in_with_statement(self, node: ast.AST) -> bool:
-        """Check if this call is already in a with statement."""
-        # This would need proper parent node tracking in a full implementation
-        return False  # Simplified for now
+    def _in_finally(self, node: ast.AST) -> bool:
+        child = node
+        for ancestor in self.semantic.ancestors(node):
+            if isinstance(ancestor, _SCOPE_NODES):
+                return False
+            if isinstance(ancestor, ast.Try) and child in ancestor.finalbody:
+                return True
+            child = ancestor
+        return False
 
 
 class IneffientLoopRule(ASTVisitorRule):
@@ -254,6 +785,953 @@ class IneffientLoopRule(ASTVisitorRule):
         return False
 
 
+class QuadraticMembershipRule(LoopAwareRule):
+    """
+    Detect linear list searches repeated inside loops.
+
+    ``x in items``, ``items.index(x)`` and ``items.count(x)`` scan the whole
+    list, so running them for every element of another collection is
+    quadratic. Only containers inferred to be lists are reported; literal
+    lists are left alone since Python turns them into constants.
+    """
+
+    # List methods that scan the list from the start
+    SCANNING_METHODS = ("index", "count")
+
+    def __init__(self) -> None:
+        super().__init__(
+            rule_id="quadratic_membership",
+            name="Quadratic Membership Test",
+            description="Membership test on a list inside a loop",
+            category="green",
+            severity="warning",
+        )
+
+    def visit_Compare(self, node: ast.Compare) -> None:
+        """Check ``in`` and ``not in`` tests against lists."""
+        if self.loop_depth:
+            for op, comparator in zip(node.ops, node.comparators):
+                if isinstance(op, (ast.In, ast.NotIn)) and self._is_list(comparator):
+                    self._report(node, comparator, "Membership test")
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        """Check ``list.index`` and ``list.count`` calls."""
+        func = node.func
+        if (
+            self.loop_depth
+            and isinstance(func, ast.Attribute)
+            and func.attr in self.SCANNING_METHODS
+            and self._is_list(func.value)
+        ):
+            self._report(node, func.value, f"list.{func.attr}()")
+        self.generic_visit(node)
+
+    def _is_list(self, node: ast.AST) -> bool:
+        if isinstance(node, (ast.List, ast.Tuple)):
+            return False
+        return infer_type(self.semantic, node) == "list"
+
+    def _report(self, node: ast.AST, container: ast.AST, what: str) -> None:
+        name = container.id if isinstance(container, ast.Name) else "list"
+        if what == "list.index()":
+            fix = Fix(
+                description=(
+                    f"Build a dict mapping each value of '{name}' to its index "
+                    "once, before the loop"
+                ),
+                replacement_code=(
+                    f"# positions = {{value: i for i, value in enumerate({name})}}"
+                ),
+                confidence=0.7,
+            )
+        else:
+            fix = Fix(
+                description=(
+                    f"Convert '{name}' to a set (or a collections.Counter for "
+                    "counts) once, before the loop"
+                ),
+                replacement_code=f"# {name}_set = set({name})",
+                confidence=0.8,
+            )
+        self.add_issue(
+            f"{what} on list '{name}' inside a loop scans the whole list on "
+            "every iteration",
+            node,
+            suggested_fix=fix,
+            impact=_loop_impact(self.loop_depth, 0.2, 8.0),
+        )
+
+
+@dataclass
+class _HoistState:
+    """Expressions already reported for an enclosing loop."""
+
+    reported: Set[int] = field(default_factory=set)
+
+
+class LoopInvariantRule(ASTVisitorRule):
+    """
+    Detect computations that could be hoisted out of a loop.
+
+    Pure builtin calls such as ``len(x)``, ``re.compile(...)``, attribute
+    chains and repeated ``d[key]`` lookups are reported when nothing they
+    read is rebound or mutated in the loop. Each expression is reported for
+    the outermost loop it does not depend on. The fix confidence is lower
+    when the loop also calls unknown code, which could change attributes or
+    items behind the analysis' back.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            rule_id="loop_invariant_computation",
+            name="Loop-Invariant Computation",
+            description="Computation inside a loop does not change between "
+            "iterations",
+            category="green",
+            severity="info",
+        )
+
+    def create_state(self) -> _HoistState:
+        """Nothing is reported at the start of a file."""
+        return _HoistState()
+
+    def visit_For(self, node: ast.For) -> None:
+        self._check_loop(node)
+        self.generic_visit(node)
+
+    def visit_AsyncFor(self, node: ast.AsyncFor) -> None:
+        self._check_loop(node)
+        self.generic_visit(node)
+
+    def visit_While(self, node: ast.While) -> None:
+        self._check_loop(node)
+        self.generic_visit(node)
+
+    def _check_loop(self, loop: ast.AST) -> None:
+        effects = loop_effects(self.semantic, loop)
+        region = loop_region(loop)
+        lookups = Counter(
+            ast.dump(node)
+            for node in iter_region(region)
+            if isinstance(node, ast.Subscript)
+            and isinstance(node.ctx, ast.Load)
+            and is_invariant(self.semantic, node, effects)
+        )
+        repeated = {dump for dump, count in lookups.items() if count > 1}
+        if isinstance(loop, ast.While) and effects.impure_calls:
+            # Unknown calls may be what ends the loop, through its condition
+            region = region[1:]
+        for node in region:
+            self._scan(node, loop, effects, repeated)
+
+    def _scan(
+        self, node: ast.AST, loop: ast.AST, effects: LoopEffects, repeated: Set[str]
+    ) -> None:
+        if id(node) in self.state.reported or isinstance(
+            node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)
+        ):
+            return
+        confidence = self._hoistable(node, effects, repeated)
+        if confidence:
+            self._report(node, loop, confidence)
+            # Report a repeated lookup once
+            repeated.discard(ast.dump(node))
+            return
+        for child in ast.iter_child_nodes(node):
+            # A method looked up for a call is not worth hoisting on its own
+            if isinstance(node, ast.Call) and child is node.func:
+                if isinstance(child, ast.Attribute):
+                    self._scan(child.value, loop, effects, repeated)
+                continue
+            self._scan(child, loop, effects, repeated)
+
+    def _hoistable(
+        self, node: ast.AST, effects: LoopEffects, repeated: Set[str]
+    ) -> float:
+        """Return the confidence that a node can be hoisted, 0 if it cannot."""
+        if not isinstance(node, (ast.Call, ast.Attribute, ast.Subscript)):
+            return 0.0
+        if isinstance(node, ast.Call):
+            if not node.args or not is_pure_call(self.semantic, node):
+                return 0.0
+        elif not isinstance(node.ctx, ast.Load):
+            return 0.0
+        elif isinstance(node, ast.Attribute) and not self._is_object_chain(node):
+            return 0.0
+        elif isinstance(node, ast.Subscript) and ast.dump(node) not in repeated:
+            return 0.0
+        if not is_invariant(self.semantic, node, effects):
+            return 0.0
+
+        if isinstance(node, ast.Call):
+            if all(isinstance(a, ast.Constant) for a in node.args):
+                return 0.95
+            return 0.9 if not effects.impure_calls else 0.7
+        # Unknown calls may change attributes and items in place
+        return 0.8 if not effects.impure_calls else 0.5
+
+    def _is_object_chain(self, node: ast.Attribute) -> bool:
+        """Whether a node is an a.b.c chain on an object rather than a module."""
+        if not isinstance(node.value, ast.Attribute):
+            return False
+        root: ast.expr = node.value
+        while isinstance(root, ast.Attribute):
+            root = root.value
+        if not isinstance(root, ast.Name):
+            return False
+        bindings = self.semantic.resolve(root)
+        return not any(b.kind is BindingKind.IMPORT for b in bindings)
+
+    def _report(self, node: ast.AST, loop: ast.AST, confidence: float) -> None:
+        self.state.reported.add(id(node))
+        text = self.analysis.lines.segment(node) or "expression"
+        loop_line = getattr(loop, "lineno", 1)
+        self.add_issue(
+            f"'{text}' does not change in the loop at line {loop_line} but is "
+            "recomputed on every iteration",
+            node,
+            suggested_fix=Fix(
+                description=(
+                    f"Compute '{text}' once before the loop and reuse the result"
+                ),
+                replacement_code=f"# value = {text}  (before the loop)",
+                confidence=confidence,
+            ),
+            impact=_loop_impact(loops_between(self.semantic, node, loop), 0.05, 1.5),
+        )
+
+
+def _imports_module(rule: ASTVisitorRule, module: str) -> bool:
+    """Whether the file being checked imports ``module`` or a submodule."""
+    return any(
+        (binding.qualified_name or "").split(".")[0] == module
+        for binding in rule.semantic.imports()
+    )
+
+
+def _axis_is_rows(call: ast.Call) -> bool:
+    """Whether a pandas call passes axis=1 / axis="columns" (one row at a time)."""
+    return any(
+        keyword.arg == "axis"
+        and isinstance(keyword.value, ast.Constant)
+        and keyword.value.value in (1, "columns")
+        for keyword in call.keywords
+    )
+
+
+def _first_arg_is_lambda(call: ast.Call) -> bool:
+    """Whether a call's first positional argument is a lambda."""
+    return bool(call.args) and isinstance(call.args[0], ast.Lambda)
+
+
+class PandasRowIterationRule(LoopAwareRule):
+    """
+    Detect pandas code that processes a DataFrame one row at a time.
+
+    ``df.iterrows()`` builds a Series for every row and ``df.apply(f,
+    axis=1)`` calls Python code for every row; both are orders of magnitude
+    slower than column-wise operations. Receivers are recognized by their
+    inferred type; ``iterrows()``, a name no other common library uses, is
+    also reported on receivers of unknown type when the file imports pandas.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            rule_id="pandas_row_iteration",
+            name="Row-Wise pandas Processing",
+            description="DataFrame processed row by row instead of vectorized",
+            category="green",
+            severity="warning",
+        )
+
+    def visit_Call(self, node: ast.Call) -> None:
+        """Check iterrows() and row-wise apply() calls."""
+        if isinstance(node.func, ast.Attribute):
+            self._check_method(node, node.func)
+        self.generic_visit(node)
+
+    def _check_method(self, node: ast.Call, func: ast.Attribute) -> None:
+        if func.attr == "iterrows" and self._is_pandas(
+            func.value, assume_with_import=True
+        ):
+            self._report(
+                node,
+                "DataFrame.iterrows() builds a Series for every row",
+                "Use column-wise operations, or itertuples() if a loop "
+                "is unavoidable",
+                "# df['total'] = df['price'] * df['quantity']",
+            )
+        elif (
+            func.attr == "apply"
+            and (_axis_is_rows(node) or _first_arg_is_lambda(node))
+            and self._is_pandas(func.value)
+        ):
+            self._report(
+                node,
+                "apply() with a Python function runs once per row or element",
+                "Replace the function with vectorized column arithmetic, "
+                "Series.str/.dt methods or numpy.where",
+                "# df['flag'] = np.where(df['a'] > df['b'], 1, 0)",
+            )
+
+    def _is_pandas(self, node: ast.AST, assume_with_import: bool = False) -> bool:
+        inferred = infer_type(self.semantic, node)
+        if inferred is not None:
+            return inferred.startswith("pandas.")
+        return assume_with_import and _imports_module(self, "pandas")
+
+    def _report(self, node: ast.AST, message: str, fix: str, code: str) -> None:
+        self.add_issue(
+            message,
+            node,
+            suggested_fix=Fix(description=fix, replacement_code=code),
+            # The call itself loops over the rows
+            impact=_loop_impact(self.loop_depth + 1, 0.3, 15.0),
+        )
+
+
+class NumpyElementLoopRule(LoopAwareRule):
+    """
+    Detect Python loops over the elements of a NumPy array.
+
+    Iterating an ``ndarray`` in Python boxes every element into a Python
+    object; ``for x in arr`` and ``for i in range(len(arr))`` (or
+    ``arr.shape[0]``) should be whole-array expressions instead.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            rule_id="numpy_element_loop",
+            name="Python Loop Over NumPy Array",
+            description="NumPy array processed element by element",
+            category="green",
+            severity="warning",
+        )
+
+    def visit_For(self, node: ast.For) -> None:
+        """Check what a for loop iterates over."""
+        self._check_iterable(node, node.iter)
+        super().visit_For(node)
+
+    def _visit_comprehension(self, node: ast.AST, elements: List[ast.AST]) -> None:
+        for generator in getattr(node, "generators"):
+            self._check_iterable(node, generator.iter)
+        super()._visit_comprehension(node, elements)
+
+    def _check_iterable(self, node: ast.AST, iterable: ast.AST) -> None:
+        array = self._iterated_array(iterable)
+        if array is None:
+            return
+        name = self.analysis.lines.segment(array) or "array"
+        self.add_issue(
+            f"Python loop over the elements of NumPy array '{name}'",
+            node,
+            suggested_fix=Fix(
+                description=(
+                    "Express the loop body as whole-array operations "
+                    "(arithmetic, ufuncs, boolean masks, np.where)"
+                ),
+                replacement_code=f"# result = np.sqrt({name}) * 2",
+            ),
+            impact=_loop_impact(self.loop_depth + 1, 0.3, 15.0),
+        )
+
+    def _iterated_array(self, iterable: ast.AST) -> Optional[ast.AST]:
+        """Return the array a loop goes through, element by element."""
+        if self._is_array(iterable):
+            return iterable
+        if (
+            isinstance(iterable, ast.Call)
+            and self.semantic.qualified_name(iterable.func) == "range"
+            and len(iterable.args) == 1
+        ):
+            bound = iterable.args[0]
+            # range(len(a)), range(a.size), range(a.shape[0])
+            if isinstance(bound, ast.Call) and len(bound.args) == 1:
+                if self.semantic.qualified_name(bound.func) == "len":
+                    bound = bound.args[0]
+            if isinstance(bound, ast.Subscript):
+                bound = bound.value
+            if isinstance(bound, ast.Attribute) and bound.attr in ("size", "shape"):
+                bound = bound.value
+            if self._is_array(bound):
+                return bound
+        return None
+
+    def _is_array(self, node: ast.AST) -> bool:
+        return infer_type(self.semantic, node) == "numpy.ndarray"
+
+
+class ArrayConcatInLoopRule(LoopAwareRule):
+    """
+    Detect arrays and DataFrames grown by concatenation inside loops.
+
+    ``np.append``, ``np.concatenate``, ``pd.concat`` and ``DataFrame.append``
+    copy all existing data into a new object, so growing a result this way
+    is quadratic in the number of iterations.
+    """
+
+    # Calls that return a copy of all their inputs
+    COPYING_CALLS = (
+        "numpy.append",
+        "numpy.concatenate",
+        "numpy.vstack",
+        "numpy.hstack",
+        "pandas.concat",
+    )
+
+    def __init__(self) -> None:
+        super().__init__(
+            rule_id="array_concat_in_loop",
+            name="Array Concatenation in Loop",
+            description="Array or DataFrame grown by concatenation in a loop",
+            category="green",
+            severity="warning",
+        )
+
+    def visit_Call(self, node: ast.Call) -> None:
+        """Check copying concatenation calls made inside loops."""
+        if self.loop_depth:
+            name = self._copying_call(node)
+            if name is not None:
+                self.add_issue(
+                    f"{name}() inside a loop copies all data gathered so far "
+                    "on every iteration",
+                    node,
+                    suggested_fix=Fix(
+                        description=(
+                            "Collect the pieces in a list and concatenate "
+                            "them once after the loop"
+                        ),
+                        replacement_code=(
+                            "# parts.append(piece)  ...  "
+                            "result = pd.concat(parts)  # or np.concatenate"
+                        ),
+                        confidence=0.8,
+                    ),
+                    impact=_loop_impact(self.loop_depth, 0.25, 10.0),
+                )
+        self.generic_visit(node)
+
+    def _copying_call(self, node: ast.Call) -> Optional[str]:
+        qualified = self.semantic.qualified_name(node.func)
+        if qualified in self.COPYING_CALLS:
+            return qualified
+        func = node.func
+        if (
+            isinstance(func, ast.Attribute)
+            and func.attr == "append"
+            and infer_type(self.semantic, func.value) == "pandas.DataFrame"
+        ):
+            return "DataFrame.append"
+        return None
+
+
+class IOInLoopRule(LoopAwareRule):
+    """
+    Detect database queries, HTTP requests, file opens and subprocesses
+    issued once per loop iteration.
+
+    A query per element of a previous query's results (the N+1 pattern)
+    or a request per item turns one round trip into thousands. Calls are
+    recognized by configurable signatures; when a signature names a bulk
+    API, it is suggested instead.
+    """
+
+    def __init__(self, signatures: Optional[Sequence[IOCallSignature]] = None) -> None:
+        super().__init__(
+            rule_id="io_in_loop",
+            name="I/O in Loop",
+            description="Query, request or other I/O performed on every "
+            "loop iteration",
+            category="green",
+            severity="warning",
+        )
+        self.signatures = list(
+            DEFAULT_IO_SIGNATURES if signatures is None else signatures
+        )
+
+    def visit_Call(self, node: ast.Call) -> None:
+        """Check I/O calls made inside loops."""
+        if self.loop_depth:
+            signature = match_io_call(self.semantic, node, self.signatures)
+            if signature is not None:
+                self._report(node, signature)
+        self.generic_visit(node)
+
+    def _report(self, node: ast.Call, signature: IOCallSignature) -> None:
+        call = self.analysis.lines.segment(node.func) or signature.pattern
+        trips = signature.round_trips
+        message = (
+            f"{signature.kind.capitalize()} call '{call}' inside a loop makes "
+            f"{trips} round trip{'s' if trips != 1 else ''} per iteration"
+        )
+        if signature.kind == "database":
+            message += " (N+1 queries)"
+        fix = Fix(
+            description=(
+                f"Use {signature.bulk}"
+                if signature.bulk
+                else "Move the call out of the loop and batch its inputs"
+            ),
+            confidence=0.6 if signature.pattern.startswith(".") else 0.8,
+        )
+        self.add_issue(
+            message,
+            node,
+            suggested_fix=fix,
+            impact=_loop_impact(self.loop_depth, 0.2 * trips, 5.0 * trips),
+        )
+
+
+class MemoizationRule(ASTVisitorRule):
+    """
+    Detect pure functions whose results are computed again and again.
+
+    Purity is inferred over the module's call graph (see
+    ``green.purity``). A pure function called with loop-invariant arguments
+    inside a loop, or with the same constant arguments several times in one
+    scope, returns the same value each time; a pure recursive function that
+    calls itself on several smaller arguments (the naive Fibonacci shape)
+    solves the same subproblems an exponential number of times. Calls of
+    builtins are left to loop_invariant_computation. Functions that can
+    return a new list, dict or other mutable object are never reported, nor
+    are calls whose result the loop changes: reusing one result would share
+    a single object between what were separate values.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            rule_id="memoization_opportunity",
+            name="Redundant Recomputation",
+            description="Pure function is recomputed with the same arguments",
+            category="green",
+            severity="info",
+        )
+
+    def visit_Module(self, node: ast.Module) -> None:
+        """Infer purity once per module and check every function and call."""
+        purity = infer_purity(self.semantic)
+        pure = {
+            name: result
+            for name, result in purity.items()
+            if result.pure
+            and not result.returns_mutable
+            and not is_cached(self.semantic, result.node)
+        }
+        if not pure:
+            return
+        for name, result in pure.items():
+            self._check_recursion(name, result)
+        self._check_calls(node, pure)
+
+    def _check_recursion(self, name: str, purity: FunctionPurity) -> None:
+        function = purity.node
+        parameters = {arg.arg for arg in function.args.args}
+        calls = [
+            child
+            for child in iter_region(list(function.body))
+            if isinstance(child, ast.Call)
+            and called_function(self.semantic, child) == name
+        ]
+        shrinking = [c for c in calls if self._shrinks(c, parameters)]
+        distinct = {ast.dump(c) for c in shrinking}
+        if len(distinct) < 2:
+            return
+        shown = ", ".join(self.analysis.lines.segment(c) or name for c in shrinking[:3])
+        self.add_issue(
+            f"Recursive function '{name}' recomputes overlapping subproblems: "
+            f"it calls itself as {shown}, so the same arguments are solved "
+            "an exponential number of times",
+            function,
+            suggested_fix=Fix(
+                description=(
+                    f"Memoize '{name}' with @functools.lru_cache(maxsize=None), "
+                    "or @functools.cache on Python 3.9+"
+                ),
+                replacement_code=(
+                    f"@functools.lru_cache(maxsize=None)\ndef {name}(...):"
+                ),
+                confidence=0.85,
+                instructions=purity_statement(name, purity)
+                + " Its arguments must be hashable to be cached.",
+            ),
+            impact=Impact(performance=-0.5, carbon_impact=10.0),
+        )
+
+    @staticmethod
+    def _shrinks(call: ast.Call, parameters: Set[str]) -> bool:
+        """Whether a call passes a parameter reduced by a constant, as n - 1."""
+        return any(
+            isinstance(argument, ast.BinOp)
+            and isinstance(argument.op, (ast.Sub, ast.FloorDiv, ast.RShift))
+            and isinstance(argument.left, ast.Name)
+            and argument.left.id in parameters
+            and isinstance(argument.right, ast.Constant)
+            for argument in call.args
+        )
+
+    def _check_calls(self, tree: ast.AST, pure: Dict[str, FunctionPurity]) -> None:
+        calls = sorted(
+            (
+                (node, name)
+                for node in ast.walk(tree)
+                if isinstance(node, ast.Call) and (node.args or node.keywords)
+                for name in [called_function(self.semantic, node)]
+                if name in pure
+                # Recursive calls are checked with their function
+                and pure[name].node not in self.semantic.ancestors(node)
+            ),
+            key=lambda item: (item[0].lineno, item[0].col_offset),
+        )
+        repeated: Dict[Tuple[int, str], List[ast.Call]] = {}
+        for call, name in calls:
+            hoisting = self._hoisting_loop(call, pure)
+            if hoisting is not None:
+                self._report_loop(call, name, pure[name], *hoisting)
+            elif all(
+                isinstance(a, ast.Constant)
+                for a in [*call.args, *(k.value for k in call.keywords)]
+            ):
+                scope = self.semantic.enclosing_scope(call)
+                key = (id(scope), ast.dump(call))
+                repeated.setdefault(key, []).append(call)
+        for same in repeated.values():
+            if len(same) > 1:
+                name = getattr(same[0].func, "id", "")
+                self._report_repeated(same, name, pure[name])
+
+    def _hoisting_loop(
+        self, call: ast.Call, pure: Dict[str, FunctionPurity]
+    ) -> Optional[Tuple[ast.AST, LoopEffects]]:
+        """Return the outermost loop a call does not depend on, and its effects."""
+
+        def calls_pure_function(node: ast.Call) -> bool:
+            return called_function(self.semantic, node) in pure
+
+        arguments = [*call.args, *(k.value for k in call.keywords)]
+        statement = self.semantic.parent(call)
+        targets: Set[str] = set()
+        if isinstance(statement, (ast.Assign, ast.AnnAssign)):
+            assigned = (
+                statement.targets
+                if isinstance(statement, ast.Assign)
+                else [statement.target]
+            )
+            targets = {
+                n.id for t in assigned for n in ast.walk(t) if isinstance(n, ast.Name)
+            }
+        found: Optional[Tuple[ast.AST, LoopEffects]] = None
+        child: ast.AST = call
+        for ancestor in self.semantic.ancestors(call):
+            if isinstance(ancestor, _SCOPE_NODES):
+                break
+            if isinstance(ancestor, (ast.For, ast.AsyncFor, ast.While)) and (
+                getattr(ancestor, "iter", None) is not child
+            ):
+                effects = loop_effects(self.semantic, ancestor, calls_pure_function)
+                if not all(is_invariant(self.semantic, a, effects) for a in arguments):
+                    break
+                # A result changed in the loop must be a new object each time
+                if targets & effects.mutated:
+                    break
+                found = (ancestor, effects)
+            child = ancestor
+        return found
+
+    def _report_loop(
+        self,
+        call: ast.Call,
+        name: str,
+        purity: FunctionPurity,
+        loop: ast.AST,
+        effects: LoopEffects,
+    ) -> None:
+        text = self.analysis.lines.segment(call) or name
+        self.add_issue(
+            f"Pure function '{name}' is called with the same arguments on every "
+            f"iteration of the loop at line {getattr(loop, 'lineno', 1)}",
+            call,
+            suggested_fix=Fix(
+                description=(
+                    f"Compute '{text}' once before the loop and reuse the result"
+                ),
+                replacement_code=f"# value = {text}  (before the loop)",
+                # Unknown calls in the loop may change globals the function reads
+                confidence=0.9 if not effects.impure_calls else 0.7,
+                instructions=purity_statement(name, purity),
+            ),
+            impact=_loop_impact(loops_between(self.semantic, call, loop), 0.1, 2.0),
+        )
+
+    def _report_repeated(
+        self, calls: List[ast.Call], name: str, purity: FunctionPurity
+    ) -> None:
+        text = self.analysis.lines.segment(calls[0]) or name
+        extra = len(calls) - 1
+        self.add_issue(
+            f"Pure function '{name}' is called {len(calls)} times with the same "
+            f"constant arguments as '{text}'",
+            calls[1],
+            suggested_fix=Fix(
+                description=(
+                    f"Compute '{text}' once and reuse the result, or memoize "
+                    f"'{name}' with @functools.lru_cache"
+                ),
+                confidence=0.8,
+                instructions=purity_statement(name, purity),
+            ),
+            impact=Impact(
+                performance=-min(0.3, 0.05 * extra), carbon_impact=1.0 * extra
+            ),
+        )
+
+
+# re functions taking a pattern first, with the position of their flags
+REGEX_FUNCTIONS = {
+    "re.compile": 1,
+    "re.match": 2,
+    "re.search": 2,
+    "re.fullmatch": 2,
+    "re.findall": 2,
+    "re.finditer": 2,
+    "re.split": 3,
+    "re.sub": 4,
+    "re.subn": 4,
+}
+
+_VERBOSE_FLAGS = ("re.X", "re.VERBOSE")
+
+
+def _regex_call(
+    rule: ASTVisitorRule, node: ast.Call
+) -> Optional[Tuple[str, ast.AST, Union[str, bytes], int]]:
+    """
+    Recognize a call of an re function with a constant pattern.
+
+    Returns:
+        The qualified function name, the pattern node, the pattern and
+        the flags that change how it parses, or None
+    """
+    qualified = rule.semantic.qualified_name(node.func)
+    if qualified not in REGEX_FUNCTIONS or not node.args:
+        return None
+    pattern_node = node.args[0]
+    pattern = _constant_value(rule, pattern_node)
+    if not isinstance(pattern, (str, bytes)):
+        return None
+    flags_index = REGEX_FUNCTIONS[qualified]
+    flags_node = next(
+        (k.value for k in node.keywords if k.arg == "flags"),
+        node.args[flags_index] if len(node.args) > flags_index else None,
+    )
+    flags = 0
+    if flags_node is not None and any(
+        rule.semantic.qualified_name(part) in _VERBOSE_FLAGS
+        for part in ast.walk(flags_node)
+    ):
+        flags = re.VERBOSE
+    return qualified, pattern_node, pattern, flags
+
+
+def _constant_value(rule: ASTVisitorRule, node: ast.AST) -> object:
+    """Return the value of a literal or of a name assigned one literal."""
+    value: Optional[ast.AST] = node
+    if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+        bindings = rule.semantic.resolve(node)
+        if len(bindings) != 1 or bindings[0].kind is not BindingKind.ASSIGNMENT:
+            return None
+        value = bindings[0].value
+    return value.value if isinstance(value, ast.Constant) else None
+
+
+class RegexInLoopRule(LoopAwareRule):
+    """
+    Detect re module functions called with a constant pattern in a loop.
+
+    ``re.search(pattern, text)`` compiles its pattern through a bounded
+    cache: every call hashes the pattern and flags to find it, and once
+    more distinct patterns are in use than the cache holds they are
+    compiled again. A pattern compiled once at module level skips both.
+    ``re.compile`` itself in a loop is left to loop_invariant_computation.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            rule_id="regex_in_loop",
+            name="Regex Compiled in Loop",
+            description="re function with a constant pattern is called in a loop",
+            category="green",
+            severity="info",
+        )
+
+    def visit_Call(self, node: ast.Call) -> None:
+        """Check re calls made inside loops."""
+        if self.loop_depth:
+            found = _regex_call(self, node)
+            if found is not None and found[0] != "re.compile":
+                self._report(node, found[0], found[1])
+        self.generic_visit(node)
+
+    def _report(self, node: ast.Call, qualified: str, pattern: ast.AST) -> None:
+        method = qualified.split(".")[-1]
+        source = self.analysis.lines.segment(pattern) or "pattern"
+        self.add_issue(
+            f"{qualified}() with a constant pattern is called on every loop "
+            "iteration; each call looks the pattern up in re's cache and "
+            "recompiles it once the cache is full",
+            node,
+            suggested_fix=Fix(
+                description=(
+                    f"Compile the pattern once at module level and call its "
+                    f".{method}() method"
+                ),
+                replacement_code=(
+                    f"_PATTERN = re.compile({source})  # at module level\n"
+                    f"# ... _PATTERN.{method}(...)"
+                ),
+                confidence=0.9,
+            ),
+            impact=_loop_impact(self.loop_depth, 0.05, 1.0),
+        )
+
+
+class RegexBacktrackingRule(ASTVisitorRule):
+    """
+    Detect constant regular expressions that can backtrack catastrophically.
+
+    Patterns passed to re functions are parsed and checked for nested
+    quantifiers and overlapping alternations (see
+    ``green.regex_patterns``). On a non-matching input such a pattern can
+    take time exponential in the input length, pinning a CPU core and
+    making the code open to regular expression denial of service.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            rule_id="regex_backtracking",
+            name="Catastrophic Regex Backtracking",
+            description="Regular expression can backtrack catastrophically",
+            category="green",
+            severity="warning",
+        )
+
+    def visit_Call(self, node: ast.Call) -> None:
+        """Check the pattern of re calls."""
+        found = _regex_call(self, node)
+        if found is not None:
+            _, pattern_node, pattern, flags = found
+            problem = backtracking_problem(pattern, flags)
+            if problem is not None:
+                source = self.analysis.lines.segment(pattern_node) or repr(pattern)
+                self.add_issue(
+                    f"Regular expression {source} can backtrack catastrophically: "
+                    f"{problem}",
+                    pattern_node,
+                    suggested_fix=Fix(
+                        description=(
+                            "Make every part of the input matchable in only one "
+                            "way: drop the inner quantifier, make the alternatives "
+                            "disjoint, or use an atomic group or possessive "
+                            "quantifier (Python 3.11+)"
+                        ),
+                        confidence=0.7,
+                    ),
+                    impact=Impact(
+                        performance=-0.5, security_risk=0.5, carbon_impact=5.0
+                    ),
+                )
+        self.generic_visit(node)
+
+
+@dataclass
+class _BlockingState:
+    """Blocking module functions, found on the first coroutine of a file."""
+
+    functions: Optional[Dict[str, BlockingPath]] = None
+
+
+class AsyncBlockingCallRule(ASTVisitorRule):
+    """
+    Detect blocking calls inside ``async def`` functions.
+
+    ``time.sleep``, synchronous HTTP clients, file and process I/O and
+    CPU-heavy functions hold the event loop thread, so every other task
+    waits for them. Synchronous helpers of the same module are followed
+    through the call graph: a coroutine calling ``load()`` that calls
+    ``requests.get`` is reported at the call of ``load()``. Calls inside
+    nested functions and lambdas, typically handed to an executor, are not
+    reported.
+    """
+
+    def __init__(self, calls: Optional[Sequence[BlockingCall]] = None) -> None:
+        super().__init__(
+            rule_id="blocking_call_in_async",
+            name="Blocking Call in Async Function",
+            description="Synchronous blocking call inside an async function",
+            category="green",
+            severity="warning",
+        )
+        self.calls = list(DEFAULT_BLOCKING_CALLS if calls is None else calls)
+
+    def create_state(self) -> _BlockingState:
+        """The call graph is analyzed lazily, once per file."""
+        return _BlockingState()
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        """Check the calls made by a coroutine."""
+        if self.state.functions is None:
+            self.state.functions = blocking_functions(self.semantic, self.calls)
+        for child in iter_region(list(node.body)):
+            if not isinstance(child, ast.Call):
+                continue
+            blocking = match_blocking_call(self.semantic, child, self.calls)
+            if blocking is not None:
+                self._report_call(child, node, blocking)
+                continue
+            helper = called_function(self.semantic, child)
+            if helper in self.state.functions:
+                self._report_helper(child, node, self.state.functions[helper])
+        self.generic_visit(node)
+
+    def _report_call(
+        self, node: ast.Call, function: ast.AsyncFunctionDef, blocking: BlockingCall
+    ) -> None:
+        self.add_issue(
+            f"Blocking {blocking.kind} call {blocking.name}() inside async "
+            f"function '{function.name}' stalls the event loop",
+            node,
+            suggested_fix=Fix(
+                description=f"Use {blocking.alternative}",
+                confidence=0.9,
+            ),
+            impact=Impact(performance=-0.4, carbon_impact=2.0),
+        )
+
+    def _report_helper(
+        self, node: ast.Call, function: ast.AsyncFunctionDef, path: BlockingPath
+    ) -> None:
+        helper = path.via[0]
+        chain = " -> ".join(path.via)
+        blocking = path.blocking
+        self.add_issue(
+            f"'{helper}()' called inside async function '{function.name}' "
+            f"blocks the event loop: {chain} calls {blocking.name}() at line "
+            f"{path.call.lineno}",
+            node,
+            suggested_fix=Fix(
+                description=(
+                    f"Run it in a thread with await asyncio.to_thread({helper}, "
+                    f"...), or make it async using {blocking.alternative}"
+                ),
+                replacement_code=f"await asyncio.to_thread({helper}, ...)",
+                confidence=0.8,
+            ),
+            impact=Impact(performance=-0.4, carbon_impact=2.0),
+        )
+
+
 class GreenAnalyzer(BaseAnalyzer):
     """
     Green software analyzer for Python code.
@@ -263,6 +1741,15 @@ class GreenAnalyzer(BaseAnalyzer):
     - List comprehension optimization
     - Generator vs list usage
     - Memory-efficient patterns
+    - Quadratic membership tests in loops
+    - Loop-invariant computations
+    - pandas and NumPy code that bypasses vectorization
+    - N+1 queries and other I/O repeated in loops
+    - Quadratic accumulation into sequences
+    - Resources that are leaked or reopened in loops
+    - Pure functions recomputed with the same arguments
+    - Regular expressions compiled in loops or prone to catastrophic backtracking
+    - Blocking calls inside async functions
     """
 
     def __init__(self) -> None:
@@ -271,12 +1758,8 @@ class GreenAnalyzer(BaseAnalyzer):
             description="Analyzes environmental sustainability and efficiency",
         )
 
-        # Register green software rules
-        self.register_rule(StringConcatenationRule())
-        self.register_rule(ListComprehensionRule())
-        self.register_rule(GeneratorExpressionRule())
-        self.register_rule(FileHandlingRule())
-        self.register_rule(IneffientLoopRule())
+        # Rules are loaded from the registry when first used
+        self.load_rules("green")
 
     def analyze(self, tree: ast.AST, source_code: str, file_path: str) -> List[Issue]:
         """
@@ -290,19 +1773,4 @@ class GreenAnalyzer(BaseAnalyzer):
         Returns:
             List of green software issues
         """
-        all_issues = []
-
-        for rule in self.rules.values():
-            if rule.enabled:
-                if isinstance(rule, ASTVisitorRule):
-                    # Use visitor pattern for traversal rules
-                    rule.reset(file_path, source_code)
-                    rule.visit(tree)
-                    rule.finalize()
-                    all_issues.extend(rule.issues)
-                else:
-                    # Use direct checking for other rules
-                    issues = rule.check(tree, source_code, file_path)
-                    all_issues.extend(issues)
-
-        return all_issues
+        return self.run_rules(tree, source_code, file_path)
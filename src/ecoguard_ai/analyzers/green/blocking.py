@@ -0,0 +1,173 @@
+"""
+Calls that block the event loop, and the functions that make them.
+
+An ``async def`` runs on the event loop thread: while a synchronous call
+inside it sleeps, waits for the network or disk, or burns CPU, no other
+task runs. Blocking calls are recognized by the qualified name of the
+callee, following imports. ``blocking_functions`` then follows the
+module's call graph so that a coroutine calling a synchronous helper that
+blocks, however deep, is found as well.
+"""
+
+import ast
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ecoguard_ai.analyzers.green.dataflow import iter_region
+from ecoguard_ai.analyzers.green.purity import called_function, module_functions
+from ecoguard_ai.analyzers.semantic import SemanticModel
+
+
+@dataclass(frozen=True)
+class BlockingCall:
+    """A synchronous call that blocks, and what to use in async code."""
+
+    name: str
+    # sleep, http, file, process, database, socket, console or cpu
+    kind: str
+    alternative: str
+
+
+@dataclass(frozen=True)
+class BlockingPath:
+    """How a function of the module ends up making a blocking call."""
+
+    # Functions from the one called down to the one making the call
+    via: Tuple[str, ...]
+    call: ast.Call
+    blocking: BlockingCall
+
+
+def _calls(kind: str, names: Sequence[str], alternative: str) -> List[BlockingCall]:
+    """Create one entry per qualified name for a kind of blocking call."""
+    return [BlockingCall(name, kind, alternative) for name in names]
+
+
+_TO_THREAD = "await asyncio.to_thread(...)"
+
+DEFAULT_BLOCKING_CALLS: List[BlockingCall] = [
+    BlockingCall("time.sleep", "sleep", "await asyncio.sleep(...)"),
+    *_calls(
+        "http",
+        [
+            "requests.get",
+            "requests.post",
+            "requests.put",
+            "requests.patch",
+            "requests.delete",
+            "requests.head",
+            "requests.request",
+            "httpx.get",
+            "httpx.post",
+            "urllib.request.urlopen",
+        ],
+        "an async client such as httpx.AsyncClient or aiohttp",
+    ),
+    *_calls(
+        "file",
+        ["open", "io.open", "shutil.copy", "shutil.copyfile", "shutil.copytree"],
+        f"aiofiles, or {_TO_THREAD}",
+    ),
+    *_calls(
+        "process",
+        [
+            "subprocess.run",
+            "subprocess.call",
+            "subprocess.check_call",
+            "subprocess.check_output",
+            "os.system",
+        ],
+        "asyncio.create_subprocess_exec(...)",
+    ),
+    *_calls(
+        "database",
+        ["sqlite3.connect", "psycopg2.connect", "pymysql.connect"],
+        "an async driver such as aiosqlite or asyncpg",
+    ),
+    BlockingCall(
+        "socket.create_connection", "socket", "await asyncio.open_connection(...)"
+    ),
+    BlockingCall("input", "console", "await asyncio.to_thread(input, ...)"),
+    *_calls(
+        "cpu",
+        [
+            "hashlib.pbkdf2_hmac",
+            "hashlib.scrypt",
+            "bcrypt.hashpw",
+            "bcrypt.checkpw",
+            "zlib.compress",
+            "zlib.decompress",
+            "gzip.compress",
+            "bz2.compress",
+            "lzma.compress",
+        ],
+        f"{_TO_THREAD}, or loop.run_in_executor() with a ProcessPoolExecutor",
+    ),
+]
+
+
+def match_blocking_call(
+    model: SemanticModel, node: ast.Call, calls: Sequence[BlockingCall]
+) -> Optional[BlockingCall]:
+    """
+    Find the blocking call a call matches.
+
+    Args:
+        model: Semantic model of the tree the call belongs to
+        node: The call
+        calls: Blocking calls to try
+
+    Returns:
+        The matching entry, or None
+    """
+    qualified = model.qualified_name(node.func)
+    if qualified is None:
+        return None
+    return next((call for call in calls if call.name == qualified), None)
+
+
+def blocking_functions(
+    model: SemanticModel, calls: Sequence[BlockingCall]
+) -> Dict[str, BlockingPath]:
+    """
+    Find the synchronous module-level functions that block.
+
+    Calls inside nested functions and lambdas are not counted: they only
+    block when the nested function is called, typically by an executor.
+
+    Args:
+        model: Semantic model of the module
+        calls: Blocking calls to look for
+
+    Returns:
+        For every function that blocks, directly or through other functions
+        of the module, a path to a blocking call
+    """
+    callees: Dict[str, List[str]] = {}
+    paths: Dict[str, BlockingPath] = {}
+    for name, function in module_functions(model).items():
+        callees[name] = []
+        for node in iter_region(list(function.body)):
+            if not isinstance(node, ast.Call):
+                continue
+            blocking = match_blocking_call(model, node, calls)
+            if blocking is not None:
+                paths[name] = BlockingPath((name,), node, blocking)
+                break
+            callee = called_function(model, node)
+            if callee is not None:
+                callees[name].append(callee)
+
+    changed = True
+    while changed:
+        changed = False
+        for name, called in callees.items():
+            if name in paths:
+                continue
+            reached = next((paths[c] for c in called if c in paths), None)
+            if reached is not None:
+                paths[name] = BlockingPath(
+                    (name, *reached.via), reached.call, reached.blocking
+                )
+                changed = True
+    return paths
@@ -0,0 +1,295 @@
+"""
+Per-loop def-use analysis for the green software rules.
+
+An expression inside a loop can be computed once, before the loop, when
+nothing it reads changes between iterations. ``loop_effects`` collects what
+a loop changes: the names it (re)binds, the objects it may mutate
+(attribute and item stores, receivers of methods and arguments of
+functions not known to be pure) and whether it calls such functions at
+all. A mutated object is tracked by the name it is reached from, so names
+the enclosing scope binds to one another (``y = x``, ``y = x.items``) are
+mutated together. ``is_invariant`` then tells whether an expression reads only things
+the loop leaves alone.
+
+Like the rest of the green package this is deliberately conservative:
+anything that might change is treated as changing.
+"""
+
+import ast
+import sys
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from ecoguard_ai.analyzers.semantic import SemanticModel
+
+# Functions without side effects whose result depends only on the arguments
+PURE_FUNCTIONS = frozenset(
+    {
+        "abs",
+        "all",
+        "any",
+        "bool",
+        "chr",
+        "divmod",
+        "float",
+        "frozenset",
+        "hash",
+        "int",
+        "len",
+        "max",
+        "min",
+        "ord",
+        "pow",
+        "repr",
+        "round",
+        "sorted",
+        "str",
+        "sum",
+        "tuple",
+        "re.compile",
+        "re.escape",
+        "os.path.join",
+        "os.path.basename",
+        "os.path.dirname",
+        "os.path.splitext",
+    }
+)
+
+# Modules whose functions are all pure
+PURE_MODULES = ("math.",)
+
+# Methods that change the object they are called on
+MUTATING_METHODS = frozenset(
+    {
+        "append",
+        "appendleft",
+        "extend",
+        "extendleft",
+        "insert",
+        "pop",
+        "popleft",
+        "popitem",
+        "remove",
+        "discard",
+        "add",
+        "clear",
+        "update",
+        "setdefault",
+        "sort",
+        "reverse",
+        "rotate",
+        "write",
+        "send",
+    }
+)
+
+_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)
+_LOOPS = (ast.For, ast.AsyncFor, ast.While)
+
+# Expressions that are invariant when all of their parts are
+_COMPOSITE: Tuple[type, ...] = (
+    ast.Attribute,
+    ast.Subscript,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.BoolOp,
+    ast.Compare,
+    ast.Tuple,
+    ast.Starred,
+    ast.Slice,
+)
+if sys.version_info < (3, 9):
+    _COMPOSITE += (ast.Index,)
+_OPERATORS = (ast.expr_context, ast.operator, ast.unaryop, ast.boolop, ast.cmpop)
+
+
+@dataclass
+class LoopEffects:
+    """What one loop changes from one iteration to the next."""
+
+    assigned: Set[str] = field(default_factory=set)
+    mutated: Set[str] = field(default_factory=set)
+    impure_calls: int = 0
+
+    def changes(self, name: str) -> bool:
+        """Whether the loop rebinds or mutates a name."""
+        return name in self.assigned or name in self.mutated
+
+
+def loop_region(loop: ast.AST) -> List[ast.AST]:
+    """
+    Return the parts of a loop that run on every iteration.
+
+    Args:
+        loop: A For, AsyncFor or While node
+
+    Returns:
+        The target and body of a for loop, the test and body of a while loop
+    """
+    if isinstance(loop, ast.While):
+        return [loop.test, *loop.body]
+    return [getattr(loop, "target"), *getattr(loop, "body")]
+
+
+def iter_region(nodes: List[ast.AST]) -> Iterator[ast.AST]:
+    """
+    Walk nodes without entering nested functions, lambdas or classes.
+
+    The nested definitions themselves are yielded; their bodies do not run
+    when the definition does.
+    """
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        yield node
+        if isinstance(node, _SCOPES):
+            continue
+        stack.extend(reversed(list(ast.iter_child_nodes(node))))
+
+
+def root_name(node: ast.AST) -> Optional[str]:
+    """Return the name an attribute or subscript chain starts from."""
+    while isinstance(node, (ast.Attribute, ast.Subscript, ast.Call)):
+        node = node.func if isinstance(node, ast.Call) else node.value
+    return node.id if isinstance(node, ast.Name) else None
+
+
+def is_pure_call(model: SemanticModel, node: ast.Call) -> bool:
+    """Whether a call is to a function known to have no side effects."""
+    qualified = model.qualified_name(node.func)
+    if qualified is None:
+        return False
+    return qualified in PURE_FUNCTIONS or qualified.startswith(PURE_MODULES)
+
+
+def loop_effects(
+    model: SemanticModel,
+    loop: ast.AST,
+    is_pure: Optional[Callable[[ast.Call], bool]] = None,
+) -> LoopEffects:
+    """
+    Collect the names a loop rebinds or mutates.
+
+    Args:
+        model: Semantic model of the tree the loop belongs to
+        loop: A For, AsyncFor or While node
+        is_pure: Tells about calls known to be pure beyond ``is_pure_call``,
+            such as functions of the module inferred to be pure
+
+    Returns:
+        The loop's effects
+    """
+    effects = LoopEffects()
+    for node in iter_region(loop_region(loop)):
+        if isinstance(node, ast.Call):
+            if not (
+                is_pure_call(model, node) or (is_pure is not None and is_pure(node))
+            ):
+                _record_impure_call(node, effects)
+        else:
+            _record_binding(node, effects)
+    if effects.mutated:
+        effects.mutated = _with_aliases(model, loop, effects.mutated)
+    return effects
+
+
+def _record_binding(node: ast.AST, effects: LoopEffects) -> None:
+    """Record the names a statement or expression rebinds or stores into."""
+    if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+        effects.assigned.add(node.id)
+    elif isinstance(node, (ast.Attribute, ast.Subscript)):
+        if not isinstance(node.ctx, ast.Load):
+            _add(effects.mutated, root_name(node))
+    elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        effects.assigned.add(node.name)
+    elif isinstance(node, (ast.Import, ast.ImportFrom)):
+        for alias in node.names:
+            effects.assigned.add((alias.asname or alias.name).split(".")[0])
+
+
+def _record_impure_call(node: ast.Call, effects: LoopEffects) -> None:
+    """Record a call that may change its receiver and its arguments."""
+    effects.impure_calls += 1
+    if isinstance(node.func, ast.Attribute):
+        # Any method not known to be pure may change the object it is called on
+        _add(effects.mutated, root_name(node.func.value))
+    # The callee may change whatever it is given
+    for argument in [*node.args, *(k.value for k in node.keywords)]:
+        _add(effects.mutated, root_name(argument))
+
+
+def _with_aliases(model: SemanticModel, loop: ast.AST, names: Set[str]) -> Set[str]:
+    """Add the names that may refer to the same objects as ``names``."""
+    links: Dict[str, Set[str]] = {}
+    for name, bindings in model.enclosing_scope(loop).bindings.items():
+        for binding in bindings:
+            if not isinstance(binding.value, (ast.Name, ast.Attribute, ast.Subscript)):
+                continue
+            other = root_name(binding.value)
+            if other is not None and other != name:
+                links.setdefault(name, set()).add(other)
+                links.setdefault(other, set()).add(name)
+    found = set(names)
+    stack = list(names)
+    while stack:
+        for other in links.get(stack.pop(), ()):
+            if other not in found:
+                found.add(other)
+                stack.append(other)
+    return found
+
+
+def _add(names: Set[str], name: Optional[str]) -> None:
+    if name is not None:
+        names.add(name)
+
+
+def is_invariant(model: SemanticModel, node: ast.AST, effects: LoopEffects) -> bool:
+    """
+    Tell whether an expression gives the same value on every iteration.
+
+    Args:
+        model: Semantic model of the tree the expression belongs to
+        node: Expression inside the loop
+        effects: Effects of the loop, from ``loop_effects``
+
+    Returns:
+        True if the expression reads nothing the loop changes
+    """
+    if isinstance(node, ast.Constant):
+        return True
+    if isinstance(node, ast.Name):
+        return isinstance(node.ctx, ast.Load) and not effects.changes(node.id)
+    if isinstance(node, ast.Call):
+        if not is_pure_call(model, node):
+            return False
+        arguments = [*node.args, *(k.value for k in node.keywords)]
+        return all(is_invariant(model, a, effects) for a in arguments)
+    if isinstance(node, _COMPOSITE):
+        return all(
+            is_invariant(model, child, effects)
+            for child in ast.iter_child_nodes(node)
+            if not isinstance(child, _OPERATORS)
+        )
+    return False
+
+
+def loops_between(model: SemanticModel, node: ast.AST, loop: ast.AST) -> int:
+    """
+    Count the loops from ``loop`` down to a node inside it, ``loop`` included.
+
+    Args:
+        model: Semantic model of the tree the nodes belong to
+        node: A node inside ``loop``
+        loop: A For, AsyncFor or While node
+
+    Returns:
+        How many loops repeat the node for one run of ``loop``
+    """
+    depth = 1
+    for ancestor in model.ancestors(node):
+        if ancestor is loop:
+            break
+        if isinstance(ancestor, _LOOPS):
+            depth += 1
+    return depth
@@ -0,0 +1,261 @@
+"""
+Lightweight type inference for the green software rules.
+
+Most green rules only matter for particular container types: a membership
+test is linear on a list but constant on a set, ``+=`` copies a string or a
+tuple but extends a list in place. This module infers the type of an
+expression from literals, constructor calls, annotations and, for names,
+every assignment the shared semantic model resolves them to.
+
+The inference is flow-insensitive and conservative: a name has a type only
+when all of its assignments agree, so unknown code is never mistaken for a
+known container. Types are plain strings: builtin type names such as
+``"list"`` and qualified names for library types such as
+``"pandas.DataFrame"``.
+"""
+
+import ast
+from typing import Dict, Optional, Set
+
+from ecoguard_ai.analyzers.semantic import Binding, BindingKind, SemanticModel
+
+# Types whose "+" builds a new object holding a copy of both operands
+SEQUENCE_TYPES = frozenset({"str", "bytes", "list", "tuple"})
+
+# Return types of calls, keyed by the qualified name of the callee
+CALL_TYPES: Dict[str, str] = {
+    "list": "list",
+    "sorted": "list",
+    "set": "set",
+    "frozenset": "frozenset",
+    "dict": "dict",
+    "tuple": "tuple",
+    "str": "str",
+    "repr": "str",
+    "chr": "str",
+    "bytes": "bytes",
+    "bytearray": "bytearray",
+    "int": "int",
+    "float": "float",
+    "len": "int",
+    "collections.deque": "collections.deque",
+    "collections.defaultdict": "dict",
+    "collections.OrderedDict": "dict",
+    "collections.Counter": "dict",
+    "pandas.DataFrame": "pandas.DataFrame",
+    "pandas.concat": "pandas.DataFrame",
+    "pandas.merge": "pandas.DataFrame",
+    "pandas.read_csv": "pandas.DataFrame",
+    "pandas.read_parquet": "pandas.DataFrame",
+    "pandas.read_json": "pandas.DataFrame",
+    "pandas.read_sql": "pandas.DataFrame",
+    "pandas.read_excel": "pandas.DataFrame",
+    "pandas.Series": "pandas.Series",
+    "numpy.array": "numpy.ndarray",
+    "numpy.asarray": "numpy.ndarray",
+    "numpy.zeros": "numpy.ndarray",
+    "numpy.ones": "numpy.ndarray",
+    "numpy.empty": "numpy.ndarray",
+    "numpy.full": "numpy.ndarray",
+    "numpy.arange": "numpy.ndarray",
+    "numpy.linspace": "numpy.ndarray",
+    "numpy.append": "numpy.ndarray",
+    "numpy.concatenate": "numpy.ndarray",
+    "numpy.vstack": "numpy.ndarray",
+    "numpy.hstack": "numpy.ndarray",
+}
+
+# Types of literals, displays and comprehensions, by node type
+LITERAL_TYPES: Dict[type, str] = {
+    ast.JoinedStr: "str",
+    ast.List: "list",
+    ast.ListComp: "list",
+    ast.Set: "set",
+    ast.SetComp: "set",
+    ast.Dict: "dict",
+    ast.DictComp: "dict",
+    ast.Tuple: "tuple",
+}
+
+# Types named by annotations, keyed by the last part of the annotation name
+ANNOTATION_TYPES: Dict[str, str] = {
+    "list": "list",
+    "List": "list",
+    "set": "set",
+    "Set": "set",
+    "frozenset": "frozenset",
+    "FrozenSet": "frozenset",
+    "dict": "dict",
+    "Dict": "dict",
+    "tuple": "tuple",
+    "Tuple": "tuple",
+    "str": "str",
+    "bytes": "bytes",
+    "int": "int",
+    "float": "float",
+    "DataFrame": "pandas.DataFrame",
+    "Series": "pandas.Series",
+    "ndarray": "numpy.ndarray",
+}
+
+# Methods returning a new object of a known type, per receiver type
+METHOD_TYPES: Dict[str, Dict[str, str]] = {
+    "str": {
+        "split": "list",
+        "rsplit": "list",
+        "splitlines": "list",
+        "encode": "bytes",
+        **{
+            name: "str"
+            for name in (
+                "format",
+                "strip",
+                "lstrip",
+                "rstrip",
+                "lower",
+                "upper",
+                "title",
+                "replace",
+                "zfill",
+                "center",
+                "ljust",
+                "rjust",
+            )
+        },
+    },
+    "bytes": {"decode": "str", "split": "list", "replace": "bytes"},
+    "list": {"copy": "list"},
+    "set": {"copy": "set", "union": "set", "intersection": "set"},
+    "dict": {"copy": "dict", "keys": "dict_keys", "values": "dict_values"},
+    "pandas.DataFrame": {
+        "copy": "pandas.DataFrame",
+        "append": "pandas.DataFrame",
+        "merge": "pandas.DataFrame",
+        "join": "pandas.DataFrame",
+        "reset_index": "pandas.DataFrame",
+    },
+    "numpy.ndarray": {"copy": "numpy.ndarray", "reshape": "numpy.ndarray"},
+}
+
+
+def infer_type(model: SemanticModel, node: Optional[ast.AST]) -> Optional[str]:
+    """
+    Infer the type of an expression.
+
+    Args:
+        model: Semantic model of the tree the expression belongs to
+        node: The expression
+
+    Returns:
+        The type name, or None if it cannot be told
+    """
+    return _Inference(model).infer(node)
+
+
+class _Inference:
+    """One inference query; remembers the bindings being inferred."""
+
+    def __init__(self, model: SemanticModel) -> None:
+        self.model = model
+        self.visiting: Set[int] = set()
+
+    def infer(self, node: Optional[ast.AST]) -> Optional[str]:
+        if node is None:
+            return None
+        literal = LITERAL_TYPES.get(type(node))
+        if literal is not None:
+            return literal
+        handler = getattr(self, f"_infer_{type(node).__name__}", None)
+        return None if handler is None else handler(node)
+
+    def _infer_Constant(self, node: ast.Constant) -> Optional[str]:
+        if node.value is None or isinstance(node.value, type(Ellipsis)):
+            return None
+        return type(node.value).__name__
+
+    def _infer_IfExp(self, node: ast.IfExp) -> Optional[str]:
+        body = self.infer(node.body)
+        return body if body == self.infer(node.orelse) else None
+
+    def _infer_Name(self, node: ast.Name) -> Optional[str]:
+        if isinstance(node.ctx, ast.Load):
+            bindings = self.model.resolve(node)
+        else:
+            # An assignment target: every binding of the name in its scope
+            scope = self.model.enclosing_scope(node)
+            bindings = scope.lookup(node.id)
+        found: Optional[str] = None
+        for binding in bindings:
+            statement = binding.statement
+            # "x += ..." keeps the type of every container it applies to
+            if (
+                isinstance(statement, ast.AugAssign)
+                and binding.node is statement.target
+            ):
+                continue
+            # A self-referencing assignment such as "s = s + x" adds nothing
+            if id(binding) in self.visiting:
+                continue
+            self.visiting.add(id(binding))
+            try:
+                inferred = self._infer_binding(binding)
+            finally:
+                self.visiting.discard(id(binding))
+            if inferred is None or (found is not None and inferred != found):
+                return None
+            found = inferred
+        return found
+
+    def _infer_binding(self, binding: Binding) -> Optional[str]:
+        if binding.kind is BindingKind.PARAMETER:
+            return self.annotation_type(getattr(binding.node, "annotation", None))
+        if binding.kind is not BindingKind.ASSIGNMENT:
+            return None
+        statement = binding.statement
+        if isinstance(statement, ast.AnnAssign) and binding.node is statement.target:
+            annotated = self.annotation_type(statement.annotation)
+            if annotated is not None:
+                return annotated
+        return self.infer(binding.value)
+
+    def annotation_type(self, annotation: Optional[ast.AST]) -> Optional[str]:
+        if isinstance(annotation, ast.Subscript):
+            annotation = annotation.value
+        if isinstance(annotation, ast.Name):
+            name = annotation.id
+        elif isinstance(annotation, ast.Attribute):
+            name = annotation.attr
+        else:
+            return None
+        return ANNOTATION_TYPES.get(name)
+
+    def _infer_BinOp(self, node: ast.BinOp) -> Optional[str]:
+        left = self.infer(node.left)
+        if isinstance(node.op, ast.Add):
+            right = left if left in SEQUENCE_TYPES else self.infer(node.right)
+            if left == right or (left is None and right in SEQUENCE_TYPES):
+                return right
+            if {left, right} <= {"int", "float"}:
+                return "float"
+            return None
+        if isinstance(node.op, ast.Mult):
+            if left in SEQUENCE_TYPES:
+                return left
+            right = self.infer(node.right)
+            return right if right in SEQUENCE_TYPES else None
+        if isinstance(node.op, ast.Mod) and left == "str":
+            return "str"
+        return None
+
+    def _infer_Call(self, node: ast.Call) -> Optional[str]:
+        func = node.func
+        qualified = self.model.qualified_name(func)
+        if qualified in CALL_TYPES:
+            return CALL_TYPES[qualified]
+        if isinstance(func, ast.Attribute):
+            if func.attr == "join" and isinstance(func.value, ast.Constant):
+                return type(func.value.value).__name__
+            receiver = self.infer(func.value)
+            if receiver is not None:
+                return METHOD_TYPES.get(receiver, {}).get(func.attr)
+        return None
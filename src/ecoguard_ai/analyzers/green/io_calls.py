@@ -0,0 +1,163 @@
+"""
+Call signatures of database, network, file and process I/O.
+
+A signature recognizes a call either by the qualified name of the callee,
+following imports (``requests.get`` also matches ``http.get`` after
+``import requests as http``), or, when its pattern starts with a dot, by
+the end of the call's dotted name (``.objects.get`` matches Django's
+``User.objects.get``, while ``.cursor.execute`` also matches a plain
+``cursor.execute``). ORM and client idioms are attribute chains on
+objects the analysis cannot type, so suffixes are the practical way to
+recognize them; receivers inferred to be pandas objects never match one.
+"""
+
+import ast
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence
+
+from ecoguard_ai.analyzers.green.inference import infer_type
+from ecoguard_ai.analyzers.semantic import SemanticModel
+
+
+@dataclass(frozen=True)
+class IOCallSignature:
+    """A call that performs I/O, and its batched alternative."""
+
+    pattern: str
+    # database, http, file or process
+    kind: str
+    # Bulk or batched API to use instead, if there is one
+    bulk: Optional[str] = None
+    # Network or disk round trips made by one call
+    round_trips: int = 1
+
+
+def _signatures(
+    kind: str, patterns: Sequence[str], **kwargs: Any
+) -> List[IOCallSignature]:
+    """Create one signature per pattern for a kind of I/O."""
+    return [IOCallSignature(pattern, kind, **kwargs) for pattern in patterns]
+
+
+DEFAULT_IO_SIGNATURES: List[IOCallSignature] = [
+    # Django ORM
+    IOCallSignature(
+        ".objects.get",
+        "database",
+        "Model.objects.in_bulk(ids) or filter(pk__in=ids) before the loop",
+    ),
+    *_signatures(
+        "database",
+        [".objects.filter", ".objects.exclude", ".objects.all"],
+        bulk="one query with field__in=..., or select_related/prefetch_related",
+    ),
+    IOCallSignature(
+        ".objects.create", "database", "Model.objects.bulk_create(objects)"
+    ),
+    IOCallSignature(
+        ".objects.update_or_create",
+        "database",
+        "Model.objects.bulk_update(objects, fields)",
+    ),
+    # DB-API cursors and connections, and SQLAlchemy sessions. A bare
+    # ".execute" or ".query" would also match e.g. pandas' DataFrame.query
+    *_signatures(
+        "database",
+        [".cursor.execute", ".cur.execute", ".conn.execute", ".connection.execute"],
+        bulk="cursor.executemany(sql, rows)",
+    ),
+    *_signatures(
+        "database",
+        [".session.execute", ".session.query"],
+        bulk="a single query with IN or a join",
+    ),
+    # HTTP clients; module-level calls open a new connection every time
+    *_signatures(
+        "http",
+        [
+            "requests.get",
+            "requests.post",
+            "requests.put",
+            "requests.patch",
+            "requests.delete",
+            "requests.request",
+            "httpx.get",
+            "httpx.post",
+            "urllib.request.urlopen",
+        ],
+        bulk="a batch endpoint, or at least one shared requests.Session",
+        round_trips=2,
+    ),
+    # Processes; files reopened in loops are left to file_handling_efficiency
+    *_signatures(
+        "process",
+        [
+            "subprocess.run",
+            "subprocess.call",
+            "subprocess.check_call",
+            "subprocess.check_output",
+            "subprocess.Popen",
+            "os.system",
+            "os.popen",
+        ],
+        bulk="one process invocation handling every item",
+    ),
+]
+
+
+def dotted_name(node: ast.AST) -> Optional[str]:
+    """
+    Return the dotted text of a Name or an attribute chain on a Name.
+
+    Args:
+        node: Expression, typically the function of a call
+
+    Returns:
+        E.g. "User.objects.get", or None for other expressions
+    """
+    attributes: List[str] = []
+    while isinstance(node, ast.Attribute):
+        attributes.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    return ".".join([node.id, *reversed(attributes)])
+
+
+def match_io_call(
+    model: SemanticModel, node: ast.Call, signatures: Sequence[IOCallSignature]
+) -> Optional[IOCallSignature]:
+    """
+    Find the signature an I/O call matches.
+
+    Args:
+        model: Semantic model of the tree the call belongs to
+        node: The call
+        signatures: Signatures to try, in order
+
+    Returns:
+        The first matching signature, or None
+    """
+    qualified = model.qualified_name(node.func)
+    dotted = None
+    for signature in signatures:
+        if not signature.pattern.startswith("."):
+            if qualified == signature.pattern:
+                return signature
+            continue
+        if dotted is None:
+            dotted = _suffix_text(model, node.func)
+        if dotted.endswith(signature.pattern):
+            return signature
+    return None
+
+
+def _suffix_text(model: SemanticModel, func: ast.AST) -> str:
+    """Return the dotted name suffix patterns are matched against."""
+    if isinstance(func, ast.Attribute):
+        receiver = infer_type(model, func.value) or ""
+        if receiver.startswith("pandas."):
+            # DataFrame.query and friends work in memory
+            return ""
+    # The leading dot lets ".cursor.execute" match "cursor.execute"
+    return "." + (dotted_name(func) or "")
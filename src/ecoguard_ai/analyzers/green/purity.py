@@ -0,0 +1,331 @@
+"""
+Purity inference over the functions of one module.
+
+A function is pure, for memoization purposes, when calling it twice with
+the same arguments gives the same result and changes nothing. Each
+module-level function is first checked on its own: it must not declare
+global or nonlocal names, yield or await, store into or call methods of
+anything but values it built itself (locals assigned a fresh literal,
+comprehension or constructor call, never an alias of a parameter or a
+global), and may otherwise only call read-only methods of builtin types
+and functions known to be pure; calls through imported modules count as
+impure unless they are listed in ``PURE_FUNCTIONS``. The
+calls it makes are then resolved through the module's call graph: a
+function stays pure only if every function it calls is a known pure
+builtin or another pure function of the module, which is computed as a
+fixpoint so mutual recursion is handled. Reads of module globals are
+assumed to be constant.
+
+A pure function may still return a new mutable object on every call, as
+``return [0] * n`` does. Caching or hoisting such a call would hand every
+caller the same object, so these functions are marked ``returns_mutable``,
+again through the call graph for functions returning another's result.
+"""
+
+import ast
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set
+
+from ecoguard_ai.analyzers.green.dataflow import (
+    MUTATING_METHODS,
+    is_pure_call,
+    iter_region,
+    root_name,
+)
+from ecoguard_ai.analyzers.green.inference import CALL_TYPES, infer_type
+from ecoguard_ai.analyzers.semantic import BindingKind, SemanticModel
+
+# Builtin types whose PURE_METHODS only read the receiver
+BUILTIN_TYPES = frozenset(
+    {"str", "bytes", "list", "tuple", "dict", "set", "frozenset", "int", "float"}
+)
+
+# Methods of builtin types that only read their receiver
+PURE_METHODS = frozenset(
+    {
+        "count",
+        "endswith",
+        "format",
+        "get",
+        "index",
+        "items",
+        "join",
+        "keys",
+        "lower",
+        "replace",
+        "split",
+        "startswith",
+        "strip",
+        "upper",
+        "values",
+    }
+)
+
+# Types whose instances can be changed in place
+MUTABLE_TYPES = frozenset(
+    {
+        "list",
+        "dict",
+        "set",
+        "bytearray",
+        "collections.deque",
+        "pandas.DataFrame",
+        "pandas.Series",
+        "numpy.ndarray",
+    }
+)
+
+# Decorators that already memoize a function
+CACHE_DECORATORS = ("functools.lru_cache", "functools.cache")
+
+
+@dataclass
+class FunctionPurity:
+    """What purity inference found out about one function."""
+
+    node: ast.FunctionDef
+    pure: bool = True
+    # Functions of the module it calls
+    callees: Set[str] = field(default_factory=set)
+    # Builtins and library functions it calls, all known to be pure
+    pure_calls: Set[str] = field(default_factory=set)
+    reason: Optional[str] = None
+    # Whether it can return a new mutable object rather than a shared one
+    returns_mutable: bool = False
+    # Functions of the module whose result it returns
+    returned_callees: Set[str] = field(default_factory=set)
+
+
+def module_functions(model: SemanticModel) -> Dict[str, ast.FunctionDef]:
+    """
+    Return the functions defined once at the top level of a module.
+
+    Args:
+        model: Semantic model of the module
+
+    Returns:
+        Function definitions by name
+    """
+    functions: Dict[str, ast.FunctionDef] = {}
+    for name, bindings in model.module_scope.bindings.items():
+        if len(bindings) == 1 and isinstance(bindings[0].node, ast.FunctionDef):
+            functions[name] = bindings[0].node
+    return functions
+
+
+def called_function(model: SemanticModel, call: ast.Call) -> Optional[str]:
+    """Return the module function a call resolves to, if any."""
+    if not isinstance(call.func, ast.Name):
+        return None
+    bindings = model.resolve(call.func)
+    if len(bindings) != 1 or bindings[0].kind is not BindingKind.FUNCTION:
+        return None
+    if bindings[0].scope is not model.module_scope:
+        return None
+    return call.func.id
+
+
+def is_cached(model: SemanticModel, node: ast.FunctionDef) -> bool:
+    """Whether a function is already decorated with a memoizing cache."""
+    for decorator in node.decorator_list:
+        if isinstance(decorator, ast.Call):
+            decorator = decorator.func
+        if model.qualified_name(decorator) in CACHE_DECORATORS:
+            return True
+    return False
+
+
+def infer_purity(model: SemanticModel) -> Dict[str, FunctionPurity]:
+    """
+    Infer which module-level functions are pure.
+
+    Args:
+        model: Semantic model of the module
+
+    Returns:
+        Purity of every module-level function, by name
+    """
+    functions = module_functions(model)
+    results = {
+        name: _check_function(model, node, functions)
+        for name, node in functions.items()
+    }
+    changed = True
+    while changed:
+        changed = False
+        for name, result in results.items():
+            if not result.pure:
+                continue
+            impure = sorted(c for c in result.callees if not results[c].pure)
+            if impure:
+                result.pure = False
+                result.reason = f"calls impure function '{impure[0]}'"
+                changed = True
+            if not result.returns_mutable and any(
+                results[c].returns_mutable for c in result.returned_callees
+            ):
+                result.returns_mutable = True
+                changed = True
+    return results
+
+
+def _check_function(
+    model: SemanticModel,
+    node: ast.FunctionDef,
+    functions: Dict[str, ast.FunctionDef],
+) -> FunctionPurity:
+    """Check the body of one function, recording the calls it makes."""
+    result = FunctionPurity(node)
+    local_names = _owned_locals(model, node)
+
+    def impure(reason: str) -> FunctionPurity:
+        result.pure = False
+        result.reason = reason
+        return result
+
+    _check_returns(model, node, result, functions)
+    if node.decorator_list and not is_cached(model, node):
+        return impure("has decorators that may change its behavior")
+    for child in iter_region(list(node.body)):
+        if isinstance(child, (ast.Global, ast.Nonlocal)):
+            return impure("declares global or nonlocal names")
+        if isinstance(child, (ast.Yield, ast.YieldFrom, ast.Await)):
+            return impure("is a generator or coroutine")
+        if isinstance(child, (ast.Attribute, ast.Subscript)) and not isinstance(
+            child.ctx, ast.Load
+        ):
+            if root_name(child) not in local_names:
+                return impure("stores into a parameter or global object")
+        if isinstance(child, ast.Call):
+            reason = _check_call(model, child, result, functions, local_names)
+            if reason is not None:
+                return impure(reason)
+    return result
+
+
+def _check_returns(
+    model: SemanticModel,
+    node: ast.FunctionDef,
+    result: FunctionPurity,
+    functions: Dict[str, ast.FunctionDef],
+) -> None:
+    """Record whether a function can return a new mutable object."""
+    for child in iter_region(list(node.body)):
+        if not isinstance(child, ast.Return) or child.value is None:
+            continue
+        if _is_mutable(model, child.value):
+            result.returns_mutable = True
+        elif isinstance(child.value, ast.Call):
+            callee = called_function(model, child.value)
+            if callee is not None and callee in functions:
+                result.returned_callees.add(callee)
+
+
+def _check_call(
+    model: SemanticModel,
+    call: ast.Call,
+    result: FunctionPurity,
+    functions: Dict[str, ast.FunctionDef],
+    local_names: Set[str],
+) -> Optional[str]:
+    """Record a call made by a function; return why it is impure, if it is."""
+    callee = called_function(model, call)
+    if callee is not None and callee in functions:
+        result.callees.add(callee)
+        return None
+    if is_pure_call(model, call):
+        result.pure_calls.add(model.qualified_name(call.func) or "")
+        return None
+    func = call.func
+    if isinstance(func, ast.Attribute) and model.qualified_name(func) is None:
+        if root_name(func.value) in local_names:
+            # Changing a value the function built itself is fine
+            return None
+        if (
+            func.attr in PURE_METHODS
+            and func.attr not in MUTATING_METHODS
+            and infer_type(model, func.value) in BUILTIN_TYPES
+        ):
+            return None
+    name = model.qualified_name(func)
+    if name is None:
+        name = (
+            f"method '{func.attr}'"
+            if isinstance(func, ast.Attribute)
+            else "an unknown function"
+        )
+    return f"calls {name}, which may have side effects"
+
+
+def _owned_locals(model: SemanticModel, node: ast.FunctionDef) -> Set[str]:
+    """
+    Return the local names only ever bound to values built by the function.
+
+    A local assigned a parameter, a global or anything read from them is
+    an alias: changing it changes what the caller sees.
+    """
+    scope = model.scope_of(node)
+    if scope is None:
+        return set()
+    # Global and nonlocal names are bound in outer scopes, not here
+    return {
+        name
+        for name, bindings in scope.bindings.items()
+        if all(_is_fresh(model, binding.value) for binding in bindings)
+        and all(binding.kind is BindingKind.ASSIGNMENT for binding in bindings)
+    }
+
+
+_FRESH_VALUES = (
+    ast.Constant,
+    ast.JoinedStr,
+    ast.List,
+    ast.Tuple,
+    ast.Set,
+    ast.Dict,
+    ast.ListComp,
+    ast.SetComp,
+    ast.DictComp,
+    ast.GeneratorExp,
+)
+
+
+def _is_fresh(model: SemanticModel, value: Optional[ast.AST]) -> bool:
+    """Whether an assigned value is a new object rather than an alias."""
+    if isinstance(value, _FRESH_VALUES):
+        return True
+    if isinstance(value, ast.Call):
+        return model.qualified_name(value.func) in CALL_TYPES
+    return False
+
+
+def _is_mutable(model: SemanticModel, value: ast.expr) -> bool:
+    """Whether a returned value can be a mutable object."""
+    if infer_type(model, value) in MUTABLE_TYPES:
+        return True
+    if isinstance(value, ast.IfExp):
+        return _is_mutable(model, value.body) or _is_mutable(model, value.orelse)
+    if isinstance(value, ast.Name):
+        # Any assignment of a mutable value, even if others disagree
+        return any(
+            binding.kind is BindingKind.ASSIGNMENT
+            and infer_type(model, binding.value) in MUTABLE_TYPES
+            for binding in model.resolve(value)
+        )
+    return False
+
+
+def purity_statement(name: str, purity: FunctionPurity) -> str:
+    """Explain, for a fix, why a function was inferred to be pure."""
+    calls = sorted((purity.callees - {name}) | purity.pure_calls)
+    called = (
+        f"only calls {', '.join(calls)}, all known to be pure"
+        if calls
+        else "calls no other functions"
+    )
+    return (
+        f"'{name}' was inferred to be pure: it declares no global or nonlocal "
+        "names, stores only into its own local variables, neither yields nor "
+        f"awaits, and {called}. Module globals it reads are assumed not to "
+        "change."
+    )
@@ -0,0 +1,252 @@
+"""
+Static checks of regular expressions for catastrophic backtracking.
+
+Patterns are parsed with the standard library's own regex parser, whose
+parse tree already merges common prefixes of alternatives and turns
+alternatives of single characters into character sets, so only the shapes
+that really make the backtracking engine try many ways of matching the
+same input are left to find:
+
+- nested quantifiers, such as ``(a+)+`` or ``(\\w+\\s?)*``, where a repeated
+  group can split one run of input into its iterations in exponentially
+  many ways;
+- overlapping alternations under a quantifier, such as ``(\\w+|\\d+)*`` or
+  ``(a|a)*``, where several alternatives can match the same text.
+
+Possessive quantifiers and atomic groups (Python 3.11+) never backtrack and
+are not reported.
+
+The parser is CPython's private ``re._parser`` (``sre_parse`` before 3.11),
+with its opcodes from ``re._constants``. Depending on these internals is
+deliberate: only the engine's own parser sees a pattern exactly as it is
+compiled. Their shape may change between Python versions, so every use of
+them stays in this module, and patterns that fail to parse are treated as
+safe.
+"""
+
+import re
+from typing import Any, FrozenSet, List, Optional, Tuple, Union
+
+try:  # Python 3.11+
+    from re import _constants as sre_constants  # type: ignore[attr-defined]
+    from re import _parser as sre_parse  # type: ignore[attr-defined]
+except ImportError:  # pragma: no cover
+    import sre_constants
+    import sre_parse
+
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+_UNBOUNDED = sre_constants.MAXREPEAT
+
+# Characters used to compare what alternatives can start with
+_PROBES: FrozenSet[str] = frozenset(chr(code) for code in range(256))
+
+_CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: str.isdecimal,
+    sre_constants.CATEGORY_SPACE: str.isspace,
+    sre_constants.CATEGORY_WORD: lambda c: c.isalnum() or c == "_",
+}
+_NEGATED_CATEGORIES = {
+    sre_constants.CATEGORY_NOT_DIGIT: sre_constants.CATEGORY_DIGIT,
+    sre_constants.CATEGORY_NOT_SPACE: sre_constants.CATEGORY_SPACE,
+    sre_constants.CATEGORY_NOT_WORD: sre_constants.CATEGORY_WORD,
+}
+
+# Parsed items are (opcode, argument) pairs
+Items = List[Tuple[Any, Any]]
+
+
+def backtracking_problem(pattern: Union[str, bytes], flags: int = 0) -> Optional[str]:
+    """
+    Look for shapes in a regex that backtrack catastrophically.
+
+    Args:
+        pattern: The regular expression, as text or bytes
+        flags: re flags it is compiled with; only VERBOSE changes parsing
+
+    Returns:
+        A description of the first problem found, or None for a safe or
+        invalid pattern
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, OverflowError, RecursionError):
+        return None
+    return _Checker(parsed.state).check(list(parsed))
+
+
+class _Checker:
+    """Walks one parsed pattern."""
+
+    def __init__(self, state: Any) -> None:
+        self.state = state
+
+    def check(self, items: Items) -> Optional[str]:
+        for op, av in items:
+            for body in self._children(op, av):
+                problem = None
+                if op in _REPEATS and av[1] == _UNBOUNDED:
+                    problem = self._repeated_body_problem(body)
+                problem = problem or self.check(body)
+                if problem:
+                    return problem
+        return None
+
+    @staticmethod
+    def _children(op: Any, av: Any) -> List[Items]:
+        """Return the subpatterns of an item that may backtrack."""
+        if op in _REPEATS:
+            return [list(av[2])]
+        if op is sre_constants.SUBPATTERN:
+            return [list(av[-1])]
+        if op is sre_constants.BRANCH:
+            return [list(alternative) for alternative in av[1]]
+        if op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            return [list(av[1])]
+        if op is sre_constants.GROUPREF_EXISTS:
+            return [list(b) for b in av[1:] if b is not None]
+        # Possessive repeats and atomic groups never backtrack
+        return []
+
+    def _repeated_body_problem(self, body: Items) -> Optional[str]:
+        if self._repeats_freely(body):
+            return (
+                "a quantified group contains an unbounded quantifier "
+                "(nested quantifiers such as (a+)+)"
+            )
+        if self._has_overlapping_branch(body):
+            return (
+                "a quantified group has alternatives that can match the same "
+                "text (overlapping alternation such as (a|a)*)"
+            )
+        return None
+
+    def _min_width(self, items: Items) -> int:
+        width: int = sre_parse.SubPattern(self.state, list(items)).getwidth()[0]
+        return width
+
+    def _repeats_freely(self, items: Items) -> bool:
+        """
+        Whether an unbounded repeat can take over a run of input alone.
+
+        It can when every other required part of the repeated body could
+        also be matched by it: nothing then marks where one iteration ends
+        and the next begins, as in ``(x+x+)+`` or ``(\\w+\\s?)*``, whereas the
+        comma in ``(\\d+,)*`` fixes every split.
+        """
+        for sequence in self._sequences(items):
+            for index, (op, av) in enumerate(sequence):
+                if op not in _REPEATS or av[1] != _UNBOUNDED:
+                    continue
+                chars = self._first_chars(list(av[2]))
+                if chars is None:
+                    continue
+                if all(
+                    self._min_width([other]) == 0
+                    or bool(chars & (self._first_chars([other]) or frozenset()))
+                    for other in sequence[:index] + sequence[index + 1 :]
+                ):
+                    return True
+        return False
+
+    def _sequences(self, items: Items, limit: int = 64) -> List[Items]:
+        """Flatten groups and expand alternatives into plain sequences."""
+        sequences: List[Items] = [[]]
+        for op, av in items:
+            if op is sre_constants.SUBPATTERN:
+                parts = self._sequences(list(av[-1]), limit)
+            elif op is sre_constants.BRANCH:
+                parts = [s for a in av[1] for s in self._sequences(list(a), limit)]
+            else:
+                parts = [[(op, av)]]
+            sequences = [s + p for s in sequences for p in parts][:limit]
+        return sequences
+
+    def _has_overlapping_branch(self, items: Items) -> bool:
+        for op, av in items:
+            if op is sre_constants.SUBPATTERN:
+                if self._has_overlapping_branch(list(av[-1])):
+                    return True
+            elif op is sre_constants.BRANCH:
+                alternatives = [list(a) for a in av[1]]
+                for index, first in enumerate(alternatives):
+                    for second in alternatives[index + 1 :]:
+                        if self._overlap(first, second):
+                            return True
+        return False
+
+    def _overlap(self, first: Items, second: Items) -> bool:
+        """Whether two alternatives can match the same text."""
+        if self._min_width(first) == 0 and self._min_width(second) == 0:
+            return True
+        starts = self._first_chars(first), self._first_chars(second)
+        if starts[0] is None or starts[1] is None:
+            return False
+        return bool(starts[0] & starts[1])
+
+    def _first_chars(self, items: Items) -> Optional[FrozenSet[str]]:
+        """Return the probe characters a sequence can start with."""
+        chars: FrozenSet[str] = frozenset()
+        for op, av in items:
+            start = self._item_first_chars(op, av)
+            if start is None:
+                return None
+            chars |= start
+            if self._min_width([(op, av)]) > 0:
+                break
+        return chars
+
+    def _item_first_chars(self, op: Any, av: Any) -> Optional[FrozenSet[str]]:
+        if op is sre_constants.LITERAL:
+            return frozenset({chr(av)})
+        if op is sre_constants.NOT_LITERAL:
+            return _PROBES - {chr(av)}
+        if op is sre_constants.ANY:
+            return _PROBES
+        if op is sre_constants.IN:
+            return _char_set(av)
+        if op in _REPEATS:
+            return self._first_chars(list(av[2]))
+        if op is sre_constants.SUBPATTERN:
+            return self._first_chars(list(av[-1]))
+        if op is sre_constants.BRANCH:
+            return self._branch_first_chars(av[1])
+        if op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            return frozenset()
+        return None
+
+    def _branch_first_chars(
+        self, alternatives: List[Items]
+    ) -> Optional[FrozenSet[str]]:
+        """Return the probe characters any of the alternatives can start with."""
+        chars: FrozenSet[str] = frozenset()
+        for alternative in alternatives:
+            start = self._first_chars(list(alternative))
+            if start is None:
+                return None
+            chars |= start
+        return chars
+
+
+def _char_set(members: Items) -> Optional[FrozenSet[str]]:
+    """Return the probe characters a character class matches."""
+    chars = set()
+    negated = False
+    for op, av in members:
+        if op is sre_constants.NEGATE:
+            negated = True
+        elif op is sre_constants.LITERAL:
+            chars.add(chr(av))
+        elif op is sre_constants.RANGE:
+            low, high = av
+            chars.update(c for c in _PROBES if low <= ord(c) <= high)
+        elif op is sre_constants.CATEGORY:
+            if av in _CATEGORIES:
+                chars.update(filter(_CATEGORIES[av], _PROBES))
+            elif av in _NEGATED_CATEGORIES:
+                test = _CATEGORIES[_NEGATED_CATEGORIES[av]]
+                chars.update(c for c in _PROBES if not test(c))
+            else:
+                return None
+        else:
+            return None
+    return _PROBES - chars if negated else frozenset(chars)
@@ -9,9 +9,15 @@ This module implements code quality analysis rules including:
 """
 
 import ast
-from typing import Dict, List, Set
+from typing import List
 
 from ecoguard_ai.analyzers.base import ASTVisitorRule, BaseAnalyzer
+from ecoguard_ai.analyzers.semantic import (
+    Binding,
+    BindingKind,
+    ScopeKind,
+    SemanticModel,
+)
 from ecoguard_ai.core.issue import Fix, Impact, Issue
 
 
@@ -26,57 +32,69 @@ class UnusedVariableRule(ASTVisitorRule):
             category="quality",
             severity="warning",
         )
-        self.scopes: List[Dict[str, ast.AST]] = []
-        self.used_names: List[Set[str]] = []
 
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
-        # Enter new scope
-        self.scopes.append({})
-        self.used_names.append(set())
-
-        # Add parameters to current scope
-        for arg in node.args.args:
-            self.scopes[-1][arg.arg] = arg
-
-        # Visit function body
-        for child in ast.iter_child_nodes(node):
-            self.visit(child)
-
-        # Check for unused variables in this scope
-        for var_name, var_node in self.scopes[-1].items():
-            if var_name not in self.used_names[-1] and not var_name.startswith("_"):
-                issue = self.create_issue(
-                    message=f"Variable '{var_name}' is defined but never used",
-                    node=var_node,
-                    file_path=self.current_file_path,
-                    suggested_fix=Fix(
-                        description=(
-                            f"Remove unused variable '{var_name}' or prefix with "
-                            "underscore if intentional"
-                        ),
-                        replacement_code=f"# Remove line or rename to _{var_name}",
-                    ),
-                    impact=Impact(maintainability=-0.5, performance=-0.1),
-                )
-                self.issues.append(issue)
-
-        # Exit scope
-        self.scopes.pop()
-        self.used_names.pop()
-
-    def visit_Assign(self, node: ast.Assign) -> None:
-        # Record variable assignments
-        if self.scopes:
-            for target in node.targets:
-                if isinstance(target, ast.Name):
-                    self.scopes[-1][target.id] = target
-        self.generic_visit(node)
+    def visit_Module(self, node: ast.Module) -> None:
+        """Check every function scope of the shared semantic model."""
+        model = self.semantic
+        for scope in model.scopes_of_kind(ScopeKind.FUNCTION):
+            for var_name, bindings in scope.bindings.items():
+                if var_name.startswith("_") or scope.is_referenced(var_name):
+                    continue
+                candidates = [b for b in bindings if self._is_variable(model, b)]
+                if candidates:
+                    self._report(var_name, candidates[-1].node)
+
+    def _is_variable(self, model: SemanticModel, binding: Binding) -> bool:
+        """Parameters and plain ``name = value`` assignments count as variables."""
+        if binding.kind is BindingKind.PARAMETER:
+            return self._is_checked_parameter(binding)
+        return binding.kind is BindingKind.ASSIGNMENT and isinstance(
+            model.parent(binding.node), ast.Assign
+        )
+
+    def _is_checked_parameter(self, binding: Binding) -> bool:
+        """Skip self/cls, *args/**kwargs and parameters of stub functions."""
+        function = binding.scope.node
+        args = getattr(function, "args", None)
+        if args is None or binding.node in (args.vararg, args.kwarg):
+            return False
+        positional = list(getattr(args, "posonlyargs", [])) + list(args.args)
+        parent = binding.scope.parent
+        if (
+            parent is not None
+            and parent.kind is ScopeKind.CLASS
+            and positional
+            and binding.node is positional[0]
+        ):
+            return False
+        return not _is_stub(function)
+
+    def _report(self, var_name: str, var_node: ast.AST) -> None:
+        issue = self.create_issue(
+            message=f"Variable '{var_name}' is defined but never used",
+            node=var_node,
+            file_path=self.current_file_path,
+            suggested_fix=Fix(
+                description=(
+                    f"Remove unused variable '{var_name}' or prefix with "
+                    "underscore if intentional"
+                ),
+                replacement_code=f"# Remove line or rename to _{var_name}",
+            ),
+            impact=Impact(maintainability=-0.5, performance=-0.1),
+        )
+        self.issues.append(issue)
 
-    def visit_Name(self, node: ast.Name) -> None:
-        # Record variable usage
-        if isinstance(node.ctx, ast.Load) and self.used_names:
-            self.used_names[-1].add(node.id)
-        self.generic_visit(node)
+
+def _is_stub(function: ast.AST) -> bool:
+    """Check if a function body is only a docstring, pass, ... or raise."""
+    for stmt in getattr(function, "body", []):
+        if isinstance(stmt, (ast.Pass, ast.Raise)):
+            continue
+        if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant):
+            continue
+        return False
+    return True
 
 
 class UnusedImportRule(ASTVisitorRule):
@@ -90,47 +108,25 @@ class UnusedImportRule(ASTVisitorRule):
             category="quality",
             severity="info",
         )
-        self.imported_names: Dict[str, ast.AST] = {}
-        self.used_names: Set[str] = set()
-
-    def visit_Import(self, node: ast.Import) -> None:
-        for alias in node.names:
-            name = alias.asname if alias.asname else alias.name
-            self.imported_names[name] = node
-        self.generic_visit(node)
-
-    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
-        for alias in node.names:
-            name = alias.asname if alias.asname else alias.name
-            self.imported_names[name] = node
-        self.generic_visit(node)
-
-    def visit_Name(self, node: ast.Name) -> None:
-        if isinstance(node.ctx, ast.Load):
-            self.used_names.add(node.id)
-        self.generic_visit(node)
-
-    def visit_Attribute(self, node: ast.Attribute) -> None:
-        # Handle module.attribute usage
-        if isinstance(node.value, ast.Name):
-            self.used_names.add(node.value.id)
-        self.generic_visit(node)
 
-    def finalize(self) -> None:
-        """Check for unused imports after visiting entire module."""
-        for name, import_node in self.imported_names.items():
-            if name not in self.used_names:
-                issue = self.create_issue(
-                    message=f"Import '{name}' is not used",
-                    node=import_node,
-                    file_path=self.current_file_path,
-                    suggested_fix=Fix(
-                        description=f"Remove unused import '{name}'",
-                        replacement_code="# Remove import line",
-                    ),
-                    impact=Impact(performance=-0.1, maintainability=-0.2),
-                )
-                self.issues.append(issue)
+    def visit_Module(self, node: ast.Module) -> None:
+        """Check for unused imports using the shared semantic model."""
+        for binding in self.semantic.imports():
+            if binding.used or (binding.qualified_name or "").startswith("__future__."):
+                continue
+            alias = binding.node
+            name = getattr(alias, "asname", None) or getattr(alias, "name", "")
+            issue = self.create_issue(
+                message=f"Import '{name}' is not used",
+                node=binding.statement or alias,
+                file_path=self.current_file_path,
+                suggested_fix=Fix(
+                    description=f"Remove unused import '{name}'",
+                    replacement_code="# Remove import line",
+                ),
+                impact=Impact(performance=-0.1, maintainability=-0.2),
+            )
+            self.issues.append(issue)
 
 
 class FunctionComplexityRule(ASTVisitorRule):
@@ -146,16 +142,17 @@ class FunctionComplexityRule(ASTVisitorRule):
         )
         self.max_complexity = max_complexity
 
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
-        complexity = self._calculate_complexity(node)
-
-        if complexity > self.max_complexity:
+    def visit_Module(self, node: ast.Module) -> None:
+        """Check every function using the shared complexity report."""
+        for metrics in self.analysis.complexity.functions:
+            if metrics.cyclomatic <= self.max_complexity:
+                continue
             issue = self.create_issue(
                 message=(
-                    f"Function '{node.name}' has complexity {complexity} "
-                    f"(max: {self.max_complexity})"
+                    f"Function '{metrics.name}' has complexity "
+                    f"{metrics.cyclomatic} (max: {self.max_complexity})"
                 ),
-                node=node,
+                node=metrics.node,
                 file_path=self.current_file_path,
                 suggested_fix=Fix(
                     description=(
@@ -167,34 +164,6 @@ class FunctionComplexityRule(ASTVisitorRule):
             )
             self.issues.append(issue)
 
-        self.generic_visit(node)
-
-    def _calculate_complexity(self, node: ast.FunctionDef) -> int:
-        """Calculate cyclomatic complexity for a function."""
-        complexity = 1  # Base complexity
-
-        for child in ast.walk(node):
-            # Decision points that increase complexity
-            if isinstance(
-                child,
-                (
-                    ast.If,
-                    ast.While,
-                    ast.For,
-                    ast.ListComp,
-                    ast.DictComp,
-                    ast.SetComp,
-                ),
-            ):
-                complexity += 1
-            elif isinstance(child, ast.BoolOp):
-                # And/Or operations
-                complexity += len(child.values) - 1
-            elif isinstance(child, (ast.ExceptHandler,)):
-                complexity += 1
-
-        return complexity
-
 
 class LongParameterListRule(ASTVisitorRule):
     """Detect functions with too many parameters."""
@@ -251,11 +220,8 @@ class QualityAnalyzer(BaseAnalyzer):
             description="Analyzes code quality and maintainability",
         )
 
-        # Register quality rules
-        self.register_rule(UnusedVariableRule())
-        self.register_rule(UnusedImportRule())
-        self.register_rule(FunctionComplexityRule())
-        self.register_rule(LongParameterListRule())
+        # Rules are loaded from the registry when first used
+        self.load_rules("quality")
 
     def analyze(self, tree: ast.AST, source_code: str, file_path: str) -> List[Issue]:
         """
@@ -269,19 +235,4 @@ class QualityAnalyzer(BaseAnalyzer):
         Returns:
             List of quality-related issues
         """
-        all_issues = []
-
-        for rule in self.rules.values():
-            if rule.enabled:
-                if isinstance(rule, ASTVisitorRule):
-                    # Use visitor pattern for traversal rules
-                    rule.reset(file_path, source_code)
-                    rule.visit(tree)
-                    rule.finalize()
-                    all_issues.extend(rule.issues)
-                else:
-                    # Use direct checking for other rules
-                    issues = rule.check(tree, source_code, file_path)
-                    all_issues.extend(issues)
-
-        return all_issues
+        return self.run_rules(tree, source_code, file_path)
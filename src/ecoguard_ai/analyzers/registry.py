@@ -0,0 +1,619 @@
+"""
+Registry of analyzers and rules for EcoGuard AI.
+
+Analyzers and rules are described by lightweight specs: an id, the analyzer a
+rule belongs to, the AST node types it looks at and an import target of the
+form ``"package.module:ClassName"``. The module behind a spec is imported only
+when the rule (or analyzer) is actually used, so the cost of starting an
+analysis does not grow with the number of installed rule packs.
+
+Third-party packages contribute specs through entry points::
+
+    [project.entry-points."ecoguard_ai.rules"]
+    my_rules = "my_pack.manifest:RULES"
+
+    [project.entry-points."ecoguard_ai.analyzers"]
+    my_analyzer = "my_pack.manifest:ANALYZER"
+
+An entry point may resolve to a single spec or to an iterable of specs. The
+manifest module should only define specs; the rules themselves live in other
+modules named by each spec's ``target``.
+"""
+
+import ast
+import importlib
+import threading
+import warnings
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    from ecoguard_ai.analyzers.base import BaseAnalyzer, BaseRule
+
+RULES_ENTRY_POINT_GROUP = "ecoguard_ai.rules"
+ANALYZERS_ENTRY_POINT_GROUP = "ecoguard_ai.analyzers"
+
+
+def _is_node_type(name: str) -> bool:
+    """Whether ``name`` is the name of an AST node class."""
+    node_type = getattr(ast, name, None)
+    return isinstance(node_type, type) and issubclass(node_type, ast.AST)
+
+
+def _import_target(target: str) -> Any:
+    """Import ``"package.module:attribute"`` and return the attribute."""
+    module_name, _, attribute = target.partition(":")
+    if not attribute:
+        raise ValueError(f"Invalid target (expected 'module:attribute'): {target}")
+    value: Any = importlib.import_module(module_name)
+    for part in attribute.split("."):
+        value = getattr(value, part)
+    return value
+
+
+@dataclass(frozen=True)
+class RuleSpec:
+    """Metadata describing a rule without importing it."""
+
+    rule_id: str
+    analyzer: str
+    target: str
+    name: str = ""
+    category: str = ""
+    severity: str = "warning"
+    # Names of the AST node classes the rule inspects. The rule is skipped
+    # for files that contain none of them; empty means "always run".
+    node_types: Tuple[str, ...] = ()
+    description: str = ""
+    # Whether the rule can check raw text (``scan_text``); only such rules
+    # run on files too large to parse
+    text_only: bool = False
+
+    def load(self) -> "BaseRule":
+        """
+        Import the rule class and create an instance of it.
+
+        Returns:
+            A new rule instance
+
+        Raises:
+            ValueError: If the created rule's id, name or category does not
+                match the spec, or a node type is not an AST class
+        """
+        unknown = [name for name in self.node_types if not _is_node_type(name)]
+        if unknown:
+            raise ValueError(
+                f"Rule spec '{self.rule_id}' names unknown node types: "
+                + ", ".join(unknown)
+            )
+        rule: "BaseRule" = _import_target(self.target)()
+        if rule.rule_id != self.rule_id:
+            raise ValueError(
+                f"Rule spec '{self.rule_id}' loaded a rule with id '{rule.rule_id}'"
+            )
+        # Empty fields were left out of the spec
+        for field_name in ("name", "category"):
+            expected = getattr(self, field_name)
+            actual = getattr(rule, field_name)
+            if expected and expected != actual:
+                raise ValueError(
+                    f"Rule spec '{self.rule_id}' has {field_name} '{expected}' "
+                    f"but the rule has '{actual}'"
+                )
+        return rule
+
+    def applies_to(self, node_types: Iterable[str]) -> bool:
+        """Whether a file containing ``node_types`` needs this rule."""
+        return not self.node_types or not set(self.node_types).isdisjoint(node_types)
+
+
+@dataclass(frozen=True)
+class AnalyzerSpec:
+    """Metadata describing an analyzer without importing it."""
+
+    name: str
+    target: str
+    description: str = ""
+
+    def load(self) -> "BaseAnalyzer":
+        """
+        Import the analyzer class and create an instance of it.
+
+        Returns:
+            A new analyzer instance
+        """
+        analyzer: "BaseAnalyzer" = _import_target(self.target)()
+        return analyzer
+
+
+class RuleMap(Mapping[str, "BaseRule"]):
+    """
+    Mapping of rule ids to rules that instantiates rules on first access.
+
+    Rules can be added either as instances or as specs. Enabling and
+    disabling a rule that has not been loaded yet only records the flag, so
+    a disabled rule's module is never imported.
+    """
+
+    def __init__(self) -> None:
+        self._specs: Dict[str, RuleSpec] = {}
+        self._rules: Dict[str, "BaseRule"] = {}
+        self._disabled: Set[str] = set()
+        self._order: List[str] = []
+        self._lock = threading.Lock()
+
+    def __getitem__(self, rule_id: str) -> "BaseRule":
+        rule = self._rules.get(rule_id)
+        if rule is not None:
+            return rule
+        spec = self._specs.get(rule_id)
+        if spec is None:
+            raise KeyError(rule_id)
+        with self._lock:
+            rule = self._rules.get(rule_id)
+            if rule is None:
+                rule = spec.load()
+                rule.enabled = rule_id not in self._disabled
+                self._rules[rule_id] = rule
+        return rule
+
+    def __setitem__(self, rule_id: str, rule: "BaseRule") -> None:
+        if rule_id not in self._specs and rule_id not in self._rules:
+            self._order.append(rule_id)
+        self._rules[rule_id] = rule
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, rule_id: object) -> bool:
+        return rule_id in self._rules or rule_id in self._specs
+
+    def add_spec(self, spec: RuleSpec) -> None:
+        """Add a rule that will be loaded on first use."""
+        if spec.rule_id not in self:
+            self._order.append(spec.rule_id)
+        self._specs[spec.rule_id] = spec
+        self._rules.pop(spec.rule_id, None)
+
+    def spec(self, rule_id: str) -> Optional[RuleSpec]:
+        """Return the spec a rule was registered with, if any."""
+        return self._specs.get(rule_id)
+
+    def is_loaded(self, rule_id: str) -> bool:
+        """Whether the rule has been instantiated."""
+        return rule_id in self._rules
+
+    def is_enabled(self, rule_id: str) -> bool:
+        """Whether the rule is enabled, without loading it."""
+        rule = self._rules.get(rule_id)
+        if rule is not None:
+            return rule.enabled
+        return rule_id in self._specs and rule_id not in self._disabled
+
+    def set_enabled(self, rule_id: str, enabled: bool) -> None:
+        """Enable or disable a rule, without loading it."""
+        if rule_id not in self:
+            return
+        if enabled:
+            self._disabled.discard(rule_id)
+        else:
+            self._disabled.add(rule_id)
+        rule = self._rules.get(rule_id)
+        if rule is not None:
+            rule.enabled = enabled
+
+    def loaded(self) -> List["BaseRule"]:
+        """Return the rules that have been instantiated so far."""
+        return [
+            self._rules[rule_id] for rule_id in self._order if rule_id in self._rules
+        ]
+
+
+class RuleRegistry:
+    """Known analyzers and rules, by name and id."""
+
+    def __init__(self) -> None:
+        self._analyzers: Dict[str, AnalyzerSpec] = {}
+        self._rules: Dict[str, RuleSpec] = {}
+
+    def register_analyzer(self, spec: AnalyzerSpec) -> None:
+        """Register an analyzer; a later spec with the same name replaces it."""
+        self._analyzers[spec.name] = spec
+
+    def register_rule(self, spec: RuleSpec) -> None:
+        """Register a rule; a later spec with the same id replaces it."""
+        self._rules[spec.rule_id] = spec
+
+    @property
+    def analyzers(self) -> List[AnalyzerSpec]:
+        """All registered analyzer specs, in registration order."""
+        return list(self._analyzers.values())
+
+    @property
+    def rules(self) -> List[RuleSpec]:
+        """All registered rule specs, in registration order."""
+        return list(self._rules.values())
+
+    def rules_for(self, analyzer: str) -> List[RuleSpec]:
+        """
+        Return the rule specs that belong to an analyzer.
+
+        Args:
+            analyzer: Analyzer name, e.g. "quality"
+
+        Returns:
+            Rule specs in registration order
+        """
+        return [spec for spec in self._rules.values() if spec.analyzer == analyzer]
+
+    def load_entry_points(self) -> None:
+        """Register every analyzer and rule advertised by installed packages."""
+        for value in _load_entry_points(ANALYZERS_ENTRY_POINT_GROUP):
+            for spec in _as_specs(value, AnalyzerSpec):
+                self.register_analyzer(spec)
+        for value in _load_entry_points(RULES_ENTRY_POINT_GROUP):
+            for spec in _as_specs(value, RuleSpec):
+                self.register_rule(spec)
+
+
+def _entry_points(group: str) -> List[Any]:
+    """Return the entry points of a group on every supported Python version."""
+    from importlib import metadata
+
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return list(entry_points.select(group=group))
+    return list(entry_points.get(group, []))  # Python < 3.10
+
+
+def _load_entry_points(group: str) -> List[Any]:
+    """Load every entry point of a group, skipping the broken ones."""
+    values = []
+    for entry_point in _entry_points(group):
+        try:
+            values.append(entry_point.load())
+        except Exception as e:
+            warnings.warn(
+                f"Could not load EcoGuard AI plugin '{entry_point.name}': {e}",
+                stacklevel=2,
+            )
+    return values
+
+
+def _as_specs(value: Any, spec_type: type) -> List[Any]:
+    """Normalize an entry point value to a list of specs of one type."""
+    items = [value] if isinstance(value, spec_type) else list(value)
+    specs = [item for item in items if isinstance(item, spec_type)]
+    if len(specs) != len(items):
+        warnings.warn(
+            f"Ignoring plugin entries that are not {spec_type.__name__} objects",
+            stacklevel=2,
+        )
+    return specs
+
+
+BUILTIN_ANALYZERS = [
+    AnalyzerSpec(
+        "quality",
+        "ecoguard_ai.analyzers.quality:QualityAnalyzer",
+        "Analyzes code quality and maintainability",
+    ),
+    AnalyzerSpec(
+        "security",
+        "ecoguard_ai.analyzers.security:SecurityAnalyzer",
+        "Analyzes security vulnerabilities and risks",
+    ),
+    AnalyzerSpec(
+        "green",
+        "ecoguard_ai.analyzers.green:GreenAnalyzer",
+        "Analyzes environmental sustainability and efficiency",
+    ),
+    AnalyzerSpec(
+        "ai_code",
+        "ecoguard_ai.analyzers.ai_code:AICodeAnalyzer",
+        "Analyzes AI-generated code inefficiencies and patterns",
+    ),
+]
+
+_FUNCTIONS = ("FunctionDef", "AsyncFunctionDef")
+_LOOPS = ("For", "AsyncFor", "While")
+
+BUILTIN_RULES = [
+    # Quality
+    RuleSpec(
+        "unused_variable",
+        "quality",
+        "ecoguard_ai.analyzers.quality:UnusedVariableRule",
+        "Unused Variable",
+        "quality",
+        "warning",
+        _FUNCTIONS + ("Lambda",),
+    ),
+    RuleSpec(
+        "unused_import",
+        "quality",
+        "ecoguard_ai.analyzers.quality:UnusedImportRule",
+        "Unused Import",
+        "quality",
+        "info",
+        ("Import", "ImportFrom"),
+    ),
+    RuleSpec(
+        "function_complexity",
+        "quality",
+        "ecoguard_ai.analyzers.quality:FunctionComplexityRule",
+        "High Function Complexity",
+        "quality",
+        "warning",
+        _FUNCTIONS,
+    ),
+    RuleSpec(
+        "too_many_params",
+        "quality",
+        "ecoguard_ai.analyzers.quality:LongParameterListRule",
+        "Too Many Parameters",
+        "quality",
+        "info",
+        ("FunctionDef",),
+    ),
+    # Security
+    RuleSpec(
+        "hardcoded_secret",
+        "security",
+        "ecoguard_ai.analyzers.security:HardcodedSecretRule",
+        "Hardcoded Secret",
+        "security",
+        "error",
+        text_only=True,
+    ),
+    RuleSpec(
+        "sql_injection",
+        "security",
+        "ecoguard_ai.analyzers.security:SQLInjectionRule",
+        "SQL Injection",
+        "security",
+        "error",
+        ("Call",),
+    ),
+    RuleSpec(
+        "dangerous_call",
+        "security",
+        "ecoguard_ai.analyzers.security:DangerousCallRule",
+        "Dangerous Call With Untrusted Input",
+        "security",
+        "error",
+        ("Call",),
+    ),
+    # Green
+    RuleSpec(
+        "inefficient_string_concat",
+        "green",
+        "ecoguard_ai.analyzers.green:StringConcatenationRule",
+        "Inefficient String Concatenation",
+        "green",
+        "warning",
+        ("AugAssign", "Assign"),
+    ),
+    RuleSpec(
+        "quadratic_accumulation",
+        "green",
+        "ecoguard_ai.analyzers.green:QuadraticAccumulationRule",
+        "Quadratic Accumulation",
+        "green",
+        "warning",
+        ("AugAssign", "Assign"),
+    ),
+    RuleSpec(
+        "use_list_comprehension",
+        "green",
+        "ecoguard_ai.analyzers.green:ListComprehensionRule",
+        "Use List Comprehension",
+        "green",
+        "info",
+        ("For",),
+    ),
+    RuleSpec(
+        "use_generator",
+        "green",
+        "ecoguard_ai.analyzers.green:GeneratorExpressionRule",
+        "Use Generator Expression",
+        "green",
+        "info",
+        ("ListComp",),
+    ),
+    RuleSpec(
+        "file_handling_efficiency",
+        "green",
+        "ecoguard_ai.analyzers.green:FileHandlingRule",
+        "Resource Handling",
+        "green",
+        "info",
+        ("Call",),
+    ),
+    RuleSpec(
+        "inefficient_loop",
+        "green",
+        "ecoguard_ai.analyzers.green:IneffientLoopRule",
+        "Inefficient Loop Pattern",
+        "green",
+        "warning",
+        ("For",),
+    ),
+    RuleSpec(
+        "quadratic_membership",
+        "green",
+        "ecoguard_ai.analyzers.green:QuadraticMembershipRule",
+        "Quadratic Membership Test",
+        "green",
+        "warning",
+        ("Compare", "Call"),
+    ),
+    RuleSpec(
+        "loop_invariant_computation",
+        "green",
+        "ecoguard_ai.analyzers.green:LoopInvariantRule",
+        "Loop-Invariant Computation",
+        "green",
+        "info",
+        _LOOPS,
+    ),
+    RuleSpec(
+        "pandas_row_iteration",
+        "green",
+        "ecoguard_ai.analyzers.green:PandasRowIterationRule",
+        "Row-Wise pandas Processing",
+        "green",
+        "warning",
+        ("Call",),
+    ),
+    RuleSpec(
+        "numpy_element_loop",
+        "green",
+        "ecoguard_ai.analyzers.green:NumpyElementLoopRule",
+        "Python Loop Over NumPy Array",
+        "green",
+        "warning",
+        ("For", "ListComp", "SetComp", "DictComp", "GeneratorExp"),
+    ),
+    RuleSpec(
+        "array_concat_in_loop",
+        "green",
+        "ecoguard_ai.analyzers.green:ArrayConcatInLoopRule",
+        "Array Concatenation in Loop",
+        "green",
+        "warning",
+        ("Call",),
+    ),
+    RuleSpec(
+        "io_in_loop",
+        "green",
+        "ecoguard_ai.analyzers.green:IOInLoopRule",
+        "I/O in Loop",
+        "green",
+        "warning",
+        ("Call",),
+    ),
+    RuleSpec(
+        "memoization_opportunity",
+        "green",
+        "ecoguard_ai.analyzers.green:MemoizationRule",
+        "Redundant Recomputation",
+        "green",
+        "info",
+        ("FunctionDef",),
+    ),
+    RuleSpec(
+        "regex_in_loop",
+        "green",
+        "ecoguard_ai.analyzers.green:RegexInLoopRule",
+        "Regex Compiled in Loop",
+        "green",
+        "info",
+        ("Call",),
+    ),
+    RuleSpec(
+        "regex_backtracking",
+        "green",
+        "ecoguard_ai.analyzers.green:RegexBacktrackingRule",
+        "Catastrophic Regex Backtracking",
+        "green",
+        "warning",
+        ("Call",),
+    ),
+    RuleSpec(
+        "blocking_call_in_async",
+        "green",
+        "ecoguard_ai.analyzers.green:AsyncBlockingCallRule",
+        "Blocking Call in Async Function",
+        "green",
+        "warning",
+        ("AsyncFunctionDef",),
+    ),
+    # AI code
+    RuleSpec(
+        "verbose_ai_code",
+        "ai_code",
+        "ecoguard_ai.analyzers.ai_code:VerboseCodeRule",
+        "Verbose AI-Generated Code",
+        "ai_code",
+        "info",
+        ("If", "FunctionDef"),
+    ),
+    RuleSpec(
+        "redundant_variable",
+        "ai_code",
+        "ecoguard_ai.analyzers.ai_code:RedundantVariableRule",
+        "Redundant Variable Assignment",
+        "ai_code",
+        "info",
+        _FUNCTIONS,
+    ),
+    RuleSpec(
+        "duplicate_function",
+        "ai_code",
+        "ecoguard_ai.analyzers.ai_code:DuplicateFunctionRule",
+        "Potential Duplicate Function",
+        "ai_code",
+        "warning",
+        _FUNCTIONS,
+    ),
+    RuleSpec(
+        "over_commented",
+        "ai_code",
+        "ecoguard_ai.analyzers.ai_code:OverCommentedCodeRule",
+        "Over-Commented Code",
+        "ai_code",
+        "info",
+        ("FunctionDef",),
+    ),
+    RuleSpec(
+        "unnecessary_type_check",
+        "ai_code",
+        "ecoguard_ai.analyzers.ai_code:UnnecessaryTypeChecksRule",
+        "Unnecessary Type Check",
+        "ai_code",
+        "info",
+        ("If",),
+    ),
+]
+
+_registry: Optional[RuleRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> RuleRegistry:
+    """
+    Return the process-wide registry.
+
+    It holds the built-in analyzers and rules plus everything installed
+    packages advertise through entry points, which are scanned once.
+
+    Returns:
+        The shared RuleRegistry
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                registry = RuleRegistry()
+                for analyzer_spec in BUILTIN_ANALYZERS:
+                    registry.register_analyzer(analyzer_spec)
+                for rule_spec in BUILTIN_RULES:
+                    registry.register_rule(rule_spec)
+                registry.load_entry_points()
+                _registry = registry
+    return _registry
@@ -1,28 +1,299 @@
 """
-Security analyzer placeholder for EcoGuard AI.
+Security analyzer for EcoGuard AI.
 
-This module will implement security analysis rules in Stage 2.
-Currently serves as a placeholder to prevent import errors.
+This module implements security analysis rules that detect risky
+patterns such as hardcoded credentials in source code.
 """
 
 import ast
-from typing import List
+from dataclasses import dataclass, field
+from typing import Any, FrozenSet, List, Optional, Set
 
-from ecoguard_ai.analyzers.base import BaseAnalyzer
-from ecoguard_ai.core.issue import Issue
+from ecoguard_ai.analyzers.base import ASTVisitorRule, BaseAnalyzer
+from ecoguard_ai.analyzers.security.secrets import (
+    SecretScanner,
+    get_default_scanner,
+    redact,
+    shannon_entropy,
+)
+from ecoguard_ai.analyzers.security.taint import (
+    SINK_KINDS,
+    SummaryCache,
+    TaintIssue,
+    get_taint_issues,
+)
+from ecoguard_ai.core.issue import Fix, Impact, Issue
+
+# Name fragments that mark a variable, keyword or key as holding a credential
+SENSITIVE_NAMES = (
+    "password",
+    "passwd",
+    "secret",
+    "token",
+    "api_key",
+    "apikey",
+    "access_key",
+    "private_key",
+    "credential",
+)
+
+
+@dataclass
+class _SecretState:
+    """Lines already reported in the current file."""
+
+    reported_lines: Set[int] = field(default_factory=set)
+
+
+class HardcodedSecretRule(ASTVisitorRule):
+    """
+    Rule to detect credentials hardcoded in source code.
+
+    The whole file is scanned once for known token formats (cloud keys,
+    VCS tokens, private keys, ...). String constants assigned to names that
+    look like credentials are reported too when their entropy shows they are
+    real values rather than placeholders.
+    """
+
+    def __init__(
+        self,
+        scanner: Optional[SecretScanner] = None,
+        min_entropy: float = 3.0,
+        min_length: int = 8,
+    ) -> None:
+        super().__init__(
+            rule_id="hardcoded_secret",
+            name="Hardcoded Secret",
+            description="Detects credentials and keys hardcoded in source code",
+            category="security",
+            severity="error",
+        )
+        self.scanner = scanner or get_default_scanner()
+        self.min_entropy = min_entropy
+        self.min_length = min_length
+
+    def create_state(self) -> _SecretState:
+        """Track reported lines so one secret is reported once."""
+        return _SecretState()
+
+    def visit_Module(self, node: ast.Module) -> None:
+        """Scan the source of the whole module for known secret formats."""
+        self._scan_signatures()
+        self.generic_visit(node)
+
+    def scan_text(self, source_code: str, file_path: str) -> List[Issue]:
+        """Scan an unparsed file for known secret formats only."""
+        previous = getattr(self._local, "context", None)
+        self.reset(file_path, source_code)
+        try:
+            self._scan_signatures()
+            return self.issues.copy()
+        finally:
+            self._local.context = previous
+
+    def _scan_signatures(self) -> None:
+        lines = self.analysis.lines
+        for match in self.scanner.scan(self.current_source_code):
+            lineno, column = lines.position(match.start)
+            line = lines.line(lineno)
+            end_lineno, end_column = lines.position(match.end)
+            location = ast.Pass(
+                lineno=lineno,
+                col_offset=len(line[:column].encode("utf-8")),
+                end_lineno=end_lineno,
+                end_col_offset=None if end_lineno != lineno else end_column,
+            )
+            self._report(
+                f"Possible {match.signature.name} hardcoded in source",
+                location,
+                (
+                    line.replace(match.value, match.redacted)
+                    if match.value in line
+                    else None
+                ),
+            )
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        """Check string constants assigned to credential-like names."""
+        for target in node.targets:
+            self._check_named_value(_target_name(target), node.value)
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        """Check annotated assignments of credential-like names."""
+        self._check_named_value(_target_name(node.target), node.value)
+        self.generic_visit(node)
+
+    def visit_keyword(self, node: ast.keyword) -> None:
+        """Check credential-like keyword arguments, e.g. password="..."."""
+        self._check_named_value(node.arg, node.value)
+        self.generic_visit(node)
+
+    def visit_Dict(self, node: ast.Dict) -> None:
+        """Check credential-like keys of dictionary literals."""
+        for key, value in zip(node.keys, node.values):
+            if isinstance(key, ast.Constant) and isinstance(key.value, str):
+                self._check_named_value(key.value, value)
+        self.generic_visit(node)
+
+    def _check_named_value(self, name: Optional[str], value: Optional[ast.AST]) -> None:
+        if not name or not _is_sensitive_name(name):
+            return
+        if not (isinstance(value, ast.Constant) and isinstance(value.value, str)):
+            return
+        secret = value.value
+        if (
+            len(secret) < self.min_length
+            or any(char.isspace() for char in secret)
+            or shannon_entropy(secret) < self.min_entropy
+        ):
+            return
+        self._report(
+            f"Possible hardcoded credential assigned to '{name}'",
+            value,
+            f"{name} = '{redact(secret)}'",
+        )
+
+    def _report(self, message: str, node: ast.AST, snippet: Optional[str]) -> None:
+        line = getattr(node, "lineno", 1)
+        if line in self.state.reported_lines:
+            return
+        self.state.reported_lines.add(line)
+        self.add_issue(
+            message,
+            node,
+            # Never copy the secret itself into reports
+            code_snippet=snippet,
+            suggested_fix=Fix(
+                description=(
+                    "Load the secret from the environment or a secrets manager "
+                    "and revoke the exposed value"
+                ),
+                replacement_code='os.environ["SECRET_NAME"]',
+            ),
+            impact=Impact(security_risk=0.9),
+        )
+
+
+class TaintRule(ASTVisitorRule):
+    """
+    Base class for rules reporting untrusted data that reaches a sink.
+
+    The module is analyzed once by the taint engine and every taint rule
+    reports the flows into the sink kinds it is responsible for.
+    """
+
+    sink_kinds: FrozenSet[str] = frozenset()
+
+    def __init__(
+        self, *args: Any, cache: Optional[SummaryCache] = None, **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.cache = cache
+
+    def visit_Module(self, node: ast.Module) -> None:
+        """Report the taint flows of the module into this rule's sinks."""
+        for flow in get_taint_issues(node, self.cache):
+            if flow.kind in self.sink_kinds:
+                self._report(flow)
+
+    def _report(self, flow: TaintIssue) -> None:
+        location = ast.Pass(
+            lineno=flow.line,
+            col_offset=flow.column,
+            end_lineno=flow.end_line,
+            end_col_offset=flow.end_column,
+        )
+        via = f" through a call to '{flow.via}'" if flow.via else ""
+        self.add_issue(
+            f"Untrusted input reaches '{flow.sink}'{via}: possible "
+            f"{SINK_KINDS[flow.kind]}",
+            location,
+            suggested_fix=self.suggested_fix(flow),
+            impact=Impact(security_risk=0.9),
+        )
+
+    def suggested_fix(self, flow: TaintIssue) -> Fix:
+        """Return the fix suggested for a flow."""
+        return Fix(description="Validate or sanitize the input before using it")
+
+
+class SQLInjectionRule(TaintRule):
+    """Rule to detect untrusted input used to build SQL queries."""
+
+    sink_kinds = frozenset(["sql"])
+
+    def __init__(self, cache: Optional[SummaryCache] = None) -> None:
+        super().__init__(
+            rule_id="sql_injection",
+            name="SQL Injection",
+            description="Detects untrusted input flowing into SQL queries",
+            category="security",
+            severity="error",
+            cache=cache,
+        )
+
+    def suggested_fix(self, flow: TaintIssue) -> Fix:
+        """Suggest a parameterized query."""
+        return Fix(
+            description="Pass user input as query parameters instead of "
+            "formatting it into the SQL string",
+            replacement_code='cursor.execute("SELECT * FROM t WHERE id = %s", (id,))',
+        )
+
+
+class DangerousCallRule(TaintRule):
+    """Rule to detect untrusted input passed to shell, eval or unpickling."""
+
+    sink_kinds = frozenset(["command", "code", "deserialization"])
+
+    def __init__(self, cache: Optional[SummaryCache] = None) -> None:
+        super().__init__(
+            rule_id="dangerous_call",
+            name="Dangerous Call With Untrusted Input",
+            description=(
+                "Detects untrusted input flowing into shell commands, "
+                "eval/exec or deserialization"
+            ),
+            category="security",
+            severity="error",
+            cache=cache,
+        )
+
+    def suggested_fix(self, flow: TaintIssue) -> Fix:
+        """Suggest the safe alternative for the kind of sink."""
+        if flow.kind == "command":
+            return Fix(
+                description="Pass arguments as a list without shell=True, or "
+                "quote them with shlex.quote"
+            )
+        if flow.kind == "code":
+            return Fix(description="Use ast.literal_eval or an explicit parser")
+        return Fix(description="Deserialize untrusted data with json instead")
+
+
+def _target_name(target: ast.AST) -> Optional[str]:
+    """Name assigned to by a simple assignment target."""
+    if isinstance(target, ast.Name):
+        return target.id
+    if isinstance(target, ast.Attribute):
+        return target.attr
+    return None
+
+
+def _is_sensitive_name(name: str) -> bool:
+    lowered = name.lower()
+    return any(fragment in lowered for fragment in SENSITIVE_NAMES)
 
 
 class SecurityAnalyzer(BaseAnalyzer):
     """
     Security analyzer for Python code.
 
-    This analyzer will implement SAST rules for:
-    - SQL injection vulnerabilities
+    This analyzer implements SAST rules for:
     - Hardcoded secrets
-    - Insecure file handling
-    - Dangerous function usage
-
-    Currently a placeholder - will be implemented in Stage 2.
+    - SQL injection vulnerabilities
+    - Dangerous function usage with untrusted input
     """
 
     def __init__(self) -> None:
@@ -31,6 +302,9 @@ class SecurityAnalyzer(BaseAnalyzer):
             description="Analyzes security vulnerabilities and risks",
         )
 
+        # Rules are loaded from the registry when first used
+        self.load_rules("security")
+
     def analyze(self, tree: ast.AST, source_code: str, file_path: str) -> List[Issue]:
         """
         Analyze security issues.
@@ -41,8 +315,6 @@ class SecurityAnalyzer(BaseAnalyzer):
             file_path: Path to the file being analyzed
 
         Returns:
-            List of security-related issues (empty for now)
+            List of security-related issues
         """
-        # Placeholder implementation
-        # Will be expanded in Stage 2 with actual SAST rules
-        return []
+        return self.run_rules(tree, source_code, file_path)
@@ -0,0 +1,836 @@
+"""
+Interprocedural taint analysis for the security analyzer.
+
+Untrusted data enters a program through sources (``input()``, ``sys.argv``,
+``flask.request``, ...) and is dangerous when it reaches a sink (SQL
+``execute``, ``os.system``, ``eval``, ``pickle.loads``, ...) without passing
+through a sanitizer such as ``int`` or ``shlex.quote``.
+
+Each function is analyzed once into a ``FunctionSummary``: which of its
+parameters reach which sinks, which parameters (or sources) flow into its
+return value, and the source-to-sink flows found inside it. Calls to other
+functions of the module are resolved through the callee's summary, so flows
+are followed across calls without re-analyzing the callee.
+
+Summaries are cached by a key made from the function's normalized AST, what
+the names it reads resolve to (``os`` may be ``mylib`` imported under that
+name) and the digests of the summaries of the functions it calls. Editing a
+function or its imports changes its key; editing a callee changes the
+callee's digest and therefore the caller's key. Everything else is served
+from the cache, which keeps the most recently used summaries up to a bound
+and can be saved to and loaded from a JSON file between runs.
+"""
+
+import ast
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from ecoguard_ai.analyzers.semantic import (
+    BindingKind,
+    FunctionNode,
+    SemanticModel,
+    get_semantic_model,
+)
+
+# Bump when the analysis changes so stale cache files are ignored
+CACHE_VERSION = 3
+
+# Summaries kept by a cache before the least recently used are dropped
+DEFAULT_CACHE_SIZE = 10_000
+
+# Label of data that comes from a source; parameters are labelled by index
+SOURCE = "source"
+Label = Union[int, str]
+Labels = FrozenSet[Label]
+_CLEAN: Labels = frozenset()
+_TAINTED: Labels = frozenset([SOURCE])
+
+# Qualified names (and prefixes, for attribute chains) of untrusted data
+TAINT_SOURCES = (
+    "input",
+    "sys.argv",
+    "sys.stdin",
+    "flask.request",
+    "bottle.request",
+    "fastapi.Request",
+)
+
+# Calls whose result is safe whatever their arguments
+SANITIZERS = {
+    "int",
+    "float",
+    "bool",
+    "len",
+    "shlex.quote",
+    "pipes.quote",
+    "html.escape",
+    "markupsafe.escape",
+    "os.path.basename",
+}
+
+SQL_METHODS = {"execute", "executemany", "executescript", "raw", "mogrify"}
+COMMAND_SINKS = {
+    "os.system",
+    "os.popen",
+    "os.spawnl",
+    "os.spawnlp",
+    "os.execl",
+    "os.execlp",
+    "os.execv",
+    "os.execvp",
+    "subprocess.getoutput",
+    "subprocess.getstatusoutput",
+    "commands.getoutput",
+}
+SHELL_SINKS = {
+    "subprocess.call",
+    "subprocess.run",
+    "subprocess.Popen",
+    "subprocess.check_call",
+    "subprocess.check_output",
+}
+CODE_SINKS = {"eval", "exec", "compile"}
+DESERIALIZATION_SINKS = {
+    "pickle.loads",
+    "pickle.load",
+    "cPickle.loads",
+    "marshal.loads",
+    "dill.loads",
+    "shelve.open",
+    "yaml.unsafe_load",
+}
+SQL_SINKS = {"sqlalchemy.text"}
+
+# Human readable description of each sink kind
+SINK_KINDS = {
+    "sql": "SQL injection",
+    "command": "command injection",
+    "code": "code injection",
+    "deserialization": "unsafe deserialization",
+}
+
+
+@dataclass(frozen=True)
+class TaintFinding:
+    """A flow of untrusted data into a sink, positioned in a function."""
+
+    kind: str
+    sink: str
+    # Lines and columns are relative to the start of the analyzed function
+    line_offset: int
+    column_offset: int
+    end_line_offset: int
+    end_column_offset: Optional[int]
+    # Name of the called function through which the data reached the sink
+    via: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the finding to a JSON-compatible dictionary."""
+        return {
+            "kind": self.kind,
+            "sink": self.sink,
+            "line_offset": self.line_offset,
+            "column_offset": self.column_offset,
+            "end_line_offset": self.end_line_offset,
+            "end_column_offset": self.end_column_offset,
+            "via": self.via,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TaintFinding":
+        """Create a finding from a dictionary made by ``to_dict``."""
+        return cls(**data)
+
+
+@dataclass(frozen=True)
+class FunctionSummary:
+    """What a function does with untrusted data, independent of callers."""
+
+    name: str
+    # Parameter index -> sinks its value can reach
+    param_sinks: Dict[int, Tuple[TaintFinding, ...]] = field(default_factory=dict)
+    # Parameter indexes (and SOURCE) that flow into the return value
+    returns: Labels = _CLEAN
+    # Source-to-sink flows inside the function
+    findings: Tuple[TaintFinding, ...] = ()
+
+    @property
+    def digest(self) -> str:
+        """Stable hash of the summary, used in the cache keys of callers."""
+        payload = json.dumps(self.to_dict(), sort_keys=True)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the summary to a JSON-compatible dictionary."""
+        return {
+            "name": self.name,
+            "param_sinks": {
+                str(index): [finding.to_dict() for finding in findings]
+                for index, findings in sorted(self.param_sinks.items())
+            },
+            "returns": sorted(str(label) for label in self.returns),
+            "findings": [finding.to_dict() for finding in self.findings],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FunctionSummary":
+        """Create a summary from a dictionary made by ``to_dict``."""
+        return cls(
+            name=data["name"],
+            param_sinks={
+                int(index): tuple(TaintFinding.from_dict(f) for f in findings)
+                for index, findings in data["param_sinks"].items()
+            },
+            returns=frozenset(
+                label if label == SOURCE else int(label) for label in data["returns"]
+            ),
+            findings=tuple(TaintFinding.from_dict(f) for f in data["findings"]),
+        )
+
+
+class SummaryCache:
+    """
+    Thread-safe store of function summaries keyed by content.
+
+    One cache can be shared by every file of a project and persisted
+    between runs with ``save`` and ``load``. It holds at most ``max_size``
+    summaries, dropping the least recently used ones, so long-running
+    processes do not grow without bound.
+    """
+
+    def __init__(self, max_size: Optional[int] = DEFAULT_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self._summaries: "OrderedDict[str, FunctionSummary]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._summaries)
+
+    def get(self, key: str) -> Optional[FunctionSummary]:
+        """Return the cached summary for a key, counting hits and misses."""
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._summaries.move_to_end(key)
+            return summary
+
+    def put(self, key: str, summary: FunctionSummary) -> None:
+        """Store a summary, dropping the least recently used over the bound."""
+        with self._lock:
+            self._summaries[key] = summary
+            self._summaries.move_to_end(key)
+            if self.max_size is not None:
+                while len(self._summaries) > self.max_size:
+                    self._summaries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget every summary."""
+        with self._lock:
+            self._summaries.clear()
+            self.hits = self.misses = 0
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Write the cache to a JSON file.
+
+        Args:
+            path: Destination file
+        """
+        with self._lock:
+            data = {
+                "version": CACHE_VERSION,
+                "summaries": {
+                    key: summary.to_dict() for key, summary in self._summaries.items()
+                },
+            }
+        Path(path).write_text(json.dumps(data), encoding="utf-8")
+
+    @classmethod
+    def load(
+        cls, path: Union[str, Path], max_size: Optional[int] = DEFAULT_CACHE_SIZE
+    ) -> "SummaryCache":
+        """
+        Read a cache written by ``save``.
+
+        A missing file or one written by another version gives an empty
+        cache.
+
+        Args:
+            path: Cache file
+            max_size: Bound of the loaded cache
+
+        Returns:
+            The loaded SummaryCache
+        """
+        cache = cls(max_size)
+        path = Path(path)
+        if not path.exists():
+            return cache
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != CACHE_VERSION:
+            return cache
+        for key, summary in data.get("summaries", {}).items():
+            cache.put(key, FunctionSummary.from_dict(summary))
+        return cache
+
+
+def _is_source(qualified_name: Optional[str]) -> bool:
+    if not qualified_name:
+        return False
+    return any(
+        qualified_name == source or qualified_name.startswith(source + ".")
+        for source in TAINT_SOURCES
+    )
+
+
+def _sink_arguments(
+    call: ast.Call, qualified_name: Optional[str]
+) -> Optional[Tuple[str, str, range]]:
+    """Return (kind, sink name, dangerous argument indexes) for a sink call."""
+    first = range(min(1, len(call.args)))
+    if qualified_name in COMMAND_SINKS:
+        return "command", qualified_name, range(len(call.args))
+    if qualified_name in SHELL_SINKS:
+        shell = any(
+            kw.arg == "shell"
+            and isinstance(kw.value, ast.Constant)
+            and kw.value.value is True
+            for kw in call.keywords
+        )
+        return ("command", qualified_name, first) if shell else None
+    if qualified_name in CODE_SINKS:
+        return "code", qualified_name, first
+    if qualified_name in DESERIALIZATION_SINKS:
+        return "deserialization", qualified_name, first
+    if qualified_name in SQL_SINKS:
+        return "sql", qualified_name, first
+    if isinstance(call.func, ast.Attribute) and call.func.attr in SQL_METHODS:
+        return "sql", call.func.attr, first
+    return None
+
+
+def _parameter_names(function: FunctionNode) -> List[str]:
+    args = function.args
+    return [a.arg for a in list(getattr(args, "posonlyargs", [])) + list(args.args)] + [
+        a.arg for a in args.kwonlyargs
+    ]
+
+
+Env = Dict[str, Labels]
+
+_COMPREHENSIONS = (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.DictComp)
+
+
+def _merge(*envs: Env) -> Env:
+    merged: Env = {}
+    for env in envs:
+        for name, labels in env.items():
+            merged[name] = merged.get(name, _CLEAN) | labels
+    return merged
+
+
+class _FunctionAnalyzer:
+    """Flow-sensitive taint propagation through one function body."""
+
+    def __init__(
+        self,
+        engine: "TaintEngine",
+        unit: ast.AST,
+        body: Sequence[ast.stmt],
+        params: Sequence[str],
+    ) -> None:
+        self.engine = engine
+        self.model = engine.model
+        self.unit = unit
+        self.body = body
+        self.params = list(params)
+        self.returns: Set[Label] = set()
+        self.findings: Dict[Tuple[Any, ...], TaintFinding] = {}
+        self.param_sinks: Dict[int, Dict[Tuple[Any, ...], TaintFinding]] = {}
+
+    def run(self, name: str) -> FunctionSummary:
+        env: Env = {
+            param: frozenset([index]) for index, param in enumerate(self.params)
+        }
+        self._block(self.body, env)
+        return FunctionSummary(
+            name=name,
+            param_sinks={
+                index: tuple(hits.values())
+                for index, hits in sorted(self.param_sinks.items())
+            },
+            returns=frozenset(self.returns),
+            findings=tuple(self.findings.values()),
+        )
+
+    # Statements
+
+    def _block(self, statements: Iterable[ast.stmt], env: Env) -> Env:
+        for statement in statements:
+            env = self._statement(statement, env)
+        return env
+
+    def _statement(self, node: ast.stmt, env: Env) -> Env:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            # Nested definitions are analyzed as units of their own
+            return env
+        handler: Optional[Callable[[Any, Env], Env]] = getattr(
+            self, f"_statement_{type(node).__name__}", None
+        )
+        if handler is not None:
+            return handler(node, env)
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.expr):
+                self._expr(child, env)
+            elif isinstance(child, ast.stmt):
+                env = self._statement(child, env)
+        return env
+
+    def _statement_Assign(self, node: ast.Assign, env: Env) -> Env:
+        labels = self._expr(node.value, env)
+        for target in node.targets:
+            self._bind(target, labels, env)
+        return env
+
+    def _statement_AnnAssign(self, node: ast.AnnAssign, env: Env) -> Env:
+        if node.value is not None:
+            self._bind(node.target, self._expr(node.value, env), env)
+        return env
+
+    def _statement_AugAssign(self, node: ast.AugAssign, env: Env) -> Env:
+        labels = self._expr(node.value, env) | self._expr(node.target, env)
+        self._bind(node.target, labels, env)
+        return env
+
+    def _statement_Return(self, node: ast.Return, env: Env) -> Env:
+        if node.value is not None:
+            self.returns |= self._expr(node.value, env)
+        return env
+
+    def _statement_If(self, node: ast.If, env: Env) -> Env:
+        self._expr(node.test, env)
+        return _merge(
+            self._block(node.body, dict(env)), self._block(node.orelse, dict(env))
+        )
+
+    def _statement_For(self, node: ast.For, env: Env) -> Env:
+        return self._loop(node, node.body, node.orelse, env)
+
+    _statement_AsyncFor = _statement_For
+    _statement_While = _statement_For
+
+    def _statement_With(self, node: ast.With, env: Env) -> Env:
+        for item in node.items:
+            labels = self._expr(item.context_expr, env)
+            if item.optional_vars is not None:
+                self._bind(item.optional_vars, labels, env)
+        return self._block(node.body, env)
+
+    _statement_AsyncWith = _statement_With
+
+    def _statement_Try(self, node: ast.Try, env: Env) -> Env:
+        body_env = self._block(node.body, dict(env))
+        handler_envs = [
+            self._block(handler.body, _merge(env, body_env))
+            for handler in node.handlers
+        ]
+        else_env = self._block(node.orelse, body_env)
+        return self._block(node.finalbody, _merge(else_env, *handler_envs))
+
+    def _loop(
+        self,
+        node: Union[ast.For, ast.AsyncFor, ast.While],
+        body: List[ast.stmt],
+        orelse: List[ast.stmt],
+        env: Env,
+    ) -> Env:
+        loop_env = dict(env)
+        # Two passes let values assigned late in the body reach its start
+        for _ in range(2):
+            pass_env = dict(loop_env)
+            if isinstance(node, ast.While):
+                self._expr(node.test, pass_env)
+            else:
+                self._bind(node.target, self._expr(node.iter, pass_env), pass_env)
+            loop_env = _merge(loop_env, self._block(body, pass_env))
+        return self._block(orelse, loop_env)
+
+    def _bind(self, target: ast.AST, labels: Labels, env: Env) -> None:
+        if isinstance(target, ast.Name):
+            env[target.id] = labels
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            for element in target.elts:
+                self._bind(element, labels, env)
+        elif isinstance(target, ast.Starred):
+            self._bind(target.value, labels, env)
+        elif isinstance(target, (ast.Attribute, ast.Subscript)):
+            # Storing into a container taints the container
+            base = target.value
+            while isinstance(base, (ast.Attribute, ast.Subscript)):
+                base = base.value
+            if isinstance(base, ast.Name):
+                env[base.id] = env.get(base.id, _CLEAN) | labels
+
+    # Expressions
+
+    def _expr(self, node: ast.AST, env: Env) -> Labels:
+        if isinstance(node, (ast.Name, ast.Attribute)):
+            return self._reference(node, env)
+        if isinstance(node, ast.Call):
+            return self._call(node, env)
+        if isinstance(node, _COMPREHENSIONS):
+            return self._comprehension(node, env)
+        if isinstance(node, ast.Lambda):
+            return _CLEAN
+        labels = _CLEAN
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.expr):
+                labels = labels | self._expr(child, env)
+            elif isinstance(child, ast.keyword):
+                labels = labels | self._expr(child.value, env)
+        # Comparisons produce booleans, which carry no data
+        return _CLEAN if isinstance(node, ast.Compare) else labels
+
+    def _reference(self, node: Union[ast.Name, ast.Attribute], env: Env) -> Labels:
+        if isinstance(node, ast.Name) and node.id in env:
+            return env[node.id]
+        if _is_source(self.model.qualified_name(node)):
+            return _TAINTED
+        if isinstance(node, ast.Attribute):
+            return self._expr(node.value, env)
+        return _CLEAN
+
+    def _comprehension(self, node: ast.AST, env: Env) -> Labels:
+        if isinstance(node, ast.DictComp):
+            elements = [node.key, node.value]
+        else:
+            elements = [getattr(node, "elt")]
+        inner = dict(env)
+        for generator in getattr(node, "generators"):
+            self._bind(generator.target, self._expr(generator.iter, inner), inner)
+            for condition in generator.ifs:
+                self._expr(condition, inner)
+        labels = _CLEAN
+        for element in elements:
+            labels = labels | self._expr(element, inner)
+        return labels
+
+    def _call(self, node: ast.Call, env: Env) -> Labels:
+        qualified_name = self.model.qualified_name(node.func)
+        arg_labels = [self._expr(arg, env) for arg in node.args]
+        keyword_labels = {kw.arg: self._expr(kw.value, env) for kw in node.keywords}
+        receiver = (
+            self._expr(node.func.value, env)
+            if isinstance(node.func, ast.Attribute)
+            else _CLEAN
+        )
+
+        sink = _sink_arguments(node, qualified_name)
+        if sink is not None:
+            kind, sink_name, indexes = sink
+            labels = _CLEAN
+            for index in indexes:
+                labels = labels | arg_labels[index]
+            self._reach_sink(labels, node, kind, sink_name, None)
+
+        callee = self.engine.callee(node)
+        if callee is not None:
+            return self._summarized_call(node, *callee, arg_labels, keyword_labels)
+        if qualified_name in SANITIZERS:
+            return _CLEAN
+        if _is_source(qualified_name):
+            return _TAINTED
+        result = receiver
+        for labels in [*arg_labels, *keyword_labels.values()]:
+            result = result | labels
+        return result
+
+    def _summarized_call(
+        self,
+        node: ast.Call,
+        function: FunctionNode,
+        summary: FunctionSummary,
+        arg_labels: List[Labels],
+        keyword_labels: Dict[Optional[str], Labels],
+    ) -> Labels:
+        """Apply a callee's summary to the labels of the call's arguments."""
+        bound = self._bind_arguments(function, arg_labels, keyword_labels)
+        for index, hits in summary.param_sinks.items():
+            labels = bound.get(index, _CLEAN)
+            for hit in hits:
+                self._reach_sink(labels, node, hit.kind, hit.sink, function.name)
+        result = _CLEAN
+        for label in summary.returns:
+            if isinstance(label, int):
+                result = result | bound.get(label, _CLEAN)
+            else:
+                result = result | _TAINTED
+        return result
+
+    def _bind_arguments(
+        self,
+        function: FunctionNode,
+        arg_labels: List[Labels],
+        keyword_labels: Dict[Optional[str], Labels],
+    ) -> Dict[int, Labels]:
+        names = _parameter_names(function)
+        positional = len(getattr(function.args, "posonlyargs", [])) + len(
+            function.args.args
+        )
+        bound: Dict[int, Labels] = {}
+        for index, labels in enumerate(arg_labels[:positional]):
+            bound[index] = labels
+        for keyword, labels in keyword_labels.items():
+            # Positional-only parameters cannot be passed by keyword
+            if keyword in names[len(getattr(function.args, "posonlyargs", [])) :]:
+                index = names.index(keyword)
+                bound[index] = bound.get(index, _CLEAN) | labels
+        return bound
+
+    def _reach_sink(
+        self,
+        labels: Labels,
+        node: ast.AST,
+        kind: str,
+        sink: str,
+        via: Optional[str],
+    ) -> None:
+        if not labels:
+            return
+        base_line = getattr(self.unit, "lineno", 1)
+        base_column = getattr(self.unit, "col_offset", 0)
+        end_column = getattr(node, "end_col_offset", None)
+        finding = TaintFinding(
+            kind=kind,
+            sink=sink,
+            line_offset=getattr(node, "lineno", base_line) - base_line,
+            column_offset=getattr(node, "col_offset", 0) - base_column,
+            end_line_offset=(getattr(node, "end_lineno", None) or base_line)
+            - base_line,
+            end_column_offset=(
+                None if end_column is None else end_column - base_column
+            ),
+            via=via,
+        )
+        key = (finding.line_offset, finding.column_offset, kind, sink, via)
+        for label in labels:
+            if isinstance(label, int):
+                self.param_sinks.setdefault(label, {}).setdefault(key, finding)
+            else:
+                self.findings.setdefault(key, finding)
+
+
+@dataclass(frozen=True)
+class TaintIssue:
+    """A finding placed at an absolute position in the module."""
+
+    kind: str
+    sink: str
+    line: int
+    column: int
+    end_line: int
+    end_column: Optional[int]
+    via: Optional[str] = None
+
+
+class TaintEngine:
+    """Computes (or fetches) the summaries of every function of a module."""
+
+    def __init__(self, tree: ast.AST, cache: Optional[SummaryCache] = None) -> None:
+        self.tree = tree
+        self.model: SemanticModel = get_semantic_model(tree)
+        self.cache = cache if cache is not None else SummaryCache()
+        self._summaries: Dict[int, FunctionSummary] = {}
+        self._in_progress: Set[int] = set()
+
+    def summary(self, function: FunctionNode) -> FunctionSummary:
+        """
+        Return the summary of a function, computing callees first.
+
+        Args:
+            function: Function definition from this module
+
+        Returns:
+            The function's summary
+        """
+        known = self._summaries.get(id(function))
+        if known is not None:
+            return known
+        if id(function) in self._in_progress:
+            # Recursive call: assume nothing about the unfinished summary
+            return FunctionSummary(name=function.name)
+
+        self._in_progress.add(id(function))
+        try:
+            callee_digests = sorted(
+                f"{callee.name}={self.summary(callee).digest}"
+                for callee in self._callees(function)
+            )
+            key = _content_key(self.model, function, callee_digests)
+            summary = self.cache.get(key)
+            if summary is None:
+                summary = _FunctionAnalyzer(
+                    self, function, function.body, _parameter_names(function)
+                ).run(function.name)
+                self.cache.put(key, summary)
+        finally:
+            self._in_progress.discard(id(function))
+        self._summaries[id(function)] = summary
+        return summary
+
+    def callee(self, call: ast.Call) -> Optional[Tuple[FunctionNode, FunctionSummary]]:
+        """Resolve a call to a function of this module and its summary."""
+        function = self._resolve_function(call)
+        if function is None:
+            return None
+        return function, self.summary(function)
+
+    def analyze(self) -> List[TaintIssue]:
+        """
+        Find every source-to-sink flow of the module.
+
+        Returns:
+            Flows positioned in the module, in source order
+        """
+        issues: List[TaintIssue] = []
+        module_body = getattr(self.tree, "body", [])
+        module_summary = _FunctionAnalyzer(self, self.tree, module_body, []).run(
+            "<module>"
+        )
+        units: List[Tuple[ast.AST, FunctionSummary]] = [(self.tree, module_summary)]
+        for node in ast.walk(self.tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                units.append((node, self.summary(node)))
+
+        for unit, summary in units:
+            base_line = getattr(unit, "lineno", 1)
+            base_column = getattr(unit, "col_offset", 0)
+            for finding in summary.findings:
+                issues.append(
+                    TaintIssue(
+                        kind=finding.kind,
+                        sink=finding.sink,
+                        line=base_line + finding.line_offset,
+                        column=base_column + finding.column_offset,
+                        end_line=base_line + finding.end_line_offset,
+                        end_column=(
+                            None
+                            if finding.end_column_offset is None
+                            else base_column + finding.end_column_offset
+                        ),
+                        via=finding.via,
+                    )
+                )
+        return sorted(issues, key=lambda issue: (issue.line, issue.column))
+
+    def _callees(self, function: FunctionNode) -> List[FunctionNode]:
+        callees: Dict[int, FunctionNode] = {}
+        for node in _walk_body(function.body):
+            if isinstance(node, ast.Call):
+                callee = self._resolve_function(node)
+                if callee is not None:
+                    callees[id(callee)] = callee
+        return list(callees.values())
+
+    def _resolve_function(self, call: ast.Call) -> Optional[FunctionNode]:
+        if not isinstance(call.func, ast.Name):
+            return None
+        bindings = self.model.resolve(call.func)
+        if len(bindings) != 1 or bindings[0].kind is not BindingKind.FUNCTION:
+            return None
+        node = bindings[0].node
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            return node
+        return None
+
+
+def _walk_body(statements: Iterable[ast.stmt]) -> Iterable[ast.AST]:
+    """Walk statements without entering nested functions and classes."""
+    stack: List[ast.AST] = list(statements)
+    while stack:
+        node = stack.pop()
+        yield node
+        for child in ast.iter_child_nodes(node):
+            if not isinstance(
+                child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+            ):
+                stack.append(child)
+
+
+def _content_key(
+    model: SemanticModel, function: FunctionNode, callee_digests: List[str]
+) -> str:
+    """
+    Cache key of a function: its position-free AST, what its names resolve
+    to and its callees.
+
+    The same code means different things under different imports, so the
+    qualified name of every name the function reads is part of the key.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(CACHE_VERSION).encode("ascii"))
+    digest.update(ast.dump(function, include_attributes=False).encode("utf-8"))
+    resolved = sorted(
+        {
+            f"{node.id}={model.qualified_name(node)}"
+            for node in ast.walk(function)
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load)
+        }
+    )
+    for name in resolved:
+        digest.update(name.encode("utf-8"))
+    for callee in callee_digests:
+        digest.update(callee.encode("utf-8"))
+    return digest.hexdigest()
+
+
+_TREE_ATTRIBUTE = "_ecoguard_taint_issues"
+_default_cache = SummaryCache()
+
+
+def get_default_cache() -> SummaryCache:
+    """Return the summary cache shared by every analyzer of the process."""
+    return _default_cache
+
+
+def get_taint_issues(
+    tree: ast.AST, cache: Optional[SummaryCache] = None
+) -> List[TaintIssue]:
+    """
+    Return the source-to-sink flows of a module, computed once per tree.
+
+    Args:
+        tree: Parsed module
+        cache: Summary cache to use (the process-wide cache by default)
+
+    Returns:
+        Every taint flow of the module
+    """
+    issues: Optional[List[TaintIssue]] = getattr(tree, _TREE_ATTRIBUTE, None)
+    if issues is None:
+        engine = TaintEngine(tree, cache if cache is not None else _default_cache)
+        issues = engine.analyze()
+        setattr(tree, _TREE_ATTRIBUTE, issues)
+    return issues
@@ -0,0 +1,521 @@
+"""
+Shared scope and symbol table for EcoGuard AI rules.
+
+This module builds a semantic model of a parsed module in a single pass:
+scopes (module, class, function, lambda, comprehension), the bindings that
+define names in each scope, and every load resolved to the bindings it
+refers to, following Python's LEGB rules. The model is cached on the tree,
+so every rule analyzing the same file shares one traversal and can answer
+name questions with dictionary lookups.
+"""
+
+import ast
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, List, Optional, Set, Union
+
+_CACHE_ATTRIBUTE = "_ecoguard_semantic_model"
+
+FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+
+class ScopeKind(Enum):
+    """Kinds of scopes that introduce a new namespace."""
+
+    MODULE = "module"
+    CLASS = "class"
+    FUNCTION = "function"
+    LAMBDA = "lambda"
+    COMPREHENSION = "comprehension"
+
+
+class BindingKind(Enum):
+    """How a name was bound."""
+
+    ASSIGNMENT = "assignment"
+    PARAMETER = "parameter"
+    IMPORT = "import"
+    FUNCTION = "function"
+    CLASS = "class"
+    LOOP = "loop"
+    EXCEPTION = "exception"
+    WITH = "with"
+    OTHER = "other"
+
+
+@dataclass(eq=False)
+class Binding:
+    """A single definition of a name in a scope."""
+
+    name: str
+    kind: BindingKind
+    node: ast.AST
+    scope: "Scope"
+    line: int
+    column: int = 0
+    statement: Optional[ast.AST] = None
+    value: Optional[ast.AST] = None
+    qualified_name: Optional[str] = None
+    references: List[ast.AST] = field(default_factory=list)
+
+    @property
+    def used(self) -> bool:
+        """Whether any load in the module resolves to this binding."""
+        return bool(self.references)
+
+
+@dataclass(eq=False)
+class Scope:
+    """A namespace and the names bound and referenced in it."""
+
+    kind: ScopeKind
+    node: ast.AST
+    name: str
+    parent: Optional["Scope"] = None
+    bindings: Dict[str, List[Binding]] = field(default_factory=dict)
+    global_names: Set[str] = field(default_factory=set)
+    nonlocal_names: Set[str] = field(default_factory=set)
+    children: List["Scope"] = field(default_factory=list)
+
+    def lookup(self, name: str) -> List[Binding]:
+        """Return the bindings of ``name`` in this scope only."""
+        return self.bindings.get(name, [])
+
+    def is_referenced(self, name: str) -> bool:
+        """Whether any binding of ``name`` in this scope is used."""
+        return any(binding.used for binding in self.lookup(name))
+
+
+class SemanticModel:
+    """
+    Scopes, bindings and resolved loads of one module.
+
+    Build it with ``get_semantic_model`` so it is computed once per tree.
+    """
+
+    def __init__(self, tree: ast.AST) -> None:
+        self.tree = tree
+        self.scopes: List[Scope] = []
+        self.bindings: List[Binding] = []
+        self.unresolved: List[ast.Name] = []
+        # "from m import *" binds no names it could be found by
+        self.star_imports: List[ast.ImportFrom] = []
+        self._scope_by_node: Dict[int, Scope] = {}
+        self._enclosing_scope: Dict[int, Scope] = {}
+        self._parents: Dict[int, ast.AST] = {}
+        self._resolved: Dict[int, List[Binding]] = {}
+
+        builder = _ModelBuilder(self)
+        builder.build(tree)
+
+    @property
+    def module_scope(self) -> Scope:
+        """The outermost scope of the module."""
+        return self.scopes[0]
+
+    def scope_of(self, node: ast.AST) -> Optional[Scope]:
+        """Return the scope introduced by ``node`` (a function, class, ...)."""
+        return self._scope_by_node.get(id(node))
+
+    def enclosing_scope(self, node: ast.AST) -> Scope:
+        """Return the scope in which ``node`` is evaluated."""
+        return self._enclosing_scope.get(id(node), self.module_scope)
+
+    def parent(self, node: ast.AST) -> Optional[ast.AST]:
+        """Return the parent node of ``node`` (None for the root)."""
+        return self._parents.get(id(node))
+
+    def ancestors(self, node: ast.AST) -> List[ast.AST]:
+        """Return the ancestors of ``node``, nearest first."""
+        chain = []
+        current = self.parent(node)
+        while current is not None:
+            chain.append(current)
+            current = self.parent(current)
+        return chain
+
+    def resolve(self, node: ast.Name) -> List[Binding]:
+        """Return the bindings a loaded name refers to (empty if builtin)."""
+        return self._resolved.get(id(node), [])
+
+    def qualified_name(self, node: ast.AST) -> Optional[str]:
+        """
+        Return the dotted name an expression refers to, following imports.
+
+        ``np.mean`` after ``import numpy as np`` gives ``"numpy.mean"`` and a
+        builtin such as ``open`` gives ``"open"``.
+
+        Args:
+            node: A Name or an Attribute chain ending in a Name
+
+        Returns:
+            The qualified name, or None for expressions rooted in anything
+            other than an import or an unresolved (builtin) name
+        """
+        attributes: List[str] = []
+        while isinstance(node, ast.Attribute):
+            attributes.append(node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name):
+            return None
+        bindings = self.resolve(node)
+        if not bindings:
+            root = node.id
+        elif bindings[-1].kind is BindingKind.IMPORT and bindings[-1].qualified_name:
+            root = bindings[-1].qualified_name
+        else:
+            return None
+        return ".".join([root, *reversed(attributes)])
+
+    def scopes_of_kind(self, *kinds: ScopeKind) -> List[Scope]:
+        """Return all scopes of the given kinds in creation order."""
+        return [scope for scope in self.scopes if scope.kind in kinds]
+
+    def imports(self) -> List[Binding]:
+        """Return every import binding in the module."""
+        return [b for b in self.bindings if b.kind is BindingKind.IMPORT]
+
+    def import_statements(self) -> List[ast.stmt]:
+        """Return every import statement in the module, star imports included."""
+        statements = {id(b.statement): b.statement for b in self.imports()}
+        statements.update((id(node), node) for node in self.star_imports)
+        return sorted(
+            (node for node in statements.values() if isinstance(node, ast.stmt)),
+            key=lambda node: (node.lineno, node.col_offset),
+        )
+
+
+def get_semantic_model(tree: ast.AST) -> SemanticModel:
+    """
+    Return the semantic model of ``tree``, building it on first use.
+
+    Args:
+        tree: Parsed module
+
+    Returns:
+        SemanticModel cached on the tree
+    """
+    model: Optional[SemanticModel] = getattr(tree, _CACHE_ATTRIBUTE, None)
+    if model is None:
+        model = SemanticModel(tree)
+        setattr(tree, _CACHE_ATTRIBUTE, model)
+    return model
+
+
+class _ModelBuilder(ast.NodeVisitor):
+    """Single traversal that fills a SemanticModel."""
+
+    def __init__(self, model: SemanticModel) -> None:
+        self.model = model
+        self.scope: Scope
+        self.statement: Optional[ast.AST] = None
+        self.loads: List[ast.Name] = []
+
+    def build(self, tree: ast.AST) -> None:
+        self.scope = self._new_scope(ScopeKind.MODULE, tree, "<module>", None)
+        self.visit(tree)
+        self._bind_dunder_all()
+        for load in self.loads:
+            self._resolve(load)
+
+    # Scope management
+
+    def _new_scope(
+        self, kind: ScopeKind, node: ast.AST, name: str, parent: Optional[Scope]
+    ) -> Scope:
+        scope = Scope(kind=kind, node=node, name=name, parent=parent)
+        if parent is not None:
+            parent.children.append(scope)
+        self.model.scopes.append(scope)
+        self.model._scope_by_node[id(node)] = scope
+        return scope
+
+    def _bind(
+        self,
+        name: str,
+        kind: BindingKind,
+        node: ast.AST,
+        value: Optional[ast.AST] = None,
+        qualified_name: Optional[str] = None,
+        line: Optional[int] = None,
+    ) -> None:
+        scope = self.scope
+        if name in scope.global_names:
+            scope = self.model.module_scope
+        elif name in scope.nonlocal_names:
+            scope = self._nonlocal_target(scope, name) or scope
+        binding = Binding(
+            name=name,
+            kind=kind,
+            node=node,
+            scope=scope,
+            line=line if line is not None else getattr(node, "lineno", 1),
+            column=getattr(node, "col_offset", 0),
+            statement=self.statement,
+            value=value,
+            qualified_name=qualified_name,
+        )
+        scope.bindings.setdefault(name, []).append(binding)
+        self.model.bindings.append(binding)
+
+    def _nonlocal_target(self, scope: Scope, name: str) -> Optional[Scope]:
+        current = scope.parent
+        while current is not None and current.kind is not ScopeKind.MODULE:
+            if current.kind is not ScopeKind.CLASS and name in current.bindings:
+                return current
+            current = current.parent
+        return None
+
+    # Generic traversal
+
+    def visit(self, node: ast.AST) -> None:
+        parents = self.model._parents
+        for child in ast.iter_child_nodes(node):
+            parents[id(child)] = node
+        self.model._enclosing_scope[id(node)] = self.scope
+        previous_statement = self.statement
+        if isinstance(node, ast.stmt):
+            self.statement = node
+        super().visit(node)
+        self.statement = previous_statement
+
+    def visit_Global(self, node: ast.Global) -> None:
+        self.scope.global_names.update(node.names)
+
+    def visit_Nonlocal(self, node: ast.Nonlocal) -> None:
+        self.scope.nonlocal_names.update(node.names)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if isinstance(node.ctx, ast.Store):
+            self._bind(
+                node.id, self._store_kind(node), node, self._assigned_value(node)
+            )
+        else:
+            # Loads and deletes both count as references
+            self.loads.append(node)
+
+    def _store_kind(self, node: ast.Name) -> BindingKind:
+        if self.scope.kind is ScopeKind.COMPREHENSION:
+            return BindingKind.LOOP
+        statement = self.statement
+        if isinstance(statement, (ast.For, ast.AsyncFor)):
+            return BindingKind.LOOP
+        if isinstance(statement, (ast.With, ast.AsyncWith)):
+            return BindingKind.WITH
+        return BindingKind.ASSIGNMENT
+
+    def _assigned_value(self, node: ast.Name) -> Optional[ast.AST]:
+        parent = self.model.parent(node)
+        if isinstance(parent, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            return parent.value
+        if isinstance(parent, ast.NamedExpr):
+            return parent.value
+        return None
+
+    # Definitions
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            if alias.asname:
+                name, qualified = alias.asname, alias.name
+            else:
+                # "import a.b" binds "a"
+                name = qualified = alias.name.split(".")[0]
+            self._bind(
+                name, BindingKind.IMPORT, alias, None, qualified, line=node.lineno
+            )
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module = "." * node.level + (node.module or "")
+        for alias in node.names:
+            if alias.name == "*":
+                self.model.star_imports.append(node)
+                continue
+            qualified = f"{module}.{alias.name}" if module else alias.name
+            self._bind(
+                alias.asname or alias.name,
+                BindingKind.IMPORT,
+                alias,
+                None,
+                qualified,
+                line=node.lineno,
+            )
+
+    def _visit_arguments(self, args: ast.arguments) -> None:
+        """Visit defaults and annotations, which run in the enclosing scope."""
+        for default in list(args.defaults) + [d for d in args.kw_defaults if d]:
+            self.visit(default)
+        for arg in self._all_args(args):
+            if arg.annotation is not None:
+                self.visit(arg.annotation)
+
+    @staticmethod
+    def _all_args(args: ast.arguments) -> List[ast.arg]:
+        all_args = list(getattr(args, "posonlyargs", [])) + list(args.args)
+        if args.vararg:
+            all_args.append(args.vararg)
+        all_args.extend(args.kwonlyargs)
+        if args.kwarg:
+            all_args.append(args.kwarg)
+        return all_args
+
+    def _visit_function(self, node: FunctionNode) -> None:
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        self._visit_arguments(node.args)
+        if node.returns is not None:
+            self.visit(node.returns)
+        self._bind(node.name, BindingKind.FUNCTION, node, node)
+
+        outer = self.scope
+        self.scope = self._new_scope(ScopeKind.FUNCTION, node, node.name, outer)
+        for arg in self._all_args(node.args):
+            self._register_child(node, arg)
+            self._bind(arg.arg, BindingKind.PARAMETER, arg)
+        for stmt in node.body:
+            self.visit(stmt)
+        self.scope = outer
+
+    def _register_child(self, parent: ast.AST, child: ast.AST) -> None:
+        self.model._parents.setdefault(id(child), parent)
+        self.model._enclosing_scope[id(child)] = self.scope
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._visit_function(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self._visit_function(node)
+
+    def visit_Lambda(self, node: ast.Lambda) -> None:
+        self._visit_arguments(node.args)
+        outer = self.scope
+        self.scope = self._new_scope(ScopeKind.LAMBDA, node, "<lambda>", outer)
+        for arg in self._all_args(node.args):
+            self._register_child(node, arg)
+            self._bind(arg.arg, BindingKind.PARAMETER, arg)
+        self.visit(node.body)
+        self.scope = outer
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        for expr in node.decorator_list + node.bases:
+            self.visit(expr)
+        for keyword in node.keywords:
+            self.visit(keyword)
+        self._bind(node.name, BindingKind.CLASS, node, node)
+
+        outer = self.scope
+        self.scope = self._new_scope(ScopeKind.CLASS, node, node.name, outer)
+        for stmt in node.body:
+            self.visit(stmt)
+        self.scope = outer
+
+    def _visit_comprehension(self, node: ast.AST, elements: List[ast.AST]) -> None:
+        generators: List[ast.comprehension] = getattr(node, "generators")
+        # The first iterable is evaluated in the enclosing scope
+        self.visit(generators[0].iter)
+
+        outer = self.scope
+        self.scope = self._new_scope(
+            ScopeKind.COMPREHENSION, node, f"<{type(node).__name__.lower()}>", outer
+        )
+        for index, generator in enumerate(generators):
+            self.model._parents[id(generator)] = node
+            self.model._enclosing_scope[id(generator)] = self.scope
+            self.model._parents[id(generator.target)] = generator
+            self.model._parents[id(generator.iter)] = generator
+            if index > 0:
+                self.visit(generator.iter)
+            self.visit(generator.target)
+            for condition in generator.ifs:
+                self.model._parents[id(condition)] = generator
+                self.visit(condition)
+        for element in elements:
+            self.visit(element)
+        self.scope = outer
+
+    def visit_ListComp(self, node: ast.ListComp) -> None:
+        self._visit_comprehension(node, [node.elt])
+
+    def visit_SetComp(self, node: ast.SetComp) -> None:
+        self._visit_comprehension(node, [node.elt])
+
+    def visit_GeneratorExp(self, node: ast.GeneratorExp) -> None:
+        self._visit_comprehension(node, [node.elt])
+
+    def visit_DictComp(self, node: ast.DictComp) -> None:
+        self._visit_comprehension(node, [node.key, node.value])
+
+    def visit_NamedExpr(self, node: ast.NamedExpr) -> None:
+        self.visit(node.value)
+        # Walrus targets bind in the nearest non-comprehension scope
+        outer = self.scope
+        while self.scope.kind is ScopeKind.COMPREHENSION and self.scope.parent:
+            self.scope = self.scope.parent
+        self.visit(node.target)
+        self.scope = outer
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler) -> None:
+        if node.type is not None:
+            self.visit(node.type)
+        if node.name:
+            self._bind(node.name, BindingKind.EXCEPTION, node)
+        for stmt in node.body:
+            self.visit(stmt)
+
+    def visit_MatchAs(self, node: ast.AST) -> None:
+        self.generic_visit(node)
+        name = getattr(node, "name", None)
+        if name:
+            self._bind(name, BindingKind.OTHER, node)
+
+    def visit_MatchStar(self, node: ast.AST) -> None:
+        name = getattr(node, "name", None)
+        if name:
+            self._bind(name, BindingKind.OTHER, node)
+
+    def visit_MatchMapping(self, node: ast.AST) -> None:
+        self.generic_visit(node)
+        rest = getattr(node, "rest", None)
+        if rest:
+            self._bind(rest, BindingKind.OTHER, node)
+
+    # Resolution
+
+    def _bind_dunder_all(self) -> None:
+        """Treat names exported through ``__all__`` as used."""
+        module = self.model.module_scope
+        for binding in module.lookup("__all__"):
+            if isinstance(binding.value, (ast.List, ast.Tuple)):
+                for element in binding.value.elts:
+                    if isinstance(element, ast.Constant) and isinstance(
+                        element.value, str
+                    ):
+                        for target in module.lookup(element.value):
+                            target.references.append(element)
+
+    def _resolve(self, node: ast.Name) -> None:
+        scope = self.model.enclosing_scope(node)
+        target = self._lookup_scope(scope, node.id)
+        if target is None:
+            self.model.unresolved.append(node)
+            return
+        bindings = target.bindings[node.id]
+        for binding in bindings:
+            binding.references.append(node)
+        self.model._resolved[id(node)] = bindings
+
+    def _lookup_scope(self, scope: Scope, name: str) -> Optional[Scope]:
+        if name in scope.global_names:
+            module = self.model.module_scope
+            return module if name in module.bindings else None
+        if name in scope.nonlocal_names:
+            return self._nonlocal_target(scope, name)
+        if name in scope.bindings:
+            return scope
+        current = scope.parent
+        while current is not None:
+            # Class bodies are not visible from nested scopes
+            if current.kind is not ScopeKind.CLASS and name in current.bindings:
+                return current
+            current = current.parent
+        return None
@@ -4,18 +4,21 @@ Command-line interface for EcoGuard AI.
 This module provides the main entry point for the EcoGuard AI command-line tool.
 """
 
+import json
 import sys
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import click
 from rich.console import Console
 from rich.table import Table
 from rich.text import Text
 
+from ecoguard_ai.analyzers.registry import get_registry
 from ecoguard_ai.core.analyzer import AnalysisConfig, EcoGuardAnalyzer
 from ecoguard_ai.core.issue import Category, Severity
 from ecoguard_ai.core.result import AnalysisResult, ProjectAnalysisResult
+from ecoguard_ai.core.sharding import parse_shard
 
 console = Console()
 
@@ -81,6 +84,30 @@ def cli() -> None:
     type=click.Path(exists=True),
     help="Configuration file path",
 )
+@click.option(
+    "--changed",
+    multiple=True,
+    type=click.Path(),
+    help="Only analyze these files and the files that import them "
+    "(repeatable; PATH must be a directory)",
+)
+@click.option(
+    "--import-graph",
+    type=click.Path(),
+    help="File to keep the import graph in between runs",
+)
+@click.option(
+    "--shard",
+    help="Only analyze shard INDEX/COUNT of the directory (e.g. 2/4); "
+    "combine the JSON outputs with 'ecoguard merge'",
+)
+@click.option(
+    "--oversized",
+    type=click.Choice(["fast", "skip", "full"]),
+    default="fast",
+    help="How to analyze files over the size limits: text-only rules, "
+    "not at all, or fully",
+)
 def analyze(
     path: str,
     output: Optional[str],
@@ -95,6 +122,10 @@ def analyze(
     enable_pattern_analysis: bool,
     enable_complexity_metrics: bool,
     config: Optional[str],
+    changed: Tuple[str, ...],
+    import_graph: Optional[str],
+    shard: Optional[str],
+    oversized: str,
 ) -> None:
     """
     Analyze Python code for quality, security, and sustainability issues.
@@ -116,6 +147,8 @@ def analyze(
             ast_research_depth=ast_depth,
             enable_pattern_analysis=enable_pattern_analysis,
             enable_complexity_metrics=enable_complexity_metrics,
+            import_graph_file=import_graph,
+            oversized_file_mode=oversized,
         )
 
         # Load config file if provided
@@ -147,8 +180,16 @@ def analyze(
         if path_obj.is_file():
             result = analyzer.analyze_file(path_obj)
             _display_single_result(result, output_format, output)
+        elif shard:
+            index, count = parse_shard(shard)
+            project_result = analyzer.analyze_shard(path_obj, index, count)
+            results = project_result.file_results
+            _display_project_result(project_result, output_format, output)
         else:
-            results = analyzer.analyze_directory(path_obj)
+            if changed:
+                results = analyzer.analyze_changed(path_obj, changed)
+            else:
+                results = analyzer.analyze_directory(path_obj)
             project_result = ProjectAnalysisResult(
                 project_path=str(path_obj), file_results=results
             )
@@ -167,6 +208,43 @@ def analyze(
         sys.exit(1)
 
 
+@cli.command()
+@click.argument("reports", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("--output", "-o", help="Output file path")
+@click.option(
+    "--format",
+    "-f",
+    "output_format",
+    type=click.Choice(["json", "text", "table"]),
+    default="table",
+    help="Output format",
+)
+def merge(reports: Tuple[str, ...], output: Optional[str], output_format: str) -> None:
+    """
+    Merge the JSON results of 'ecoguard analyze --shard' into one result.
+
+    Cross-file checks such as duplicate detection run across all shards.
+    """
+    try:
+        shards = [
+            ProjectAnalysisResult.from_json(Path(report).read_text(encoding="utf-8"))
+            for report in reports
+        ]
+        project_result = EcoGuardAnalyzer().merge_shards(shards)
+    except Exception as e:
+        console.print(f"[red]Error: {str(e)}[/red]")
+        sys.exit(1)
+
+    missing = project_result.metadata.get("shards", {}).get("missing")
+    # Keep JSON on stdout parseable
+    if missing and (output or output_format != "json"):
+        console.print(
+            f"[yellow]⚠[/yellow] Missing shard(s): {', '.join(map(str, missing))}"
+        )
+    _display_project_result(project_result, output_format, output)
+    sys.exit(1 if project_result.has_errors() else 0)
+
+
 @cli.command()
 def version() -> None:
     """Show EcoGuard AI version information."""
@@ -178,13 +256,215 @@ def version() -> None:
 @cli.command()
 def rules() -> None:
     """List all available analysis rules."""
-    console.print("[blue]Available Analysis Rules[/blue]")
+    # Only the registry metadata is read; no rule module gets imported
+    table = Table(title="Available Analysis Rules")
+    table.add_column("Rule", style="cyan")
+    table.add_column("Analyzer", style="blue")
+    table.add_column("Severity")
+    table.add_column("Name")
+
+    for spec in get_registry().rules:
+        table.add_row(spec.rule_id, spec.analyzer, spec.severity, spec.name)
+
+    console.print(table)
+
+
+@cli.command()
+@click.option("--host", default="127.0.0.1", help="Interface to listen on")
+@click.option("--port", "-p", default=8765, type=int, help="Port to listen on")
+@click.option("--workers", "-w", type=int, help="Number of analyzer processes")
+@click.option(
+    "--batch-size", default=32, type=int, help="Most files analyzed in one batch"
+)
+@click.option(
+    "--batch-window-ms",
+    default=5.0,
+    type=float,
+    help="How long to wait for concurrent requests to join a batch",
+)
+@click.option(
+    "--queue-size",
+    default=256,
+    type=int,
+    help="Requests that may wait before new ones get 503",
+)
+@click.option("--verbose", "-v", is_flag=True, help="Log every request")
+def serve(
+    host: str,
+    port: int,
+    workers: Optional[int],
+    batch_size: int,
+    batch_window_ms: float,
+    queue_size: int,
+    verbose: bool,
+) -> None:
+    """
+    Run a local HTTP/JSON analysis service.
+
+    POST source code to /analyze; GET /metrics for throughput and latency.
+    """
+    from ecoguard_ai.server import BatchingAnalysisService, create_server
+
+    config = AnalysisConfig(max_workers=workers or AnalysisConfig().max_workers)
+    service = BatchingAnalysisService(
+        config,
+        max_batch_size=batch_size,
+        batch_window=batch_window_ms / 1000,
+        queue_size=queue_size,
+    )
+    server = create_server(host, port, service=service, verbose=verbose)
+    console.print(
+        f"[green]✓[/green] EcoGuard AI serving on http://{host}:"
+        f"{server.server_address[1]} ({service.workers} workers)"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+
+
+@cli.group()
+def store() -> None:
+    """Keep analysis results in a SQLite database for trend queries."""
+    pass
+
+
+@store.command("ingest")
+@click.argument("database", type=click.Path())
+@click.argument("reports", nargs=-1, required=True, type=click.Path(exists=True))
+def store_ingest(database: str, reports: Tuple[str, ...]) -> None:
+    """
+    Add JSON reports written by 'ecoguard analyze --format json'.
+
+    All REPORTS are stored in one transaction; runs already in DATABASE
+    are skipped.
+    """
+    from ecoguard_ai.core.store import ResultStore
+
+    try:
+        results = [_load_report(Path(report)) for report in reports]
+        with ResultStore(database) as result_store:
+            run_ids = result_store.add_runs(results)
+    except Exception as e:
+        console.print(f"[red]Error: {str(e)}[/red]")
+        sys.exit(1)
+
+    added = sum(1 for run_id in run_ids if run_id is not None)
     console.print(
-        "\n[yellow]Note:[/yellow] Rules will be implemented in upcoming stages:"
+        f"[green]Stored {added} run(s)[/green], "
+        f"{len(run_ids) - added} already present"
     )
-    console.print("• Stage 1: Quality and Green Software rules")
-    console.print("• Stage 2: Security and AI Code rules")
-    console.print("• Stage 3+: Advanced rules and custom rule support")
+
+
+@store.command("rule-trend")
+@click.argument("database", type=click.Path(exists=True))
+@click.option("--rule", "rule_id", help="Only this rule")
+@click.option("--project", help="Only runs of this project path")
+@click.option("--since", help="Only runs at or after this ISO date")
+@click.option("--until", help="Only runs before this ISO date")
+@click.option(
+    "--format",
+    "-f",
+    "output_format",
+    type=click.Choice(["json", "table"]),
+    default="table",
+    help="Output format",
+)
+def store_rule_trend(
+    database: str,
+    rule_id: Optional[str],
+    project: Optional[str],
+    since: Optional[str],
+    until: Optional[str],
+    output_format: str,
+) -> None:
+    """Show issue counts per rule over time."""
+    from ecoguard_ai.core.store import ResultStore
+
+    with ResultStore(database) as result_store:
+        rows = result_store.rule_trend(rule_id, project, since, until)
+    _display_store_rows(
+        rows,
+        ["analysis_time", "project_path", "rule_id", "count"],
+        "Issues per Rule",
+        output_format,
+    )
+
+
+@store.command("scores")
+@click.argument("database", type=click.Path(exists=True))
+@click.option("--project", help="Only runs of this project path")
+@click.option("--since", help="Only runs at or after this ISO date")
+@click.option("--until", help="Only runs before this ISO date")
+@click.option(
+    "--format",
+    "-f",
+    "output_format",
+    type=click.Choice(["json", "table"]),
+    default="table",
+    help="Output format",
+)
+def store_scores(
+    database: str,
+    project: Optional[str],
+    since: Optional[str],
+    until: Optional[str],
+    output_format: str,
+) -> None:
+    """Show the green and security score history."""
+    from ecoguard_ai.core.store import ResultStore
+
+    with ResultStore(database) as result_store:
+        rows = result_store.score_history(project, since, until)
+    _display_store_rows(
+        rows,
+        [
+            "analysis_time",
+            "project_path",
+            "total_issues",
+            "green_score",
+            "security_score",
+        ],
+        "Score History",
+        output_format,
+    )
+
+
+def _load_report(path: Path) -> ProjectAnalysisResult:
+    """Read a project or single-file JSON report as a project result."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if "file_results" in data:
+        return ProjectAnalysisResult.from_dict(data)
+    result = AnalysisResult.from_dict(data)
+    return ProjectAnalysisResult(
+        project_path=result.file_path,
+        file_results=[result],
+        analysis_time=result.analysis_time,
+    )
+
+
+def _display_store_rows(
+    rows: List[Dict[str, Any]], columns: List[str], title: str, output_format: str
+) -> None:
+    """Print query results from the results store."""
+    if output_format == "json":
+        click.echo(json.dumps(rows, indent=2))
+        return
+
+    table = Table(title=title)
+    for column in columns:
+        table.add_column(column.replace("_", " ").title())
+    for row in rows:
+        table.add_row(
+            *(
+                f"{row[c]:.1f}" if isinstance(row[c], float) else str(row[c])
+                for c in columns
+            )
+        )
+    console.print(table)
 
 
 def _display_single_result(
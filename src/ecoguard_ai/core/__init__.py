@@ -1,11 +1,13 @@
 """Core module initialization."""
 
 from ecoguard_ai.core.analyzer import AnalysisConfig, EcoGuardAnalyzer
+from ecoguard_ai.core.async_analyzer import AsyncEcoGuardAnalyzer
 from ecoguard_ai.core.issue import Category, Fix, Impact, Issue, Severity
 from ecoguard_ai.core.result import AnalysisResult, ProjectAnalysisResult
 
 __all__ = [
     "EcoGuardAnalyzer",
+    "AsyncEcoGuardAnalyzer",
     "AnalysisConfig",
     "Issue",
     "Severity",
@@ -6,13 +6,26 @@ that power all EcoGuard AI analyzers.
 """
 
 import ast
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
-
-from ecoguard_ai.analyzers.base import BaseAnalyzer
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from ecoguard_ai.analyzers.base import BaseAnalyzer, project_run
+from ecoguard_ai.analyzers.context import AnalysisContext, LineIndex
+from ecoguard_ai.analyzers.registry import get_registry
+from ecoguard_ai.core.gating import GateDecision, gate_file_size, gate_source
+from ecoguard_ai.core.import_graph import (
+    ImportGraph,
+    file_stamp,
+    import_names,
+    module_name,
+    statement_imports,
+)
 from ecoguard_ai.core.issue import Issue
-from ecoguard_ai.core.result import AnalysisResult
+from ecoguard_ai.core.parallel import analyze_source_task, get_process_pool
+from ecoguard_ai.core.result import AnalysisResult, ProjectAnalysisResult
+from ecoguard_ai.core.sharding import shard_files
 
 
 @dataclass
@@ -37,6 +50,9 @@ class AnalysisConfig:
     enable_green: bool = True
     enable_ai_code: bool = True
 
+    # Rule ids to switch off; disabled rules are never imported
+    disabled_rules: List[str] = field(default_factory=list)
+
     # AST Research capabilities (Phase 1 Stage 3 Integration)
     enable_ast_research: bool = False
     ast_research_depth: str = "basic"  # basic, detailed, comprehensive
@@ -50,10 +66,104 @@ class AnalysisConfig:
     # Severity thresholds
     min_severity: str = "info"  # debug, info, warning, error, critical
 
+    # Import graph kept between runs for incremental analysis
+    import_graph_file: Optional[str] = None
+
     # Performance settings
     max_workers: int = 4
     timeout_seconds: int = 300
 
+    # Files over any of these limits (None disables a limit) are analyzed
+    # according to oversized_file_mode: fast, skip or full
+    max_file_bytes: Optional[int] = 1_000_000
+    max_file_lines: Optional[int] = 20_000
+    max_estimated_nodes: Optional[int] = 300_000
+    oversized_file_mode: str = "fast"
+
+
+def check_source_file(file_path: Path) -> None:
+    """
+    Make sure a path names an existing Python file.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is not a ``.py`` file
+    """
+    if not file_path.exists():
+        raise FileNotFoundError(f"File not found: {file_path}")
+
+    if not file_path.suffix == ".py":
+        raise ValueError(f"Only Python files are supported: {file_path}")
+
+
+def read_source(file_path: Path) -> Tuple[str, int]:
+    """
+    Read a Python file for analysis.
+
+    Args:
+        file_path: Path to the Python file
+
+    Returns:
+        Tuple of the source code and the file size in bytes
+    """
+    return file_path.read_text(encoding="utf-8"), file_path.stat().st_size
+
+
+def analysis_error_result(file_path: str, error: Exception) -> AnalysisResult:
+    """Build the result of a file whose analysis failed unexpectedly."""
+    error_issue = Issue(
+        rule_id="analysis_error",
+        category="system",
+        severity="error",
+        message=f"Analysis failed: {str(error)}",
+        line=1,
+        column=1,
+        file_path=file_path,
+    )
+    return AnalysisResult(
+        file_path=file_path,
+        issues=[error_issue],
+        metadata={"error": "analysis_error"},
+    )
+
+
+def file_error_result(file_path: str, error: Exception) -> AnalysisResult:
+    """Build the result of a file that could not be analyzed in a batch."""
+    return AnalysisResult(
+        file_path=file_path,
+        issues=[
+            Issue(
+                rule_id="file_error",
+                category="system",
+                severity="error",
+                message=f"Failed to analyze file: {str(error)}",
+                line=1,
+                column=1,
+                file_path=file_path,
+            )
+        ],
+        metadata={"error": "file_error"},
+    )
+
+
+def skipped_file_result(file_path: str, decision: GateDecision) -> AnalysisResult:
+    """Build the result of a file skipped for being too large."""
+    return AnalysisResult(
+        file_path=file_path,
+        issues=[
+            Issue(
+                rule_id="file_skipped",
+                category="system",
+                severity="info",
+                message=decision.message,
+                line=1,
+                column=1,
+                file_path=file_path,
+            )
+        ],
+        metadata={"file_path": file_path, "gating": decision.to_dict()},
+    )
+
 
 class EcoGuardAnalyzer:
     """
@@ -66,6 +176,11 @@ class EcoGuardAnalyzer:
     def __init__(self, config: Optional[AnalysisConfig] = None):
         self.config = config or AnalysisConfig()
         self._analyzers: List[BaseAnalyzer] = []
+        self.import_graph = (
+            ImportGraph.load(self.config.import_graph_file)
+            if self.config.import_graph_file
+            else ImportGraph()
+        )
 
         # Initialize AST research capabilities if enabled
         self.ast_explorer = None
@@ -73,7 +188,8 @@ class EcoGuardAnalyzer:
             try:
                 from ecoguard_ai.research.ast_analysis import ASTExplorer
 
-                self.ast_explorer = ASTExplorer()
+                # Shared by every analyze_file call, so keep no history
+                self.ast_explorer = ASTExplorer(keep_history=False)
             except ImportError:
                 # AST research module not available, continue without it
                 pass
@@ -82,26 +198,14 @@ class EcoGuardAnalyzer:
 
     def _initialize_analyzers(self) -> None:
         """Initialize and register all available analyzers."""
-        # This will be expanded as we implement specific analyzers
-        if self.config.enable_quality:
-            from ecoguard_ai.analyzers.quality import QualityAnalyzer
-
-            self._analyzers.append(QualityAnalyzer())
-
-        if self.config.enable_security:
-            from ecoguard_ai.analyzers.security import SecurityAnalyzer
-
-            self._analyzers.append(SecurityAnalyzer())
-
-        if self.config.enable_green:
-            from ecoguard_ai.analyzers.green import GreenAnalyzer
-
-            self._analyzers.append(GreenAnalyzer())
-
-        if self.config.enable_ai_code:
-            from ecoguard_ai.analyzers.ai_code import AICodeAnalyzer
-
-            self._analyzers.append(AICodeAnalyzer())
+        for spec in get_registry().analyzers:
+            # Built-in analyzers have an enable_<name> switch; plugins are on
+            if not getattr(self.config, f"enable_{spec.name}", True):
+                continue
+            analyzer = spec.load()
+            for rule_id in self.config.disabled_rules:
+                analyzer.disable_rule(rule_id)
+            self._analyzers.append(analyzer)
 
     def analyze_file(self, file_path: Union[str, Path]) -> AnalysisResult:
         """
@@ -114,61 +218,61 @@ class EcoGuardAnalyzer:
             AnalysisResult containing all issues found
         """
         file_path = Path(file_path)
+        check_source_file(file_path)
 
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        try:
+            # Skipped files are never read
+            decision = gate_file_size(self.config, file_path.stat().st_size)
+            if decision is not None and decision.mode == "skip":
+                return skipped_file_result(str(file_path), decision)
+            source_code, file_size = read_source(file_path)
+        except Exception as e:
+            return analysis_error_result(str(file_path), e)
+        return self.analyze_source(source_code, str(file_path), file_size)
+
+    def analyze_source(
+        self,
+        source_code: str,
+        virtual_path: Union[str, Path] = "<string>",
+        file_size: Optional[int] = None,
+    ) -> AnalysisResult:
+        """
+        Analyze source code held in memory, without touching the filesystem.
+
+        Args:
+            source_code: Python source to analyze
+            virtual_path: Path reported in the result and its issues; it
+                does not need to exist
+            file_size: Size of the file in bytes; defaults to the size of
+                the UTF-8 encoded source
 
-        if not file_path.suffix == ".py":
-            raise ValueError(f"Only Python files are supported: {file_path}")
+        Returns:
+            AnalysisResult containing all issues found
+        """
+        file_path = str(virtual_path)
+        if file_size is None:
+            file_size = len(source_code.encode("utf-8"))
 
         try:
-            # Read and parse the file
-            source_code = file_path.read_text(encoding="utf-8")
-            tree = ast.parse(source_code, filename=str(file_path))
+            gated = self._gated_result(source_code, file_path, file_size)
+            if gated is not None:
+                return gated
 
-            # Enhanced AST analysis if research is enabled
-            ast_research_data = {}
-            if self.ast_explorer and self.config.enable_ast_research:
-                try:
-                    # Perform comprehensive AST analysis
-                    ast_metrics = self.ast_explorer.analyze_code(
-                        source_code, f"Analysis of {file_path.name}"
-                    )
+            tree = ast.parse(source_code, filename=file_path)
 
-                    # Collect pattern analysis if enabled
-                    if self.config.enable_pattern_analysis:
-                        patterns = self.ast_explorer.find_specific_patterns(
-                            source_code,
-                            [
-                                "function_def",
-                                "class_def",
-                                "import",
-                                "loop",
-                                "comprehension",
-                            ],
-                        )
-                        ast_research_data["patterns"] = patterns
-
-                    # Add complexity metrics to research data
-                    if self.config.enable_complexity_metrics:
-                        ast_research_data["complexity_metrics"] = (
-                            ast_metrics.complexity_metrics
-                        )
-                        ast_research_data["max_depth"] = ast_metrics.max_depth
-                        ast_research_data["node_type_counts"] = dict(
-                            ast_metrics.node_type_counts
-                        )
+            # Shared by every analyzer: line index, semantic model, ...
+            context = AnalysisContext.for_tree(tree, source_code, file_path)
 
-                except Exception as e:
-                    # Continue analysis even if AST research fails
-                    ast_research_data["error"] = f"AST research failed: {str(e)}"
+            # Enhanced AST analysis if research is enabled
+            ast_research_data = self._ast_research(source_code, file_path, context)
 
             # Run all analyzers
             all_issues: List[Issue] = []
             metadata: Dict[str, Any] = {
-                "file_path": str(file_path),
-                "file_size": file_path.stat().st_size,
-                "line_count": len(source_code.splitlines()),
+                "file_path": file_path,
+                "file_size": file_size,
+                "line_count": len(context.lines),
+                "imports": statement_imports(context.semantic.import_statements()),
             }
 
             # Add AST research data to metadata if available
@@ -176,11 +280,11 @@ class EcoGuardAnalyzer:
                 metadata["ast_research"] = ast_research_data
 
             for analyzer in self._analyzers:
-                issues = analyzer.analyze(tree, source_code, str(file_path))
+                issues = analyzer.analyze(tree, source_code, file_path)
                 all_issues.extend(issues)
 
             return AnalysisResult(
-                file_path=str(file_path), issues=all_issues, metadata=metadata
+                file_path=file_path, issues=all_issues, metadata=metadata
             )
 
         except SyntaxError as e:
@@ -192,30 +296,127 @@ class EcoGuardAnalyzer:
                 message=f"Syntax error: {e.msg}",
                 line=e.lineno or 1,
                 column=e.offset or 1,
-                file_path=str(file_path),
+                file_path=file_path,
             )
             return AnalysisResult(
-                file_path=str(file_path),
+                file_path=file_path,
                 issues=[syntax_issue],
                 metadata={"error": "syntax_error"},
             )
 
         except Exception as e:
             # Handle other unexpected errors
-            error_issue = Issue(
-                rule_id="analysis_error",
-                category="system",
-                severity="error",
-                message=f"Analysis failed: {str(e)}",
-                line=1,
-                column=1,
-                file_path=str(file_path),
-            )
-            return AnalysisResult(
-                file_path=str(file_path),
-                issues=[error_issue],
-                metadata={"error": "analysis_error"},
-            )
+            return analysis_error_result(file_path, e)
+
+    def _ast_research(
+        self, source_code: str, file_path: str, context: AnalysisContext
+    ) -> Dict[str, Any]:
+        """Collect AST research data of a file, when research is enabled."""
+        ast_research_data: Dict[str, Any] = {}
+        if self.ast_explorer and self.config.enable_ast_research:
+            try:
+                # Perform comprehensive AST analysis
+                ast_metrics = self.ast_explorer.analyze_code(
+                    source_code, f"Analysis of {Path(file_path).name}"
+                )
+
+                # Collect pattern analysis if enabled
+                if self.config.enable_pattern_analysis:
+                    patterns = self.ast_explorer.find_specific_patterns(
+                        source_code,
+                        [
+                            "function_def",
+                            "class_def",
+                            "import",
+                            "loop",
+                            "comprehension",
+                        ],
+                    )
+                    ast_research_data["patterns"] = patterns
+
+                # Add complexity metrics to research data
+                if self.config.enable_complexity_metrics:
+                    ast_research_data["complexity_metrics"] = (
+                        ast_metrics.complexity_metrics
+                    )
+                    # Per-function metrics, shared with the quality rules
+                    ast_research_data["complexity"] = context.complexity.to_dict()
+                    ast_research_data["max_depth"] = ast_metrics.max_depth
+                    ast_research_data["node_type_counts"] = dict(
+                        ast_metrics.node_type_counts
+                    )
+
+            except Exception as e:
+                # Continue analysis even if AST research fails
+                ast_research_data["error"] = f"AST research failed: {str(e)}"
+        return ast_research_data
+
+    def _gated_result(
+        self, source_code: str, file_path: str, file_size: int
+    ) -> Optional[AnalysisResult]:
+        """
+        Handle a file over the size limits without parsing it.
+
+        Returns:
+            The result of a skipped or text-only analysis, or None when the
+            file is within the limits (or they are off) and gets a full one
+        """
+        decision = gate_source(self.config, source_code, file_size)
+        if decision is None:
+            return None
+        if decision.mode == "skip":
+            return skipped_file_result(file_path, decision)
+        return self._analyze_text(source_code, file_path, file_size, decision)
+
+    def _analyze_text(
+        self, source_code: str, file_path: str, file_size: int, decision: GateDecision
+    ) -> AnalysisResult:
+        """Run only the rules that work on the raw text of an oversized file."""
+        all_issues: List[Issue] = []
+        for analyzer in self._analyzers:
+            all_issues.extend(analyzer.scan_text(source_code, file_path))
+        return AnalysisResult(
+            file_path=file_path,
+            issues=all_issues,
+            metadata={
+                "file_path": file_path,
+                "file_size": file_size,
+                "line_count": len(LineIndex(source_code)),
+                "gating": decision.to_dict(),
+            },
+        )
+
+    def analyze_sources(
+        self,
+        sources: Iterable[Tuple[Union[str, Path], str]],
+        parallel: bool = False,
+    ) -> List[AnalysisResult]:
+        """
+        Analyze a batch of in-memory sources as one project run.
+
+        Args:
+            sources: Pairs of (virtual path, source code)
+            parallel: Run the batch on the shared process pool, whose
+                workers keep warm analyzers. Cross-file issues are only
+                reported for in-process runs.
+
+        Returns:
+            List of AnalysisResult objects, in the order of ``sources``
+        """
+        items = [(str(path), source_code) for path, source_code in sources]
+
+        if parallel:
+            executor = get_process_pool(self.config.max_workers)
+            futures = [
+                executor.submit(analyze_source_task, self.config, source_code, path)
+                for path, source_code in items
+            ]
+            return [future.result() for future in futures]
+
+        with self._project_run():
+            results = [self.analyze_source(code, path) for path, code in items]
+        self._apply_project_issues(results)
+        return results
 
     def analyze_directory(self, directory: Union[str, Path]) -> List[AnalysisResult]:
         """
@@ -232,7 +433,164 @@ class EcoGuardAnalyzer:
         if not directory.exists():
             raise FileNotFoundError(f"Directory not found: {directory}")
 
-        # Find all Python files
+        results = self._analyze_files(self._collect_files(directory))
+
+        # Record who imports whom for later incremental runs
+        for result in results:
+            imports = result.metadata.get("imports")
+            if imports is not None:
+                path = Path(result.file_path)
+                self.import_graph.update(
+                    module_name(path, directory),
+                    imports,
+                    file_path=path.resolve(),
+                    stamp=file_stamp(path),
+                    is_package=path.name == "__init__.py",
+                )
+        self._save_import_graph()
+        return results
+
+    def analyze_changed(
+        self,
+        directory: Union[str, Path],
+        changed_files: Iterable[Union[str, Path]],
+    ) -> List[AnalysisResult]:
+        """
+        Analyze changed files and every file that depends on them.
+
+        The import graph is brought up to date first; only files whose size
+        or modification time changed since they were last indexed are
+        parsed for that.
+
+        Args:
+            directory: Project root the module names are relative to
+            changed_files: Files that were edited
+
+        Returns:
+            Results for the reverse-dependency closure of the changed files
+        """
+        directory = Path(directory)
+        if not directory.exists():
+            raise FileNotFoundError(f"Directory not found: {directory}")
+
+        files = self._collect_files(directory)
+        changed_paths = [Path(changed).resolve() for changed in changed_files]
+        # Deleted files are only known before the refresh, new ones after it
+        changed_modules = self._modules_of(changed_paths)
+        self._refresh_import_graph(directory, files)
+        changed_modules |= self._modules_of(changed_paths)
+
+        affected = self.import_graph.reverse_closure(changed_modules)
+
+        targets = [
+            path
+            for path in files
+            if self.import_graph.module_of(path.resolve()) in affected
+        ]
+        self._save_import_graph()
+        return self._analyze_files(targets)
+
+    def analyze_shard(
+        self, directory: Union[str, Path], index: int, count: int
+    ) -> ProjectAnalysisResult:
+        """
+        Analyze one shard of a directory for a scan split across machines.
+
+        Cross-file checks are not finalized here. Their state is stored in
+        the result's metadata, and ``merge_shards`` finishes them once the
+        results of all shards are available. The import graph is left
+        untouched, since a shard only sees part of the project.
+
+        Args:
+            directory: Project root
+            index: 1-based shard index
+            count: Number of shards
+
+        Returns:
+            ProjectAnalysisResult of the files in the shard
+        """
+        directory = Path(directory)
+        if not directory.exists():
+            raise FileNotFoundError(f"Directory not found: {directory}")
+
+        files = shard_files(self._collect_files(directory), index, count, directory)
+        results = self._analyze_files(files, finalize=False)
+        states = {}
+        for analyzer in self._analyzers:
+            state = analyzer.export_project_state()
+            if state:
+                states[analyzer.name] = state
+        return ProjectAnalysisResult(
+            project_path=str(directory),
+            file_results=results,
+            metadata={
+                "shard": {"index": index, "count": count},
+                "project_state": states,
+            },
+        )
+
+    def merge_shards(
+        self, shards: Iterable[ProjectAnalysisResult]
+    ) -> ProjectAnalysisResult:
+        """
+        Combine the results of ``analyze_shard`` into one project result.
+
+        The project state of every shard is loaded into this analyzer's
+        rules, so cross-file checks such as duplicate detection see the
+        whole project.
+
+        Args:
+            shards: Results of the individual shards
+
+        Returns:
+            ProjectAnalysisResult for the whole project
+
+        Raises:
+            ValueError: If no results are given, or they come from
+                different shard counts or repeat a shard
+        """
+        shards = list(shards)
+        if not shards:
+            raise ValueError("No shard results to merge")
+        specs = [shard.metadata.get("shard") or {} for shard in shards]
+        counts = {spec.get("count") for spec in specs}
+        if len(counts) > 1:
+            raise ValueError("Shard results come from different shard counts")
+        indexes = [spec["index"] for spec in specs if "index" in spec]
+        if len(indexes) != len(set(indexes)):
+            raise ValueError("The same shard was given more than once")
+
+        self._reset_project()
+        by_path: Dict[str, AnalysisResult] = {}
+        for shard in shards:
+            for result in shard.file_results:
+                by_path[result.file_path] = result
+            states = shard.metadata.get("project_state") or {}
+            for analyzer in self._analyzers:
+                analyzer.import_project_state(states.get(analyzer.name) or {})
+
+        results = [by_path[path] for path in sorted(by_path)]
+        self._apply_project_issues(results)
+
+        count = counts.pop()
+        metadata: Dict[str, Any] = {}
+        if count:
+            metadata["shards"] = {
+                "count": count,
+                "merged": sorted(indexes),
+                "missing": sorted(set(range(1, count + 1)) - set(indexes)),
+            }
+        return ProjectAnalysisResult(
+            project_path=shards[0].project_path,
+            file_results=results,
+            metadata=metadata,
+            analysis_time=max(
+                shard.analysis_time for shard in shards if shard.analysis_time
+            ),
+        )
+
+    def _collect_files(self, directory: Path) -> List[Path]:
+        """Find the files under ``directory`` matching the include patterns."""
         python_files: List[Path] = []
         for pattern in self.config.include_patterns:
             python_files.extend(directory.rglob(pattern))
@@ -250,30 +608,104 @@ class EcoGuardAnalyzer:
 
             if not exclude:
                 filtered_files.append(file_path)
+        return filtered_files
+
+    def _analyze_files(
+        self, files: List[Path], finalize: bool = True
+    ) -> List[AnalysisResult]:
+        """
+        Analyze a set of files as one project run.
+
+        Args:
+            files: Files to analyze
+            finalize: Report cross-file issues at the end of the run
 
+        Returns:
+            List of AnalysisResult objects for each file
+        """
         # Analyze each file
         results = []
-        for file_path in filtered_files:
-            try:
-                result = self.analyze_file(file_path)
-                results.append(result)
-            except Exception as e:
-                # Log error but continue with other files
-                error_result = AnalysisResult(
-                    file_path=str(file_path),
-                    issues=[
-                        Issue(
-                            rule_id="file_error",
-                            category="system",
-                            severity="error",
-                            message=f"Failed to analyze file: {str(e)}",
-                            line=1,
-                            column=1,
-                            file_path=str(file_path),
-                        )
-                    ],
-                    metadata={"error": "file_error"},
-                )
-                results.append(error_result)
+        with self._project_run():
+            for file_path in files:
+                try:
+                    result = self.analyze_file(file_path)
+                    results.append(result)
+                except Exception as e:
+                    # Log error but continue with other files
+                    results.append(file_error_result(str(file_path), e))
 
+        if finalize:
+            self._apply_project_issues(results)
         return results
+
+    def _reset_project(self) -> None:
+        """Clear the project-wide state of every analyzer."""
+        for analyzer in self._analyzers:
+            analyzer.reset_project()
+
+    @contextmanager
+    def _project_run(self) -> Iterator[None]:
+        """
+        Collect project-wide state from the files analyzed inside the block.
+
+        The state is kept per thread. It starts out empty and is kept after
+        the block, until the thread's next run, for ``finalize_project`` and
+        ``export_project_state``.
+        """
+        self._reset_project()
+        with project_run():
+            yield
+
+    def _modules_of(self, paths: List[Path]) -> Set[str]:
+        """Return the modules the import graph records for some files."""
+        modules = {self.import_graph.module_of(path) for path in paths}
+        return {module for module in modules if module is not None}
+
+    def _refresh_import_graph(self, directory: Path, files: List[Path]) -> None:
+        """Re-index the imports of new and modified files."""
+        graph = self.import_graph
+        present = set()
+        for path in files:
+            resolved = path.resolve()
+            present.add(str(resolved))
+            stamp = file_stamp(path)
+            if graph.is_current(resolved, stamp):
+                continue
+            try:
+                imports = import_names(
+                    ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+                )
+            except (SyntaxError, UnicodeDecodeError, ValueError):
+                imports = []
+            graph.update(
+                module_name(path, directory),
+                imports,
+                file_path=resolved,
+                stamp=stamp,
+                is_package=path.name == "__init__.py",
+            )
+        # Forget deleted files of this project
+        root = directory.resolve()
+        for known in graph.files():
+            if known in present:
+                continue
+            try:
+                Path(known).relative_to(root)
+            except ValueError:
+                continue
+            module = graph.module_of(known)
+            if module is not None:
+                graph.remove(module)
+
+    def _save_import_graph(self) -> None:
+        """Persist the import graph when the config names a file for it."""
+        if self.config.import_graph_file:
+            self.import_graph.save(self.config.import_graph_file)
+
+    def _apply_project_issues(self, results: List[AnalysisResult]) -> None:
+        """Attach cross-file issues from every analyzer to their file results."""
+        by_path = {result.file_path: result for result in results}
+        for analyzer in self._analyzers:
+            for issue in analyzer.finalize_project():
+                if issue.file_path in by_path:
+                    by_path[issue.file_path].issues.append(issue)
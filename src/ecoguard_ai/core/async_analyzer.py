@@ -0,0 +1,167 @@
+"""
+Asyncio interface to the EcoGuard AI analysis engine.
+
+``AsyncEcoGuardAnalyzer`` lets async services analyze code without
+blocking their event loop: files are read in the loop's default thread
+pool, parsing and rule execution run on an executor (by default the
+process pool shared through ``ecoguard_ai.core.parallel``), and a
+semaphore bounds how many analyses are in flight at once.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Optional, Set, Union
+
+from ecoguard_ai.core.analyzer import (
+    AnalysisConfig,
+    analysis_error_result,
+    check_source_file,
+    file_error_result,
+    read_source,
+)
+from ecoguard_ai.core.parallel import analyze_source_task, get_process_pool
+from ecoguard_ai.core.result import AnalysisResult
+
+
+class AsyncEcoGuardAnalyzer:
+    """
+    Coroutine-based counterpart of ``EcoGuardAnalyzer``.
+
+    Every coroutine can be cancelled: work that has not started on the
+    executor yet is dropped. Only per-file issues are reported; cross-file
+    checks need the in-process ``EcoGuardAnalyzer.analyze_directory``.
+    """
+
+    def __init__(
+        self,
+        config: Optional[AnalysisConfig] = None,
+        executor: Optional[Executor] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the async analyzer.
+
+        Args:
+            config: Analysis configuration
+            executor: Executor running the analyses; defaults to the shared
+                process pool sized by ``config.max_workers``
+            max_concurrency: Maximum number of analyses in flight; defaults
+                to ``config.max_workers``
+        """
+        self.config = config or AnalysisConfig()
+        self._executor = executor
+        self.max_concurrency = max(1, max_concurrency or self.config.max_workers)
+        # Created on first use so it belongs to the running event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def executor(self) -> Executor:
+        """Executor the CPU-bound analysis runs on."""
+        if self._executor is None:
+            self._executor = get_process_pool(self.config.max_workers)
+        return self._executor
+
+    def _slots(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def analyze_source(
+        self, source_code: str, file_path: str = "<string>"
+    ) -> AnalysisResult:
+        """
+        Analyze source code held in memory.
+
+        Args:
+            source_code: Python source to analyze
+            file_path: Path reported in the result and its issues
+
+        Returns:
+            AnalysisResult containing all issues found
+        """
+        async with self._slots():
+            return await self._run(source_code, file_path)
+
+    async def analyze_file(self, file_path: Union[str, Path]) -> AnalysisResult:
+        """
+        Analyze a single Python file.
+
+        Args:
+            file_path: Path to the Python file to analyze
+
+        Returns:
+            AnalysisResult containing all issues found
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file is not a ``.py`` file
+        """
+        path = Path(file_path)
+        loop = asyncio.get_running_loop()
+        async with self._slots():
+            await loop.run_in_executor(None, check_source_file, path)
+            try:
+                source_code, file_size = await loop.run_in_executor(
+                    None, read_source, path
+                )
+            except Exception as e:
+                return analysis_error_result(str(path), e)
+            return await self._run(source_code, str(path), file_size)
+
+    async def analyze_paths(
+        self, paths: Iterable[Union[str, Path]]
+    ) -> AsyncIterator[AnalysisResult]:
+        """
+        Analyze many files, yielding each result as soon as it is ready.
+
+        At most ``max_concurrency`` files are scheduled at a time, so large
+        inputs are consumed lazily. Results arrive in completion order.
+        Leaving the loop early or cancelling the consumer cancels the
+        outstanding analyses.
+
+        Args:
+            paths: Python files to analyze
+
+        Yields:
+            AnalysisResult for every file; files that cannot be analyzed
+            give a "file_error" result instead of raising
+        """
+        remaining = iter(paths)
+        pending: Set["asyncio.Future[AnalysisResult]"] = set()
+        try:
+            while True:
+                for path in remaining:
+                    pending.add(asyncio.ensure_future(self._analyze_path(path)))
+                    if len(pending) >= self.max_concurrency:
+                        break
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _analyze_path(self, path: Union[str, Path]) -> AnalysisResult:
+        try:
+            return await self.analyze_file(path)
+        except Exception as e:
+            return file_error_result(str(path), e)
+
+    async def _run(
+        self, source_code: str, file_path: str, file_size: Optional[int] = None
+    ) -> AnalysisResult:
+        """Run one analysis on the executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            analyze_source_task,
+            self.config,
+            source_code,
+            file_path,
+            file_size,
+        )
@@ -0,0 +1,137 @@
+"""
+Size gating of oversized source files.
+
+Generated files (protobuf stubs, large data tables, ...) can be so big that
+parsing them and walking every rule over the tree dominates a whole scan.
+Before a file is parsed it is checked against cheap estimates of its size:
+bytes, lines and the number of AST nodes parsing would create. Files over a
+limit are skipped, or analyzed in fast mode by the rules that only need the
+raw text.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    from ecoguard_ai.core.analyzer import AnalysisConfig
+
+# What to do with files over a limit
+GATING_MODES = ("fast", "skip", "full")
+
+# Names, numbers and operators; every one of them becomes roughly one node
+_NODE_TOKEN = re.compile(r"\w+|[^\w\s,()\[\]{}:;]")
+
+
+@dataclass
+class GateDecision:
+    """Why a file is not analyzed in full, and what is done instead."""
+
+    mode: str  # fast or skip
+    reason: str  # bytes, lines or nodes
+    value: int
+    limit: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the decision to a dictionary for the result metadata."""
+        return {
+            "mode": self.mode,
+            "reason": self.reason,
+            "value": self.value,
+            "limit": self.limit,
+        }
+
+    @property
+    def message(self) -> str:
+        """Human-readable description of the decision."""
+        action = "skipped" if self.mode == "skip" else "analyzed in fast mode"
+        return (
+            f"File {action}: {self.value} {self.reason} exceeds the limit "
+            f"of {self.limit}"
+        )
+
+
+def estimate_node_count(source_code: str) -> int:
+    """
+    Estimate how many AST nodes parsing a source would create.
+
+    Counting tokens with a regular expression is much cheaper than parsing
+    and close enough to decide whether a file is too big.
+
+    Args:
+        source_code: Python source
+
+    Returns:
+        Estimated number of nodes
+    """
+    return sum(1 for _ in _NODE_TOKEN.finditer(source_code))
+
+
+def _check_mode(config: "AnalysisConfig") -> Optional[str]:
+    mode = config.oversized_file_mode
+    if mode not in GATING_MODES:
+        raise ValueError(
+            f"Unknown oversized file mode {mode!r}, expected one of "
+            f"{', '.join(GATING_MODES)}"
+        )
+    return None if mode == "full" else mode
+
+
+def gate_file_size(config: "AnalysisConfig", file_size: int) -> Optional[GateDecision]:
+    """
+    Check a file's size before it is read.
+
+    Args:
+        config: Analysis configuration holding the limits
+        file_size: Size of the file in bytes
+
+    Returns:
+        The decision if the file is over the byte limit, else None
+
+    Raises:
+        ValueError: If the configured mode is unknown
+    """
+    mode = _check_mode(config)
+    limit = config.max_file_bytes
+    if mode is None or limit is None or file_size <= limit:
+        return None
+    return GateDecision(mode, "bytes", file_size, limit)
+
+
+def gate_source(
+    config: "AnalysisConfig", source_code: str, file_size: int
+) -> Optional[GateDecision]:
+    """
+    Check a source before it is parsed, cheapest estimate first.
+
+    Args:
+        config: Analysis configuration holding the limits
+        source_code: Python source
+        file_size: Size of the source in bytes
+
+    Returns:
+        The decision if the source is over a limit, else None
+
+    Raises:
+        ValueError: If the configured mode is unknown
+    """
+    decision = gate_file_size(config, file_size)
+    mode = _check_mode(config)
+    if decision is not None or mode is None:
+        return decision
+
+    limit = config.max_file_lines
+    if limit is not None:
+        # Counted like LineIndex: a trailing newline does not start a line
+        lines = source_code.count("\n")
+        if source_code and not source_code.endswith("\n"):
+            lines += 1
+        if lines > limit:
+            return GateDecision(mode, "lines", lines, limit)
+
+    limit = config.max_estimated_nodes
+    if limit is not None:
+        nodes = estimate_node_count(source_code)
+        if nodes > limit:
+            return GateDecision(mode, "nodes", nodes, limit)
+    return None
@@ -0,0 +1,328 @@
+"""
+Project-wide import graph for EcoGuard AI.
+
+The graph records which module imports which. Module names are interned to
+integers and edges are kept as sorted integer arrays in both directions, so
+the index stays small on large projects and can be updated one file at a
+time. Its main query is the reverse-dependency closure of a set of modules:
+everything that may behave differently after those modules change, which is
+what an incremental run needs to re-analyze.
+"""
+
+import ast
+import json
+import os
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+# Bump when the file format changes so old graphs are rebuilt
+GRAPH_VERSION = 1
+
+# File signature used to detect changes without reading the file
+Stamp = Tuple[int, int]
+
+
+def module_name(file_path: Union[str, Path], root: Union[str, Path]) -> str:
+    """
+    Return the dotted module name of a file relative to a project root.
+
+    Args:
+        file_path: Path to a Python file inside ``root``
+        root: Directory the module names are relative to
+
+    Returns:
+        Module name, e.g. "pkg.sub.mod" (packages are named after their
+        directory)
+    """
+    relative = Path(file_path).resolve().relative_to(Path(root).resolve())
+    parts = list(relative.with_suffix("").parts)
+    if parts and parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def import_names(tree: ast.AST) -> List[str]:
+    """
+    Collect the modules a parsed file imports.
+
+    Relative imports keep their leading dots, since resolving them needs the
+    importing module's name. ``from a import b`` yields both "a" and "a.b"
+    because "b" may be a submodule.
+
+    Args:
+        tree: Parsed module
+
+    Returns:
+        Sorted, de-duplicated import names
+    """
+    return statement_imports(
+        node
+        for node in ast.walk(tree)
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    )
+
+
+def statement_imports(statements: Iterable[ast.stmt]) -> List[str]:
+    """
+    Collect the modules a set of import statements imports.
+
+    Lets callers that already know a file's imports, such as the semantic
+    model, skip the walk over the whole tree done by ``import_names``.
+
+    Args:
+        statements: ``import`` and ``from ... import`` statements
+
+    Returns:
+        Sorted, de-duplicated import names
+    """
+    names: Set[str] = set()
+    for node in statements:
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = "." * node.level + (node.module or "")
+            if node.module:
+                names.add(base)
+            for alias in node.names:
+                if alias.name != "*":
+                    separator = "" if base.endswith(".") or not base else "."
+                    names.add(f"{base}{separator}{alias.name}")
+    return sorted(names)
+
+
+def resolve_import(name: str, importer: str, is_package: bool = False) -> Optional[str]:
+    """
+    Turn an import name into an absolute module name.
+
+    Args:
+        name: Name from ``import_names``, possibly relative
+        importer: Module name of the importing file
+        is_package: Whether the importing file is a package ``__init__``
+
+    Returns:
+        Absolute module name, or None if the relative import escapes the
+        project
+    """
+    level = len(name) - len(name.lstrip("."))
+    if not level:
+        return name
+    parts = importer.split(".") if importer else []
+    if not is_package:
+        parts = parts[:-1]
+    if level - 1 > len(parts):
+        return None
+    parts = parts[: len(parts) - (level - 1)]
+    remainder = name[level:]
+    return ".".join(parts + ([remainder] if remainder else [])) or None
+
+
+def _with_parents(module: str) -> List[str]:
+    """Importing "a.b.c" also imports the packages "a" and "a.b"."""
+    parts = module.split(".")
+    return [".".join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+
+def file_stamp(file_path: Union[str, Path]) -> Stamp:
+    """Return the (mtime_ns, size) signature of a file."""
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ImportGraph:
+    """
+    Incrementally updated index of imports between modules.
+
+    Every module name seen (as a file or as an import target) gets an
+    integer id. Forward edges are stored per module as a sorted array of
+    ids; reverse edges are kept in sync so the importers of a module are a
+    single lookup.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._forward: Dict[int, array] = {}
+        self._reverse: Dict[int, Set[int]] = {}
+        self._files: Dict[int, str] = {}
+        self._modules_by_file: Dict[str, int] = {}
+        self._stamps: Dict[str, Stamp] = {}
+
+    def __len__(self) -> int:
+        """Number of modules backed by a file."""
+        return len(self._files)
+
+    def __contains__(self, module: object) -> bool:
+        module_id = self._ids.get(module) if isinstance(module, str) else None
+        return module_id is not None and module_id in self._files
+
+    @property
+    def modules(self) -> List[str]:
+        """Names of every module backed by a file, sorted."""
+        return sorted(self._names[i] for i in self._files)
+
+    def _intern(self, name: str) -> int:
+        module_id = self._ids.get(name)
+        if module_id is None:
+            module_id = len(self._names)
+            self._ids[name] = module_id
+            self._names.append(name)
+        return module_id
+
+    def update(
+        self,
+        module: str,
+        imports: Iterable[str],
+        file_path: Optional[Union[str, Path]] = None,
+        stamp: Optional[Stamp] = None,
+        is_package: bool = False,
+    ) -> None:
+        """
+        Replace the imports of one module.
+
+        Args:
+            module: Dotted name of the importing module
+            imports: Names from ``import_names`` (relative names allowed)
+            file_path: File the module was read from
+            stamp: ``file_stamp`` of that file when it was read
+            is_package: Whether the file is a package ``__init__``
+        """
+        module_id = self._intern(module)
+        targets: Set[int] = set()
+        for name in imports:
+            resolved = resolve_import(name, module, is_package)
+            if resolved is None:
+                continue
+            for target in _with_parents(resolved):
+                if target != module:
+                    targets.add(self._intern(target))
+
+        for old in self._forward.get(module_id, ()):
+            self._reverse.get(old, set()).discard(module_id)
+        self._forward[module_id] = array("I", sorted(targets))
+        for target_id in targets:
+            self._reverse.setdefault(target_id, set()).add(module_id)
+
+        if file_path is not None:
+            path = str(file_path)
+            self._files[module_id] = path
+            self._modules_by_file[path] = module_id
+            if stamp is not None:
+                self._stamps[path] = stamp
+
+    def remove(self, module: str) -> None:
+        """Forget a module's file and outgoing edges (e.g. after deletion)."""
+        module_id = self._ids.get(module)
+        if module_id is None:
+            return
+        for target_id in self._forward.pop(module_id, ()):
+            self._reverse.get(target_id, set()).discard(module_id)
+        path = self._files.pop(module_id, None)
+        if path is not None:
+            self._modules_by_file.pop(path, None)
+            self._stamps.pop(path, None)
+
+    def imports_of(self, module: str) -> List[str]:
+        """Return the modules ``module`` imports."""
+        module_id = self._ids.get(module)
+        if module_id is None:
+            return []
+        return sorted(self._names[i] for i in self._forward.get(module_id, ()))
+
+    def importers_of(self, module: str) -> List[str]:
+        """Return the modules that import ``module`` directly."""
+        module_id = self._ids.get(module)
+        if module_id is None:
+            return []
+        return sorted(self._names[i] for i in self._reverse.get(module_id, ()))
+
+    def reverse_closure(self, modules: Iterable[str]) -> Set[str]:
+        """
+        Return the modules that depend on any of ``modules``, transitively.
+
+        Args:
+            modules: Changed module names
+
+        Returns:
+            The changed modules plus everything importing them, directly or
+            through other modules
+        """
+        seen: Set[int] = set()
+        queue = deque(self._ids[m] for m in modules if m in self._ids)
+        while queue:
+            module_id = queue.popleft()
+            if module_id in seen:
+                continue
+            seen.add(module_id)
+            queue.extend(self._reverse.get(module_id, ()))
+        return {self._names[i] for i in seen}
+
+    def file_of(self, module: str) -> Optional[str]:
+        """Return the file a module was read from."""
+        module_id = self._ids.get(module)
+        return None if module_id is None else self._files.get(module_id)
+
+    def module_of(self, file_path: Union[str, Path]) -> Optional[str]:
+        """Return the module name recorded for a file."""
+        module_id = self._modules_by_file.get(str(file_path))
+        return None if module_id is None else self._names[module_id]
+
+    def is_current(self, file_path: Union[str, Path], stamp: Stamp) -> bool:
+        """Whether a file is unchanged since its imports were recorded."""
+        return self._stamps.get(str(file_path)) == stamp
+
+    def files(self) -> List[str]:
+        """Return every file in the graph."""
+        return sorted(self._modules_by_file)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the graph to a JSON-compatible dictionary."""
+        return {
+            "version": GRAPH_VERSION,
+            "names": self._names,
+            "forward": {str(i): list(edges) for i, edges in self._forward.items()},
+            "files": {str(i): path for i, path in self._files.items()},
+            "stamps": {path: list(stamp) for path, stamp in self._stamps.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ImportGraph":
+        """Create a graph from a dictionary made by ``to_dict``."""
+        graph = cls()
+        if data.get("version") != GRAPH_VERSION:
+            return graph
+        names: List[str] = list(data["names"])
+        graph._names = names
+        graph._ids = {name: i for i, name in enumerate(names)}
+        for key, edges in data["forward"].items():
+            module_id = int(key)
+            graph._forward[module_id] = array("I", edges)
+            for target_id in edges:
+                graph._reverse.setdefault(target_id, set()).add(module_id)
+        for key, path in data["files"].items():
+            graph._files[int(key)] = path
+            graph._modules_by_file[path] = int(key)
+        for path, stamp in data["stamps"].items():
+            graph._stamps[path] = (stamp[0], stamp[1])
+        return graph
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the graph to a JSON file."""
+        Path(path).write_text(json.dumps(self.to_dict()), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ImportGraph":
+        """
+        Read a graph written by ``save``.
+
+        Args:
+            path: Graph file; a missing file gives an empty graph
+
+        Returns:
+            The loaded ImportGraph
+        """
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
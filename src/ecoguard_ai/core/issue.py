@@ -66,6 +66,9 @@ class Impact:
     # Financial cost impact (estimated cost increase)
     cost_impact: float = 0.0
 
+    # Peak memory impact (estimated bytes)
+    memory_impact: float = 0.0
+
 
 @dataclass
 class Fix:
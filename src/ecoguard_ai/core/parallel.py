@@ -0,0 +1,162 @@
+"""
+Process-pool execution of EcoGuard AI analyses.
+
+Parsing and running the rules is CPU-bound, so batches of files are spread
+over worker processes. Every worker keeps one warm ``EcoGuardAnalyzer`` per
+configuration: the rules, the registry and the imported analyzer modules
+are set up once per process instead of once per file.
+
+Results analyzed in separate processes cannot share project-wide state, so
+cross-file issues (such as duplicates between files) are only reported by
+the in-process ``EcoGuardAnalyzer.analyze_directory``.
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from ecoguard_ai.core.result import AnalysisResult
+
+if TYPE_CHECKING:
+    from ecoguard_ai.core.analyzer import AnalysisConfig, EcoGuardAnalyzer
+
+_pool_lock = threading.Lock()
+# One shared pool per number of workers
+_pools: Dict[int, ProcessPoolExecutor] = {}
+
+_analyzers_lock = threading.Lock()
+_analyzers: Dict[str, "EcoGuardAnalyzer"] = {}
+
+
+def worker_count(max_workers: Optional[int] = None) -> int:
+    """
+    Return the number of processes a pool started for ``max_workers`` has.
+
+    Args:
+        max_workers: Requested number of workers; None means one per CPU
+
+    Returns:
+        The number of worker processes
+    """
+    return max_workers or os.cpu_count() or 1
+
+
+def get_process_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Return the process pool shared by every parallel analysis.
+
+    Callers asking for different numbers of workers get different pools, so
+    a pool is never shut down while another caller still submits to it.
+
+    Args:
+        max_workers: Number of worker processes; None means one per CPU
+
+    Returns:
+        The shared ProcessPoolExecutor with that many workers
+    """
+    workers = worker_count(max_workers)
+    with _pool_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            _pools[workers] = pool
+        return pool
+
+
+def shutdown_process_pool(wait: bool = True) -> None:
+    """Stop every shared process pool that was started."""
+    with _pool_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=wait)
+
+
+def warm_analyzer(config: "AnalysisConfig") -> "EcoGuardAnalyzer":
+    """
+    Return this process's analyzer for ``config``, creating it on first use.
+
+    Args:
+        config: Analysis configuration
+
+    Returns:
+        EcoGuardAnalyzer reused by every analysis with an equal config
+    """
+    from ecoguard_ai.core.analyzer import EcoGuardAnalyzer
+
+    key = repr(config)
+    with _analyzers_lock:
+        analyzer = _analyzers.get(key)
+        if analyzer is None:
+            analyzer = EcoGuardAnalyzer(config)
+            _analyzers[key] = analyzer
+    return analyzer
+
+
+def analyze_source_task(
+    config: "AnalysisConfig",
+    source_code: str,
+    file_path: str,
+    file_size: Optional[int] = None,
+) -> AnalysisResult:
+    """
+    Analyze one source in a worker; the unit of work sent to an executor.
+
+    Args:
+        config: Analysis configuration
+        source_code: Python source to analyze
+        file_path: Path reported in the result
+        file_size: Size of the file in bytes, if it was read from disk
+
+    Returns:
+        AnalysisResult of the source
+    """
+    return warm_analyzer(config).analyze_source(source_code, file_path, file_size)
+
+
+def analyze_batch_task(
+    config: "AnalysisConfig", sources: List[Tuple[str, str]]
+) -> List[AnalysisResult]:
+    """
+    Analyze a batch of (path, source) pairs in one worker round trip.
+
+    Args:
+        config: Analysis configuration
+        sources: Pairs of (virtual path, source code)
+
+    Returns:
+        AnalysisResult for every source, in order
+    """
+    analyzer = warm_analyzer(config)
+    return [analyzer.analyze_source(code, path) for path, code in sources]
+
+
+def create_warm_pool(
+    config: "AnalysisConfig", max_workers: Optional[int] = None
+) -> ProcessPoolExecutor:
+    """
+    Start a dedicated process pool whose workers are ready to analyze.
+
+    Every worker builds its analyzer when it starts, and all workers are
+    forked up front, so the first requests do not pay for either.
+
+    Args:
+        config: Analysis configuration the workers are warmed for
+        max_workers: Number of worker processes
+
+    Returns:
+        The new ProcessPoolExecutor; the caller shuts it down
+    """
+    workers = worker_count(max_workers)
+    pool = ProcessPoolExecutor(
+        max_workers=workers, initializer=_warm_worker, initargs=(config,)
+    )
+    for future in [pool.submit(_warm_worker, config) for _ in range(workers)]:
+        future.result()
+    return pool
+
+
+def _warm_worker(config: "AnalysisConfig") -> None:
+    """Build the worker's analyzer without sending it back to the parent."""
+    warm_analyzer(config)
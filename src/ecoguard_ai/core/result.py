@@ -326,3 +326,26 @@ class ProjectAnalysisResult:
     def to_json(self, indent: Optional[int] = 2) -> str:
         """Convert project result to JSON string."""
         return json.dumps(self.to_dict(), indent=indent, default=str)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProjectAnalysisResult":
+        """Create project result from dictionary representation."""
+        analysis_time = None
+        if data.get("analysis_time"):
+            analysis_time = datetime.fromisoformat(data["analysis_time"])
+
+        return cls(
+            project_path=data["project_path"],
+            file_results=[
+                AnalysisResult.from_dict(result_data)
+                for result_data in data.get("file_results", [])
+            ],
+            metadata=data.get("metadata", {}),
+            analysis_time=analysis_time,
+        )
+
+    @classmethod
+    def from_json(cls, json_str: str) -> "ProjectAnalysisResult":
+        """Create project result from JSON string."""
+        data = json.loads(json_str)
+        return cls.from_dict(data)
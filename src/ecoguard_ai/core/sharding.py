@@ -0,0 +1,84 @@
+"""
+Deterministic partitioning of a project's files into shards.
+
+Large projects can be scanned on several machines: every machine discovers
+the same files and keeps only its own shard. Files are assigned by the
+longest-processing-time rule, using the file size as the cost estimate:
+the largest remaining file goes to the least loaded shard. Ties are broken
+by the file's path relative to the project root, so every machine computes
+the same partition without talking to the others.
+"""
+
+import heapq
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """
+    Parse a shard specification such as "2/4".
+
+    Args:
+        text: "INDEX/COUNT" with a 1-based index
+
+    Returns:
+        Tuple of (index, count)
+
+    Raises:
+        ValueError: If the text is not a valid specification
+    """
+    try:
+        index_text, count_text = text.split("/")
+        index, count = int(index_text), int(count_text)
+    except ValueError:
+        raise ValueError(f"Invalid shard {text!r}, expected INDEX/COUNT") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard {text!r}: index must be in 1..{count}")
+    return index, count
+
+
+def partition_files(files: Iterable[Path], count: int, root: Path) -> List[List[Path]]:
+    """
+    Split files into ``count`` shards of roughly equal total size.
+
+    Args:
+        files: Files of the project
+        count: Number of shards
+        root: Project root; relative paths make the order machine independent
+
+    Returns:
+        One list of files per shard, each sorted by relative path
+    """
+    sized = []
+    for path in files:
+        relative = path.relative_to(root).as_posix()
+        # Empty files still cost a little to analyze
+        sized.append((-max(path.stat().st_size, 1), relative, path))
+    sized.sort(key=lambda item: (item[0], item[1]))
+
+    shards: List[List[Tuple[str, Path]]] = [[] for _ in range(count)]
+    loads = [(0, shard) for shard in range(count)]
+    for negative_size, relative, path in sized:
+        load, shard = heapq.heappop(loads)
+        shards[shard].append((relative, path))
+        heapq.heappush(loads, (load - negative_size, shard))
+
+    return [[path for _, path in sorted(shard)] for shard in shards]
+
+
+def shard_files(
+    files: Iterable[Path], index: int, count: int, root: Path
+) -> List[Path]:
+    """
+    Return the files belonging to one shard.
+
+    Args:
+        files: Files of the project
+        index: 1-based shard index
+        count: Number of shards
+        root: Project root the files are under
+
+    Returns:
+        Files of shard ``index``, sorted by relative path
+    """
+    return partition_files(files, count, root)[index - 1]
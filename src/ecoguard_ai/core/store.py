@@ -0,0 +1,329 @@
+"""
+SQLite store of analysis runs for EcoGuard AI.
+
+Nightly ``ProjectAnalysisResult`` reports are loaded into a normalized
+schema (runs, files, rules, issues) so that trends can be queried without
+re-reading every JSON report. Per-run issue counts for each rule are
+materialized when a run is added, so trend queries read one small indexed
+table however many issues the history holds.
+"""
+
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ecoguard_ai.core.result import ProjectAnalysisResult
+
+# Bump when the schema changes incompatibly
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    project_path TEXT NOT NULL,
+    analysis_time TEXT NOT NULL,
+    total_files INTEGER NOT NULL,
+    total_issues INTEGER NOT NULL,
+    green_score REAL NOT NULL,
+    security_score REAL NOT NULL,
+    UNIQUE (project_path, analysis_time)
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS rules (
+    id INTEGER PRIMARY KEY,
+    rule_id TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS issues (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    file_id INTEGER NOT NULL REFERENCES files (id),
+    rule_id INTEGER NOT NULL REFERENCES rules (id),
+    severity TEXT NOT NULL,
+    category TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    column INTEGER NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rule_counts (
+    rule_id INTEGER NOT NULL REFERENCES rules (id),
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (rule_id, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_runs_time ON runs (analysis_time);
+CREATE INDEX IF NOT EXISTS idx_runs_project ON runs (project_path, analysis_time);
+CREATE INDEX IF NOT EXISTS idx_issues_run ON issues (run_id);
+CREATE INDEX IF NOT EXISTS idx_issues_rule ON issues (rule_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_issues_severity ON issues (severity, run_id);
+CREATE INDEX IF NOT EXISTS idx_issues_category ON issues (category, run_id);
+CREATE INDEX IF NOT EXISTS idx_issues_file ON issues (file_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_rule_counts_run ON rule_counts (run_id);
+"""
+
+
+def _timestamp(value: Optional[datetime]) -> str:
+    """Normalize a time to a UTC ISO string, which sorts chronologically."""
+    value = value or datetime.now(timezone.utc)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+def _enum_value(value: Any) -> str:
+    return str(getattr(value, "value", value))
+
+
+class ResultStore:
+    """
+    Analysis history in a SQLite database.
+
+    Use it as a context manager, or call ``close`` when done.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Open (and create if needed) a results database.
+
+        Args:
+            path: Database file; ":memory:" gives a throwaway store
+        """
+        self.path = str(path)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self._create_schema()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def _create_schema(self) -> None:
+        with self.connection:
+            self.connection.executescript(_SCHEMA)
+            row = self.connection.execute(
+                "SELECT value FROM meta WHERE key = 'schema_version'"
+            ).fetchone()
+            if row is None:
+                self.connection.execute(
+                    "INSERT INTO meta (key, value) VALUES ('schema_version', ?)",
+                    (str(SCHEMA_VERSION),),
+                )
+            elif int(row["value"]) != SCHEMA_VERSION:
+                raise ValueError(
+                    f"Unsupported results database version {row['value']}: "
+                    f"{self.path}"
+                )
+
+    def _intern(self, table: str, column: str, values: Iterable[str]) -> Dict[str, int]:
+        """Return the ids of ``values`` in a lookup table, inserting new ones."""
+        unique = sorted(set(values))
+        self.connection.executemany(
+            f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)",
+            [(value,) for value in unique],
+        )
+        ids: Dict[str, int] = {}
+        # Stay well below SQLite's limit on bound parameters
+        for start in range(0, len(unique), 500):
+            chunk = unique[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row in self.connection.execute(
+                f"SELECT id, {column} FROM {table} WHERE {column} IN ({placeholders})",
+                chunk,
+            ):
+                ids[row[1]] = row[0]
+        return ids
+
+    def add_run(self, result: ProjectAnalysisResult) -> Optional[int]:
+        """
+        Store one project run.
+
+        Args:
+            result: Project analysis result
+
+        Returns:
+            Id of the new run, or None if the run was already stored
+        """
+        return self.add_runs([result])[0]
+
+    def add_runs(self, results: Iterable[ProjectAnalysisResult]) -> List[Optional[int]]:
+        """
+        Store many project runs in a single transaction.
+
+        Args:
+            results: Project analysis results
+
+        Returns:
+            Id of each new run, or None for runs that were already stored
+        """
+        run_ids: List[Optional[int]] = []
+        with self.connection:
+            for result in results:
+                run_ids.append(self._insert_run(result))
+        return run_ids
+
+    def _insert_run(self, result: ProjectAnalysisResult) -> Optional[int]:
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO runs (project_path, analysis_time, total_files, "
+            "total_issues, green_score, security_score) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                result.project_path,
+                _timestamp(result.analysis_time),
+                result.total_files,
+                result.total_issues,
+                result.calculate_overall_green_score(),
+                result.calculate_overall_security_score(),
+            ),
+        )
+        if not cursor.rowcount:
+            return None
+        run_id = cursor.lastrowid
+
+        issues = result.all_issues
+        file_ids = self._intern("files", "path", (i.file_path for i in issues))
+        rule_ids = self._intern("rules", "rule_id", (i.rule_id for i in issues))
+        self.connection.executemany(
+            "INSERT INTO issues (run_id, file_id, rule_id, severity, category, "
+            "line, column, message) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    run_id,
+                    file_ids[issue.file_path],
+                    rule_ids[issue.rule_id],
+                    _enum_value(issue.severity),
+                    _enum_value(issue.category),
+                    issue.line,
+                    issue.column,
+                    issue.message,
+                )
+                for issue in issues
+            ],
+        )
+        self.connection.execute(
+            "INSERT INTO rule_counts (rule_id, run_id, count) "
+            "SELECT rule_id, run_id, COUNT(*) FROM issues WHERE run_id = ? "
+            "GROUP BY rule_id",
+            (run_id,),
+        )
+        return run_id
+
+    def rule_trend(
+        self,
+        rule_id: Optional[str] = None,
+        project_path: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return issue counts per rule for every run, oldest first.
+
+        Args:
+            rule_id: Only this rule
+            project_path: Only runs of this project
+            since: Only runs at or after this ISO date or time
+            until: Only runs before this ISO date or time
+
+        Returns:
+            Rows with analysis_time, project_path, rule_id and count
+        """
+        conditions, params = self._run_filters(project_path, since, until)
+        if rule_id is not None:
+            conditions.append("rules.rule_id = ?")
+            params.append(rule_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.connection.execute(
+            "SELECT runs.analysis_time, runs.project_path, rules.rule_id, "
+            "rule_counts.count FROM rule_counts "
+            "JOIN runs ON runs.id = rule_counts.run_id "
+            "JOIN rules ON rules.id = rule_counts.rule_id "
+            f"{where} ORDER BY runs.analysis_time, rules.rule_id",
+            params,
+        )
+        return [dict(row) for row in rows]
+
+    def score_history(
+        self,
+        project_path: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the green and security scores of every run, oldest first.
+
+        Args:
+            project_path: Only runs of this project
+            since: Only runs at or after this ISO date or time
+            until: Only runs before this ISO date or time
+
+        Returns:
+            Rows with analysis_time, project_path, total_files, total_issues,
+            green_score and security_score
+        """
+        conditions, params = self._run_filters(project_path, since, until)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.connection.execute(
+            "SELECT analysis_time, project_path, total_files, total_issues, "
+            f"green_score, security_score FROM runs {where} "
+            "ORDER BY analysis_time",
+            params,
+        )
+        return [dict(row) for row in rows]
+
+    def issue_counts(self, run_id: int, group_by: str = "severity") -> Dict[str, int]:
+        """
+        Count the issues of one run by severity, category, rule or path.
+
+        Args:
+            run_id: Run to summarize
+            group_by: "severity", "category", "rule" or "path"
+
+        Returns:
+            Mapping of group to issue count
+        """
+        columns = {
+            "severity": ("issues.severity", ""),
+            "category": ("issues.category", ""),
+            "rule": ("rules.rule_id", "JOIN rules ON rules.id = issues.rule_id"),
+            "path": ("files.path", "JOIN files ON files.id = issues.file_id"),
+        }
+        if group_by not in columns:
+            raise ValueError(f"Cannot group issues by {group_by!r}")
+        column, join = columns[group_by]
+        rows = self.connection.execute(
+            f"SELECT {column}, COUNT(*) FROM issues {join} "
+            f"WHERE issues.run_id = ? GROUP BY {column} ORDER BY {column}",
+            (run_id,),
+        )
+        return {row[0]: row[1] for row in rows}
+
+    @staticmethod
+    def _run_filters(
+        project_path: Optional[str], since: Optional[str], until: Optional[str]
+    ) -> Tuple[List[str], List[Any]]:
+        conditions: List[str] = []
+        params: List[Any] = []
+        if project_path is not None:
+            conditions.append("runs.project_path = ?")
+            params.append(project_path)
+        if since is not None:
+            conditions.append("runs.analysis_time >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("runs.analysis_time < ?")
+            params.append(until)
+        return conditions, params
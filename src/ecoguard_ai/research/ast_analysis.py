@@ -19,6 +19,9 @@ from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
+# Statements counted for the nesting depth metric
+_CONTROL_FLOW_NODES = (ast.If, ast.While, ast.For, ast.Try, ast.With)
+
 
 @dataclass
 class ASTNodeInfo:
@@ -54,6 +57,9 @@ class ASTNodeVisitor(ast.NodeVisitor):
         self.metrics = ASTAnalysisMetrics()
         self.current_depth = 0
         self.parent_stack: List[ast.AST] = []
+        # Enclosing control-flow statements and functions of the current node
+        self.control_depth = 0
+        self.function_depth = 0
 
     def visit(self, node: ast.AST) -> None:
         """Visit a node and collect detailed information."""
@@ -85,9 +91,15 @@ class ASTNodeVisitor(ast.NodeVisitor):
         self._update_complexity_metrics(node)
 
         # Visit children
+        is_control = isinstance(node, _CONTROL_FLOW_NODES)
+        is_function = isinstance(node, ast.FunctionDef)
+        self.control_depth += is_control
+        self.function_depth += is_function
         self.parent_stack.append(node)
         self.generic_visit(node)
         self.parent_stack.pop()
+        self.control_depth -= is_control
+        self.function_depth -= is_function
         self.current_depth -= 1
 
     def _extract_node_attributes(self, node: ast.AST) -> Dict[str, Any]:
@@ -138,9 +150,7 @@ class ASTNodeVisitor(ast.NodeVisitor):
         node_type = type(node).__name__
 
         # Pattern: Nested function definitions
-        if node_type == "FunctionDef" and any(
-            isinstance(p, ast.FunctionDef) for p in self.parent_stack
-        ):
+        if node_type == "FunctionDef" and self.function_depth:
             self.metrics.patterns_found.append("nested_function")
 
         # Pattern: List comprehensions with multiple conditions
@@ -172,23 +182,25 @@ class ASTNodeVisitor(ast.NodeVisitor):
             # And/Or operations add to complexity
             self.metrics.complexity_metrics["cyclomatic"] += len(node.values) - 1
 
-        # Nesting depth complexity
-        if node_type in ("If", "While", "For", "Try", "With"):
-            current_nesting = sum(
-                1
-                for p in self.parent_stack
-                if type(p).__name__ in ("If", "While", "For", "Try", "With")
-            )
+        # Nesting depth complexity, counted on the way down by ``visit``
+        if isinstance(node, _CONTROL_FLOW_NODES):
             self.metrics.complexity_metrics["max_nesting"] = max(
-                self.metrics.complexity_metrics.get("max_nesting", 0), current_nesting
+                self.metrics.complexity_metrics.get("max_nesting", 0),
+                self.control_depth,
             )
 
 
 class ASTExplorer:
     """Advanced AST exploration and analysis tool."""
 
-    def __init__(self):
-        """Initialize the AST explorer."""
+    def __init__(self, keep_history: bool = True):
+        """Initialize the AST explorer.
+
+        Args:
+            keep_history: Store every analysis in ``analysis_results``. Long-lived
+                or shared explorers should disable this so memory stays flat.
+        """
+        self.keep_history = keep_history
         self.analysis_results: List[
             Tuple[str, ASTAnalysisMetrics, List[ASTNodeInfo]]
         ] = []
@@ -203,9 +215,10 @@ class ASTExplorer:
             visitor.visit(tree)
 
             # Store results for comparison
-            self.analysis_results.append(
-                (description, visitor.metrics, visitor.nodes_info)
-            )
+            if self.keep_history:
+                self.analysis_results.append(
+                    (description, visitor.metrics, visitor.nodes_info)
+                )
 
             return visitor.metrics
 
@@ -0,0 +1,506 @@
+"""
+Local HTTP analysis service for EcoGuard AI.
+
+``ecoguard serve`` exposes the analyzers over HTTP/JSON using only the
+standard library:
+
+- ``POST /analyze`` takes ``{"source": ..., "path": ...}`` for one file or
+  ``{"files": [{"source": ..., "path": ...}, ...]}`` for a batch.
+- ``GET /metrics`` reports throughput, latency percentiles and queue depth.
+- ``GET /health`` answers ``{"status": "ok"}``.
+
+Requests go through a bounded queue. A dispatcher thread coalesces
+concurrent requests into batches and hands them to a pre-forked pool of
+warm analyzer processes. When every worker is busy the queue fills up, and
+further requests are answered with 503 instead of piling up in memory.
+"""
+
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ecoguard_ai.core.analyzer import AnalysisConfig
+from ecoguard_ai.core.parallel import analyze_batch_task, create_warm_pool
+from ecoguard_ai.core.result import AnalysisResult
+
+# Largest request body accepted, in bytes
+MAX_REQUEST_BYTES = 10 * 1024 * 1024
+
+Source = Tuple[str, str]
+
+
+class ServiceOverloaded(Exception):
+    """Raised when the request queue is full."""
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """
+    Return a nearest-rank percentile.
+
+    Args:
+        values: Samples, in any order
+        fraction: Percentile as a fraction, e.g. 0.99
+
+    Returns:
+        The percentile, or 0.0 without samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+class ServiceMetrics:
+    """
+    Throughput and latency statistics of the service.
+
+    Latencies and batch sizes are kept for the most recent ``window``
+    requests, so memory stays flat however long the service runs.
+    """
+
+    def __init__(self, window: int = 10000) -> None:
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._batch_sizes: Deque[int] = deque(maxlen=window)
+        self.requests = 0
+        self.files = 0
+        self.batches = 0
+        self.rejected = 0
+        self.failed = 0
+
+    def record_request(self, files: int, latency: float) -> None:
+        """Record a completed request and its latency in seconds."""
+        with self._lock:
+            self.requests += 1
+            self.files += files
+            self._latencies.append(latency)
+
+    def record_batch(self, size: int) -> None:
+        """Record a batch sent to the workers."""
+        with self._lock:
+            self.batches += 1
+            self._batch_sizes.append(size)
+
+    def record_rejected(self) -> None:
+        """Record a request turned away because the queue was full."""
+        with self._lock:
+            self.rejected += 1
+
+    def record_failed(self) -> None:
+        """Record a request whose analysis failed."""
+        with self._lock:
+            self.failed += 1
+
+    def snapshot(self, queue_depth: int = 0) -> Dict[str, Any]:
+        """Return the current statistics as a JSON-compatible dictionary."""
+        with self._lock:
+            latencies = list(self._latencies)
+            batch_sizes = list(self._batch_sizes)
+            uptime = max(time.monotonic() - self.started, 1e-9)
+            return {
+                "uptime_seconds": round(uptime, 3),
+                "requests": self.requests,
+                "files": self.files,
+                "batches": self.batches,
+                "rejected": self.rejected,
+                "failed": self.failed,
+                "queue_depth": queue_depth,
+                "throughput": {
+                    "requests_per_second": round(self.requests / uptime, 3),
+                    "files_per_second": round(self.files / uptime, 3),
+                },
+                "latency_ms": {
+                    name: round(percentile(latencies, fraction) * 1000, 3)
+                    for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99))
+                },
+                "batch_size": {
+                    "mean": (
+                        round(sum(batch_sizes) / len(batch_sizes), 3)
+                        if batch_sizes
+                        else 0.0
+                    ),
+                    "max": max(batch_sizes, default=0),
+                },
+            }
+
+
+@dataclass
+class _Job:
+    """One request waiting in the queue."""
+
+    sources: List[Source]
+    future: "Future[List[AnalysisResult]]" = field(default_factory=Future)
+
+
+class BatchingAnalysisService:
+    """
+    Coalesces analysis requests into batches for a pool of warm workers.
+
+    ``submit`` never blocks: it either queues the request or raises
+    ``ServiceOverloaded``. A dispatcher thread takes the first waiting
+    request, keeps collecting requests for up to ``batch_window`` seconds
+    or until ``max_batch_size`` files are gathered, and sends the batch to
+    a worker once one is free.
+    """
+
+    def __init__(
+        self,
+        config: Optional[AnalysisConfig] = None,
+        executor: Optional[Executor] = None,
+        workers: Optional[int] = None,
+        max_batch_size: int = 32,
+        batch_window: float = 0.005,
+        queue_size: int = 256,
+    ) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            config: Analysis configuration
+            executor: Executor running the batches; by default a warm
+                process pool is started by ``start`` and stopped by ``stop``
+            workers: Number of batches analyzed at once; defaults to
+                ``config.max_workers``
+            max_batch_size: Files gathered before a batch is sent early
+            batch_window: Seconds to wait for more requests to join a batch
+            queue_size: Requests that may wait before new ones are rejected
+        """
+        self.config = config or AnalysisConfig()
+        self.workers = max(1, workers or self.config.max_workers)
+        self.max_batch_size = max(1, max_batch_size)
+        self.batch_window = batch_window
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue(maxsize=queue_size)
+        self._free_workers = threading.BoundedSemaphore(self.workers)
+        self._dispatcher: Optional[threading.Thread] = None
+        self.metrics = ServiceMetrics()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting for a batch."""
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """Start the worker pool (if needed) and the dispatcher thread."""
+        if self._dispatcher is not None:
+            return
+        if self._executor is None:
+            self._executor = create_warm_pool(self.config, self.workers)
+        self._dispatcher = threading.Thread(
+            target=self._dispatch, name="ecoguard-dispatcher", daemon=True
+        )
+        self._dispatcher.start()
+
+    def stop(self) -> None:
+        """Finish the queued requests, then stop the dispatcher and pool."""
+        if self._dispatcher is not None:
+            self._queue.put(None)
+            self._dispatcher.join()
+            self._dispatcher = None
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def submit(self, sources: Iterable[Source]) -> "Future[List[AnalysisResult]]":
+        """
+        Queue a request without waiting for it.
+
+        Args:
+            sources: Pairs of (virtual path, source code)
+
+        Returns:
+            Future resolving to one AnalysisResult per source, in order
+
+        Raises:
+            ServiceOverloaded: If the request queue is full
+        """
+        job = _Job(list(sources))
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            self.metrics.record_rejected()
+            raise ServiceOverloaded("Analysis queue is full, retry later") from None
+        return job.future
+
+    def analyze(
+        self, sources: Iterable[Source], timeout: Optional[float] = None
+    ) -> List[AnalysisResult]:
+        """
+        Analyze sources through the batching queue and wait for the results.
+
+        Args:
+            sources: Pairs of (virtual path, source code)
+            timeout: Seconds to wait for the results
+
+        Returns:
+            One AnalysisResult per source, in order
+        """
+        started = time.monotonic()
+        future = self.submit(sources)
+        try:
+            results = future.result(timeout)
+        except Exception:
+            self.metrics.record_failed()
+            raise
+        self.metrics.record_request(len(results), time.monotonic() - started)
+        return results
+
+    def _dispatch(self) -> None:
+        """Dispatcher thread: turn queued requests into batches."""
+        stopping = False
+        while not stopping:
+            job = self._queue.get()
+            if job is None:
+                return
+            batch = [job]
+            size = len(job.sources)
+            deadline = time.monotonic() + self.batch_window
+            while size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    job = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if job is None:
+                    stopping = True
+                    break
+                batch.append(job)
+                size += len(job.sources)
+
+            # Wait for a free worker; meanwhile new requests queue up
+            self._free_workers.acquire()
+            self._run(batch)
+
+    def _run(self, batch: List[_Job]) -> None:
+        sources = [source for job in batch for source in job.sources]
+        self.metrics.record_batch(len(sources))
+        try:
+            if self._executor is None:
+                raise RuntimeError("The analysis service has no worker pool")
+            future = self._executor.submit(analyze_batch_task, self.config, sources)
+        except Exception as e:
+            self._free_workers.release()
+            for job in batch:
+                job.future.set_exception(e)
+            return
+        future.add_done_callback(lambda done: self._complete(batch, done))
+
+    def _complete(
+        self, batch: List[_Job], future: "Future[List[AnalysisResult]]"
+    ) -> None:
+        self._free_workers.release()
+        try:
+            results = future.result()
+        except Exception as e:
+            for job in batch:
+                job.future.set_exception(e)
+            return
+        offset = 0
+        for job in batch:
+            count = len(job.sources)
+            job.future.set_result(results[offset : offset + count])
+            offset += count
+
+
+def _content_length(header: Optional[str]) -> int:
+    """
+    Parse the Content-Length header of a request.
+
+    Returns:
+        The body length in bytes; 0 when the header is missing
+
+    Raises:
+        ValueError: If the header is not a non-negative integer
+    """
+    if not header:
+        return 0
+    try:
+        length = int(header)
+    except ValueError:
+        raise ValueError("Invalid Content-Length header") from None
+    if length < 0:
+        raise ValueError("Invalid Content-Length header")
+    return length
+
+
+def _parse_sources(payload: Any) -> Tuple[List[Source], bool]:
+    """
+    Extract the sources of an ``/analyze`` request.
+
+    Returns:
+        Tuple of the (path, source) pairs and whether it was a single file
+
+    Raises:
+        ValueError: If the payload is malformed
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object")
+    if "files" in payload:
+        files = payload["files"]
+        if not isinstance(files, list) or not files:
+            raise ValueError("'files' must be a non-empty list")
+        single = False
+    else:
+        files = [payload]
+        single = True
+
+    sources = []
+    for index, item in enumerate(files):
+        if not isinstance(item, dict) or not isinstance(item.get("source"), str):
+            raise ValueError(f"File {index} needs a 'source' string")
+        path = item.get("path") or ("<string>" if single else f"<string:{index}>")
+        sources.append((str(path), item["source"]))
+    return sources, single
+
+
+class AnalysisServer(ThreadingHTTPServer):
+    """HTTP server handing requests to a BatchingAnalysisService."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        service: BatchingAnalysisService,
+        request_timeout: Optional[float] = None,
+        verbose: bool = False,
+    ) -> None:
+        super().__init__(address, _AnalysisRequestHandler)
+        self.service = service
+        self.request_timeout = request_timeout
+        self.verbose = verbose
+
+
+class _AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """Routes the service endpoints."""
+
+    server: AnalysisServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        service = self.server.service
+        if self.path == "/metrics":
+            self._send_json(200, service.metrics.snapshot(service.queue_depth))
+        elif self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self) -> None:
+        if self.path != "/analyze":
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+            return
+
+        request = self._read_sources()
+        if request is None:
+            return
+        sources, single = request
+
+        try:
+            results = self.server.service.analyze(
+                sources, timeout=self.server.request_timeout
+            )
+        except ServiceOverloaded as e:
+            self._send_json(503, {"error": str(e)}, {"Retry-After": "1"})
+            return
+        except FutureTimeoutError:
+            self._send_json(504, {"error": "Analysis timed out"})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": f"Analysis failed: {str(e)}"})
+            return
+
+        if single:
+            self._send_json(200, results[0].to_dict())
+        else:
+            self._send_json(200, {"results": [r.to_dict() for r in results]})
+
+    def _read_sources(self) -> Optional[Tuple[List[Source], bool]]:
+        """Read the sources of a request, answering it if they are invalid."""
+        try:
+            length = _content_length(self.headers.get("Content-Length"))
+        except ValueError as e:
+            # The body cannot be skipped without knowing its length
+            self._send_json(400, {"error": str(e)})
+            self.close_connection = True
+            return None
+        if length > MAX_REQUEST_BYTES:
+            self._send_json(413, {"error": "Request body too large"})
+            self.close_connection = True
+            return None
+        try:
+            payload = json.loads(self.rfile.read(length) or b"null")
+            sources, single = _parse_sources(payload)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return None
+        return sources, single
+
+    def _send_json(
+        self,
+        status: int,
+        body: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def create_server(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    service: Optional[BatchingAnalysisService] = None,
+    config: Optional[AnalysisConfig] = None,
+    verbose: bool = False,
+) -> AnalysisServer:
+    """
+    Create an analysis server and start its service.
+
+    Args:
+        host: Interface to listen on
+        port: Port to listen on; 0 picks a free port
+        service: Batching service to use; one is created from ``config``
+            when omitted
+        config: Analysis configuration for a new service
+        verbose: Log every request to stderr
+
+    Returns:
+        AnalysisServer ready for ``serve_forever``
+    """
+    service = service or BatchingAnalysisService(config)
+    timeout = float(service.config.timeout_seconds) or None
+    server = AnalysisServer((host, port), service, timeout, verbose)
+    service.start()
+    return server
+
+
+__all__ = [
+    "AnalysisServer",
+    "BatchingAnalysisService",
+    "ServiceMetrics",
+    "ServiceOverloaded",
+    "create_server",
+    "percentile",
+]
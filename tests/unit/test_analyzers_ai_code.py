@@ -0,0 +1,185 @@
+"""
+Test suite for the AI code analyzer module.
+
+This module tests the AI-specific analysis rules and the structural
+fingerprinting used for duplicate detection.
+"""
+
+import ast
+
+from ecoguard_ai.analyzers.ai_code import AICodeAnalyzer
+from ecoguard_ai.analyzers.ai_code.fingerprint import (
+    DuplicateIndex,
+    fingerprint_function,
+    normalize_function,
+)
+from ecoguard_ai.analyzers.base import project_run
+
+DUPLICATE_CODE = '''
+def total_price(items):
+    """Sum item prices."""
+    total = 0
+    for item in items:
+        total += item.price
+    return total
+
+def sum_weights(parcels):
+    result = 0
+    for parcel in parcels:
+        result += parcel.weight
+    return result
+
+def describe(user):
+    if user.admin:
+        print("admin")
+    name = user.name.title()
+    return name
+'''
+
+
+def _functions(code: str):
+    return [n for n in ast.walk(ast.parse(code)) if isinstance(n, ast.FunctionDef)]
+
+
+class TestFingerprint:
+    """Test structural fingerprints and the duplicate index."""
+
+    def test_normalization_ignores_names_and_literals(self) -> None:
+        """Test that renamed copies normalize to the same tokens."""
+        first, second, third = _functions(DUPLICATE_CODE)
+
+        assert normalize_function(first) == normalize_function(second)
+        assert normalize_function(first) != normalize_function(third)
+
+    def test_renamed_clone_has_same_hash(self) -> None:
+        """Test that structural hashes match for renamed clones."""
+        first, second, third = _functions(DUPLICATE_CODE)
+
+        fp1 = fingerprint_function(first, "a.py")
+        fp2 = fingerprint_function(second, "b.py")
+        fp3 = fingerprint_function(third, "a.py")
+
+        assert fp1.structural_hash == fp2.structural_hash
+        assert fp1.similarity(fp2) == 1.0
+        assert fp1.structural_hash != fp3.structural_hash
+
+    def test_index_clusters_near_duplicates(self) -> None:
+        """Test that a small edit still lands in the same cluster."""
+        code = """
+def a(rows):
+    out = []
+    for row in rows:
+        if row.ok:
+            out.append(row.value * 2)
+            log(row)
+            count(row)
+            check(row)
+    return out
+
+def b(rows):
+    out = []
+    for row in rows:
+        if row.ok:
+            out.append(row.value * 2)
+            log(row)
+            count(row)
+            check(row)
+            extra(row)
+    return out
+
+def c(x):
+    while x:
+        x -= 1
+    return {x: [x, x]}
+"""
+        index = DuplicateIndex(threshold=0.6)
+        index.extend(fingerprint_function(f, "m.py") for f in _functions(code))
+
+        clusters = index.clusters()
+        assert len(clusters) == 1
+        assert [fp.name for fp in clusters[0]] == ["a", "b"]
+
+    def test_index_clear(self) -> None:
+        """Test clearing the index."""
+        index = DuplicateIndex()
+        index.extend(
+            fingerprint_function(f, "m.py") for f in _functions(DUPLICATE_CODE)
+        )
+        assert len(index) == 3
+
+        index.clear()
+        assert len(index) == 0
+        assert index.clusters() == []
+
+
+class TestDuplicateFunctionRule:
+    """Test the DuplicateFunctionRule class."""
+
+    def setup_method(self) -> None:
+        """Set up test fixtures."""
+        self.analyzer = AICodeAnalyzer()
+
+    def test_detect_renamed_duplicate(self) -> None:
+        """Test detecting a copy with renamed identifiers."""
+        tree = ast.parse(DUPLICATE_CODE)
+        issues = self.analyzer.analyze(tree, DUPLICATE_CODE, "test.py")
+
+        duplicate_issues = [i for i in issues if i.rule_id == "duplicate_function"]
+        assert len(duplicate_issues) == 1
+        assert "'sum_weights' appears similar to 'total_price'" in (
+            duplicate_issues[0].message
+        )
+
+    def test_state_does_not_leak_between_files(self) -> None:
+        """Test that functions from one file are not compared in the next."""
+        tree = ast.parse(DUPLICATE_CODE)
+        self.analyzer.analyze(tree, DUPLICATE_CODE, "first.py")
+
+        single = "def f(x):\n    a = x\n    b = a\n    return b\n"
+        issues = self.analyzer.analyze(ast.parse(single), single, "second.py")
+
+        assert [i for i in issues if i.rule_id == "duplicate_function"] == []
+
+    def test_cross_file_duplicates_reported_by_project_pass(self) -> None:
+        """Test that duplicates in separate files are reported once."""
+        first = "def f(x):\n    a = x + 1\n    b = a * 2\n    return b\n"
+        second = "def g(y):\n    c = y + 5\n    d = c * 3\n    return d\n"
+
+        self.analyzer.reset_project()
+        with project_run():
+            self.analyzer.analyze(ast.parse(first), first, "first.py")
+            self.analyzer.analyze(ast.parse(second), second, "second.py")
+
+        issues = self.analyzer.finalize_project()
+        assert len(issues) == 1
+        assert issues[0].file_path == "second.py"
+        assert "first.py:1" in issues[0].message
+
+
+class TestRedundantVariableRule:
+    """Test the RedundantVariableRule class."""
+
+    def setup_method(self) -> None:
+        """Set up test fixtures."""
+        self.analyzer = AICodeAnalyzer()
+
+    def _issues(self, code: str):
+        tree = ast.parse(code)
+        issues = self.analyzer.analyze(tree, code, "test.py")
+        return [i for i in issues if i.rule_id == "redundant_variable"]
+
+    def test_detect_assign_then_return(self) -> None:
+        """Test detecting a variable that is assigned and returned."""
+        code = "def f(x):\n    result = x * 2\n    return result\n"
+        assert len(self._issues(code)) == 1
+
+    def test_variable_captured_by_closure_not_flagged(self) -> None:
+        """Test that variables shared with nested functions are kept."""
+        code = """
+def f(x):
+    def show():
+        print(result)
+    result = x * 2
+    return result
+"""
+        assert self._issues(code) == []
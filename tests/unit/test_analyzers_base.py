@@ -5,6 +5,7 @@ This module tests the base analyzer classes and rule framework.
 """
 
 import ast
+from concurrent.futures import ThreadPoolExecutor
 
 from ecoguard_ai.analyzers.base import (
     ASTVisitorRule,
@@ -217,6 +218,47 @@ def another_function():
         assert rule.issues[0].message == "Test issue"
         assert rule.issues[0].file_path == "test.py"
 
+    def test_concurrent_checks_are_isolated(self) -> None:
+        """Test that one rule instance can check many files concurrently."""
+        rule = ConcreteASTRule(
+            rule_id="ast_rule",
+            name="AST Rule",
+            description="AST test rule",
+            category="quality",
+        )
+        sources = {
+            f"file{i}.py": "".join(f"def f{j}():\n    pass\n" for j in range(i))
+            for i in range(1, 30)
+        }
+
+        def run(path: str):
+            code = sources[path]
+            issues = rule.check(ast.parse(code), code, path)
+            return [(i.file_path, i.message) for i in issues]
+
+        expected = {path: run(path) for path in sources}
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for _ in range(5):
+                actual = dict(zip(sources, pool.map(run, sources)))
+                assert actual == expected
+
+    def test_nested_check_restores_context(self) -> None:
+        """Test that a check inside a run does not clobber the outer run."""
+        rule = ConcreteASTRule(
+            rule_id="ast_rule",
+            name="AST Rule",
+            description="AST test rule",
+            category="quality",
+        )
+        rule.reset("outer.py", "x = 1")
+        rule.add_issue("Outer", ast.parse("x = 1").body[0])
+
+        inner = rule.check(ast.parse("def g(): pass"), "def g(): pass", "inner.py")
+
+        assert [i.file_path for i in inner] == ["inner.py"]
+        assert rule.current_file_path == "outer.py"
+        assert [i.message for i in rule.issues] == ["Outer"]
+
 
 def test_get_source_segment() -> None:
     """Test the get_source_segment utility function."""
@@ -0,0 +1,123 @@
+"""
+Test suite for the one-pass complexity metrics.
+
+This module tests cyclomatic complexity, cognitive complexity and nesting
+depth per function and class, and the report shared through the context.
+"""
+
+import ast
+
+from ecoguard_ai.analyzers.complexity import compute_complexity
+from ecoguard_ai.analyzers.context import AnalysisContext
+from ecoguard_ai.analyzers.quality import QualityAnalyzer
+
+
+def _metrics(code: str, name: str):
+    report = compute_complexity(ast.parse(code))
+    return next(m for m in report.functions + report.classes if m.name == name)
+
+
+class TestComplexityMetrics:
+    """Test compute_complexity."""
+
+    def test_straight_line_function(self) -> None:
+        """Test the base complexity of a function without branches."""
+        metrics = _metrics("def f(x):\n    return x + 1\n", "f")
+
+        assert (metrics.cyclomatic, metrics.cognitive, metrics.max_nesting) == (
+            1,
+            0,
+            0,
+        )
+
+    def test_decision_points(self) -> None:
+        """Test if/elif/else, loops, boolean operators and handlers."""
+        code = """
+def f(items, flag):
+    if flag and items:          # +1 if, +1 and
+        return 0
+    elif flag:                  # +1 elif
+        return 1
+    for item in items:          # +1 for
+        try:
+            item()
+        except ValueError:      # +1 except
+            pass
+    return [i for i in items if i]  # +1 for, +1 if
+"""
+        metrics = _metrics(code, "f")
+
+        assert metrics.cyclomatic == 8
+        # if 1, and 1, elif 1, for 1, except 1 + nesting 1, comprehension 2
+        assert metrics.cognitive == 8
+        assert metrics.max_nesting == 2
+
+    def test_nesting_weights_cognitive_complexity(self) -> None:
+        """Test that nested branches cost more than flat ones."""
+        flat = "def f(a, b):\n    if a:\n        pass\n    if b:\n        pass\n"
+        nested = "def f(a, b):\n    if a:\n        if b:\n            pass\n"
+
+        assert _metrics(flat, "f").cyclomatic == _metrics(nested, "f").cyclomatic
+        assert _metrics(flat, "f").cognitive == 2
+        assert _metrics(nested, "f").cognitive == 3
+        assert _metrics(nested, "f").max_nesting == 2
+
+    def test_nested_functions_are_measured_separately(self) -> None:
+        """Test that inner functions do not add to the outer function."""
+        code = """
+def outer(x):
+    def inner(y):
+        if y:
+            return 1
+        return 0
+    return inner(x)
+"""
+        assert _metrics(code, "outer").cyclomatic == 1
+        assert _metrics(code, "inner").cyclomatic == 2
+        # The inner function is itself nested once
+        assert _metrics(code, "inner").cognitive == 2
+
+    def test_class_aggregates_methods(self) -> None:
+        """Test that a class sums the complexity of its methods."""
+        code = """
+class Service:
+    def a(self, x):
+        if x:
+            return 1
+
+    async def b(self, xs):
+        async for x in xs:
+            while x:
+                x -= 1
+"""
+        metrics = _metrics(code, "Service")
+
+        assert metrics.cyclomatic == 1 + 2 + 3
+        assert metrics.max_nesting == 2
+
+    def test_report_is_shared_through_the_context(self) -> None:
+        """Test that the context caches one report per tree."""
+        tree = ast.parse("def f():\n    pass\n")
+        context = AnalysisContext.for_tree(tree, "def f():\n    pass\n", "t.py")
+
+        assert context.complexity is context.complexity
+        assert context.complexity.get(tree.body[0]).name == "f"
+        assert context.complexity.to_dict()["functions"][0]["cyclomatic"] == 1
+
+
+class TestFunctionComplexityRule:
+    """Test the quality rule built on the report."""
+
+    def test_async_functions_are_checked(self) -> None:
+        """Test that async functions are measured too."""
+        branches = "".join(f"    if x == {i}:\n        return {i}\n" for i in range(11))
+        code = f"async def handler(x):\n{branches}    return None\n"
+
+        issues = [
+            issue
+            for issue in QualityAnalyzer().analyze(ast.parse(code), code, "t.py")
+            if issue.rule_id == "function_complexity"
+        ]
+
+        assert len(issues) == 1
+        assert "'handler' has complexity 12" in issues[0].message
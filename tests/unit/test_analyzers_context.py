@@ -0,0 +1,86 @@
+"""
+Test suite for the per-file analysis context.
+
+This module tests the line index used for source segments and the
+context shared between analyzers.
+"""
+
+import ast
+
+import pytest
+
+from ecoguard_ai.analyzers.context import AnalysisContext, LineIndex
+from ecoguard_ai.analyzers.quality import QualityAnalyzer
+
+SAMPLE = '''
+def greet(name):
+    """Say hello."""
+    message = f"héllo {name} ✓"
+    return (
+        message
+        + "!"
+    )
+
+values = [1, 2,
+          3]
+'''
+
+
+class TestLineIndex:
+    """Test the LineIndex class."""
+
+    @pytest.mark.parametrize(
+        "source",
+        ["", "x = 1", "x = 1\n", "a\nb\n\nc", "a\r\nb\r\n", "\n\n", SAMPLE],
+    )
+    def test_line_count_matches_splitlines(self, source: str) -> None:
+        """Test that the line count matches str.splitlines."""
+        index = LineIndex(source)
+
+        assert len(index) == len(source.splitlines())
+        for number, line in enumerate(source.splitlines(), start=1):
+            assert index.line(number) == line
+
+    def test_segments_match_ast(self) -> None:
+        """Test that segments match ast.get_source_segment for every node."""
+        index = LineIndex(SAMPLE)
+
+        for node in ast.walk(ast.parse(SAMPLE)):
+            if hasattr(node, "end_lineno"):
+                assert index.segment(node) == ast.get_source_segment(SAMPLE, node)
+
+    def test_segment_truncation(self) -> None:
+        """Test that long segments are cut at max_lines."""
+        index = LineIndex(SAMPLE)
+        function = ast.parse(SAMPLE).body[0]
+
+        segment = index.segment(function, max_lines=2)
+        assert segment.splitlines() == ["def greet(name):", '    """Say hello."""']
+
+    def test_out_of_range_line(self) -> None:
+        """Test lines outside the source."""
+        index = LineIndex("x = 1")
+
+        assert index.line(0) == ""
+        assert index.line(2) == ""
+
+
+class TestAnalysisContext:
+    """Test the AnalysisContext class."""
+
+    def test_for_tree_reuses_context(self) -> None:
+        """Test that one context is shared per tree."""
+        tree = ast.parse(SAMPLE)
+        context = AnalysisContext.for_tree(tree, SAMPLE, "sample.py")
+
+        assert AnalysisContext.for_tree(tree, SAMPLE, "sample.py") is context
+        assert context.lines is context.lines
+        assert context.semantic is context.semantic
+
+    def test_issues_carry_code_snippets(self) -> None:
+        """Test that rule issues are filled with a snippet of the source."""
+        code = "import os\n\nprint('hi')\n"
+        issues = QualityAnalyzer().analyze(ast.parse(code), code, "test.py")
+
+        unused = [i for i in issues if i.rule_id == "unused_import"]
+        assert unused[0].code_snippet == "import os"
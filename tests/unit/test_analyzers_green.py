@@ -0,0 +1,824 @@
+"""
+Test suite for the green software analyzer module.
+
+This module tests the green-specific analysis rules.
+"""
+
+import ast
+
+from ecoguard_ai.analyzers.green import GreenAnalyzer, IOInLoopRule
+from ecoguard_ai.analyzers.green.inference import infer_type
+from ecoguard_ai.analyzers.green.io_calls import IOCallSignature
+from ecoguard_ai.analyzers.green.regex_patterns import backtracking_problem
+from ecoguard_ai.analyzers.semantic import get_semantic_model
+
+
+def _issues(code: str, rule_id: str):
+    tree = ast.parse(code)
+    issues = GreenAnalyzer().analyze(tree, code, "test.py")
+    return [i for i in issues if i.rule_id == rule_id]
+
+
+class TestStringConcatenationRule:
+    """Test the StringConcatenationRule class."""
+
+    def test_detect_string_concat_in_loop(self) -> None:
+        """Test detecting += on a string inside a loop."""
+        code = """
+text = ""
+for word in words:
+    text += word
+"""
+        assert len(_issues(code, "inefficient_string_concat")) == 1
+
+    def test_numeric_accumulator_not_flagged(self) -> None:
+        """Test that numeric += is not mistaken for string building."""
+        code = """
+total = 0
+for item in items:
+    total += item.price
+"""
+        assert _issues(code, "inefficient_string_concat") == []
+
+    def test_concat_outside_loop_not_flagged(self) -> None:
+        """Test that a single concatenation outside loops is fine."""
+        code = """
+text = "a"
+text += "b"
+"""
+        assert _issues(code, "inefficient_string_concat") == []
+
+    def test_detect_rebinding_concat_in_while_loop(self) -> None:
+        """Test the s = s + x form, typed through a parameter annotation."""
+        code = """
+def pad(text: str, width: int) -> str:
+    while len(text) < width:
+        text = text + " "
+    return text
+"""
+        (issue,) = _issues(code, "inefficient_string_concat")
+
+        assert issue.line == 4
+
+
+class TestQuadraticAccumulationRule:
+    """Test the QuadraticAccumulationRule class."""
+
+    def test_accumulating_sequences(self) -> None:
+        """Test tuples, bytes and rebuilt lists."""
+        code = """
+def collect(chunks, stream):
+    found = ()
+    data = b""
+    items = []
+    for chunk in chunks:
+        found += (chunk,)
+        data += stream.read(chunk)
+        items = items + [chunk]
+    return found, data, items
+"""
+        issues = _issues(code, "quadratic_accumulation")
+
+        assert [i.line for i in issues] == [7, 8, 9]
+        assert "Tuple 'found'" in issues[0].message
+        assert "bytearray" in issues[1].suggested_fix.description
+        assert "extend" in issues[2].suggested_fix.description
+
+    def test_in_place_and_unknown_types_not_flagged(self) -> None:
+        """Test list +=, unknown accumulators and code outside loops."""
+        code = """
+items = []
+total = load()
+pair = (1,)
+pair += (2,)
+for chunk in chunks:
+    items += [chunk]
+    total = total + chunk
+"""
+        assert _issues(code, "quadratic_accumulation") == []
+
+
+class TestTypeInference:
+    """Test infer_type."""
+
+    def _infer(self, code: str):
+        tree = ast.parse(code)
+        expression = tree.body[-1].value
+        return infer_type(get_semantic_model(tree), expression)
+
+    def test_literals_calls_and_annotations(self) -> None:
+        """Test the sources of type information."""
+        assert self._infer("[1, 2]") == "list"
+        assert self._infer("'a b'.split()") == "list"
+        assert self._infer("import numpy as np\nnp.zeros(3)") == "numpy.ndarray"
+        assert self._infer("x: List[int] = load()\nx") == "list"
+
+    def test_names_need_agreeing_assignments(self) -> None:
+        """Test that names are typed only when every assignment agrees."""
+        assert self._infer("s = ''\nfor w in ws:\n    s = s + w\ns") == "str"
+        assert self._infer("x = []\nx = load()\nx") is None
+        assert self._infer("x = []\nx += [1]\nx") == "list"
+        assert self._infer("list = tuple\nlist()") is None
+
+
+class TestQuadraticMembershipRule:
+    """Test the QuadraticMembershipRule class."""
+
+    def test_membership_on_list_in_loop(self) -> None:
+        """Test list membership, index and count inside loops."""
+        code = """
+def dedupe(items, allowed: List[str]):
+    seen = []
+    for item in items:
+        if item not in seen and item in allowed:
+            seen.append(item)
+    return [allowed.index(s) for s in seen]
+"""
+        issues = _issues(code, "quadratic_membership")
+
+        assert [i.line for i in issues] == [5, 5, 7]
+        assert "'seen'" in issues[0].message
+        assert issues[2].suggested_fix.replacement_code.startswith("# positions")
+
+    def test_impact_grows_with_nesting(self) -> None:
+        """Test that deeper loops get a larger impact estimate."""
+        code = """
+names = sorted(load())
+for a in xs:
+    if a in names:
+        pass
+    for b in ys:
+        if b in names:
+            pass
+"""
+        outer, inner = _issues(code, "quadratic_membership")
+
+        assert inner.impact.carbon_impact == 2 * outer.impact.carbon_impact
+        assert inner.impact.performance < outer.impact.performance
+
+    def test_sets_literals_and_single_tests_not_flagged(self) -> None:
+        """Test containers and positions that are fine."""
+        code = """
+lookup = set(load())
+names = list(load())
+if "x" in names:
+    pass
+for item in names:
+    if item in lookup or item in ["a", "b"]:
+        pass
+"""
+        assert _issues(code, "quadratic_membership") == []
+
+    def test_function_defined_in_loop_not_in_loop(self) -> None:
+        """Test that a function body starts outside of any loop."""
+        code = """
+names = []
+for handler in handlers:
+    def check(x):
+        return x in names
+"""
+        assert _issues(code, "quadratic_membership") == []
+
+
+class TestLoopInvariantRule:
+    """Test the LoopInvariantRule class."""
+
+    def test_hoistable_expressions(self) -> None:
+        """Test pure calls, attribute chains and repeated lookups."""
+        code = """
+import re
+
+def process(self, rows, settings):
+    for row in rows:
+        pattern = re.compile("[a-z]+")
+        limit = len(settings)
+        if row.size > self.config.max_size:
+            continue
+        total = settings["scale"] * row.value + settings["scale"]
+"""
+        issues = _issues(code, "loop_invariant_computation")
+        texts = [i.message.split("'")[1] for i in issues]
+
+        assert texts == [
+            're.compile("[a-z]+")',
+            "len(settings)",
+            "self.config.max_size",
+            'settings["scale"]',
+        ]
+        assert issues[0].suggested_fix.confidence == 0.95
+        assert all("line 5" in i.message for i in issues)
+
+    def test_changing_operands_not_flagged(self) -> None:
+        """Test that rebound, mutated and loop-dependent values are kept."""
+        code = """
+def process(rows, seen, cache):
+    for row in rows:
+        n = len(seen)
+        seen.append(row)
+        value = len(row.items)
+        cache["hits"] = cache["hits"] + cache["hits"]
+        total = os.path.join(row.name, "x")
+"""
+        assert _issues(code, "loop_invariant_computation") == []
+
+    def test_mutation_through_aliases(self) -> None:
+        """Test that changing an alias changes the name it was bound from."""
+        code = """
+def process(x, table, rows):
+    y = x
+    entries = table.entries
+    out = []
+    for i in rows:
+        y.append(i)
+        entries[i] = i
+        out.append(len(x))
+        out.append(len(table.entries))
+        out.append(len(y))
+"""
+        assert _issues(code, "loop_invariant_computation") == []
+
+    def test_reported_for_outermost_loop(self) -> None:
+        """Test that an expression is reported once, for the outer loop."""
+        code = """
+def grid(rows, cols, names):
+    for r in rows:
+        for c in cols:
+            size = len(names)
+"""
+        (issue,) = _issues(code, "loop_invariant_computation")
+
+        assert "line 3" in issue.message
+        assert issue.impact.carbon_impact == 3.0
+
+    def test_unknown_calls_lower_confidence(self) -> None:
+        """Test that unknown calls in the loop lower the fix confidence."""
+        code = """
+def run(jobs, self):
+    for job in jobs:
+        submit(job)
+        delay = self.options.retry.delay
+"""
+        (issue,) = _issues(code, "loop_invariant_computation")
+
+        assert issue.suggested_fix.confidence == 0.5
+
+    def test_method_calls_may_change_their_receiver(self) -> None:
+        """Test that a loop condition changed by a method call is kept."""
+        code = """
+def run(self, worker, limits):
+    while not self.state.done:
+        self.step()
+    while len(limits.values) > 0:
+        worker.run()
+    for job in self.jobs:
+        worker.submit(job)
+        timeout = worker.config.timeout
+"""
+        assert _issues(code, "loop_invariant_computation") == []
+
+
+class TestDataFrameRules:
+    """Test the pandas and NumPy rules."""
+
+    def test_row_wise_pandas(self) -> None:
+        """Test iterrows() and row-wise apply() through import aliases."""
+        code = """
+import pandas as pd
+
+df = pd.read_csv("sales.csv")
+for _, row in df.iterrows():
+    print(row["price"])
+df["total"] = df.apply(lambda r: r.price * r.qty, axis=1)
+df["name"].apply(str.upper)
+"""
+        issues = _issues(code, "pandas_row_iteration")
+
+        assert [i.line for i in issues] == [5, 7]
+        assert issues[0].impact.carbon_impact == 15.0
+
+    def test_pandas_methods_need_pandas(self) -> None:
+        """Test that look-alike methods are ignored without pandas."""
+        code = """
+for key, value in table.iterrows():
+    pass
+"""
+        assert _issues(code, "pandas_row_iteration") == []
+
+    def test_apply_needs_a_pandas_receiver(self) -> None:
+        """Test that apply() on other objects is ignored in pandas files."""
+        code = """
+import pandas as pd
+
+def run(pool, frame: pd.DataFrame):
+    pool.apply(lambda job: job.run())
+    frame.apply(lambda r: r.a + r.b, axis=1)
+    for _, row in frame.iterrows():
+        pass
+    for _, row in other.iterrows():
+        pass
+"""
+        issues = _issues(code, "pandas_row_iteration")
+
+        assert [i.line for i in issues] == [6, 7, 9]
+
+    def test_loops_over_numpy_arrays(self) -> None:
+        """Test element loops over arrays, directly and by index."""
+        code = """
+import numpy as np
+
+values = np.arange(1000)
+for v in values:
+    print(v)
+for i in range(len(values)):
+    values[i] *= 2
+squares = [v * v for v in np.asarray(data)]
+for item in items:
+    pass
+"""
+        issues = _issues(code, "numpy_element_loop")
+
+        assert [i.line for i in issues] == [5, 7, 9]
+        assert "'values'" in issues[0].message
+
+    def test_concat_in_loop_scales_with_depth(self) -> None:
+        """Test np.append and pd.concat inside nested loops."""
+        code = """
+import numpy as np
+from pandas import concat
+
+result = np.zeros(0)
+for batch in batches:
+    result = np.append(result, batch)
+    for chunk in batch:
+        frame = concat([frame, chunk])
+merged = concat(frames)
+"""
+        outer, inner = _issues(code, "array_concat_in_loop")
+
+        assert "numpy.append()" in outer.message
+        assert "pandas.concat()" in inner.message
+        assert inner.impact.carbon_impact == 2 * outer.impact.carbon_impact
+
+
+class TestIOInLoopRule:
+    """Test the IOInLoopRule class."""
+
+    def test_queries_and_requests_in_loops(self) -> None:
+        """Test ORM queries, HTTP requests and subprocesses in loops."""
+        code = """
+import requests as http
+import subprocess
+
+for order in Order.objects.filter(paid=True):
+    customer = Customer.objects.get(pk=order.customer_id)
+    http.post(url, json=order.payload)
+    subprocess.run(["gzip", order.path])
+"""
+        issues = _issues(code, "io_in_loop")
+
+        assert [i.line for i in issues] == [6, 7, 8]
+        assert "(N+1 queries)" in issues[0].message
+        assert "in_bulk" in issues[0].suggested_fix.description
+        assert "2 round trips" in issues[1].message
+        assert issues[1].impact.carbon_impact == 2 * issues[0].impact.carbon_impact
+
+    def test_calls_outside_loops_not_flagged(self) -> None:
+        """Test that the loop's own iterable and plain calls are fine."""
+        code = """
+import requests
+
+users = User.objects.filter(active=True)
+for user in requests.get(url).json():
+    print(user)
+"""
+        assert _issues(code, "io_in_loop") == []
+
+    def test_cursors_and_sessions_but_not_dataframes(self) -> None:
+        """Test that only database receivers match execute and query."""
+        code = """
+import pandas as pd
+
+frame = pd.read_csv("data.csv")
+for key in keys:
+    cursor.execute("SELECT 1 WHERE k = ?", (key,))
+    self.db.session.query(User).get(key)
+    frame.query("k == @key")
+    results.query(key)
+"""
+        issues = _issues(code, "io_in_loop")
+
+        assert [i.line for i in issues] == [6, 7]
+        assert "executemany" in issues[0].suggested_fix.description
+
+    def test_custom_signatures(self) -> None:
+        """Test configuring the recognized calls."""
+        code = """
+for key in keys:
+    value = client.fetch_one(key)
+"""
+        rule = IOInLoopRule(
+            [IOCallSignature(".fetch_one", "database", "client.fetch_many(keys)")]
+        )
+
+        (issue,) = rule.check(ast.parse(code), code, "test.py")
+
+        assert issue.suggested_fix.description == "Use client.fetch_many(keys)"
+
+
+class TestGeneratorExpressionRule:
+    """Test the GeneratorExpressionRule class."""
+
+    def test_single_use_comprehensions(self) -> None:
+        """Test sinks consuming the list directly or through a variable."""
+        code = """
+total = sum([x * x for x in range(10000)])
+for name in [n.strip() for n in names]:
+    print(name)
+squares = [x * x for x in values]
+biggest = max(squares)
+"""
+        issues = _issues(code, "use_generator")
+
+        assert [i.line for i in issues] == [2, 3, 5]
+        assert "sum()" in issues[0].message
+        assert issues[0].impact.memory_impact == 56 + 10000 * 40
+        assert "through 'squares'" in issues[2].message
+
+    def test_unusual_ranges(self) -> None:
+        """Test empty, invalid and huge ranges."""
+        code = """
+a = sum([x for x in range(5, 5)])
+b = sum([x for x in range(0, 10, 0)])
+c = sum([x for x in range(1000000000000000000000000000000)])
+"""
+        issues = _issues(code, "use_generator")
+
+        assert [i.line for i in issues] == [2, 3, 4]
+        assert "0 elements)" in issues[0].message
+        assert issues[0].impact.memory_impact == 56
+        assert "1,000 elements assumed" in issues[1].message
+        assert "1,000 elements assumed" in issues[2].message
+
+    def test_shadowed_range_not_sized(self) -> None:
+        """Test that only the builtin range() gives a static size."""
+        code = """
+from numpy import arange as range
+
+total = sum([x for x in range(5)])
+"""
+        (issue,) = _issues(code, "use_generator")
+
+        assert "1,000 elements assumed" in issue.message
+
+    def test_reused_or_materialized_lists_not_flagged(self) -> None:
+        """Test lists that are needed as lists."""
+        code = """
+a = [x for x in xs]
+print(len(a), sum(a))
+b = [x for x in xs]
+for item in items:
+    total = sum(b)
+text = ",".join([str(x) for x in xs])
+rows = [x for x in xs]
+save(rows)
+"""
+        assert _issues(code, "use_generator") == []
+
+
+class TestFileHandlingRule:
+    """Test the FileHandlingRule class."""
+
+    def test_managed_resources_not_flagged(self) -> None:
+        """Test with statements, contextlib and handed-over resources."""
+        code = """
+import contextlib
+import socket
+
+def read(path, stack):
+    with open(path) as f:
+        data = f.read()
+    with contextlib.closing(socket.socket()) as s:
+        s.connect(addr)
+    log = stack.enter_context(open("log.txt"))
+    out = open(path + ".out", "w")
+    try:
+        out.write(data)
+    finally:
+        out.close()
+    return open(path, "rb")
+"""
+        assert _issues(code, "file_handling_efficiency") == []
+
+    def test_leaked_resources(self) -> None:
+        """Test resources that are never closed, or closed unreliably."""
+        code = """
+import json
+import sqlite3
+
+def load(path):
+    config = json.load(open(path))
+    conn = sqlite3.connect("app.db")
+    rows = conn.execute("SELECT 1").fetchall()
+    f = open(path)
+    text = f.read()
+    f.close()
+    with sqlite3.connect("app.db") as db:
+        db.execute("DELETE FROM t")
+"""
+        issues = _issues(code, "file_handling_efficiency")
+        messages = [i.message for i in issues]
+
+        assert [i.line for i in issues] == [6, 7, 9, 12]
+        assert "garbage collection" in messages[0]
+        assert "'conn' is never closed" in messages[1]
+        assert "closed manually" in messages[2]
+        assert "never closed" in messages[3]
+
+    def test_reopened_in_loop(self) -> None:
+        """Test resources reopened unchanged on every iteration."""
+        code = """
+import requests
+import socket
+import sqlite3
+
+def export(lines, paths):
+    for line in lines:
+        with open("audit.log", "a") as log:
+            log.write(line)
+        session = requests.Session()
+        session.close()
+    for path in paths:
+        with open(path) as f:
+            print(f.read())
+        with socket.socket() as s:
+            s.connect(path)
+        with sqlite3.connect(database="app.db") as db:
+            db.execute("SELECT 1")
+"""
+        issues = _issues(code, "file_handling_efficiency")
+
+        assert [i.line for i in issues] == [8, 10, 17]
+        assert all("the loop at line 7" in i.message for i in issues[:2])
+        assert "the loop at line 12" in issues[2].message
+
+
+class TestMemoizationRule:
+    """Test the MemoizationRule class."""
+
+    def test_naive_recursion(self) -> None:
+        """Test the naive Fibonacci shape and its cached version."""
+        code = """
+import functools
+
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+
+@functools.lru_cache(maxsize=None)
+def fast_fib(n):
+    return n if n < 2 else fast_fib(n - 1) + fast_fib(n - 2)
+
+def factorial(n):
+    return 1 if n < 2 else n * factorial(n - 1)
+"""
+        issues = _issues(code, "memoization_opportunity")
+
+        assert [i.line for i in issues] == [4]
+        assert "fib(n - 1), fib(n - 2)" in issues[0].message
+        assert "lru_cache" in issues[0].suggested_fix.description
+        assert "inferred to be pure" in issues[0].suggested_fix.instructions
+
+    def test_repeated_pure_calls(self) -> None:
+        """Test calls with loop-invariant or repeated constant arguments."""
+        code = """
+def scale(x, factor):
+    return x * factor + len(str(x))
+
+def main(items, k):
+    out = []
+    for item in items:
+        out.append(scale(k, 3) + scale(item, 3))
+    a = scale(2, 3)
+    b = scale(2, 3)
+    return out, a, b
+"""
+        issues = _issues(code, "memoization_opportunity")
+
+        assert [i.line for i in issues] == [8, 10]
+        assert "every iteration of the loop at line 7" in issues[0].message
+        assert "called 2 times" in issues[1].message
+        assert "only calls len, str" in issues[1].suggested_fix.instructions
+
+    def test_impure_functions_not_flagged(self) -> None:
+        """Test that side effects, also through callees, prevent reports."""
+        code = """
+counter = []
+
+def log(x):
+    print(x)
+    return x
+
+def wrapped(x):
+    return log(x) + 1
+
+def record(x):
+    counter.append(x)
+    return x
+
+def walk(n):
+    global counter
+    return walk(n - 1) + walk(n - 2)
+
+def main(k):
+    for _ in range(10):
+        wrapped(k)
+        record(k)
+    log(1)
+    log(1)
+"""
+        assert _issues(code, "memoization_opportunity") == []
+
+    def test_method_calls_need_known_receivers(self) -> None:
+        """Test that read-only methods are pure only on builtin types."""
+        code = """
+import os
+import requests
+
+def fetch(url):
+    return requests.get(url)
+
+def setting(key):
+    return os.environ.get(key)
+
+def add(items, x):
+    alias = items
+    alias.append(x)
+    return alias
+
+def shout(text: str):
+    return text.upper()
+
+def main(urls, items):
+    for u in urls:
+        fetch("https://example.com")
+        setting("HOME")
+        add(items, 1)
+        shout("hi")
+"""
+        issues = _issues(code, "memoization_opportunity")
+
+        assert [i.line for i in issues] == [24]
+
+    def test_mutable_results_not_shared(self) -> None:
+        """Test that fresh mutable results and results changed in loops are kept."""
+        code = """
+TABLE = {"a": (1, 2)}
+
+def empty(n):
+    return [0] * n
+
+def grid(n):
+    return empty(n)
+
+def counts(keys):
+    found = {}
+    return found if keys else None
+
+def lookup(key):
+    return TABLE.get(key)
+
+def width(key):
+    return len(key) * 2
+
+def main(n, keys):
+    rows = []
+    for i in range(n):
+        row = empty(5)
+        row[0] = i
+        rows.append(row)
+        cells = grid(3)
+        seen = counts(keys)
+        cell = lookup("a")
+        cell.append(i)
+        size = width("a")
+    return rows, cells, seen, size
+"""
+        issues = _issues(code, "memoization_opportunity")
+
+        assert [i.line for i in issues] == [30]
+
+
+class TestRegexRules:
+    """Test the RegexInLoopRule and RegexBacktrackingRule classes."""
+
+    def test_constant_pattern_in_loop(self) -> None:
+        """Test re calls with literal or constant patterns inside loops."""
+        code = """
+import re
+from re import sub
+
+WORD = r"\\w+"
+
+def scan(lines, pattern):
+    for line in lines:
+        re.search(r"\\d+", line)
+        sub(WORD, "", line)
+        re.match(pattern, line)
+        re.compile("x")
+    re.search(r"\\d+", lines[0])
+"""
+        issues = _issues(code, "regex_in_loop")
+
+        assert [i.line for i in issues] == [9, 10]
+        assert "re.search()" in issues[0].message
+        assert ".sub() method" in issues[1].suggested_fix.description
+
+    def test_catastrophic_backtracking(self) -> None:
+        """Test nested quantifiers and overlapping alternations."""
+        code = """
+import re
+
+EMAIL = re.compile(r"^(\\w+\\.?)*@example\\.com$")
+re.match("(a|a)*b", text)
+re.findall(r"(\\d+,)*", text)
+re.search(r"(?:x+x+)+y", text)
+re.sub(r"(\\w|\\d)+", "", text)
+re.split(r" (a +)+", text, 0, re.VERBOSE)
+re.split(r" (a +)+", text)
+"""
+        issues = _issues(code, "regex_backtracking")
+
+        # Spaces only separate the repeats without re.VERBOSE
+        assert [i.line for i in issues] == [4, 5, 7, 9]
+        assert "nested quantifiers" in issues[0].message
+        assert "overlapping alternation" in issues[1].message
+
+    def test_backtracking_checker(self) -> None:
+        """Test the regex parse-tree checker directly."""
+        assert backtracking_problem(r"^(([a-z])+.)+[A-Z]([a-z])+$")
+        assert backtracking_problem(r"([a-z]+\.)+[a-z]{2,}") is None
+        assert backtracking_problem(r"(a|ab)*c") is None
+        assert backtracking_problem("(") is None
+        assert backtracking_problem(rb"(\d+)+$")
+
+
+class TestAsyncBlockingCallRule:
+    """Test the AsyncBlockingCallRule class."""
+
+    def test_direct_blocking_calls(self) -> None:
+        """Test sleeps, HTTP requests, file and CPU-heavy calls in coroutines."""
+        code = """
+import asyncio
+import hashlib
+import time
+from requests import get
+
+async def handler(url, password):
+    time.sleep(1)
+    response = get(url)
+    with open("log.txt", "a") as log:
+        log.write(response.text)
+    key = hashlib.pbkdf2_hmac("sha256", password, b"salt", 100000)
+    await asyncio.sleep(1)
+    await asyncio.to_thread(time.sleep, 1)
+    return key
+
+def sync_handler():
+    time.sleep(1)
+"""
+        issues = _issues(code, "blocking_call_in_async")
+
+        assert [i.line for i in issues] == [8, 9, 10, 12]
+        assert "asyncio.sleep" in issues[0].suggested_fix.description
+        assert "Blocking cpu call" in issues[3].message
+
+    def test_transitive_blocking_through_helpers(self) -> None:
+        """Test blocking calls reached through synchronous helpers."""
+        code = """
+import asyncio
+import requests
+
+def fetch(url):
+    return requests.get(url).json()
+
+def load(urls):
+    return [fetch(u) for u in urls]
+
+def pure(x):
+    return x * 2
+
+async def main(urls):
+    data = load(urls)
+    await asyncio.to_thread(load, urls)
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, lambda: fetch(urls[0]))
+    return pure(len(data))
+"""
+        issues = _issues(code, "blocking_call_in_async")
+
+        assert [i.line for i in issues] == [15]
+        assert "load -> fetch calls requests.get() at line 6" in issues[0].message
+        assert issues[0].suggested_fix.replacement_code == (
+            "await asyncio.to_thread(load, ...)"
+        )
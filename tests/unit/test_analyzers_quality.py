@@ -170,6 +170,34 @@ print("Hello world")
         unused_import_issues = [i for i in issues if i.rule_id == "unused_import"]
         assert len(unused_import_issues) == 2
 
+    def test_dotted_import_used(self) -> None:
+        """Test that 'import a.b' is used through its top-level name."""
+        code = """
+import os.path
+
+print(os.path.join("a", "b"))
+"""
+
+        tree = ast.parse(code)
+        issues = self.analyzer.analyze(tree, code, "test.py")
+
+        unused_import_issues = [i for i in issues if i.rule_id == "unused_import"]
+        assert len(unused_import_issues) == 0
+
+    def test_import_exported_in_dunder_all(self) -> None:
+        """Test that names re-exported through __all__ are not flagged."""
+        code = """
+from os import getcwd
+
+__all__ = ["getcwd"]
+"""
+
+        tree = ast.parse(code)
+        issues = self.analyzer.analyze(tree, code, "test.py")
+
+        unused_import_issues = [i for i in issues if i.rule_id == "unused_import"]
+        assert len(unused_import_issues) == 0
+
     def test_import_alias_used(self) -> None:
         """Test that used import aliases are not flagged."""
         code = """
@@ -276,15 +304,25 @@ def outer_function():
         tree = ast.parse(code)
         issues = self.analyzer.analyze(tree, code, "test.py")
 
-        # Filter for unused variable issues
+        # Filter for unused variable issues - the closure reference counts
+        unused_var_issues = [i for i in issues if i.rule_id == "unused_variable"]
+        assert len(unused_var_issues) == 0
+
+    def test_global_assignment_not_flagged(self) -> None:
+        """Test that assignments to declared globals are not local variables."""
+        code = """
+counter = 0
+
+def bump():
+    global counter
+    counter = counter + 1
+"""
+
+        tree = ast.parse(code)
+        issues = self.analyzer.analyze(tree, code, "test.py")
+
         unused_var_issues = [i for i in issues if i.rule_id == "unused_variable"]
-        # Note: Current implementation has a limitation with nested scopes
-        # The variable is flagged as unused even though it's used in nested function
-        # This is a known limitation - we test the current behavior
-        assert (
-            len(unused_var_issues) == 1
-        )  # Current behavior: outer_var flagged as unused
-        assert "outer_var" in unused_var_issues[0].message
+        assert len(unused_var_issues) == 0
 
 
 class TestLongParameterListRule:
@@ -0,0 +1,174 @@
+"""
+Test suite for the analyzer and rule registry.
+
+This module tests rule specs, lazy rule loading and entry point discovery.
+"""
+
+import ast
+from types import SimpleNamespace
+
+import pytest
+
+from ecoguard_ai.analyzers import registry
+from ecoguard_ai.analyzers.base import BaseAnalyzer
+from ecoguard_ai.analyzers.registry import (
+    AnalyzerSpec,
+    RuleMap,
+    RuleRegistry,
+    RuleSpec,
+    get_registry,
+)
+
+# Importing this target fails, so a test passes only if it is never loaded
+BROKEN_TARGET = "ecoguard_ai_missing_plugin:Rule"
+
+
+class PluginAnalyzer(BaseAnalyzer):
+    """Analyzer used to exercise rule specs."""
+
+    def __init__(self) -> None:
+        super().__init__(name="Plugin Analyzer", description="Test analyzer")
+
+    def analyze(self, tree: ast.AST, source_code: str, file_path: str):
+        """Run the registered rules."""
+        return self.run_rules(tree, source_code, file_path)
+
+
+class TestRuleMap:
+    """Test the RuleMap class."""
+
+    def test_specs_are_loaded_on_first_access(self) -> None:
+        """Test that a rule is instantiated only when it is looked up."""
+        rules = RuleMap()
+        rules.add_spec(
+            RuleSpec(
+                "unused_import",
+                "quality",
+                "ecoguard_ai.analyzers.quality:UnusedImportRule",
+            )
+        )
+
+        assert "unused_import" in rules
+        assert len(rules) == 1
+        assert not rules.is_loaded("unused_import")
+        assert rules["unused_import"].rule_id == "unused_import"
+        assert rules.is_loaded("unused_import")
+
+    def test_disabling_does_not_load(self) -> None:
+        """Test that enabling and disabling only record a flag."""
+        rules = RuleMap()
+        rules.add_spec(RuleSpec("broken", "test", BROKEN_TARGET))
+
+        rules.set_enabled("broken", False)
+
+        assert not rules.is_enabled("broken")
+        assert rules.loaded() == []
+        with pytest.raises(ImportError):
+            rules["broken"]
+
+    def test_mismatched_rule_id(self) -> None:
+        """Test that a spec must load the rule it describes."""
+        rules = RuleMap()
+        rules.add_spec(
+            RuleSpec(
+                "other", "quality", "ecoguard_ai.analyzers.quality:UnusedImportRule"
+            )
+        )
+
+        with pytest.raises(ValueError):
+            rules["other"]
+
+    def test_mismatched_metadata_and_node_types(self) -> None:
+        """Test that stated names and categories, and node types, are checked."""
+        target = "ecoguard_ai.analyzers.quality:UnusedImportRule"
+
+        with pytest.raises(ValueError, match="category"):
+            RuleSpec("unused_import", "quality", target, category="green").load()
+        with pytest.raises(ValueError, match="Improt"):
+            RuleSpec("unused_import", "quality", target, node_types=("Improt",)).load()
+
+
+class TestLazyAnalyzerRules:
+    """Test that analyzers skip rules without importing them."""
+
+    def test_disabled_rule_is_never_imported(self) -> None:
+        """Test that a disabled spec does not run."""
+        analyzer = PluginAnalyzer()
+        analyzer.rules.add_spec(RuleSpec("broken", "test", BROKEN_TARGET))
+        analyzer.disable_rule("broken")
+
+        assert analyzer.analyze(ast.parse("x = 1"), "x = 1", "test.py") == []
+
+    def test_rule_skipped_for_missing_node_types(self) -> None:
+        """Test that a rule is not loaded for files without its node types."""
+        analyzer = PluginAnalyzer()
+        analyzer.rules.add_spec(
+            RuleSpec("broken", "test", BROKEN_TARGET, node_types=("Lambda",))
+        )
+
+        assert analyzer.analyze(ast.parse("x = 1"), "x = 1", "test.py") == []
+        with pytest.raises(ImportError):
+            analyzer.analyze(ast.parse("f = lambda: 1"), "f = lambda: 1", "test.py")
+
+    def test_builtin_analyzers_use_registry(self) -> None:
+        """Test that built-in analyzers register every built-in rule."""
+        from ecoguard_ai.analyzers.quality import QualityAnalyzer
+
+        analyzer = QualityAnalyzer()
+        expected = [spec.rule_id for spec in get_registry().rules_for("quality")]
+
+        assert list(analyzer.rules) == expected
+        assert analyzer.rules.loaded() == []
+
+
+class TestRuleRegistry:
+    """Test the RuleRegistry class."""
+
+    def test_builtin_rule_targets_match(self) -> None:
+        """Test that every built-in spec loads the rule it describes."""
+        for spec in registry.BUILTIN_RULES:
+            rule = spec.load()
+            assert (rule.name, rule.category, rule.severity) == (
+                spec.name,
+                spec.category,
+                spec.severity,
+            )
+            visitors = {
+                name[len("visit_") :]
+                for name in dir(type(rule))
+                if name.startswith("visit_")
+                and getattr(type(rule), name)
+                is not getattr(ast.NodeVisitor, name, None)
+            }
+            # Rules walking the module themselves may look at anything
+            if "Module" not in visitors:
+                assert set(spec.node_types) <= visitors, spec.rule_id
+
+    def test_entry_points(self, monkeypatch) -> None:
+        """Test that plugins register analyzers and rules via entry points."""
+        analyzer_spec = AnalyzerSpec("plugin", "tests.unit:PluginAnalyzer")
+        rule_specs = [
+            RuleSpec("plugin_rule", "plugin", BROKEN_TARGET),
+            RuleSpec("quality_extra", "quality", BROKEN_TARGET),
+        ]
+
+        def broken():
+            raise ImportError("missing dependency")
+
+        groups = {
+            registry.ANALYZERS_ENTRY_POINT_GROUP: [
+                SimpleNamespace(name="analyzer", load=lambda: analyzer_spec)
+            ],
+            registry.RULES_ENTRY_POINT_GROUP: [
+                SimpleNamespace(name="rules", load=lambda: rule_specs),
+                SimpleNamespace(name="broken", load=broken),
+            ],
+        }
+        monkeypatch.setattr(registry, "_entry_points", lambda group: groups[group])
+
+        rule_registry = RuleRegistry()
+        with pytest.warns(UserWarning, match="broken"):
+            rule_registry.load_entry_points()
+
+        assert rule_registry.analyzers == [analyzer_spec]
+        assert rule_registry.rules_for("quality") == [rule_specs[1]]
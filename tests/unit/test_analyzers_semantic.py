@@ -0,0 +1,124 @@
+"""
+Test suite for the shared semantic model.
+
+This module tests scope construction, binding collection and name
+resolution in the per-file symbol table.
+"""
+
+import ast
+
+from ecoguard_ai.analyzers.semantic import (
+    BindingKind,
+    ScopeKind,
+    get_semantic_model,
+)
+
+SAMPLE = """
+import os.path as osp
+from collections import OrderedDict
+
+LIMIT = 10
+
+class Config:
+    size = LIMIT
+
+    def method(self, value):
+        return size_of(value)
+
+def outer(items):
+    total = 0
+    def inner():
+        return total + LIMIT
+    squares = [x * x for x in items if x < LIMIT]
+    return inner, squares
+
+def setter():
+    global LIMIT
+    LIMIT = 20
+"""
+
+
+class TestSemanticModel:
+    """Test the SemanticModel class."""
+
+    def setup_method(self) -> None:
+        """Set up test fixtures."""
+        self.tree = ast.parse(SAMPLE)
+        self.model = get_semantic_model(self.tree)
+
+    def test_model_is_cached_on_tree(self) -> None:
+        """Test that the model is built once per tree."""
+        assert get_semantic_model(self.tree) is self.model
+
+    def test_scope_kinds(self) -> None:
+        """Test that every kind of scope is created."""
+        kinds = [scope.kind for scope in self.model.scopes]
+
+        assert kinds[0] is ScopeKind.MODULE
+        assert ScopeKind.CLASS in kinds
+        assert ScopeKind.COMPREHENSION in kinds
+        assert len(self.model.scopes_of_kind(ScopeKind.FUNCTION)) == 4
+
+    def test_import_bindings(self) -> None:
+        """Test that imports record their qualified names."""
+        imports = {b.name: b for b in self.model.imports()}
+
+        assert imports["osp"].qualified_name == "os.path"
+        assert imports["OrderedDict"].qualified_name == "collections.OrderedDict"
+        assert imports["osp"].line == 2
+        assert not imports["osp"].used
+
+    def test_closure_reference_resolves_to_outer_scope(self) -> None:
+        """Test that loads in nested functions resolve outwards."""
+        outer = next(s for s in self.model.scopes if s.name == "outer")
+
+        assert outer.is_referenced("total")
+        assert outer.lookup("items")[0].kind is BindingKind.PARAMETER
+
+    def test_class_scope_not_visible_from_methods(self) -> None:
+        """Test that class attributes are not visible inside methods."""
+        config = next(s for s in self.model.scopes if s.name == "Config")
+
+        assert config.lookup("size")
+        assert not config.is_referenced("size")
+        assert any(n.id == "size_of" for n in self.model.unresolved)
+
+    def test_global_declaration_binds_module_name(self) -> None:
+        """Test that 'global' assignments bind in the module scope."""
+        module = self.model.module_scope
+        setter = next(s for s in self.model.scopes if s.name == "setter")
+
+        assert len(module.lookup("LIMIT")) == 2
+        assert setter.lookup("LIMIT") == []
+
+    def test_comprehension_variables_are_local(self) -> None:
+        """Test that comprehension targets bind in the comprehension scope."""
+        comprehension = self.model.scopes_of_kind(ScopeKind.COMPREHENSION)[0]
+        outer = next(s for s in self.model.scopes if s.name == "outer")
+
+        assert comprehension.lookup("x")[0].kind is BindingKind.LOOP
+        assert outer.lookup("x") == []
+
+    def test_parents_and_resolution(self) -> None:
+        """Test parent links and resolution of individual loads."""
+        loads = [
+            n
+            for n in ast.walk(self.tree)
+            if isinstance(n, ast.Name)
+            and n.id == "total"
+            and isinstance(n.ctx, ast.Load)
+        ]
+        bindings = self.model.resolve(loads[0])
+
+        assert bindings[0].scope.name == "outer"
+        assert isinstance(self.model.parent(loads[0]), ast.BinOp)
+        assert isinstance(self.model.ancestors(loads[0])[-1], ast.Module)
+
+    def test_qualified_names(self) -> None:
+        """Test that names are qualified through imports."""
+        tree = ast.parse("import os.path as osp\nosp.join(a)\nopen(b)\nx.y\n")
+        model = get_semantic_model(tree)
+        calls = [n.func for n in ast.walk(tree) if isinstance(n, ast.Call)]
+
+        assert [model.qualified_name(f) for f in calls] == ["os.path.join", "open"]
+        assert model.qualified_name(tree.body[-1].value) == "x.y"
@@ -186,6 +186,31 @@ class TestAnalyzeCommand:
             result = runner.invoke(cli, ["analyze", temp_dir])
             assert result.exit_code in [0, 1]
 
+    def test_analyze_changed_files(self, runner, tmp_path) -> None:
+        """Test that --changed limits analysis to dependents of the files."""
+        (tmp_path / "base.py").write_text("X = 1\n")
+        (tmp_path / "user.py").write_text("import base\n")
+        (tmp_path / "alone.py").write_text("import os\n")
+
+        result = runner.invoke(
+            cli,
+            [
+                "analyze",
+                str(tmp_path),
+                "--changed",
+                str(tmp_path / "base.py"),
+                "--import-graph",
+                str(tmp_path / "graph.json"),
+                "--format",
+                "json",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "user.py" in result.output
+        assert "alone.py" not in result.output
+        assert (tmp_path / "graph.json").exists()
+
     def test_analyze_directory_with_errors(self, runner, tmp_path) -> None:
         """Test analyze command on directory that causes errors."""
         # Create a directory with Python files that might have issues
@@ -278,6 +303,84 @@ class TestRulesCommand:
         assert "Available Analysis Rules" in result.output
 
 
+class TestServeCommand:
+    """Test the serve command."""
+
+    def test_serve_builds_the_service_from_options(self) -> None:
+        """Test that serve wires its options into the service and stops it."""
+        server = MagicMock(server_address=("127.0.0.1", 9000))
+        server.serve_forever.side_effect = KeyboardInterrupt
+        runner = CliRunner()
+
+        with patch("ecoguard_ai.server.create_server", return_value=server) as create:
+            result = runner.invoke(
+                cli, ["serve", "--port", "9000", "--workers", "2", "--batch-size", "8"]
+            )
+
+        assert result.exit_code == 0
+        assert "http://127.0.0.1:9000" in result.output
+        service = create.call_args.kwargs["service"]
+        assert (service.workers, service.max_batch_size) == (2, 8)
+        server.server_close.assert_called_once()
+
+
+class TestShardCommands:
+    """Test analyze --shard and merge."""
+
+    def test_shard_and_merge(self, tmp_path) -> None:
+        """Test that merged shard reports cover the whole project."""
+        source = tmp_path / "project"
+        source.mkdir()
+        for name in ("a.py", "b.py", "c.py"):
+            (source / name).write_text("import os\n")
+        runner = CliRunner()
+        reports = []
+        for index in (1, 2):
+            report = tmp_path / f"shard{index}.json"
+            runner.invoke(
+                cli,
+                ["analyze", str(source), "--shard", f"{index}/2", "-f", "json"]
+                + ["-o", str(report)],
+            )
+            reports.append(str(report))
+
+        result = runner.invoke(cli, ["merge", *reports, "-f", "json"])
+        bad_shard = runner.invoke(cli, ["analyze", str(source), "--shard", "3/2"])
+
+        assert result.exit_code == 0
+        merged = json.loads(result.output)
+        assert merged["summary"]["total_files"] == 3
+        assert merged["metadata"]["shards"]["missing"] == []
+        assert bad_shard.exit_code == 1
+
+
+class TestStoreCommand:
+    """Test the store commands."""
+
+    def test_ingest_and_query(self, tmp_path) -> None:
+        """Test storing a JSON report and querying its trends."""
+        source = tmp_path / "project"
+        source.mkdir()
+        (source / "app.py").write_text("import os\n")
+        report = tmp_path / "report.json"
+        database = str(tmp_path / "history.db")
+        runner = CliRunner()
+        runner.invoke(cli, ["analyze", str(source), "-f", "json", "-o", str(report)])
+
+        ingest = runner.invoke(cli, ["store", "ingest", database, str(report)])
+        again = runner.invoke(cli, ["store", "ingest", database, str(report)])
+        trend = runner.invoke(
+            cli,
+            ["store", "rule-trend", database, "--rule", "unused_import", "-f", "json"],
+        )
+        scores = runner.invoke(cli, ["store", "scores", database])
+
+        assert ingest.exit_code == 0 and "Stored 1 run" in ingest.output
+        assert "1 already present" in again.output
+        assert [row["count"] for row in json.loads(trend.output)] == [1]
+        assert scores.exit_code == 0 and "Score History" in scores.output
+
+
 class TestCLIHelpers:
     """Test CLI helper functions."""
 
@@ -931,9 +1034,8 @@ class TestCLIEdgeCases:
         result = runner.invoke(cli, ["rules"])
         assert result.exit_code == 0
         assert "Available Analysis Rules" in result.output
-        assert "Stage 1" in result.output
-        assert "Stage 2" in result.output
-        assert "Stage 3" in result.output
+        assert "unused_import" in result.output
+        assert "inefficient_loop" in result.output
 
 
 class TestCLISeverityHandling:
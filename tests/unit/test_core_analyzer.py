@@ -1,8 +1,13 @@
 """Tests for the core analyzer functionality."""
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import pytest
 
 from ecoguard_ai.core.analyzer import AnalysisConfig, EcoGuardAnalyzer
+from ecoguard_ai.core.parallel import shutdown_process_pool
 from ecoguard_ai.core.result import AnalysisResult
 
 
@@ -146,3 +151,165 @@ class TestEcoGuardAnalyzer:
 
         assert isinstance(result, AnalysisResult)
         assert len(result.issues) == 0  # No analyzers enabled, so no issues
+
+    def test_disabled_rules(self, sample_python_file) -> None:
+        """Test that rules listed in the config are switched off."""
+        analyzer = EcoGuardAnalyzer(AnalysisConfig(disabled_rules=["unused_import"]))
+
+        result = analyzer.analyze_file(sample_python_file)
+
+        assert result.get_issues_by_rule("unused_import") == []
+        assert all(not a.rules.is_loaded("unused_import") for a in analyzer._analyzers)
+
+    def test_analyze_directory_reports_cross_file_duplicates(
+        self, analyzer, temp_dir
+    ) -> None:
+        """Test that duplicate functions across files are reported."""
+        (temp_dir / "a.py").write_text(
+            "def f(x):\n    a = x + 1\n    b = a * 2\n    return b\n"
+        )
+        (temp_dir / "b.py").write_text(
+            "def g(y):\n    c = y + 5\n    d = c * 3\n    return d\n"
+        )
+
+        results = analyzer.analyze_directory(temp_dir)
+        duplicates = {
+            r.file_path: r.get_issues_by_rule("duplicate_function") for r in results
+        }
+
+        assert duplicates[str(temp_dir / "a.py")] == []
+        assert len(duplicates[str(temp_dir / "b.py")]) == 1
+
+    def test_single_files_do_not_touch_project_state(self, analyzer) -> None:
+        """Test that files analyzed on their own, on any thread, are not indexed."""
+        code = "def f(x):\n    a = x + 1\n    b = a * 2\n    return b\n"
+        sources = [("a.py", code), ("b.py", code.replace("f(", "g("))]
+        stop = threading.Event()
+
+        def noise():
+            while not stop.is_set():
+                analyzer.analyze_source(code, "noise.py")
+
+        thread = threading.Thread(target=noise)
+        thread.start()
+        try:
+            runs = [analyzer.analyze_sources(sources) for _ in range(10)]
+        finally:
+            stop.set()
+            thread.join()
+        for index in range(5):
+            analyzer.analyze_source(code, f"file{index}.py")
+
+        for results in runs:
+            assert len(results[1].get_issues_by_rule("duplicate_function")) == 1
+        states = [a.export_project_state() for a in analyzer._analyzers]
+        functions = [
+            state["duplicate_function"]["functions"]
+            for state in states
+            if "duplicate_function" in state
+        ]
+        assert [sorted(f["file_path"] for f in fs) for fs in functions] == [
+            ["a.py", "b.py"]
+        ]
+
+    def test_analyze_source_skips_the_filesystem(self, analyzer) -> None:
+        """Test analyzing code under a path that does not exist."""
+        code = "import os\n\nx = 'é'\n"
+
+        result = analyzer.analyze_source(code, "review/patch.txt")
+
+        assert result.file_path == "review/patch.txt"
+        assert result.metadata["file_size"] == len(code.encode("utf-8"))
+        assert [i.file_path for i in result.get_issues_by_rule("unused_import")] == [
+            "review/patch.txt"
+        ]
+
+    def test_analyze_sources_in_process_and_parallel(self, analyzer) -> None:
+        """Test batches with cross-file checks and on the process pool."""
+        sources = [
+            ("a.py", "def f(x):\n    a = x + 1\n    b = a * 2\n    return b\n"),
+            ("b.py", "def g(y):\n    c = y + 5\n    d = c * 3\n    return d\n"),
+            ("c.py", "def broken(:\n"),
+        ]
+
+        results = analyzer.analyze_sources(sources)
+        try:
+            parallel = analyzer.analyze_sources(sources, parallel=True)
+        finally:
+            shutdown_process_pool()
+
+        assert [r.file_path for r in results] == ["a.py", "b.py", "c.py"]
+        assert len(results[1].get_issues_by_rule("duplicate_function")) == 1
+        assert results[2].metadata == {"error": "syntax_error"}
+        assert [r.file_path for r in parallel] == ["a.py", "b.py", "c.py"]
+        assert parallel[2].metadata == {"error": "syntax_error"}
+
+    def test_analyze_changed_follows_reverse_dependencies(self, temp_dir) -> None:
+        """Test that only changed files and their importers are analyzed."""
+        (temp_dir / "models.py").write_text("VALUE = 1\n")
+        (temp_dir / "service.py").write_text("from models import VALUE\n")
+        (temp_dir / "app.py").write_text("import service\n")
+        (temp_dir / "other.py").write_text("import json\n")
+        graph_file = temp_dir / "graph.json"
+        analyzer = EcoGuardAnalyzer(AnalysisConfig(import_graph_file=str(graph_file)))
+
+        results = analyzer.analyze_changed(temp_dir, [temp_dir / "models.py"])
+
+        assert sorted(Path(r.file_path).name for r in results) == [
+            "app.py",
+            "models.py",
+            "service.py",
+        ]
+        assert graph_file.exists()
+
+        # A fresh analyzer reuses the saved graph
+        analyzer = EcoGuardAnalyzer(AnalysisConfig(import_graph_file=str(graph_file)))
+        results = analyzer.analyze_changed(temp_dir, [temp_dir / "app.py"])
+        assert [Path(r.file_path).name for r in results] == ["app.py"]
+
+    def test_analyze_changed_reanalyzes_importers_of_deleted_files(
+        self, temp_dir
+    ) -> None:
+        """Test that deleting a module re-analyzes the files importing it."""
+        (temp_dir / "models.py").write_text("VALUE = 1\n")
+        (temp_dir / "service.py").write_text("from models import VALUE\n")
+        (temp_dir / "other.py").write_text("import json\n")
+        analyzer = EcoGuardAnalyzer()
+        analyzer.analyze_directory(temp_dir)
+
+        (temp_dir / "models.py").unlink()
+        (temp_dir / "extra.py").write_text("import service\n")
+        results = analyzer.analyze_changed(
+            temp_dir, [temp_dir / "models.py", temp_dir / "extra.py"]
+        )
+
+        assert sorted(Path(r.file_path).name for r in results) == [
+            "extra.py",
+            "service.py",
+        ]
+
+    def test_concurrent_analyze_file_matches_sequential(
+        self, analyzer, temp_dir
+    ) -> None:
+        """Test that a shared analyzer gives identical results across threads."""
+        files = []
+        for i in range(12):
+            file_path = temp_dir / f"module{i}.py"
+            file_path.write_text(
+                "import os\n"
+                + "".join(
+                    f"def f{j}(a, b, c, d, e, f):\n    unused{j} = {j}\n"
+                    f"    return [x for x in range({j})]\n"
+                    for j in range(i + 1)
+                )
+            )
+            files.append(file_path)
+
+        def summarize(path):
+            result = analyzer.analyze_file(path)
+            return sorted((i.rule_id, i.line, i.message) for i in result.issues)
+
+        expected = [summarize(path) for path in files]
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            for _ in range(3):
+                assert list(pool.map(summarize, files)) == expected
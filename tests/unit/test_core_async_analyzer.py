@@ -0,0 +1,132 @@
+"""
+Test suite for the asyncio analysis API.
+
+This module tests AsyncEcoGuardAnalyzer on thread and process executors,
+its streaming of batch results and cancellation.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from ecoguard_ai.core.analyzer import AnalysisConfig
+from ecoguard_ai.core.async_analyzer import AsyncEcoGuardAnalyzer
+from ecoguard_ai.core.parallel import get_process_pool, shutdown_process_pool
+
+CODE = "import os\n\ndef f():\n    unused = 1\n    return 2\n"
+
+
+class TestAsyncEcoGuardAnalyzer:
+    """Test the AsyncEcoGuardAnalyzer class."""
+
+    def setup_method(self) -> None:
+        """Set up an analyzer running on a small thread pool."""
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.analyzer = AsyncEcoGuardAnalyzer(executor=self.executor)
+
+    def teardown_method(self) -> None:
+        """Stop the thread pool."""
+        self.executor.shutdown(wait=True)
+
+    def test_analyze_source(self) -> None:
+        """Test analyzing code held in memory."""
+        result = asyncio.run(self.analyzer.analyze_source(CODE, "mem/module.py"))
+
+        rule_ids = {issue.rule_id for issue in result.issues}
+        assert result.file_path == "mem/module.py"
+        assert {"unused_import", "unused_variable"} <= rule_ids
+
+    def test_analyze_file(self, tmp_path: Path) -> None:
+        """Test reading and analyzing a file."""
+        path = tmp_path / "module.py"
+        path.write_text(CODE)
+
+        result = asyncio.run(self.analyzer.analyze_file(path))
+
+        assert result.metadata["file_size"] == path.stat().st_size
+        assert any(issue.rule_id == "unused_import" for issue in result.issues)
+
+    def test_analyze_file_rejects_missing_files(self, tmp_path: Path) -> None:
+        """Test that the sync API's path checks are kept."""
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(self.analyzer.analyze_file(tmp_path / "missing.py"))
+
+    def test_analyze_paths_streams_every_result(self, tmp_path: Path) -> None:
+        """Test that every path yields exactly one result."""
+        paths = []
+        for i in range(6):
+            path = tmp_path / f"m{i}.py"
+            path.write_text(CODE)
+            paths.append(path)
+        paths.append(tmp_path / "missing.py")
+
+        async def collect():
+            return [result async for result in self.analyzer.analyze_paths(paths)]
+
+        results = asyncio.run(collect())
+
+        assert sorted(r.file_path for r in results) == sorted(str(p) for p in paths)
+        errors = [r for r in results if r.metadata.get("error") == "file_error"]
+        assert [r.file_path for r in errors] == [str(tmp_path / "missing.py")]
+
+    def test_leaving_the_stream_cancels_pending_work(self, tmp_path: Path) -> None:
+        """Test that breaking out of analyze_paths cancels the rest."""
+        analyzer = AsyncEcoGuardAnalyzer(executor=self.executor, max_concurrency=2)
+        paths = [tmp_path / f"m{i}.py" for i in range(10)]
+        for path in paths:
+            path.write_text(CODE)
+
+        async def first():
+            stream = analyzer.analyze_paths(paths)
+            async for result in stream:
+                await stream.aclose()
+                return result
+
+        assert asyncio.run(first()).file_path in {str(p) for p in paths}
+
+    def test_cancellation(self) -> None:
+        """Test that a cancelled analysis raises CancelledError."""
+
+        async def cancel():
+            task = asyncio.ensure_future(self.analyzer.analyze_source(CODE))
+            await asyncio.sleep(0)
+            task.cancel()
+            await task
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(cancel())
+
+
+class TestProcessPool:
+    """Test the shared process pool."""
+
+    def teardown_method(self) -> None:
+        """Stop the shared pool."""
+        shutdown_process_pool()
+
+    def test_default_executor_is_the_shared_process_pool(self) -> None:
+        """Test analyzing in worker processes with a warm analyzer."""
+        analyzer = AsyncEcoGuardAnalyzer(AnalysisConfig(max_workers=1))
+
+        async def run():
+            return await asyncio.gather(
+                analyzer.analyze_source(CODE, "a.py"),
+                analyzer.analyze_source("x = (\n", "b.py"),
+            )
+
+        first, second = asyncio.run(run())
+
+        assert analyzer.executor is get_process_pool(1)
+        assert any(issue.rule_id == "unused_import" for issue in first.issues)
+        assert second.metadata == {"error": "syntax_error"}
+
+    def test_pools_of_other_sizes_stay_usable(self) -> None:
+        """Test that asking for another pool size keeps the first pool."""
+        first = get_process_pool(1)
+        second = get_process_pool(2)
+
+        assert second is not first
+        assert get_process_pool(1) is first
+        assert first.submit(pow, 2, 3).result() == 8
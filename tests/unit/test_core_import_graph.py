@@ -0,0 +1,110 @@
+"""
+Test suite for the project import graph.
+
+This module tests import extraction, relative import resolution and the
+incremental dependency index.
+"""
+
+import ast
+
+from ecoguard_ai.analyzers.semantic import get_semantic_model
+from ecoguard_ai.core.import_graph import (
+    ImportGraph,
+    import_names,
+    module_name,
+    resolve_import,
+    statement_imports,
+)
+
+
+class TestImportExtraction:
+    """Test import_names and resolve_import."""
+
+    def test_import_names(self) -> None:
+        """Test absolute, from and relative imports."""
+        tree = ast.parse(
+            "import os.path\n"
+            "from pkg import util\n"
+            "from . import sibling\n"
+            "from ..core import base\n"
+            "from x import *\n"
+        )
+
+        assert import_names(tree) == [
+            "..core",
+            "..core.base",
+            ".sibling",
+            "os.path",
+            "pkg",
+            "pkg.util",
+            "x",
+        ]
+        statements = get_semantic_model(tree).import_statements()
+        assert statement_imports(statements) == import_names(tree)
+
+    def test_resolve_relative_imports(self) -> None:
+        """Test relative imports from modules and packages."""
+        assert resolve_import(".sibling", "pkg.sub.mod") == "pkg.sub.sibling"
+        assert resolve_import("..core", "pkg.sub.mod") == "pkg.core"
+        assert resolve_import(".mod", "pkg.sub", is_package=True) == "pkg.sub.mod"
+        assert resolve_import("...x", "pkg.mod") is None
+        assert resolve_import("os", "pkg.mod") == "os"
+
+    def test_module_name(self, tmp_path) -> None:
+        """Test module names relative to a project root."""
+        assert module_name(tmp_path / "pkg" / "mod.py", tmp_path) == "pkg.mod"
+        assert module_name(tmp_path / "pkg" / "__init__.py", tmp_path) == "pkg"
+
+
+class TestImportGraph:
+    """Test the ImportGraph class."""
+
+    def setup_method(self) -> None:
+        """Set up a small graph: app -> service -> models, cli -> app."""
+        self.graph = ImportGraph()
+        self.graph.update("models", ["os"], file_path="models.py")
+        self.graph.update("service", ["models"], file_path="service.py")
+        self.graph.update("app", ["service", "json"], file_path="app.py")
+        self.graph.update("cli", ["app"], file_path="cli.py")
+
+    def test_edges(self) -> None:
+        """Test forward and reverse lookups."""
+        assert self.graph.imports_of("app") == ["json", "service"]
+        assert self.graph.importers_of("models") == ["service"]
+        assert "models" in self.graph
+        assert "os" not in self.graph  # imported, but not a project file
+        assert len(self.graph) == 4
+
+    def test_reverse_closure(self) -> None:
+        """Test that dependents are collected transitively."""
+        assert self.graph.reverse_closure(["models"]) == {
+            "models",
+            "service",
+            "app",
+            "cli",
+        }
+        assert self.graph.reverse_closure(["app"]) == {"app", "cli"}
+
+    def test_update_replaces_edges(self) -> None:
+        """Test that re-indexing a file drops its old edges."""
+        self.graph.update("service", [], file_path="service.py")
+
+        assert self.graph.importers_of("models") == []
+        assert self.graph.reverse_closure(["models"]) == {"models"}
+
+    def test_dotted_imports_depend_on_parent_packages(self) -> None:
+        """Test that importing a submodule also depends on its package."""
+        self.graph.update("main", ["pkg.sub.mod"], file_path="main.py")
+
+        assert "main" in self.graph.reverse_closure(["pkg"])
+
+    def test_save_and_load(self, tmp_path) -> None:
+        """Test the JSON round trip."""
+        self.graph.update("models", ["os"], file_path="models.py", stamp=(1, 2))
+        self.graph.save(tmp_path / "graph.json")
+        loaded = ImportGraph.load(tmp_path / "graph.json")
+
+        assert loaded.reverse_closure(["service"]) == {"service", "app", "cli"}
+        assert loaded.module_of("models.py") == "models"
+        assert loaded.is_current("models.py", (1, 2))
+        assert len(ImportGraph.load(tmp_path / "missing.json")) == 0
@@ -0,0 +1,94 @@
+"""
+Test suite for shard partitioning and merging.
+
+This module tests the deterministic file partition and that merged shard
+results match a single full scan.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from ecoguard_ai.core.analyzer import EcoGuardAnalyzer
+from ecoguard_ai.core.result import ProjectAnalysisResult
+from ecoguard_ai.core.sharding import parse_shard, partition_files, shard_files
+
+DUPLICATE_A = "def f(x):\n    a = x + 1\n    b = a * 2\n    return b\n"
+DUPLICATE_B = "def g(y):\n    c = y + 5\n    d = c * 3\n    return d\n"
+
+
+class TestPartition:
+    """Test parse_shard and partition_files."""
+
+    def test_parse_shard(self) -> None:
+        """Test valid and invalid shard specifications."""
+        assert parse_shard("2/4") == (2, 4)
+        for text in ("0/4", "5/4", "x/2", "1"):
+            with pytest.raises(ValueError):
+                parse_shard(text)
+
+    def test_partition_is_balanced_and_complete(self, tmp_path: Path) -> None:
+        """Test that every file lands in exactly one size-balanced shard."""
+        files = []
+        for i, size in enumerate([900, 500, 400, 300, 200, 100, 0]):
+            path = tmp_path / f"m{i}.py"
+            path.write_text("#" * size)
+            files.append(path)
+
+        shards = partition_files(files, 3, tmp_path)
+        loads = [sum(max(p.stat().st_size, 1) for p in shard) for shard in shards]
+
+        assert sorted(p for shard in shards for p in shard) == sorted(files)
+        assert max(loads) - min(loads) <= 200
+        # Independent of the discovery order
+        assert partition_files(reversed(files), 3, tmp_path) == shards
+        assert shard_files(files, 2, 3, tmp_path) == shards[1]
+
+
+class TestShardedScan:
+    """Test analyze_shard and merge_shards."""
+
+    def _project(self, root: Path) -> None:
+        (root / "a.py").write_text(DUPLICATE_A)
+        (root / "b.py").write_text(DUPLICATE_B)
+        (root / "c.py").write_text("import os\n" + "# padding\n" * 20)
+
+    def test_merge_matches_full_scan(self, tmp_path: Path) -> None:
+        """Test that cross-file duplicates are found across shards."""
+        self._project(tmp_path)
+        full = EcoGuardAnalyzer().analyze_directory(tmp_path)
+
+        shards = [EcoGuardAnalyzer().analyze_shard(tmp_path, i, 3) for i in (1, 2, 3)]
+        # Shards travel between machines as JSON
+        shards = [ProjectAnalysisResult.from_json(s.to_json()) for s in shards]
+        merged = EcoGuardAnalyzer().merge_shards(shards)
+
+        def summary(results):
+            return sorted(
+                (Path(r.file_path).name, i.rule_id, i.line)
+                for r in results
+                for i in r.issues
+            )
+
+        assert all(len(s.file_results) == 1 for s in shards)
+        assert summary(merged.file_results) == summary(full)
+        assert any(i.rule_id == "duplicate_function" for i in merged.all_issues)
+        assert merged.metadata["shards"] == {
+            "count": 3,
+            "merged": [1, 2, 3],
+            "missing": [],
+        }
+
+    def test_merge_rejects_inconsistent_shards(self, tmp_path: Path) -> None:
+        """Test repeated shards and mixed shard counts."""
+        self._project(tmp_path)
+        analyzer = EcoGuardAnalyzer()
+        first = analyzer.analyze_shard(tmp_path, 1, 2)
+
+        with pytest.raises(ValueError):
+            analyzer.merge_shards([first, first])
+        with pytest.raises(ValueError):
+            analyzer.merge_shards([first, analyzer.analyze_shard(tmp_path, 2, 3)])
+        with pytest.raises(ValueError):
+            analyzer.merge_shards([])
+        assert analyzer.merge_shards([first]).metadata["shards"]["missing"] == [2]
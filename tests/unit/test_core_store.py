@@ -0,0 +1,101 @@
+"""
+Test suite for the SQLite results store.
+
+This module tests ingesting project results and the trend queries.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from ecoguard_ai.core.issue import Issue
+from ecoguard_ai.core.result import AnalysisResult, ProjectAnalysisResult
+from ecoguard_ai.core.store import ResultStore
+
+
+def _run(day: int, unused: int, project: str = "/repo") -> ProjectAnalysisResult:
+    """A project run on a given day of 2026 with some unused-variable issues."""
+    issues = [
+        Issue(
+            rule_id="unused_variable",
+            category="quality",
+            severity="warning",
+            message=f"Variable {i} is unused",
+            line=i + 1,
+            file_path="app.py",
+        )
+        for i in range(unused)
+    ]
+    issues.append(
+        Issue(
+            rule_id="string_concatenation",
+            category="green",
+            severity="info",
+            message="Use join",
+            line=10,
+            file_path="util.py",
+        )
+    )
+    return ProjectAnalysisResult(
+        project_path=project,
+        file_results=[
+            AnalysisResult(file_path="app.py", issues=issues[:-1]),
+            AnalysisResult(file_path="util.py", issues=issues[-1:]),
+        ],
+        analysis_time=datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(days=day),
+    )
+
+
+class TestResultStore:
+    """Test the ResultStore class."""
+
+    def setup_method(self) -> None:
+        """Set up an in-memory store with three nightly runs."""
+        self.store = ResultStore(":memory:")
+        self.run_ids = self.store.add_runs([_run(0, 3), _run(1, 2), _run(2, 0)])
+
+    def teardown_method(self) -> None:
+        """Close the store."""
+        self.store.close()
+
+    def test_rule_trend(self) -> None:
+        """Test issue counts per rule over time."""
+        trend = self.store.rule_trend("unused_variable")
+
+        assert [row["count"] for row in trend] == [3, 2]
+        assert trend[0]["analysis_time"].startswith("2026-01-01")
+        assert len(self.store.rule_trend(since="2026-01-02")) == 3
+
+    def test_score_history(self) -> None:
+        """Test the green score history."""
+        history = self.store.score_history(project_path="/repo")
+
+        assert [row["total_issues"] for row in history] == [4, 3, 1]
+        assert all(0.0 <= row["green_score"] <= 100.0 for row in history)
+        assert self.store.score_history(project_path="/other") == []
+
+    def test_issue_counts(self) -> None:
+        """Test grouping one run's issues."""
+        run_id = self.run_ids[0]
+
+        assert self.store.issue_counts(run_id) == {"info": 1, "warning": 3}
+        assert self.store.issue_counts(run_id, "path") == {"app.py": 3, "util.py": 1}
+        with pytest.raises(ValueError):
+            self.store.issue_counts(run_id, "author")
+
+    def test_runs_are_stored_once(self) -> None:
+        """Test that re-ingesting a run is a no-op."""
+        assert self.store.add_run(_run(0, 3)) is None
+        assert len(self.store.score_history()) == 3
+
+    def test_round_trip_through_json(self, tmp_path) -> None:
+        """Test storing a project result read back from its JSON report."""
+        result = ProjectAnalysisResult.from_json(_run(5, 1, "/json").to_json())
+
+        with ResultStore(tmp_path / "history.db") as store:
+            run_id = store.add_run(result)
+        with ResultStore(tmp_path / "history.db") as store:
+            assert store.issue_counts(run_id, "rule") == {
+                "string_concatenation": 1,
+                "unused_variable": 1,
+            }
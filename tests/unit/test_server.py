@@ -0,0 +1,160 @@
+"""
+Test suite for the local HTTP analysis service.
+
+This module tests request batching, backpressure, the metrics and the
+HTTP endpoints on localhost.
+"""
+
+import http.client
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ecoguard_ai.server import (
+    MAX_REQUEST_BYTES,
+    BatchingAnalysisService,
+    ServiceOverloaded,
+    create_server,
+    percentile,
+)
+
+CODE = "import os\n\ndef f():\n    unused = 1\n    return 2\n"
+
+
+class TestBatchingAnalysisService:
+    """Test the BatchingAnalysisService class."""
+
+    def setup_method(self) -> None:
+        """Set up a thread pool standing in for the worker processes."""
+        self.executor = ThreadPoolExecutor(max_workers=2)
+
+    def teardown_method(self) -> None:
+        """Stop the thread pool."""
+        self.executor.shutdown(wait=True)
+
+    def test_concurrent_requests_are_coalesced(self) -> None:
+        """Test that requests waiting together share one batch."""
+        service = BatchingAnalysisService(
+            executor=self.executor, batch_window=0.5, max_batch_size=4
+        )
+        futures = [service.submit([(f"m{i}.py", CODE)]) for i in range(3)]
+        futures.append(service.submit([("a.py", CODE), ("b.py", "x = (\n")]))
+        service.start()
+        try:
+            results = [future.result(timeout=10) for future in futures]
+        finally:
+            service.stop()
+
+        assert [r[0].file_path for r in results[:3]] == ["m0.py", "m1.py", "m2.py"]
+        assert [r.file_path for r in results[3]] == ["a.py", "b.py"]
+        assert results[3][1].metadata == {"error": "syntax_error"}
+        snapshot = service.metrics.snapshot()
+        assert snapshot["batches"] == 1
+        assert snapshot["batch_size"]["max"] == 5
+
+    def test_full_queue_rejects_requests(self) -> None:
+        """Test backpressure when nothing drains the queue."""
+        service = BatchingAnalysisService(executor=self.executor, queue_size=1)
+        service.submit([("a.py", CODE)])
+
+        with pytest.raises(ServiceOverloaded):
+            service.submit([("b.py", CODE)])
+        assert service.metrics.rejected == 1
+        assert service.queue_depth == 1
+
+    def test_percentile(self) -> None:
+        """Test nearest-rank percentiles."""
+        values = [float(v) for v in range(1, 101)]
+
+        assert percentile(values, 0.5) == 50.0
+        assert percentile(values, 0.99) == 99.0
+        assert percentile([], 0.5) == 0.0
+
+
+class TestAnalysisServer:
+    """Test the HTTP endpoints."""
+
+    def setup_method(self) -> None:
+        """Start a server on a free localhost port."""
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.service = BatchingAnalysisService(executor=self.executor, queue_size=4)
+        self.server = create_server("127.0.0.1", 0, service=self.service)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def teardown_method(self) -> None:
+        """Stop the server, the service and the thread pool."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.service.stop()
+        self.executor.shutdown(wait=True)
+
+    def _request(self, path, payload=None):
+        data = None if payload is None else json.dumps(payload).encode("utf-8")
+        request = urllib.request.Request(self.url + path, data=data)
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_analyze_single_file(self) -> None:
+        """Test analyzing one file."""
+        status, body = self._request("/analyze", {"source": CODE, "path": "x.py"})
+
+        assert status == 200
+        assert body["file_path"] == "x.py"
+        assert any(issue["rule_id"] == "unused_import" for issue in body["issues"])
+
+    def test_analyze_batch_and_metrics(self) -> None:
+        """Test a batch request and the metrics it leaves behind."""
+        files = [{"source": CODE, "path": f"m{i}.py"} for i in range(3)]
+
+        status, body = self._request("/analyze", {"files": files})
+        _, metrics = self._request("/metrics")
+
+        assert status == 200
+        assert [r["file_path"] for r in body["results"]] == ["m0.py", "m1.py", "m2.py"]
+        assert metrics["requests"] == 1
+        assert metrics["files"] == 3
+        assert set(metrics["latency_ms"]) == {"p50", "p90", "p99"}
+
+    def test_bad_requests(self) -> None:
+        """Test malformed payloads and unknown endpoints."""
+        assert self._request("/analyze", {"files": []})[0] == 400
+        assert self._request("/analyze", {"path": "x.py"})[0] == 400
+        assert self._request("/missing")[0] == 404
+        assert self._request("/health") == (200, {"status": "ok"})
+
+    def test_bad_content_length(self) -> None:
+        """Test invalid, negative and oversized Content-Length headers."""
+        statuses = []
+        for length in ["abc", "-1", str(MAX_REQUEST_BYTES + 1)]:
+            connection = http.client.HTTPConnection(
+                "127.0.0.1", self.server.server_address[1], timeout=10
+            )
+            connection.putrequest("POST", "/analyze")
+            connection.putheader("Content-Length", length)
+            connection.endheaders()
+            response = connection.getresponse()
+            statuses.append(response.status)
+            response.read()
+            connection.close()
+
+        assert statuses == [400, 400, 413]
+
+    def test_overload_returns_503(self) -> None:
+        """Test that a full queue is reported as 503."""
+        idle = BatchingAnalysisService(executor=self.executor, queue_size=1)
+        idle.submit([("a.py", CODE)])
+        self.server.service = idle
+
+        status, body = self._request("/analyze", {"source": CODE})
+
+        assert status == 503
+        assert "retry" in body["error"]